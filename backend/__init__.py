@@ -15,6 +15,24 @@ from backend.endpoints.contributors import contributors_api
 from backend.endpoints.collaborations import collab_api
 from backend.endpoints.dashboard import dashboard_api
 from backend.endpoints.persons import persons_api
+from backend.endpoints.jobs import jobs_api
+from backend.endpoints.export import export_api
+from backend.endpoints.imports import import_api
+from backend.endpoints.changes import changes_api
+from backend.endpoints.events import events_api
+from backend.endpoints.relations import relations_api
+from backend.endpoints.suggest import suggest_api
+from backend.services.read_routing import register_read_your_writes
+from backend.services.http_cache import register_conditional_get
+from backend.services.compression import register_compression
+from backend.services.formats import register_formats
+from backend.services.assets import register_assets
+from backend.services.events import register_live_events
+from backend.services.rollups import register_rollups
+from backend.services.suggest import register_suggest
+from backend.services.snapshot import register_snapshot
+from backend.services.references import register_references
+from backend.services.idempotency import register_idempotency
 
 logger = get_logger(__name__)
 
@@ -28,6 +46,41 @@ def create_app():
     # Load and validate configuration from environment variables into Flask config
     app.config.from_object(Config)
 
+    # Pin a client's reads to the primary for a moment after its own writes
+    register_read_your_writes(app)
+
+    # Columnar JSON / MessagePack for API clients that ask for them via Accept
+    register_formats(app)
+
+    # gzip/brotli for API responses; registered before the ETag hook so that
+    # it runs after it and ETags/304s are computed on the uncompressed body
+    register_compression(app)
+
+    # ETag + 304 Not Modified on API lists, for the frontend's revalidation
+    register_conditional_get(app)
+
+    # Hashed frontend bundles, when they have been built
+    register_assets(app)
+
+    # Publish successful writes to the live event streams (GET /api/events)
+    register_live_events(app)
+
+    # Keep the catalog statistics rollups current: after writes and on a schedule
+    register_rollups(app)
+
+    # Load the typeahead indexes (GET /api/suggest) and rebuild them after writes
+    register_suggest(app)
+
+    # Serve list pages from the in-memory columnar snapshot, when enabled
+    register_snapshot(app)
+
+    # Forget the cached label/contributor IDs when the database is reset
+    register_references(app)
+
+    # Answer retried POST/PUT with the same Idempotency-Key from the stored
+    # response; registered last so that it stores the uncompressed response
+    register_idempotency(app)
+
     app.register_blueprint(frontend_blueprint)
     app.register_blueprint(db_admin_api)
     app.register_blueprint(record_label_api)
@@ -37,5 +90,12 @@ def create_app():
     app.register_blueprint(collab_api)
     app.register_blueprint(dashboard_api)
     app.register_blueprint(persons_api)
+    app.register_blueprint(jobs_api)
+    app.register_blueprint(export_api)
+    app.register_blueprint(import_api)
+    app.register_blueprint(changes_api)
+    app.register_blueprint(events_api)
+    app.register_blueprint(relations_api)
+    app.register_blueprint(suggest_api)
 
     return app
\ No newline at end of file
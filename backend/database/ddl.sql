@@ -6,14 +6,16 @@ CREATE TABLE RecordLabel (
     Location VARCHAR(255),
     Website VARCHAR(255) UNIQUE,
     Email VARCHAR(255) NOT NULL UNIQUE,
-    PhoneNumber VARCHAR(50) NOT NULL UNIQUE
+    PhoneNumber VARCHAR(50) NOT NULL UNIQUE,
+    RowVer ROWVERSION                      -- optimistic concurrency (If-Match)
 );
 
 CREATE TABLE Song (
     SongID INT IDENTITY(1,1) PRIMARY KEY,
     Title VARCHAR(255) NOT NULL,
     Duration INT NOT NULL,
-    ReleaseDate DATE
+    ReleaseDate DATE,
+    RowVer ROWVERSION
 );
 
 CREATE TABLE Collaboration (
@@ -23,6 +25,7 @@ CREATE TABLE Collaboration (
     EndDate DATE,
     Description TEXT,
     Song_SongID INT,
+    RowVer ROWVERSION,
     FOREIGN KEY (Song_SongID) REFERENCES Song(SongID),
     CHECK (
         (StartDate IS NOT NULL OR EndDate IS NULL) AND
@@ -35,7 +38,8 @@ CREATE TABLE Person (
     Name VARCHAR(255) NOT NULL,
     DateOfBirth DATE,
     Email VARCHAR(255) UNIQUE,
-    PhoneNumber VARCHAR(50) UNIQUE
+    PhoneNumber VARCHAR(50) UNIQUE,
+    RowVer ROWVERSION
 );
 
 -- ========= Especializações (IS-A) =========
@@ -43,6 +47,7 @@ CREATE TABLE Person (
 CREATE TABLE Contributor (
     ContributorID INT IDENTITY(1,1) PRIMARY KEY,
     Person_NIF VARCHAR(20) NOT NULL UNIQUE,
+    RowVer ROWVERSION,
     FOREIGN KEY (Person_NIF) REFERENCES Person(NIF) ON DELETE NO ACTION ON UPDATE CASCADE
 );
 
@@ -54,6 +59,7 @@ CREATE TABLE Employee (
     HireDate DATE NOT NULL,
     RecordLabel_RecordLabelID INT NOT NULL,
     Person_NIF VARCHAR(20) NOT NULL UNIQUE,
+    RowVer ROWVERSION,
     FOREIGN KEY (RecordLabel_RecordLabelID) REFERENCES RecordLabel(RecordLabelID) ON DELETE NO ACTION ON UPDATE CASCADE,
     FOREIGN KEY (Person_NIF) REFERENCES Person(NIF) ON DELETE NO ACTION ON UPDATE CASCADE
 );
@@ -117,3 +123,243 @@ CREATE TABLE Artist_Genre (
     PRIMARY KEY (Artist_ContributorID, Genre),
     FOREIGN KEY (Artist_ContributorID) REFERENCES Artist(Contributor_ContributorID) ON DELETE CASCADE ON UPDATE CASCADE
 );
+
+-- ========= Índices de Ordenação das Listas =========
+-- One per column the list endpoints can sort by (?sort=, see
+-- backend/services/list_queries.py).  The clustered key rides along in every
+-- nonclustered index, so ORDER BY <column>, <ID> is read in index order and
+-- a TOP-N page stops after N rows.  RecordLabel.Name is covered by its UNIQUE
+-- constraint.  The date indexes also serve the range filters (releasedFrom/To,
+-- hiredFrom/To) as range seeks.  For the collaboration overlap filter
+-- (StartDate <= @To AND (EndDate >= @From OR EndDate IS NULL)) each date index
+-- includes the other date, so whichever bound is more selective is sought and
+-- the other checked in the same index, without key lookups.
+
+CREATE INDEX IX_Song_Title ON Song (Title);
+CREATE INDEX IX_Song_Duration ON Song (Duration);
+CREATE INDEX IX_Song_ReleaseDate ON Song (ReleaseDate);
+CREATE INDEX IX_Person_Name ON Person (Name);
+CREATE INDEX IX_Employee_Salary ON Employee (Salary);
+CREATE INDEX IX_Employee_HireDate ON Employee (HireDate);
+CREATE INDEX IX_Collaboration_Name ON Collaboration (CollaborationName);
+CREATE INDEX IX_Collaboration_StartDate ON Collaboration (StartDate) INCLUDE (EndDate);
+CREATE INDEX IX_Collaboration_EndDate ON Collaboration (EndDate) INCLUDE (StartDate);
+
+-- ========= Índices das Relações =========
+-- The relationship endpoints (/api/<parent>/<id>/<children>, RELATIONS in
+-- backend/services/list_queries.py) seek the association tables by the
+-- parent's key.  Where the primary key does not already lead with that column
+-- (Contributor_Song by contributor, RecordLabel_Collaboration by its first
+-- label), it gets an index of its own.  The `?include=` queries
+-- (backend/services/includes.py) seek the same tables by a set of keys, plus
+-- a song's collaboration and a collaboration's labels.
+
+CREATE INDEX IX_Employee_RecordLabel ON Employee (RecordLabel_RecordLabelID);
+CREATE INDEX IX_Contributor_Song_Song ON Contributor_Song (Song_SongID);
+CREATE INDEX IX_Collaboration_Contributor_Contributor ON Collaboration_Contributor (Contributor_ContributorID);
+CREATE INDEX IX_RecordLabel_Collaboration_Label2 ON RecordLabel_Collaboration (RecordLabel_RecordLabelID2);
+CREATE INDEX IX_RecordLabel_Collaboration_Collaboration ON RecordLabel_Collaboration (Collaboration_CollaborationID);
+CREATE INDEX IX_Collaboration_Song ON Collaboration (Song_SongID);
+
+-- ========= Infraestrutura da Aplicação =========
+
+-- Background jobs (cascade deletes, schema init, data population)
+CREATE TABLE Job (
+    JobID VARCHAR(36) PRIMARY KEY,
+    Kind VARCHAR(50) NOT NULL,
+    Status VARCHAR(20) NOT NULL,           -- queued | running | succeeded | failed
+    Progress INT NOT NULL DEFAULT 0,       -- units of work done (rows, SQL batches)
+    Message VARCHAR(MAX),
+    CreatedAt DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+    UpdatedAt DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+);
+
+-- Idempotency-Key claims and stored responses, shared by the API workers
+-- when IDEMPOTENCY_SHARED is set.  StatusCode is NULL while the first request
+-- with the key is still running.
+CREATE TABLE IdempotencyKey (
+    IdempotencyKey VARCHAR(255) PRIMARY KEY,
+    Fingerprint BINARY(32) NOT NULL,       -- SHA-256 of method, path and body
+    StatusCode INT,
+    Headers VARCHAR(MAX),                  -- JSON [[name, value], ...]
+    Body VARBINARY(MAX),                   -- zlib-compressed
+    ClaimedAt DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+    ExpiresAt DATETIME2 NOT NULL
+);
+
+CREATE INDEX IX_IdempotencyKey_ExpiresAt ON IdempotencyKey (ExpiresAt);
+
+-- Change feed: one row per inserted/updated/deleted entity, appended by the
+-- trg_ChangeLog_* triggers.  RowVer orders the feed; readers only go up to
+-- MIN_ACTIVE_ROWVERSION() so rows of still-open transactions are never skipped.
+CREATE TABLE ChangeLog (
+    ChangeID BIGINT IDENTITY(1,1) PRIMARY KEY,
+    Entity VARCHAR(30) NOT NULL,           -- songs | persons | employees | contributors | collaborations | record_labels
+    EntityKey VARCHAR(20) NOT NULL,        -- the entity's ID (NIF for persons)
+    Operation CHAR(1) NOT NULL,            -- I(nsert) | U(pdate) | D(elete)
+    ChangedAt DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+    RowVer ROWVERSION
+);
+
+CREATE UNIQUE INDEX IX_ChangeLog_RowVer ON ChangeLog (RowVer);
+
+-- Bulk import staging: one set of rows per import, keyed by the import's JobID.
+-- Values are kept as text and validated set-wise by the sp_Import* procedures,
+-- which record the first rule a row breaks in Error and merge the rest.
+CREATE TABLE Import_RecordLabel (
+    ImportID VARCHAR(36) NOT NULL,
+    RowNumber INT NOT NULL,                -- line/record number in the source file
+    Name VARCHAR(255),
+    Location VARCHAR(255),
+    Website VARCHAR(255),
+    Email VARCHAR(255),
+    PhoneNumber VARCHAR(50),
+    Error VARCHAR(500),
+    PRIMARY KEY (ImportID, RowNumber)
+);
+
+CREATE TABLE Import_Employee (
+    ImportID VARCHAR(36) NOT NULL,
+    RowNumber INT NOT NULL,
+    NIF VARCHAR(20),
+    Name VARCHAR(255),
+    DateOfBirth VARCHAR(10),
+    Email VARCHAR(255),
+    PhoneNumber VARCHAR(50),
+    JobTitle VARCHAR(100),
+    Department VARCHAR(100),
+    Salary VARCHAR(20),
+    HireDate VARCHAR(10),
+    RecordLabelID VARCHAR(20),             -- either the label's ID ...
+    RecordLabelName VARCHAR(255),          -- ... or its name
+    ResolvedRecordLabelID INT,             -- set during validation
+    Error VARCHAR(500),
+    PRIMARY KEY (ImportID, RowNumber)
+);
+
+CREATE TABLE Import_Contributor (
+    ImportID VARCHAR(36) NOT NULL,
+    RowNumber INT NOT NULL,
+    NIF VARCHAR(20),
+    Name VARCHAR(255),
+    DateOfBirth VARCHAR(10),
+    Email VARCHAR(255),
+    PhoneNumber VARCHAR(50),
+    Roles VARCHAR(255),                    -- comma-separated: Artist, Producer, Songwriter
+    Error VARCHAR(500),
+    PRIMARY KEY (ImportID, RowNumber)
+);
+
+CREATE TABLE Import_Song (
+    ImportID VARCHAR(36) NOT NULL,
+    RowNumber INT NOT NULL,
+    Title VARCHAR(255),
+    Duration VARCHAR(20),
+    ReleaseDate VARCHAR(10),
+    Genres VARCHAR(4000),                  -- comma-separated
+    Contributors VARCHAR(4000),            -- comma-separated contributor NIFs
+    Error VARCHAR(500),
+    PRIMARY KEY (ImportID, RowNumber)
+);
+
+-- Catalog statistics: rollups maintained by sp_RefreshStats, so that
+-- /api/dashboard/stats/* read a few summary rows instead of joining the
+-- catalog.  StatsRefresh records when each rollup was last brought up to date.
+CREATE TABLE StatsRefresh (
+    Rollup VARCHAR(30) PRIMARY KEY,        -- genres | contributors | labels | release_dates | label_pairs
+    RefreshedAt DATETIME2 NOT NULL
+);
+
+CREATE TABLE Stats_Genre (
+    Genre VARCHAR(50) PRIMARY KEY,
+    SongCount INT NOT NULL,
+    TotalDuration INT NOT NULL             -- seconds
+);
+
+CREATE TABLE Stats_Contributor (
+    ContributorID INT PRIMARY KEY,
+    Name VARCHAR(255) NOT NULL,
+    SongCount INT NOT NULL,
+    TotalDuration INT NOT NULL
+);
+
+CREATE INDEX IX_Stats_Contributor_SongCount ON Stats_Contributor (SongCount DESC);
+
+-- A label's catalog: the songs of its employees who are also contributors,
+-- plus the songs of the collaborations it takes part in
+CREATE TABLE Stats_Label (
+    RecordLabelID INT PRIMARY KEY,
+    Name VARCHAR(255) NOT NULL,
+    SongCount INT NOT NULL,
+    TotalDuration INT NOT NULL
+);
+
+CREATE TABLE Stats_ReleaseMonth (
+    ReleaseMonth DATE PRIMARY KEY,         -- first day of the month
+    SongCount INT NOT NULL
+);
+
+-- Collaborations per pair of labels, stored once per pair (RecordLabelID1 < RecordLabelID2)
+CREATE TABLE Stats_LabelPair (
+    RecordLabelID1 INT NOT NULL,
+    RecordLabelID2 INT NOT NULL,
+    Name1 VARCHAR(255) NOT NULL,
+    Name2 VARCHAR(255) NOT NULL,
+    CollaborationCount INT NOT NULL,
+    PRIMARY KEY (RecordLabelID1, RecordLabelID2)
+);
+
+CREATE INDEX IX_Stats_LabelPair_Count ON Stats_LabelPair (CollaborationCount DESC);
+
+-- What each rollup last counted: the groups every song (or, for label pairs,
+-- collaboration) is in.  An incremental refresh finds a changed row's previous
+-- groups here, since after an update or delete the catalog no longer shows them,
+-- and recomputes only those groups and the new ones.
+CREATE TABLE Stats_GenreSong (
+    SongID INT NOT NULL,
+    Genre VARCHAR(50) NOT NULL,
+    PRIMARY KEY (SongID, Genre)
+);
+
+CREATE INDEX IX_Stats_GenreSong_Genre ON Stats_GenreSong (Genre);
+
+CREATE TABLE Stats_ContributorSong (
+    SongID INT NOT NULL,
+    ContributorID INT NOT NULL,
+    PRIMARY KEY (SongID, ContributorID)
+);
+
+CREATE INDEX IX_Stats_ContributorSong_Contributor ON Stats_ContributorSong (ContributorID);
+
+-- Via: E(mployee) or C(ollaboration), and ViaID its ID: the link that puts the song in the label's catalog.
+-- ContributorID: for employee links, the employee's contributor that credits the song
+CREATE TABLE Stats_LabelSong (
+    RecordLabelID INT NOT NULL,
+    SongID INT NOT NULL,
+    Via CHAR(1) NOT NULL,
+    ViaID INT NOT NULL,
+    ContributorID INT NULL,
+    PRIMARY KEY (RecordLabelID, SongID, Via, ViaID)
+);
+
+CREATE INDEX IX_Stats_LabelSong_Song ON Stats_LabelSong (SongID);
+CREATE INDEX IX_Stats_LabelSong_Via ON Stats_LabelSong (Via, ViaID);
+CREATE INDEX IX_Stats_LabelSong_Contributor ON Stats_LabelSong (ContributorID);
+
+CREATE TABLE Stats_ReleaseMonthSong (
+    SongID INT NOT NULL,
+    ReleaseMonth DATE NOT NULL,
+    PRIMARY KEY (SongID, ReleaseMonth)
+);
+
+CREATE INDEX IX_Stats_ReleaseMonthSong_Month ON Stats_ReleaseMonthSong (ReleaseMonth);
+
+CREATE TABLE Stats_LabelPairCollaboration (
+    CollaborationID INT NOT NULL,
+    RecordLabelID1 INT NOT NULL,
+    RecordLabelID2 INT NOT NULL,
+    PRIMARY KEY (CollaborationID, RecordLabelID1, RecordLabelID2)
+);
+
+CREATE INDEX IX_Stats_LabelPairCollaboration_Pair ON Stats_LabelPairCollaboration (RecordLabelID1, RecordLabelID2);
+CREATE INDEX IX_Stats_LabelPairCollaboration_Label2 ON Stats_LabelPairCollaboration (RecordLabelID2);
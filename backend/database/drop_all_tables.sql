@@ -19,3 +19,23 @@ DROP TABLE IF EXISTS Collaboration;
 DROP TABLE IF EXISTS Song;
 DROP TABLE IF EXISTS RecordLabel;
 DROP TABLE IF EXISTS Person;
+
+-- ========== Drop Application Tables ==========
+DROP TABLE IF EXISTS Job;
+DROP TABLE IF EXISTS IdempotencyKey;
+DROP TABLE IF EXISTS ChangeLog;
+DROP TABLE IF EXISTS Import_RecordLabel;
+DROP TABLE IF EXISTS Import_Employee;
+DROP TABLE IF EXISTS Import_Contributor;
+DROP TABLE IF EXISTS Import_Song;
+DROP TABLE IF EXISTS StatsRefresh;
+DROP TABLE IF EXISTS Stats_Genre;
+DROP TABLE IF EXISTS Stats_Contributor;
+DROP TABLE IF EXISTS Stats_Label;
+DROP TABLE IF EXISTS Stats_ReleaseMonth;
+DROP TABLE IF EXISTS Stats_LabelPair;
+DROP TABLE IF EXISTS Stats_GenreSong;
+DROP TABLE IF EXISTS Stats_ContributorSong;
+DROP TABLE IF EXISTS Stats_LabelSong;
+DROP TABLE IF EXISTS Stats_ReleaseMonthSong;
+DROP TABLE IF EXISTS Stats_LabelPairCollaboration;
@@ -0,0 +1,24 @@
+-- ====================================================
+-- GetChanges: Change feed entries after a watermark, oldest first
+--   @Since  = RowVer of the last entry the caller has seen (NULL: from the start)
+--   @Entity = comma-separated entity names to keep (NULL: all)
+--   Entries written by transactions that are still open, and everything
+--   after them, are held back until they commit, so a caller that resumes
+--   from the last RowVer it received never misses one.
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetChanges
+    @Since  BINARY(8)    = NULL,
+    @Entity VARCHAR(255) = NULL,
+    @Limit  INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT TOP (@Limit) ChangeID, Entity, EntityKey, Operation, ChangedAt, RowVer
+    FROM dbo.ChangeLog
+    WHERE (@Since IS NULL OR RowVer > @Since)
+      AND RowVer < MIN_ACTIVE_ROWVERSION()
+      AND (@Entity IS NULL OR Entity IN (SELECT LTRIM(RTRIM(value)) FROM STRING_SPLIT(@Entity, ',')))
+    ORDER BY RowVer;
+END;
+GO
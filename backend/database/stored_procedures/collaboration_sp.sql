@@ -5,21 +5,29 @@ CREATE OR ALTER PROCEDURE dbo.sp_GetCollaborations
     @Name        VARCHAR(255) = NULL,
     @Start       DATE         = NULL,
     @End         DATE         = NULL,
+    @ActiveFrom  DATE         = NULL,    -- active at some point in [@ActiveFrom, @ActiveTo];
+    @ActiveTo    DATE         = NULL,    -- a NULL EndDate means still running
     @Song        VARCHAR(255) = NULL,    -- still matches against vw_Collaborations.SongTitle
     @Label       VARCHAR(255) = NULL,
-    @Contributor VARCHAR(255) = NULL
+    @Contributor VARCHAR(255) = NULL,
+    @AfterID     INT          = NULL,    -- keyset paging: only rows after this ID
+    @Limit       INT          = NULL     -- page size; NULL returns every row
 AS
 BEGIN
     SET NOCOUNT ON;
 
-    SELECT *
+    SELECT TOP (COALESCE(@Limit, 2147483647)) *
     FROM dbo.vw_Collaborations
     WHERE (@Name        IS NULL OR CollaborationName LIKE '%' + @Name + '%')
       AND (@Start       IS NULL OR StartDate         = @Start)
       AND (@End         IS NULL OR EndDate           = @End)
+      AND (@ActiveFrom  IS NULL OR EndDate           >= @ActiveFrom OR EndDate IS NULL)
+      AND (@ActiveTo    IS NULL OR StartDate         <= @ActiveTo)
       AND (@Song        IS NULL OR SongTitle         LIKE '%' + @Song + '%')
       AND (@Label       IS NULL OR RecordLabels      LIKE '%' + @Label + '%')
-      AND (@Contributor IS NULL OR Contributors     LIKE '%' + @Contributor + '%');
+      AND (@Contributor IS NULL OR Contributors     LIKE '%' + @Contributor + '%')
+      AND (@AfterID     IS NULL OR CollaborationID   > @AfterID)
+    ORDER BY CollaborationID;
 END
 GO
 
@@ -44,6 +52,8 @@ GO
 --   Now takes @SongID directly (INT), rather than @SongTitle.
 --   @RecordLabels = comma-separated list of RecordLabel names.
 --   @Contributors  = comma-separated list of Person_NIFs.
+--   @RecordLabelIDs / @ContributorIDs: the same, already resolved to IDs
+--   (backend/services/references.py); when given, the names are ignored.
 -- ================================================
 CREATE OR ALTER PROCEDURE dbo.sp_CreateCollaboration
     @CollaborationName VARCHAR(255),
@@ -53,6 +63,8 @@ CREATE OR ALTER PROCEDURE dbo.sp_CreateCollaboration
     @SongID            INT          = NULL,   -- direct FK to Song.SongID
     @RecordLabels      VARCHAR(MAX) = NULL,   -- comma-separated list of RecordLabel names
     @Contributors      VARCHAR(MAX) = NULL,   -- comma-separated list of Person_NIFs
+    @RecordLabelIDs    VARCHAR(MAX) = NULL,   -- comma-separated RecordLabelIDs (instead of names)
+    @ContributorIDs    VARCHAR(MAX) = NULL,   -- comma-separated ContributorIDs (instead of NIFs)
     @NewID             INT           OUTPUT
 AS
 BEGIN
@@ -67,8 +79,16 @@ BEGIN
 
         SET @NewID = SCOPE_IDENTITY();
 
-        -- 2) Handle RecordLabels (if any)
-        IF @RecordLabels IS NOT NULL
+        -- 2) Handle RecordLabels (if any): resolved IDs in one statement, else by name
+        IF @RecordLabelIDs IS NOT NULL
+        BEGIN
+            INSERT INTO dbo.RecordLabel_Collaboration
+                (RecordLabel_RecordLabelID1, RecordLabel_RecordLabelID2, Collaboration_CollaborationID)
+            SELECT DISTINCT CAST(value AS INT), CAST(value AS INT), @NewID
+            FROM STRING_SPLIT(@RecordLabelIDs, ',')
+            WHERE value <> '';
+        END
+        ELSE IF @RecordLabels IS NOT NULL
         BEGIN
             DECLARE @lbl NVARCHAR(255);
             DECLARE lbl_cur CURSOR FOR
@@ -90,8 +110,16 @@ BEGIN
             DEALLOCATE lbl_cur;
         END
 
-        -- 3) Handle Contributors (if any)
-        IF @Contributors IS NOT NULL
+        -- 3) Handle Contributors (if any): resolved IDs in one statement, else by NIF
+        IF @ContributorIDs IS NOT NULL
+        BEGIN
+            INSERT INTO dbo.Collaboration_Contributor
+                (Collaboration_CollaborationID, Contributor_ContributorID)
+            SELECT DISTINCT @NewID, CAST(value AS INT)
+            FROM STRING_SPLIT(@ContributorIDs, ',')
+            WHERE value <> '';
+        END
+        ELSE IF @Contributors IS NOT NULL
         BEGIN
             DECLARE @con NVARCHAR(255);
             DECLARE con_cur CURSOR FOR
@@ -126,24 +154,64 @@ GO
 
 -- ================================================
 -- sp_UpdateCollaboration:
---   Updates an existing collaboration (and re‐writes its associations).
+--   Updates an existing collaboration and diffs its associations:
+--   only added labels/contributors are inserted and only removed ones
+--   deleted (additions first, so the link-count triggers never see a
+--   half-emptied collaboration).
 --   Now takes @SongID (INT) instead of @SongTitle.
+--   @RecordLabelIDs / @ContributorIDs: as in sp_CreateCollaboration.
+--   @ExpectedRowVersion (optional): 50412 if the collaboration changed
+--   since it was read.  Returns the updated row from vw_Collaborations.
 -- ================================================
 CREATE OR ALTER PROCEDURE dbo.sp_UpdateCollaboration
-    @ID                INT,
-    @CollaborationName VARCHAR(255),
-    @StartDate         DATE,
-    @EndDate           DATE         = NULL,
-    @Description       TEXT         = NULL,
-    @SongID            INT          = NULL,   -- direct FK to Song.SongID
-    @RecordLabels      VARCHAR(MAX) = NULL,   -- comma-separated list of RecordLabel names
-    @Contributors      VARCHAR(MAX) = NULL    -- comma-separated list of Person_NIFs
+    @ID                 INT,
+    @CollaborationName  VARCHAR(255),
+    @StartDate          DATE,
+    @EndDate            DATE          = NULL,
+    @Description        TEXT          = NULL,
+    @SongID             INT           = NULL,   -- direct FK to Song.SongID
+    @RecordLabels       VARCHAR(MAX)  = NULL,   -- comma-separated list of RecordLabel names
+    @Contributors       VARCHAR(MAX)  = NULL,   -- comma-separated list of Person_NIFs
+    @RecordLabelIDs     VARCHAR(MAX)  = NULL,   -- comma-separated RecordLabelIDs (instead of names)
+    @ContributorIDs     VARCHAR(MAX)  = NULL,   -- comma-separated ContributorIDs (instead of NIFs)
+    @ExpectedRowVersion VARBINARY(16) = NULL
 AS
 BEGIN
     SET NOCOUNT ON;
-    BEGIN TRANSACTION;
+    SET XACT_ABORT ON;
+
+    -- Resolve the requested label and contributor sets before taking any locks
+    -- (the resolved IDs when given: no lookups at all)
+    DECLARE @newLabels TABLE (RecordLabelID INT PRIMARY KEY);
+    IF @RecordLabelIDs IS NOT NULL
+        INSERT INTO @newLabels (RecordLabelID)
+        SELECT DISTINCT CAST(value AS INT)
+        FROM STRING_SPLIT(@RecordLabelIDs, ',')
+        WHERE value <> '';
+    ELSE
+        INSERT INTO @newLabels (RecordLabelID)
+        SELECT DISTINCT rl.RecordLabelID
+        FROM STRING_SPLIT(@RecordLabels, ',') AS s
+        JOIN dbo.RecordLabel rl
+          ON rl.Name = LTRIM(RTRIM(s.value));
+
+    DECLARE @newContributors TABLE (ContributorID INT PRIMARY KEY);
+    IF @ContributorIDs IS NOT NULL
+        INSERT INTO @newContributors (ContributorID)
+        SELECT DISTINCT CAST(value AS INT)
+        FROM STRING_SPLIT(@ContributorIDs, ',')
+        WHERE value <> '';
+    ELSE
+        INSERT INTO @newContributors (ContributorID)
+        SELECT DISTINCT co.ContributorID
+        FROM STRING_SPLIT(@Contributors, ',') AS s
+        JOIN dbo.Contributor co
+          ON co.Person_NIF = LTRIM(RTRIM(s.value));
+
     BEGIN TRY
-        -- 1) Update the Collaboration row itself
+        BEGIN TRANSACTION;
+
+        -- 1) Update the Collaboration row itself (version checked in the same statement)
         UPDATE dbo.Collaboration
         SET
           CollaborationName = @CollaborationName,
@@ -151,72 +219,64 @@ BEGIN
           EndDate           = @EndDate,
           Description       = @Description,
           Song_SongID       = @SongID
-        WHERE CollaborationID = @ID;
+        WHERE CollaborationID = @ID
+          AND (@ExpectedRowVersion IS NULL OR RowVer = @ExpectedRowVersion);
 
         IF @@ROWCOUNT = 0
+        BEGIN
+            IF EXISTS (SELECT 1 FROM dbo.Collaboration WHERE CollaborationID = @ID)
+                THROW 50412, 'Collaboration was modified by another request', 1;
             THROW 50030, 'Collaboration not found', 1;
+        END
 
-        -- 2) Delete existing RecordLabel links
-        DELETE FROM dbo.RecordLabel_Collaboration
-         WHERE Collaboration_CollaborationID = @ID;
+        -- 2) RecordLabel links: add missing (same row shape as CREATE), drop removed
+        INSERT INTO dbo.RecordLabel_Collaboration
+            (RecordLabel_RecordLabelID1, RecordLabel_RecordLabelID2, Collaboration_CollaborationID)
+        SELECT n.RecordLabelID, n.RecordLabelID, @ID
+        FROM @newLabels n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM dbo.RecordLabel_Collaboration rlc
+            WHERE rlc.Collaboration_CollaborationID = @ID
+              AND rlc.RecordLabel_RecordLabelID2 = n.RecordLabelID
+        );
 
-        -- 3) Delete existing Contributor links
-        DELETE FROM dbo.Collaboration_Contributor
-         WHERE Collaboration_CollaborationID = @ID;
+        DELETE rlc
+        FROM dbo.RecordLabel_Collaboration rlc
+        WHERE rlc.Collaboration_CollaborationID = @ID
+          AND NOT EXISTS (
+              SELECT 1 FROM @newLabels n
+              WHERE n.RecordLabelID = rlc.RecordLabel_RecordLabelID2
+          );
 
-        -- 4) Re‐insert RecordLabels (same logic as CREATE)
-        IF @RecordLabels IS NOT NULL
-        BEGIN
-            DECLARE @lbl2 NVARCHAR(255);
-            DECLARE lbl2_cur CURSOR FOR
-              SELECT LTRIM(RTRIM(value)) 
-              FROM STRING_SPLIT(@RecordLabels, ',');
-            OPEN lbl2_cur;
-            FETCH NEXT FROM lbl2_cur INTO @lbl2;
-            WHILE @@FETCH_STATUS = 0
-            BEGIN
-                INSERT INTO dbo.RecordLabel_Collaboration
-                    (RecordLabel_RecordLabelID1, RecordLabel_RecordLabelID2, Collaboration_CollaborationID)
-                SELECT rl.RecordLabelID, rl.RecordLabelID, @ID
-                FROM dbo.RecordLabel rl
-                WHERE rl.Name = @lbl2;
-
-                FETCH NEXT FROM lbl2_cur INTO @lbl2;
-            END
-            CLOSE lbl2_cur;  
-            DEALLOCATE lbl2_cur;
-        END
-
-        -- 5) Re‐insert Contributors (same logic as CREATE)
-        IF @Contributors IS NOT NULL
-        BEGIN
-            DECLARE @con2 NVARCHAR(255);
-            DECLARE con2_cur CURSOR FOR
-              SELECT LTRIM(RTRIM(value)) 
-              FROM STRING_SPLIT(@Contributors, ',');
-            OPEN con2_cur;
-            FETCH NEXT FROM con2_cur INTO @con2;
-            WHILE @@FETCH_STATUS = 0
-            BEGIN
-                INSERT INTO dbo.Collaboration_Contributor
-                   (Collaboration_CollaborationID, Contributor_ContributorID)
-                SELECT @ID, co.ContributorID
-                FROM dbo.Contributor co
-                JOIN dbo.Person p ON p.NIF = co.Person_NIF
-                WHERE p.NIF = @con2;
+        -- 3) Contributor links: add missing, drop removed
+        INSERT INTO dbo.Collaboration_Contributor
+           (Collaboration_CollaborationID, Contributor_ContributorID)
+        SELECT @ID, n.ContributorID
+        FROM @newContributors n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM dbo.Collaboration_Contributor cc
+            WHERE cc.Collaboration_CollaborationID = @ID
+              AND cc.Contributor_ContributorID = n.ContributorID
+        );
 
-                FETCH NEXT FROM con2_cur INTO @con2;
-            END
-            CLOSE con2_cur;  
-            DEALLOCATE con2_cur;
-        END
+        DELETE cc
+        FROM dbo.Collaboration_Contributor cc
+        WHERE cc.Collaboration_CollaborationID = @ID
+          AND NOT EXISTS (
+              SELECT 1 FROM @newContributors n
+              WHERE n.ContributorID = cc.Contributor_ContributorID
+          );
 
         COMMIT TRANSACTION;
     END TRY
     BEGIN CATCH
-        ROLLBACK TRANSACTION;
+        IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;
         THROW;
     END CATCH
+
+    SELECT *
+    FROM dbo.vw_Collaborations
+    WHERE CollaborationID = @ID;
 END
 GO
 
@@ -2,20 +2,28 @@
 -- sp_GetContributors: Fetch contributors with optional filters
 -- ================================================
 CREATE OR ALTER PROCEDURE dbo.sp_GetContributors
-    @Name   VARCHAR(255) = NULL,
-    @Role   VARCHAR(50)  = NULL,
-    @Email  VARCHAR(255) = NULL,
-    @Phone  VARCHAR(50)  = NULL
+    @Name        VARCHAR(255) = NULL,
+    @Role        VARCHAR(50)  = NULL,
+    @Email       VARCHAR(255) = NULL,
+    @Phone       VARCHAR(50)  = NULL,
+    @NIF         VARCHAR(20)  = NULL,
+    @RecordLabel VARCHAR(255) = NULL,
+    @AfterID     INT          = NULL,    -- keyset paging: only rows after this ID
+    @Limit       INT          = NULL     -- page size; NULL returns every row
 AS
 BEGIN
     SET NOCOUNT ON;
 
-    SELECT *
+    SELECT TOP (COALESCE(@Limit, 2147483647)) *
     FROM dbo.vw_Contributors
-    WHERE (@Name  IS NULL OR Name           LIKE '%' + @Name  + '%')
-      AND (@Role  IS NULL OR Roles          LIKE '%' + @Role  + '%')
-      AND (@Email IS NULL OR Email          LIKE '%' + @Email + '%')
-      AND (@Phone IS NULL OR PhoneNumber    LIKE '%' + @Phone + '%');
+    WHERE (@Name        IS NULL OR Name            LIKE '%' + @Name        + '%')
+      AND (@Role        IS NULL OR Roles           LIKE '%' + @Role        + '%')
+      AND (@Email       IS NULL OR Email           LIKE '%' + @Email       + '%')
+      AND (@Phone       IS NULL OR PhoneNumber     LIKE '%' + @Phone       + '%')
+      AND (@NIF         IS NULL OR NIF             LIKE '%' + @NIF         + '%')
+      AND (@RecordLabel IS NULL OR RecordLabelName LIKE '%' + @RecordLabel + '%')
+      AND (@AfterID     IS NULL OR ContributorID   > @AfterID)
+    ORDER BY ContributorID;
 END
 GO
 
@@ -278,6 +286,9 @@ GO
 --   then updates Roles.  If @NewNIF differs from the old one,
 --   it updates Person.NIF and fixes the Contributor.Person_NIF
 --   (and any Employee.Person_NIF) to point to the new NIF.
+--   @ExpectedRowVersion (optional) is the RowVersion the client read;
+--   if the Contributor or its Person changed since, 50412 is thrown.
+--   Returns the updated row from vw_Contributors.
 -- ================================================
 CREATE OR ALTER PROCEDURE dbo.sp_UpdateContributor
 (
@@ -287,7 +298,8 @@ CREATE OR ALTER PROCEDURE dbo.sp_UpdateContributor
     @DateOfBirth   DATE            = NULL,
     @Email         VARCHAR(255)    = NULL,
     @PhoneNumber   VARCHAR(50)     = NULL,
-    @Roles         VARCHAR(MAX)    = NULL    -- comma-separated
+    @Roles         VARCHAR(MAX)    = NULL,   -- comma-separated
+    @ExpectedRowVersion VARBINARY(16) = NULL
 )
 AS
 BEGIN
@@ -295,11 +307,15 @@ BEGIN
     BEGIN TRANSACTION;
     BEGIN TRY
         DECLARE @oldNIF VARCHAR(20);
+        DECLARE @currentRowVersion VARBINARY(16);
 
-        -- 1) Find the old Person_NIF for this Contributor
+        -- 1) Find the old Person_NIF for this Contributor; UPDLOCK keeps both
+        --    rows stable between the version check and the updates below
         SELECT 
-            @oldNIF = c.Person_NIF
-        FROM dbo.Contributor AS c
+            @oldNIF = c.Person_NIF,
+            @currentRowVersion = CAST(c.RowVer AS BINARY(8)) + CAST(p.RowVer AS BINARY(8))
+        FROM dbo.Contributor AS c WITH (UPDLOCK)
+        JOIN dbo.Person      AS p WITH (UPDLOCK) ON p.NIF = c.Person_NIF
         WHERE c.ContributorID = @ID;
 
         IF @oldNIF IS NULL
@@ -308,6 +324,9 @@ BEGIN
             THROW 50020, 'Contributor not found', 1;
         END
 
+        IF @ExpectedRowVersion IS NOT NULL AND @ExpectedRowVersion <> @currentRowVersion
+            THROW 50412, 'Contributor was modified by another request', 1;
+
         -- 2) If the NIF changed, update Person.NIF and also any referring FKs
         IF @NewNIF IS NOT NULL AND @NewNIF <> @oldNIF
         BEGIN
@@ -356,43 +375,38 @@ BEGIN
                 THROW 51010, 'Person not found', 1;
         END
 
-        -- 4) Delete existing roles for this Contributor
-        DELETE FROM dbo.Artist     WHERE Contributor_ContributorID = @ID;
-        DELETE FROM dbo.Producer   WHERE Contributor_ContributorID = @ID;
-        DELETE FROM dbo.Songwriter WHERE Contributor_ContributorID = @ID;
+        -- 4) Roles: diff against the stored role rows.  Kept roles are left
+        --    untouched, so an Artist keeps its StageName and Artist_Genre rows.
+        DECLARE @roleList TABLE (Role VARCHAR(50) PRIMARY KEY);
+        INSERT INTO @roleList (Role)
+        SELECT DISTINCT LTRIM(RTRIM(value))
+        FROM STRING_SPLIT(@Roles, ',')
+        WHERE LTRIM(RTRIM(value)) IN ('Artist', 'Producer', 'Songwriter');
 
-        -- 5) Re‐insert roles (if any)
-        IF @Roles IS NOT NULL
+        IF EXISTS (SELECT 1 FROM @roleList WHERE Role = 'Artist')
         BEGIN
-            DECLARE @r VARCHAR(50);
-            DECLARE cur CURSOR FOR
-              SELECT LTRIM(RTRIM(value)) 
-              FROM STRING_SPLIT(@Roles, ',');
-            OPEN cur;
-            FETCH NEXT FROM cur INTO @r;
-            WHILE @@FETCH_STATUS = 0
-            BEGIN
-                IF @r = 'Artist'
-                BEGIN
-                    INSERT dbo.Artist 
-                      (Contributor_ContributorID, StageName)
-                    VALUES 
-                      (@ID, CONCAT('Artist_', CAST(@ID AS VARCHAR(20))));
-                END
-                ELSE IF @r = 'Producer'
-                BEGIN
-                    INSERT dbo.Producer (Contributor_ContributorID) VALUES (@ID);
-                END
-                ELSE IF @r = 'Songwriter'
-                BEGIN
-                    INSERT dbo.Songwriter (Contributor_ContributorID) VALUES (@ID);
-                END
+            IF NOT EXISTS (SELECT 1 FROM dbo.Artist WHERE Contributor_ContributorID = @ID)
+                INSERT dbo.Artist (Contributor_ContributorID, StageName)
+                VALUES (@ID, CONCAT('Artist_', CAST(@ID AS VARCHAR(20))));
+        END
+        ELSE
+            DELETE FROM dbo.Artist WHERE Contributor_ContributorID = @ID;
 
-                FETCH NEXT FROM cur INTO @r;
-            END
-            CLOSE cur; 
-            DEALLOCATE cur;
+        IF EXISTS (SELECT 1 FROM @roleList WHERE Role = 'Producer')
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM dbo.Producer WHERE Contributor_ContributorID = @ID)
+                INSERT dbo.Producer (Contributor_ContributorID) VALUES (@ID);
         END
+        ELSE
+            DELETE FROM dbo.Producer WHERE Contributor_ContributorID = @ID;
+
+        IF EXISTS (SELECT 1 FROM @roleList WHERE Role = 'Songwriter')
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM dbo.Songwriter WHERE Contributor_ContributorID = @ID)
+                INSERT dbo.Songwriter (Contributor_ContributorID) VALUES (@ID);
+        END
+        ELSE
+            DELETE FROM dbo.Songwriter WHERE Contributor_ContributorID = @ID;
 
         COMMIT TRANSACTION;
     END TRY
@@ -400,6 +414,10 @@ BEGIN
         ROLLBACK TRANSACTION;
         THROW;  -- rethrow the original error
     END CATCH
+
+    SELECT *
+    FROM dbo.vw_Contributors
+    WHERE ContributorID = @ID;
 END
 GO
 
@@ -537,4 +555,152 @@ BEGIN
         @collabCount AS CollaborationCount,
         @songCount  AS SongCount;
 END
-GO
\ No newline at end of file
+GO
+
+-- ================================================
+-- sp_UpsertContributor:
+--   Single-call path for adding a Contributor. Upserts the Person (MERGE)
+--   and inserts the Contributor + Roles in one transaction. A mismatch
+--   between the incoming and stored Person fields is resolved by
+--   @ConflictPolicy:
+--     'fail'      → nothing is written, Outcome = 'conflict'
+--     'reuse'     → keep the stored Person fields, add the Contributor
+--     'overwrite' → replace the Person fields, add the Contributor
+--   If the Person already has a Contributor row, that row is returned
+--   (Outcome = 'existing').
+--   Returns one row:
+--     Outcome, PersonNIF,
+--     Existing* = the Person fields as stored before the call (NULL if new),
+--     followed by the vw_Contributors columns of the resulting Contributor.
+-- ================================================
+CREATE OR ALTER PROCEDURE dbo.sp_UpsertContributor
+(
+    @NIF            VARCHAR(20)    = NULL,
+    @Name           VARCHAR(255),
+    @DateOfBirth    DATE           = NULL,
+    @Email          VARCHAR(255)   = NULL,
+    @PhoneNumber    VARCHAR(50)    = NULL,
+    @Roles          VARCHAR(MAX)   = NULL,    -- comma-separated
+    @ConflictPolicy VARCHAR(10)    = 'fail'   -- fail | reuse | overwrite
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    IF @ConflictPolicy NOT IN ('fail', 'reuse', 'overwrite')
+        THROW 51020, 'Invalid conflict policy', 1;
+
+    IF @NIF IS NULL
+        SET @NIF = CONVERT(VARCHAR(20), NEWID());  -- generate random NIF
+
+    DECLARE
+        @Outcome       VARCHAR(10),
+        @ContributorID INT,
+        @personExists  BIT = 0,
+        @differs       BIT = 0,
+        @existingName  VARCHAR(255),
+        @existingDOB   DATE,
+        @existingEmail VARCHAR(255),
+        @existingPhone VARCHAR(50);
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- 1) Read (and key-range lock) the Person and any Contributor row for this NIF
+        SELECT
+            @personExists  = 1,
+            @existingName  = p.Name,
+            @existingDOB   = p.DateOfBirth,
+            @existingEmail = p.Email,
+            @existingPhone = p.PhoneNumber
+        FROM dbo.Person p WITH (UPDLOCK, HOLDLOCK)
+        WHERE p.NIF = @NIF;
+
+        SELECT @ContributorID = c.ContributorID
+        FROM dbo.Contributor c WITH (UPDLOCK, HOLDLOCK)
+        WHERE c.Person_NIF = @NIF;
+
+        IF @personExists = 1 AND NOT (
+               ISNULL(@existingName, '')  = ISNULL(@Name, '')
+           AND ISNULL(CONVERT(VARCHAR(10), @existingDOB, 120), '') = ISNULL(CONVERT(VARCHAR(10), @DateOfBirth, 120), '')
+           AND ISNULL(@existingEmail, '') = ISNULL(@Email, '')
+           AND ISNULL(@existingPhone, '') = ISNULL(@PhoneNumber, '')
+        )
+            SET @differs = 1;
+
+        IF @ContributorID IS NULL AND @differs = 1 AND @ConflictPolicy = 'fail'
+        BEGIN
+            -- 2a) Person exists but fields differ → caller decides (reuse / overwrite)
+            SET @Outcome = 'conflict';
+        END
+        ELSE
+        BEGIN
+            -- 2b) Insert the Person, or overwrite its fields if asked to
+            MERGE dbo.Person AS tgt
+            USING (SELECT @NIF AS NIF) AS src
+               ON tgt.NIF = src.NIF
+            WHEN MATCHED AND @differs = 1 AND @ConflictPolicy = 'overwrite' THEN
+                UPDATE SET
+                    Name        = @Name,
+                    DateOfBirth = @DateOfBirth,
+                    Email       = @Email,
+                    PhoneNumber = @PhoneNumber
+            WHEN NOT MATCHED THEN
+                INSERT (NIF, Name, DateOfBirth, Email, PhoneNumber)
+                VALUES (@NIF, @Name, @DateOfBirth, @Email, @PhoneNumber);
+
+            -- 2c) Add the Contributor + Roles unless it already exists
+            IF @ContributorID IS NULL
+            BEGIN
+                INSERT INTO dbo.Contributor (Person_NIF)
+                VALUES (@NIF);
+
+                SET @ContributorID = SCOPE_IDENTITY();
+
+                DECLARE @roleList TABLE (Role VARCHAR(50) PRIMARY KEY);
+                INSERT INTO @roleList (Role)
+                SELECT DISTINCT LTRIM(RTRIM(value))
+                FROM STRING_SPLIT(@Roles, ',')
+                WHERE LTRIM(RTRIM(value)) IN ('Artist', 'Producer', 'Songwriter');
+
+                -- Give each new Artist a unique default StageName
+                INSERT dbo.Artist (Contributor_ContributorID, StageName)
+                SELECT @ContributorID, CONCAT('Artist_', CAST(@ContributorID AS VARCHAR(20)))
+                WHERE EXISTS (SELECT 1 FROM @roleList WHERE Role = 'Artist');
+
+                INSERT dbo.Producer (Contributor_ContributorID)
+                SELECT @ContributorID
+                WHERE EXISTS (SELECT 1 FROM @roleList WHERE Role = 'Producer');
+
+                INSERT dbo.Songwriter (Contributor_ContributorID)
+                SELECT @ContributorID
+                WHERE EXISTS (SELECT 1 FROM @roleList WHERE Role = 'Songwriter');
+
+                SET @Outcome = 'created';
+            END
+            ELSE
+                SET @Outcome = 'existing';
+        END
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+
+    -- 3) Outcome + previous Person fields + final Contributor, in one row
+    SELECT
+        @Outcome       AS Outcome,
+        @NIF           AS PersonNIF,
+        @existingName  AS ExistingName,
+        @existingDOB   AS ExistingDateOfBirth,
+        @existingEmail AS ExistingEmail,
+        @existingPhone AS ExistingPhoneNumber,
+        v.*
+    FROM (VALUES (1)) AS o(One)
+    LEFT JOIN dbo.vw_Contributors v
+      ON v.ContributorID = @ContributorID;
+END
+GO
@@ -7,19 +7,31 @@ CREATE OR ALTER PROCEDURE dbo.sp_GetEmployees
     @JobTitle    VARCHAR(100)   = NULL,
     @Department  VARCHAR(100)   = NULL,
     @Email       VARCHAR(255)   = NULL,
-    @Phone       VARCHAR(50)    = NULL
+    @Phone       VARCHAR(50)    = NULL,
+    @MinSalary   DECIMAL(10,2)  = NULL,
+    @HiredFrom   DATE           = NULL,  -- hired on or after
+    @HiredTo     DATE           = NULL,  -- hired on or before
+    @RecordLabel VARCHAR(255)   = NULL,
+    @AfterID     INT            = NULL,  -- keyset paging: only rows after this ID
+    @Limit       INT            = NULL   -- page size; NULL returns every row
 AS
 BEGIN
     SET NOCOUNT ON;
 
-    SELECT *
+    SELECT TOP (COALESCE(@Limit, 2147483647)) *
     FROM dbo.vw_Employees
     WHERE (@NIF        IS NULL OR NIF        LIKE '%' + @NIF       + '%')
       AND (@Name       IS NULL OR Name       LIKE '%' + @Name      + '%')
       AND (@JobTitle   IS NULL OR JobTitle   LIKE '%' + @JobTitle  + '%')
       AND (@Department IS NULL OR Department LIKE '%' + @Department+ '%')
       AND (@Email      IS NULL OR Email      LIKE '%' + @Email     + '%')
-      AND (@Phone      IS NULL OR PhoneNumber LIKE '%' + @Phone    + '%');
+      AND (@Phone      IS NULL OR PhoneNumber LIKE '%' + @Phone    + '%')
+      AND (@MinSalary  IS NULL OR Salary     >= @MinSalary)
+      AND (@HiredFrom  IS NULL OR HireDate   >= @HiredFrom)
+      AND (@HiredTo    IS NULL OR HireDate   <= @HiredTo)
+      AND (@RecordLabel IS NULL OR RecordLabelName LIKE '%' + @RecordLabel + '%')
+      AND (@AfterID    IS NULL OR EmployeeID > @AfterID)
+    ORDER BY EmployeeID;
 END
 GO
 
@@ -233,6 +245,9 @@ GO
 --   then updates the Employee record (JobTitle, etc.).  
 --   If @NewNIF differs from the old one, updates Person.NIF 
 --   and fixes FKs in Employee and in Contributor (if any).
+--   @ExpectedRowVersion (optional) is the RowVersion the client read;
+--   if the Employee or its Person changed since, 50412 is thrown.
+--   Returns the updated row from vw_Employees.
 -- ================================================
 CREATE OR ALTER PROCEDURE dbo.sp_UpdateEmployee
 (
@@ -246,7 +261,8 @@ CREATE OR ALTER PROCEDURE dbo.sp_UpdateEmployee
     @Department    VARCHAR(100)   = NULL,
     @Salary        DECIMAL(10,2),
     @HireDate      DATE,
-    @RecordLabelID INT
+    @RecordLabelID INT,
+    @ExpectedRowVersion VARBINARY(16) = NULL
 )
 AS
 BEGIN
@@ -254,11 +270,15 @@ BEGIN
     BEGIN TRANSACTION;
     BEGIN TRY
         DECLARE @oldNIF VARCHAR(20);
+        DECLARE @currentRowVersion VARBINARY(16);
 
-        -- 1) Find the old Person_NIF for this Employee
+        -- 1) Find the old Person_NIF for this Employee; UPDLOCK keeps both
+        --    rows stable between the version check and the updates below
         SELECT 
-            @oldNIF = e.Person_NIF
-        FROM dbo.Employee AS e
+            @oldNIF = e.Person_NIF,
+            @currentRowVersion = CAST(e.RowVer AS BINARY(8)) + CAST(p.RowVer AS BINARY(8))
+        FROM dbo.Employee AS e WITH (UPDLOCK)
+        JOIN dbo.Person   AS p WITH (UPDLOCK) ON p.NIF = e.Person_NIF
         WHERE e.EmployeeID = @EmployeeID;
 
         IF @oldNIF IS NULL
@@ -266,6 +286,9 @@ BEGIN
             THROW 50030, 'Employee not found', 1;
         END
 
+        IF @ExpectedRowVersion IS NOT NULL AND @ExpectedRowVersion <> @currentRowVersion
+            THROW 50412, 'Employee was modified by another request', 1;
+
         -- 2) If the NIF changed, update Person.PK from oldNIF → newNIF, then fix FKs
         IF @NewNIF IS NOT NULL AND @NewNIF <> @oldNIF
         BEGIN
@@ -330,6 +353,10 @@ BEGIN
         ROLLBACK TRANSACTION;
         THROW;
     END CATCH
+
+    SELECT *
+    FROM dbo.vw_Employees
+    WHERE EmployeeID = @EmployeeID;
 END
 GO
 
@@ -438,3 +465,136 @@ BEGIN
         @songCount    AS SongCount;
 END
 GO
+
+-- ================================================
+-- sp_UpsertEmployee:
+--   Single-call hire path. Upserts the Person (MERGE) and inserts the
+--   Employee row in one transaction. A mismatch between the incoming and
+--   stored Person fields is resolved by @ConflictPolicy:
+--     'fail'      → nothing is written, Outcome = 'conflict'
+--     'reuse'     → keep the stored Person fields, add the Employee
+--     'overwrite' → replace the Person fields, add the Employee
+--   If the Person already has an Employee row, that row is returned
+--   (Outcome = 'existing').
+--   Returns one row:
+--     Outcome, PersonNIF,
+--     Existing* = the Person fields as stored before the call (NULL if new),
+--     followed by the vw_Employees columns of the resulting Employee.
+-- ================================================
+CREATE OR ALTER PROCEDURE dbo.sp_UpsertEmployee
+(
+    @NIF            VARCHAR(20)    = NULL,
+    @Name           VARCHAR(255),
+    @DateOfBirth    DATE           = NULL,
+    @Email          VARCHAR(255)   = NULL,
+    @PhoneNumber    VARCHAR(50)    = NULL,
+    @JobTitle       VARCHAR(100),
+    @Department     VARCHAR(100)   = NULL,
+    @Salary         DECIMAL(10,2),
+    @HireDate       DATE,
+    @RecordLabelID  INT,
+    @ConflictPolicy VARCHAR(10)    = 'fail'   -- fail | reuse | overwrite
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    IF @ConflictPolicy NOT IN ('fail', 'reuse', 'overwrite')
+        THROW 51020, 'Invalid conflict policy', 1;
+
+    IF @NIF IS NULL
+        SET @NIF = CONVERT(VARCHAR(20), NEWID());  -- generate random NIF
+
+    DECLARE
+        @Outcome       VARCHAR(10),
+        @EmployeeID    INT,
+        @personExists  BIT = 0,
+        @differs       BIT = 0,
+        @existingName  VARCHAR(255),
+        @existingDOB   DATE,
+        @existingEmail VARCHAR(255),
+        @existingPhone VARCHAR(50);
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- 1) Read (and key-range lock) the Person and any Employee row for this NIF
+        SELECT
+            @personExists  = 1,
+            @existingName  = p.Name,
+            @existingDOB   = p.DateOfBirth,
+            @existingEmail = p.Email,
+            @existingPhone = p.PhoneNumber
+        FROM dbo.Person p WITH (UPDLOCK, HOLDLOCK)
+        WHERE p.NIF = @NIF;
+
+        SELECT @EmployeeID = e.EmployeeID
+        FROM dbo.Employee e WITH (UPDLOCK, HOLDLOCK)
+        WHERE e.Person_NIF = @NIF;
+
+        IF @personExists = 1 AND NOT (
+               ISNULL(@existingName, '')  = ISNULL(@Name, '')
+           AND ISNULL(CONVERT(VARCHAR(10), @existingDOB, 120), '') = ISNULL(CONVERT(VARCHAR(10), @DateOfBirth, 120), '')
+           AND ISNULL(@existingEmail, '') = ISNULL(@Email, '')
+           AND ISNULL(@existingPhone, '') = ISNULL(@PhoneNumber, '')
+        )
+            SET @differs = 1;
+
+        IF @EmployeeID IS NULL AND @differs = 1 AND @ConflictPolicy = 'fail'
+        BEGIN
+            -- 2a) Person exists but fields differ → caller decides (reuse / overwrite)
+            SET @Outcome = 'conflict';
+        END
+        ELSE
+        BEGIN
+            -- 2b) Insert the Person, or overwrite its fields if asked to
+            MERGE dbo.Person AS tgt
+            USING (SELECT @NIF AS NIF) AS src
+               ON tgt.NIF = src.NIF
+            WHEN MATCHED AND @differs = 1 AND @ConflictPolicy = 'overwrite' THEN
+                UPDATE SET
+                    Name        = @Name,
+                    DateOfBirth = @DateOfBirth,
+                    Email       = @Email,
+                    PhoneNumber = @PhoneNumber
+            WHEN NOT MATCHED THEN
+                INSERT (NIF, Name, DateOfBirth, Email, PhoneNumber)
+                VALUES (@NIF, @Name, @DateOfBirth, @Email, @PhoneNumber);
+
+            -- 2c) Add the Employee role unless it already exists
+            IF @EmployeeID IS NULL
+            BEGIN
+                INSERT INTO dbo.Employee
+                    (JobTitle, Department, Salary, HireDate, RecordLabel_RecordLabelID, Person_NIF)
+                VALUES
+                    (@JobTitle, @Department, @Salary, @HireDate, @RecordLabelID, @NIF);
+
+                SET @EmployeeID = SCOPE_IDENTITY();
+                SET @Outcome    = 'created';
+            END
+            ELSE
+                SET @Outcome = 'existing';
+        END
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+
+    -- 3) Outcome + previous Person fields + final Employee, in one row
+    SELECT
+        @Outcome       AS Outcome,
+        @NIF           AS PersonNIF,
+        @existingName  AS ExistingName,
+        @existingDOB   AS ExistingDateOfBirth,
+        @existingEmail AS ExistingEmail,
+        @existingPhone AS ExistingPhoneNumber,
+        v.*
+    FROM (VALUES (1)) AS o(One)
+    LEFT JOIN dbo.vw_Employees v
+      ON v.EmployeeID = @EmployeeID;
+END
+GO
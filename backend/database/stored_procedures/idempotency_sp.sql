@@ -0,0 +1,80 @@
+-- ====================================================
+-- ClaimIdempotencyKey: Claim @IdempotencyKey for a request, or return what it holds
+--   Expired keys, and claims older than @LockSeconds that never stored a
+--   response, are dropped first.  Returns one row: Claimed = 1 if the key is
+--   now this request's, else the existing Fingerprint, StatusCode (NULL:
+--   still in progress), Headers and Body.
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ClaimIdempotencyKey
+    @IdempotencyKey VARCHAR(255),
+    @Fingerprint    BINARY(32),
+    @TTLSeconds     INT,
+    @LockSeconds    INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @Now DATETIME2 = SYSUTCDATETIME();
+    DECLARE @Claimed BIT = 0;
+
+    -- Purge a few expired keys on the way
+    DELETE TOP (100) FROM dbo.IdempotencyKey WHERE ExpiresAt < @Now;
+
+    BEGIN TRANSACTION;
+
+    DELETE FROM dbo.IdempotencyKey
+    WHERE IdempotencyKey = @IdempotencyKey
+      AND (ExpiresAt < @Now
+           OR (StatusCode IS NULL AND ClaimedAt < DATEADD(SECOND, -@LockSeconds, @Now)));
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.IdempotencyKey WITH (UPDLOCK, HOLDLOCK)
+                   WHERE IdempotencyKey = @IdempotencyKey)
+    BEGIN
+        INSERT INTO dbo.IdempotencyKey (IdempotencyKey, Fingerprint, ExpiresAt)
+        VALUES (@IdempotencyKey, @Fingerprint, DATEADD(SECOND, @TTLSeconds, @Now));
+        SET @Claimed = 1;
+    END
+
+    COMMIT TRANSACTION;
+
+    SELECT @Claimed AS Claimed, Fingerprint, StatusCode, Headers, Body
+    FROM dbo.IdempotencyKey
+    WHERE IdempotencyKey = @IdempotencyKey;
+END;
+GO
+
+-- ====================================================
+-- SaveIdempotentResponse: Store the response of a claimed key
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_SaveIdempotentResponse
+    @IdempotencyKey VARCHAR(255),
+    @StatusCode     INT,
+    @Headers        VARCHAR(MAX),
+    @Body           VARBINARY(MAX)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE dbo.IdempotencyKey
+    SET StatusCode = @StatusCode,
+        Headers    = @Headers,
+        Body       = @Body
+    WHERE IdempotencyKey = @IdempotencyKey;
+END;
+GO
+
+-- ====================================================
+-- ReleaseIdempotencyKey: Drop a claim that will not store a response
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ReleaseIdempotencyKey
+    @IdempotencyKey VARCHAR(255)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DELETE FROM dbo.IdempotencyKey
+    WHERE IdempotencyKey = @IdempotencyKey
+      AND StatusCode IS NULL;
+END;
+GO
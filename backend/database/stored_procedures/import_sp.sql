@@ -0,0 +1,533 @@
+-- ====================================================
+-- Bulk import: validate the rows staged for one import (Import_* tables,
+-- loaded by backend/services/bulk_import.py) and merge the valid ones.
+--
+-- Validation is set-wise, one UPDATE per rule; each rule only looks at rows
+-- no earlier rule rejected, so Error holds the first rule a row breaks.
+-- UNIQUE columns are checked against the existing rows and within the file
+-- (the first occurrence wins).  As in the UNIQUE constraints, a NULL in a
+-- nullable UNIQUE column (RecordLabel.Website, Person.Email/PhoneNumber)
+-- counts as a value.
+--
+-- Every procedure returns two result sets:
+--   1) one row: Imported, Rejected
+--   2) the rejected rows: RowNumber, Error and the staged values
+-- ====================================================
+
+-- ====================================================
+-- sp_ImportRecordLabels: Merge staged record labels
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ImportRecordLabels
+    @ImportID VARCHAR(36)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @Imported INT = 0;
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- 1) Required fields
+        UPDATE dbo.Import_RecordLabel
+        SET Error = 'Name, Email and PhoneNumber are required'
+        WHERE ImportID = @ImportID
+          AND (Name IS NULL OR Email IS NULL OR PhoneNumber IS NULL);
+
+        -- 2) UNIQUE columns against the existing labels
+        UPDATE s
+        SET Error = CONCAT('A record label named ''', s.Name, ''' already exists')
+        FROM dbo.Import_RecordLabel AS s
+        JOIN dbo.RecordLabel        AS r ON r.Name = s.Name
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        UPDATE s
+        SET Error = CONCAT('Email ', s.Email, ' is already used by record label ''', r.Name, '''')
+        FROM dbo.Import_RecordLabel AS s
+        JOIN dbo.RecordLabel        AS r ON r.Email = s.Email
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        UPDATE s
+        SET Error = CONCAT('PhoneNumber ', s.PhoneNumber, ' is already used by record label ''', r.Name, '''')
+        FROM dbo.Import_RecordLabel AS s
+        JOIN dbo.RecordLabel        AS r ON r.PhoneNumber = s.PhoneNumber
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        UPDATE s
+        SET Error = CONCAT('Website ', COALESCE(s.Website, '(none)'), ' is already used by record label ''', r.Name, '''')
+        FROM dbo.Import_RecordLabel AS s
+        JOIN dbo.RecordLabel        AS r
+          ON r.Website = s.Website OR (r.Website IS NULL AND s.Website IS NULL)
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        -- 3) UNIQUE columns within the file
+        WITH dup AS (
+            SELECT Error, RowNumber, MIN(RowNumber) OVER (PARTITION BY Name) AS FirstRow
+            FROM dbo.Import_RecordLabel
+            WHERE ImportID = @ImportID AND Error IS NULL
+        )
+        UPDATE dup SET Error = CONCAT('Same Name as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        WITH dup AS (
+            SELECT Error, RowNumber, MIN(RowNumber) OVER (PARTITION BY Email) AS FirstRow
+            FROM dbo.Import_RecordLabel
+            WHERE ImportID = @ImportID AND Error IS NULL
+        )
+        UPDATE dup SET Error = CONCAT('Same Email as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        WITH dup AS (
+            SELECT Error, RowNumber, MIN(RowNumber) OVER (PARTITION BY PhoneNumber) AS FirstRow
+            FROM dbo.Import_RecordLabel
+            WHERE ImportID = @ImportID AND Error IS NULL
+        )
+        UPDATE dup SET Error = CONCAT('Same PhoneNumber as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        WITH dup AS (
+            SELECT Error, RowNumber, MIN(RowNumber) OVER (PARTITION BY Website) AS FirstRow
+            FROM dbo.Import_RecordLabel
+            WHERE ImportID = @ImportID AND Error IS NULL
+        )
+        UPDATE dup SET Error = CONCAT('Same Website as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        -- 4) Merge
+        INSERT INTO dbo.RecordLabel (Name, Location, Website, Email, PhoneNumber)
+        SELECT Name, Location, Website, Email, PhoneNumber
+        FROM dbo.Import_RecordLabel
+        WHERE ImportID = @ImportID AND Error IS NULL
+        ORDER BY RowNumber;
+        SET @Imported = @@ROWCOUNT;
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+
+    SELECT @Imported AS Imported, COUNT(*) AS Rejected
+    FROM dbo.Import_RecordLabel
+    WHERE ImportID = @ImportID AND Error IS NOT NULL;
+
+    SELECT RowNumber, Error, Name, Location, Website, Email, PhoneNumber
+    FROM dbo.Import_RecordLabel
+    WHERE ImportID = @ImportID AND Error IS NOT NULL
+    ORDER BY RowNumber;
+END
+GO
+
+-- ====================================================
+-- sp_ImportEmployees: Merge staged employees
+--   A NIF that is already a Person is reused when its details match
+--   exactly (as sp_CreateEmployee does); otherwise the row is rejected.
+--   The record label is given by RecordLabelID or, failing that, by name.
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ImportEmployees
+    @ImportID VARCHAR(36)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @Imported INT = 0;
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- 1) Required fields and types
+        UPDATE dbo.Import_Employee
+        SET Error = 'NIF, Name, JobTitle, Salary and HireDate are required'
+        WHERE ImportID = @ImportID
+          AND (NIF IS NULL OR Name IS NULL OR JobTitle IS NULL OR Salary IS NULL OR HireDate IS NULL);
+
+        UPDATE dbo.Import_Employee
+        SET Error = CONCAT('Salary ''', Salary, ''' is not a non-negative amount')
+        WHERE ImportID = @ImportID AND Error IS NULL
+          AND ISNULL(TRY_CONVERT(DECIMAL(10,2), Salary), -1) < 0;
+
+        UPDATE dbo.Import_Employee
+        SET Error = CONCAT('HireDate ''', HireDate, ''' is not a YYYY-MM-DD date')
+        WHERE ImportID = @ImportID AND Error IS NULL
+          AND TRY_CONVERT(DATE, HireDate, 23) IS NULL;
+
+        UPDATE dbo.Import_Employee
+        SET Error = CONCAT('DateOfBirth ''', DateOfBirth, ''' is not a YYYY-MM-DD date')
+        WHERE ImportID = @ImportID AND Error IS NULL
+          AND DateOfBirth IS NOT NULL AND TRY_CONVERT(DATE, DateOfBirth, 23) IS NULL;
+
+        -- 2) Record label
+        UPDATE s
+        SET ResolvedRecordLabelID = r.RecordLabelID
+        FROM dbo.Import_Employee AS s
+        JOIN dbo.RecordLabel     AS r ON r.RecordLabelID = TRY_CONVERT(INT, s.RecordLabelID)
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        UPDATE s
+        SET ResolvedRecordLabelID = r.RecordLabelID
+        FROM dbo.Import_Employee AS s
+        JOIN dbo.RecordLabel     AS r ON r.Name = s.RecordLabelName
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL AND s.RecordLabelID IS NULL;
+
+        UPDATE dbo.Import_Employee
+        SET Error = CASE
+                        WHEN RecordLabelID IS NULL AND RecordLabelName IS NULL
+                            THEN 'RecordLabelID or RecordLabelName is required'
+                        ELSE CONCAT('Unknown record label ''', COALESCE(RecordLabelID, RecordLabelName), '''')
+                    END
+        WHERE ImportID = @ImportID AND Error IS NULL AND ResolvedRecordLabelID IS NULL;
+
+        -- 3) One row per NIF; not already an employee
+        WITH dup AS (
+            SELECT Error, RowNumber, MIN(RowNumber) OVER (PARTITION BY NIF) AS FirstRow
+            FROM dbo.Import_Employee
+            WHERE ImportID = @ImportID AND Error IS NULL
+        )
+        UPDATE dup SET Error = CONCAT('Same NIF as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        UPDATE s
+        SET Error = CONCAT('Person ', s.NIF, ' is already an employee')
+        FROM dbo.Import_Employee AS s
+        JOIN dbo.Employee        AS e ON e.Person_NIF = s.NIF
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        -- 4) Existing persons must match exactly
+        UPDATE s
+        SET Error = CONCAT('Person ', s.NIF, ' already exists with different details')
+        FROM dbo.Import_Employee AS s
+        JOIN dbo.Person          AS p ON p.NIF = s.NIF
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT (    ISNULL(p.Name, '')        = ISNULL(s.Name, '')
+                   AND ISNULL(p.DateOfBirth, '19000101') = ISNULL(TRY_CONVERT(DATE, s.DateOfBirth, 23), '19000101')
+                   AND ISNULL(p.Email, '')       = ISNULL(s.Email, '')
+                   AND ISNULL(p.PhoneNumber, '') = ISNULL(s.PhoneNumber, ''));
+
+        -- 5) New persons: Email / PhoneNumber UNIQUE against Person and within the file
+        UPDATE s
+        SET Error = CONCAT('Email ', COALESCE(s.Email, '(none)'), ' is already used by person ', p.NIF)
+        FROM dbo.Import_Employee AS s
+        JOIN dbo.Person          AS p
+          ON p.Email = s.Email OR (p.Email IS NULL AND s.Email IS NULL)
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF);
+
+        UPDATE s
+        SET Error = CONCAT('PhoneNumber ', COALESCE(s.PhoneNumber, '(none)'), ' is already used by person ', p.NIF)
+        FROM dbo.Import_Employee AS s
+        JOIN dbo.Person          AS p
+          ON p.PhoneNumber = s.PhoneNumber OR (p.PhoneNumber IS NULL AND s.PhoneNumber IS NULL)
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF);
+
+        WITH dup AS (
+            SELECT s.Error, s.RowNumber, MIN(s.RowNumber) OVER (PARTITION BY s.Email) AS FirstRow
+            FROM dbo.Import_Employee AS s
+            WHERE s.ImportID = @ImportID AND s.Error IS NULL
+              AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF)
+        )
+        UPDATE dup SET Error = CONCAT('Same Email as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        WITH dup AS (
+            SELECT s.Error, s.RowNumber, MIN(s.RowNumber) OVER (PARTITION BY s.PhoneNumber) AS FirstRow
+            FROM dbo.Import_Employee AS s
+            WHERE s.ImportID = @ImportID AND s.Error IS NULL
+              AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF)
+        )
+        UPDATE dup SET Error = CONCAT('Same PhoneNumber as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        -- 6) Merge: new persons, then every valid employee
+        INSERT INTO dbo.Person (NIF, Name, DateOfBirth, Email, PhoneNumber)
+        SELECT s.NIF, s.Name, TRY_CONVERT(DATE, s.DateOfBirth, 23), s.Email, s.PhoneNumber
+        FROM dbo.Import_Employee AS s
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF);
+
+        INSERT INTO dbo.Employee
+            (JobTitle, Department, Salary, HireDate, RecordLabel_RecordLabelID, Person_NIF)
+        SELECT JobTitle, Department, TRY_CONVERT(DECIMAL(10,2), Salary),
+               TRY_CONVERT(DATE, HireDate, 23), ResolvedRecordLabelID, NIF
+        FROM dbo.Import_Employee
+        WHERE ImportID = @ImportID AND Error IS NULL
+        ORDER BY RowNumber;
+        SET @Imported = @@ROWCOUNT;
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+
+    SELECT @Imported AS Imported, COUNT(*) AS Rejected
+    FROM dbo.Import_Employee
+    WHERE ImportID = @ImportID AND Error IS NOT NULL;
+
+    SELECT RowNumber, Error, NIF, Name, DateOfBirth, Email, PhoneNumber,
+           JobTitle, Department, Salary, HireDate, RecordLabelID, RecordLabelName
+    FROM dbo.Import_Employee
+    WHERE ImportID = @ImportID AND Error IS NOT NULL
+    ORDER BY RowNumber;
+END
+GO
+
+-- ====================================================
+-- sp_ImportContributors: Merge staged contributors and their roles
+--   Persons are handled as in sp_ImportEmployees.  New Artists get the
+--   same default StageName as in sp_CreateContributor.
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ImportContributors
+    @ImportID VARCHAR(36)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @Imported INT = 0;
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- 1) Required fields and types
+        UPDATE dbo.Import_Contributor
+        SET Error = 'NIF, Name and Roles are required'
+        WHERE ImportID = @ImportID
+          AND (NIF IS NULL OR Name IS NULL OR Roles IS NULL);
+
+        UPDATE dbo.Import_Contributor
+        SET Error = CONCAT('DateOfBirth ''', DateOfBirth, ''' is not a YYYY-MM-DD date')
+        WHERE ImportID = @ImportID AND Error IS NULL
+          AND DateOfBirth IS NOT NULL AND TRY_CONVERT(DATE, DateOfBirth, 23) IS NULL;
+
+        UPDATE s
+        SET Error = CONCAT('Unknown role ''', bad.Role, ''' (expected Artist, Producer or Songwriter)')
+        FROM dbo.Import_Contributor AS s
+        CROSS APPLY (
+            SELECT TOP (1) LTRIM(RTRIM(value)) AS Role
+            FROM STRING_SPLIT(s.Roles, ',')
+            WHERE LTRIM(RTRIM(value)) NOT IN ('', 'Artist', 'Producer', 'Songwriter')
+        ) AS bad
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        -- 2) One row per NIF; not already a contributor
+        WITH dup AS (
+            SELECT Error, RowNumber, MIN(RowNumber) OVER (PARTITION BY NIF) AS FirstRow
+            FROM dbo.Import_Contributor
+            WHERE ImportID = @ImportID AND Error IS NULL
+        )
+        UPDATE dup SET Error = CONCAT('Same NIF as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        UPDATE s
+        SET Error = CONCAT('Person ', s.NIF, ' is already a contributor')
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Contributor        AS c ON c.Person_NIF = s.NIF
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        -- 3) Existing persons must match exactly
+        UPDATE s
+        SET Error = CONCAT('Person ', s.NIF, ' already exists with different details')
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Person             AS p ON p.NIF = s.NIF
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT (    ISNULL(p.Name, '')        = ISNULL(s.Name, '')
+                   AND ISNULL(p.DateOfBirth, '19000101') = ISNULL(TRY_CONVERT(DATE, s.DateOfBirth, 23), '19000101')
+                   AND ISNULL(p.Email, '')       = ISNULL(s.Email, '')
+                   AND ISNULL(p.PhoneNumber, '') = ISNULL(s.PhoneNumber, ''));
+
+        -- 4) New persons: Email / PhoneNumber UNIQUE against Person and within the file
+        UPDATE s
+        SET Error = CONCAT('Email ', COALESCE(s.Email, '(none)'), ' is already used by person ', p.NIF)
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Person             AS p
+          ON p.Email = s.Email OR (p.Email IS NULL AND s.Email IS NULL)
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF);
+
+        UPDATE s
+        SET Error = CONCAT('PhoneNumber ', COALESCE(s.PhoneNumber, '(none)'), ' is already used by person ', p.NIF)
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Person             AS p
+          ON p.PhoneNumber = s.PhoneNumber OR (p.PhoneNumber IS NULL AND s.PhoneNumber IS NULL)
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF);
+
+        WITH dup AS (
+            SELECT s.Error, s.RowNumber, MIN(s.RowNumber) OVER (PARTITION BY s.Email) AS FirstRow
+            FROM dbo.Import_Contributor AS s
+            WHERE s.ImportID = @ImportID AND s.Error IS NULL
+              AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF)
+        )
+        UPDATE dup SET Error = CONCAT('Same Email as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        WITH dup AS (
+            SELECT s.Error, s.RowNumber, MIN(s.RowNumber) OVER (PARTITION BY s.PhoneNumber) AS FirstRow
+            FROM dbo.Import_Contributor AS s
+            WHERE s.ImportID = @ImportID AND s.Error IS NULL
+              AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF)
+        )
+        UPDATE dup SET Error = CONCAT('Same PhoneNumber as row ', FirstRow) WHERE RowNumber > FirstRow;
+
+        -- 5) Merge: new persons, contributors, then one row per role
+        INSERT INTO dbo.Person (NIF, Name, DateOfBirth, Email, PhoneNumber)
+        SELECT s.NIF, s.Name, TRY_CONVERT(DATE, s.DateOfBirth, 23), s.Email, s.PhoneNumber
+        FROM dbo.Import_Contributor AS s
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM dbo.Person AS x WHERE x.NIF = s.NIF);
+
+        INSERT INTO dbo.Contributor (Person_NIF)
+        SELECT NIF
+        FROM dbo.Import_Contributor
+        WHERE ImportID = @ImportID AND Error IS NULL
+        ORDER BY RowNumber;
+        SET @Imported = @@ROWCOUNT;
+
+        INSERT INTO dbo.Artist (Contributor_ContributorID, StageName)
+        SELECT DISTINCT c.ContributorID, CONCAT('Artist_', CAST(c.ContributorID AS VARCHAR(20)))
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Contributor        AS c ON c.Person_NIF = s.NIF
+        CROSS APPLY STRING_SPLIT(s.Roles, ',') AS r
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL AND LTRIM(RTRIM(r.value)) = 'Artist';
+
+        INSERT INTO dbo.Producer (Contributor_ContributorID)
+        SELECT DISTINCT c.ContributorID
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Contributor        AS c ON c.Person_NIF = s.NIF
+        CROSS APPLY STRING_SPLIT(s.Roles, ',') AS r
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL AND LTRIM(RTRIM(r.value)) = 'Producer';
+
+        INSERT INTO dbo.Songwriter (Contributor_ContributorID)
+        SELECT DISTINCT c.ContributorID
+        FROM dbo.Import_Contributor AS s
+        JOIN dbo.Contributor        AS c ON c.Person_NIF = s.NIF
+        CROSS APPLY STRING_SPLIT(s.Roles, ',') AS r
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL AND LTRIM(RTRIM(r.value)) = 'Songwriter';
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+
+    SELECT @Imported AS Imported, COUNT(*) AS Rejected
+    FROM dbo.Import_Contributor
+    WHERE ImportID = @ImportID AND Error IS NOT NULL;
+
+    SELECT RowNumber, Error, NIF, Name, DateOfBirth, Email, PhoneNumber, Roles
+    FROM dbo.Import_Contributor
+    WHERE ImportID = @ImportID AND Error IS NOT NULL
+    ORDER BY RowNumber;
+END
+GO
+
+-- ====================================================
+-- sp_ImportSongs: Merge staged songs with their genres and contributors
+--   Contributors are NIFs of existing contributors, as for sp_CreateSong.
+--   At least one is required: trg_DeleteSongWithNoContributors would
+--   delete a song without any as soon as Contributor_Song changes.
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ImportSongs
+    @ImportID VARCHAR(36)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @Imported INT = 0;
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- 1) Required fields and types
+        UPDATE s
+        SET Error = 'Title, Duration and Contributors are required'
+        FROM dbo.Import_Song AS s
+        WHERE s.ImportID = @ImportID
+          AND (s.Title IS NULL OR s.Duration IS NULL
+               OR NOT EXISTS (SELECT 1 FROM STRING_SPLIT(s.Contributors, ',')
+                              WHERE LTRIM(RTRIM(value)) <> ''));
+
+        UPDATE dbo.Import_Song
+        SET Error = CONCAT('Duration ''', Duration, ''' is not a positive number of seconds')
+        WHERE ImportID = @ImportID AND Error IS NULL
+          AND ISNULL(TRY_CONVERT(INT, Duration), 0) <= 0;
+
+        UPDATE dbo.Import_Song
+        SET Error = CONCAT('ReleaseDate ''', ReleaseDate, ''' is not a YYYY-MM-DD date')
+        WHERE ImportID = @ImportID AND Error IS NULL
+          AND ReleaseDate IS NOT NULL AND TRY_CONVERT(DATE, ReleaseDate, 23) IS NULL;
+
+        UPDATE s
+        SET Error = LEFT(CONCAT('Genre ''', bad.Genre, ''' is longer than 50 characters'), 500)
+        FROM dbo.Import_Song AS s
+        CROSS APPLY (
+            SELECT TOP (1) LTRIM(RTRIM(value)) AS Genre
+            FROM STRING_SPLIT(s.Genres, ',')
+            WHERE LEN(LTRIM(RTRIM(value))) > 50
+        ) AS bad
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL;
+
+        -- 2) Every contributor NIF must be a contributor
+        UPDATE s
+        SET Error = LEFT(CONCAT('Unknown contributor NIF(s): ', missing.NIFs), 500)
+        FROM dbo.Import_Song AS s
+        CROSS APPLY (
+            SELECT STRING_AGG(n.NIF, ', ') AS NIFs
+            FROM (SELECT DISTINCT LTRIM(RTRIM(value)) AS NIF
+                  FROM STRING_SPLIT(s.Contributors, ',')
+                  WHERE LTRIM(RTRIM(value)) <> '') AS n
+            WHERE NOT EXISTS (SELECT 1 FROM dbo.Contributor AS c WHERE c.Person_NIF = n.NIF)
+        ) AS missing
+        WHERE s.ImportID = @ImportID AND s.Error IS NULL AND missing.NIFs IS NOT NULL;
+
+        -- 3) Merge: songs (keeping the staged row → new SongID map), genres, contributors
+        CREATE TABLE #NewSong (RowNumber INT PRIMARY KEY, SongID INT NOT NULL);
+
+        MERGE INTO dbo.Song AS tgt
+        USING (
+            SELECT RowNumber, Title, TRY_CONVERT(INT, Duration) AS Duration,
+                   TRY_CONVERT(DATE, ReleaseDate, 23) AS ReleaseDate
+            FROM dbo.Import_Song
+            WHERE ImportID = @ImportID AND Error IS NULL
+        ) AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (Title, Duration, ReleaseDate)
+            VALUES (src.Title, src.Duration, src.ReleaseDate)
+        OUTPUT src.RowNumber, inserted.SongID INTO #NewSong (RowNumber, SongID);
+        SET @Imported = @@ROWCOUNT;
+
+        INSERT INTO dbo.Song_Genre (Song_SongID, Genre)
+        SELECT DISTINCT n.SongID, LTRIM(RTRIM(g.value))
+        FROM #NewSong           AS n
+        JOIN dbo.Import_Song    AS s ON s.ImportID = @ImportID AND s.RowNumber = n.RowNumber
+        CROSS APPLY STRING_SPLIT(s.Genres, ',') AS g
+        WHERE LTRIM(RTRIM(g.value)) <> '';
+
+        INSERT INTO dbo.Contributor_Song (Contributor_ContributorID, Song_SongID, Date)
+        SELECT DISTINCT c.ContributorID, n.SongID, CAST(GETDATE() AS DATE)
+        FROM #NewSong           AS n
+        JOIN dbo.Import_Song    AS s ON s.ImportID = @ImportID AND s.RowNumber = n.RowNumber
+        CROSS APPLY STRING_SPLIT(s.Contributors, ',') AS x
+        JOIN dbo.Contributor    AS c ON c.Person_NIF = LTRIM(RTRIM(x.value));
+
+        DROP TABLE #NewSong;
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+
+    SELECT @Imported AS Imported, COUNT(*) AS Rejected
+    FROM dbo.Import_Song
+    WHERE ImportID = @ImportID AND Error IS NOT NULL;
+
+    SELECT RowNumber, Error, Title, Duration, ReleaseDate, Genres, Contributors
+    FROM dbo.Import_Song
+    WHERE ImportID = @ImportID AND Error IS NOT NULL
+    ORDER BY RowNumber;
+END
+GO
+
+-- ====================================================
+-- sp_ClearImport: Remove the staged rows of one import
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_ClearImport
+    @ImportID VARCHAR(36)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DELETE FROM dbo.Import_RecordLabel WHERE ImportID = @ImportID;
+    DELETE FROM dbo.Import_Employee    WHERE ImportID = @ImportID;
+    DELETE FROM dbo.Import_Contributor WHERE ImportID = @ImportID;
+    DELETE FROM dbo.Import_Song        WHERE ImportID = @ImportID;
+END
+GO
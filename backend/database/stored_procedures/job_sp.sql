@@ -0,0 +1,41 @@
+-- ====================================================
+-- SaveJob: Insert or update the persisted state of a background job
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_SaveJob
+    @JobID    VARCHAR(36),
+    @Kind     VARCHAR(50),
+    @Status   VARCHAR(20),
+    @Progress INT,
+    @Message  VARCHAR(MAX)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    MERGE dbo.Job WITH (HOLDLOCK) AS tgt
+    USING (SELECT @JobID AS JobID) AS src
+       ON tgt.JobID = src.JobID
+    WHEN MATCHED THEN
+        UPDATE SET Status    = @Status,
+                   Progress  = @Progress,
+                   Message   = @Message,
+                   UpdatedAt = SYSUTCDATETIME()
+    WHEN NOT MATCHED THEN
+        INSERT (JobID, Kind, Status, Progress, Message)
+        VALUES (@JobID, @Kind, @Status, @Progress, @Message);
+END;
+GO
+
+-- ====================================================
+-- GetJob: Returns a single persisted job by ID
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetJob
+    @JobID VARCHAR(36)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT JobID, Kind, Status, Progress, Message, CreatedAt, UpdatedAt
+    FROM dbo.Job
+    WHERE JobID = @JobID;
+END;
+GO
@@ -6,18 +6,22 @@ CREATE OR ALTER PROCEDURE dbo.sp_GetRecordLabels
     @Location    VARCHAR(255) = NULL,
     @Website     VARCHAR(255) = NULL,
     @Email       VARCHAR(255) = NULL,
-    @Phone       VARCHAR(50)  = NULL
+    @Phone       VARCHAR(50)  = NULL,
+    @AfterID     INT          = NULL,  -- keyset paging: only rows after this ID
+    @Limit       INT          = NULL   -- page size; NULL returns every row
 AS
 BEGIN
     SET NOCOUNT ON;
 
-    SELECT *
+    SELECT TOP (COALESCE(@Limit, 2147483647)) *
     FROM dbo.vw_RecordLabels
     WHERE (@Name     IS NULL OR Name        LIKE '%' + @Name     + '%')
       AND (@Location IS NULL OR Location    LIKE '%' + @Location + '%')
       AND (@Website  IS NULL OR Website     LIKE '%' + @Website  + '%')
       AND (@Email    IS NULL OR Email       LIKE '%' + @Email    + '%')
-      AND (@Phone    IS NULL OR PhoneNumber LIKE '%' + @Phone    + '%');
+      AND (@Phone    IS NULL OR PhoneNumber LIKE '%' + @Phone    + '%')
+      AND (@AfterID  IS NULL OR RecordLabelID > @AfterID)
+    ORDER BY RecordLabelID;
 END
 GO
 
@@ -62,14 +66,18 @@ GO
 
 -- ================================================
 -- sp_UpdateRecordLabel
+--   @ExpectedRowVersion (optional) is the RowVersion the client read;
+--   if the row changed since, nothing is written and 50412 is thrown.
+--   Returns the updated row from vw_RecordLabels.
 -- ================================================
 CREATE OR ALTER PROCEDURE dbo.sp_UpdateRecordLabel
-    @ID          INT,
-    @Name        VARCHAR(255),
-    @Location    VARCHAR(255) = NULL,
-    @Website     VARCHAR(255) = NULL,
-    @Email       VARCHAR(255),
-    @PhoneNumber VARCHAR(50)  = NULL
+    @ID                 INT,
+    @Name               VARCHAR(255),
+    @Location           VARCHAR(255)  = NULL,
+    @Website            VARCHAR(255)  = NULL,
+    @Email              VARCHAR(255),
+    @PhoneNumber        VARCHAR(50)   = NULL,
+    @ExpectedRowVersion VARBINARY(16) = NULL
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -81,10 +89,19 @@ BEGIN
       Website     = @Website,
       Email       = @Email,
       PhoneNumber = @PhoneNumber
-    WHERE RecordLabelID = @ID;
+    WHERE RecordLabelID = @ID
+      AND (@ExpectedRowVersion IS NULL OR RowVer = @ExpectedRowVersion);
 
     IF @@ROWCOUNT = 0
+    BEGIN
+        IF EXISTS (SELECT 1 FROM dbo.RecordLabel WHERE RecordLabelID = @ID)
+            THROW 50412, 'RecordLabel was modified by another request', 1;
         THROW 50000, 'RecordLabel not found', 1;
+    END
+
+    SELECT *
+    FROM dbo.vw_RecordLabels
+    WHERE RecordLabelID = @ID;
 END
 GO
 
@@ -217,4 +234,95 @@ BEGIN
         THROW;  -- rethrow the original error
     END CATCH
 END
-GO
\ No newline at end of file
+GO
+
+-- ================================================
+-- sp_DeleteRecordLabel_CascadeBatch
+--   Same effect as sp_DeleteRecordLabel_Cascade, but removes at most
+--   @BatchSize dependents per call, each call in its own short transaction.
+--   The caller repeats the call until @Done = 1:
+--     1) Next batch of Employee rows (and their Person if orphaned)
+--     2) Once no Employees remain, next batch of Collaborations
+--     3) Once no Collaborations remain, leftover links and the RecordLabel
+--   @Deleted returns the number of rows removed by this call.
+-- ================================================
+CREATE OR ALTER PROCEDURE dbo.sp_DeleteRecordLabel_CascadeBatch
+    @ID        INT,
+    @BatchSize INT = 500,
+    @Deleted   INT OUTPUT,
+    @Done      BIT OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    SET @Deleted = 0;
+    SET @Done    = 0;
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.RecordLabel WHERE RecordLabelID = @ID)
+        THROW 50001, 'RecordLabel not found (or already deleted)', 1;
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        -------------------------------------------------------------
+        -- 1) Next batch of Employees tied to this label
+        -------------------------------------------------------------
+        DECLARE @batchNIF TABLE (NIF VARCHAR(20) PRIMARY KEY);
+
+        DELETE TOP (@BatchSize) FROM dbo.Employee
+        OUTPUT deleted.Person_NIF INTO @batchNIF (NIF)
+        WHERE RecordLabel_RecordLabelID = @ID;
+
+        SET @Deleted = @@ROWCOUNT;
+
+        IF @Deleted > 0
+        BEGIN
+            -- Delete Person rows of this batch if no longer used
+            DELETE p
+            FROM dbo.Person p
+            WHERE p.NIF IN (SELECT NIF FROM @batchNIF)
+              AND NOT EXISTS (SELECT 1 FROM dbo.Employee    WHERE Person_NIF = p.NIF)
+              AND NOT EXISTS (SELECT 1 FROM dbo.Contributor WHERE Person_NIF = p.NIF);
+        END
+        ELSE
+        BEGIN
+            -------------------------------------------------------------
+            -- 2) Next batch of Collaborations that reference this label
+            --    (Collaboration_Contributor and rlc rows cascade)
+            -------------------------------------------------------------
+            DELETE TOP (@BatchSize) FROM dbo.Collaboration
+            WHERE CollaborationID IN (
+                SELECT rlc.Collaboration_CollaborationID
+                FROM dbo.RecordLabel_Collaboration rlc
+                WHERE rlc.RecordLabel_RecordLabelID1 = @ID
+                   OR rlc.RecordLabel_RecordLabelID2 = @ID
+            );
+
+            SET @Deleted = @@ROWCOUNT;
+
+            IF @Deleted = 0
+            BEGIN
+                -------------------------------------------------------------
+                -- 3) Nothing left: leftover links, then the label itself
+                -------------------------------------------------------------
+                DELETE FROM dbo.RecordLabel_Collaboration
+                WHERE RecordLabel_RecordLabelID1 = @ID
+                   OR RecordLabel_RecordLabelID2 = @ID;
+
+                DELETE FROM dbo.RecordLabel
+                WHERE RecordLabelID = @ID;
+
+                SET @Deleted = @@ROWCOUNT;
+                SET @Done    = 1;
+            END
+        END
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+END
+GO
@@ -6,22 +6,30 @@ CREATE OR ALTER PROCEDURE dbo.sp_GetSongs
     @MinDuration   INT           = NULL,
     @MaxDuration   INT           = NULL,
     @ReleaseDate   DATE          = NULL,
+    @ReleasedFrom  DATE          = NULL,  -- released on or after
+    @ReleasedTo    DATE          = NULL,  -- released on or before
     @Genre         VARCHAR(50)   = NULL,
     @Contributor   VARCHAR(255)  = NULL,
-    @Collaboration VARCHAR(255)  = NULL
+    @Collaboration VARCHAR(255)  = NULL,
+    @AfterID       INT           = NULL,  -- keyset paging: only rows after this ID
+    @Limit         INT           = NULL   -- page size; NULL returns every row
 AS
 BEGIN
     SET NOCOUNT ON;
 
-    SELECT *
+    SELECT TOP (COALESCE(@Limit, 2147483647)) *
     FROM dbo.vw_Songs
     WHERE (@Title         IS NULL OR Title           LIKE '%' + @Title         + '%')
       AND (@MinDuration   IS NULL OR Duration        >= @MinDuration)
       AND (@MaxDuration   IS NULL OR Duration        <= @MaxDuration)
       AND (@ReleaseDate   IS NULL OR ReleaseDate     = @ReleaseDate)
+      AND (@ReleasedFrom  IS NULL OR ReleaseDate     >= @ReleasedFrom)
+      AND (@ReleasedTo    IS NULL OR ReleaseDate     <= @ReleasedTo)
       AND (@Genre         IS NULL OR Genres          LIKE '%' + @Genre         + '%')
       AND (@Contributor   IS NULL OR Contributors    LIKE '%' + @Contributor   + '%')
-      AND (@Collaboration IS NULL OR CollaborationName LIKE '%' + @Collaboration + '%');
+      AND (@Collaboration IS NULL OR CollaborationName LIKE '%' + @Collaboration + '%')
+      AND (@AfterID       IS NULL OR SongID          > @AfterID)
+    ORDER BY SongID;
 END
 GO
 
@@ -145,85 +153,99 @@ GO
 
 -- ================================================================
 -- sp_UpdateSong: Update an existing song, its genres, and contributors
+--   Genres and contributors are diffed against the stored links: only
+--   added ones are inserted and only removed ones deleted.  New links are
+--   inserted before old ones are removed, so the song never passes through
+--   a zero-contributor state mid-update.
+--   @ExpectedRowVersion (optional): 50412 if the song changed since it was read.
+--   Returns the updated row from vw_Songs.
 -- ================================================================
 CREATE OR ALTER PROCEDURE dbo.sp_UpdateSong
-    @ID           INT,
-    @Title        VARCHAR(255),
-    @Duration     INT,
-    @ReleaseDate  DATE                = NULL,
-    @Genres       VARCHAR(MAX)        = NULL,  -- comma-separated list
-    @Contributors VARCHAR(MAX)        = NULL   -- comma-separated list of Person_NIFs
+    @ID                 INT,
+    @Title              VARCHAR(255),
+    @Duration           INT,
+    @ReleaseDate        DATE          = NULL,
+    @Genres             VARCHAR(MAX)  = NULL,  -- comma-separated list
+    @Contributors       VARCHAR(MAX)  = NULL,  -- comma-separated list of Person_NIFs
+    @ExpectedRowVersion VARBINARY(16) = NULL
 AS
 BEGIN
     SET NOCOUNT ON;
-    BEGIN TRANSACTION;
+    SET XACT_ABORT ON;
+
+    -- Resolve the requested child sets before taking any locks
+    DECLARE @newGenres TABLE (Genre VARCHAR(50) PRIMARY KEY);
+    INSERT INTO @newGenres (Genre)
+    SELECT DISTINCT LTRIM(RTRIM(value))
+    FROM STRING_SPLIT(@Genres, ',')
+    WHERE LTRIM(RTRIM(value)) <> '';
+
+    DECLARE @newContributors TABLE (ContributorID INT PRIMARY KEY);
+    INSERT INTO @newContributors (ContributorID)
+    SELECT DISTINCT c.ContributorID
+    FROM STRING_SPLIT(@Contributors, ',') AS s
+    JOIN dbo.Contributor AS c
+      ON c.Person_NIF = LTRIM(RTRIM(s.value));
+
     BEGIN TRY
-        -- 1) Update the Song row
+        BEGIN TRANSACTION;
+
+        -- 1) Update the Song row (and check the version in the same statement)
         UPDATE dbo.Song
         SET Title       = @Title,
             Duration    = @Duration,
             ReleaseDate = @ReleaseDate
-        WHERE SongID = @ID;
+        WHERE SongID = @ID
+          AND (@ExpectedRowVersion IS NULL OR RowVer = @ExpectedRowVersion);
 
         IF @@ROWCOUNT = 0
         BEGIN
-            ROLLBACK;
-            RAISERROR('Song not found', 16, 1);
-            RETURN;
+            IF EXISTS (SELECT 1 FROM dbo.Song WHERE SongID = @ID)
+                THROW 50412, 'Song was modified by another request', 1;
+            THROW 50040, 'Song not found', 1;
         END
 
-        -- 2) Refresh genres
-        DELETE FROM dbo.Song_Genre
-        WHERE Song_SongID = @ID;
+        -- 2) Genres: add missing, drop removed
+        INSERT INTO dbo.Song_Genre (Song_SongID, Genre)
+        SELECT @ID, n.Genre
+        FROM @newGenres n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM dbo.Song_Genre sg
+            WHERE sg.Song_SongID = @ID AND sg.Genre = n.Genre
+        );
 
-        IF @Genres IS NOT NULL
-        BEGIN
-            DECLARE @g2 VARCHAR(50);
-            DECLARE curG2 CURSOR FOR
-              SELECT LTRIM(RTRIM(value))
-              FROM STRING_SPLIT(@Genres, ',');
-            OPEN curG2;
-            FETCH NEXT FROM curG2 INTO @g2;
-            WHILE @@FETCH_STATUS = 0
-            BEGIN
-                INSERT INTO dbo.Song_Genre (Song_SongID, Genre)
-                VALUES (@ID, @g2);
-                FETCH NEXT FROM curG2 INTO @g2;
-            END
-            CLOSE curG2; 
-            DEALLOCATE curG2;
-        END
+        DELETE sg
+        FROM dbo.Song_Genre sg
+        WHERE sg.Song_SongID = @ID
+          AND NOT EXISTS (SELECT 1 FROM @newGenres n WHERE n.Genre = sg.Genre);
 
-        -- 3) Refresh contributors
-        DELETE FROM dbo.Contributor_Song
-        WHERE Song_SongID = @ID;
+        -- 3) Contributors: add missing, drop removed (kept links keep their Date)
+        INSERT INTO dbo.Contributor_Song (Contributor_ContributorID, Song_SongID, Date)
+        SELECT n.ContributorID, @ID, GETDATE()
+        FROM @newContributors n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM dbo.Contributor_Song cs
+            WHERE cs.Song_SongID = @ID AND cs.Contributor_ContributorID = n.ContributorID
+        );
 
-        IF @Contributors IS NOT NULL
-        BEGIN
-            DECLARE @nif2 VARCHAR(20);
-            DECLARE curC2 CURSOR FOR
-              SELECT LTRIM(RTRIM(value))
-              FROM STRING_SPLIT(@Contributors, ',');
-            OPEN curC2;
-            FETCH NEXT FROM curC2 INTO @nif2;
-            WHILE @@FETCH_STATUS = 0
-            BEGIN
-                INSERT INTO dbo.Contributor_Song (Contributor_ContributorID, Song_SongID, Date)
-                SELECT c.ContributorID, @ID, GETDATE()
-                FROM dbo.Contributor AS c
-                WHERE c.Person_NIF = @nif2;
-                FETCH NEXT FROM curC2 INTO @nif2;
-            END
-            CLOSE curC2; 
-            DEALLOCATE curC2;
-        END
+        DELETE cs
+        FROM dbo.Contributor_Song cs
+        WHERE cs.Song_SongID = @ID
+          AND NOT EXISTS (
+              SELECT 1 FROM @newContributors n
+              WHERE n.ContributorID = cs.Contributor_ContributorID
+          );
 
         COMMIT TRANSACTION;
     END TRY
     BEGIN CATCH
-        ROLLBACK TRANSACTION;
+        IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;
         THROW;
     END CATCH
+
+    SELECT *
+    FROM dbo.vw_Songs
+    WHERE SongID = @ID;
 END
 GO
 
@@ -0,0 +1,474 @@
+-- ====================================================
+-- RefreshStats: Bring catalog rollups up to date
+--   @Rollups = comma-separated rollups to refresh (NULL: all):
+--              genres, contributors, labels, release_dates, label_pairs
+--   @Songs, @Employees, @Contributors, @Collaborations, @RecordLabels =
+--              comma-separated IDs of the rows that changed (change feed keys)
+--   With no keys, every group of each rollup is recomputed.  With keys, only
+--   the groups those rows are in, or were in before the change, are: each
+--   rollup keeps what it counted per song (or collaboration) in a Stats_*Song
+--   (Stats_LabelPairCollaboration) table, whose rows for the changed keys are
+--   merged first and name the groups to recompute.
+--   Either way the groups are MERGEd into their Stats_* table, so only the
+--   summary rows whose values changed are written, and readers see either the
+--   old or the new rollup, never a half-written one.
+--   The statements filter on "@All = 1 OR <key>"; OPTION (RECOMPILE) lets each
+--   run get the plan of its own mode (a scan for all, seeks for a few keys).
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_RefreshStats
+    @Rollups        VARCHAR(255) = NULL,
+    @Songs          VARCHAR(MAX) = NULL,
+    @Employees      VARCHAR(MAX) = NULL,
+    @Contributors   VARCHAR(MAX) = NULL,
+    @Collaborations VARCHAR(MAX) = NULL,
+    @RecordLabels   VARCHAR(MAX) = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @All BIT = IIF(COALESCE(@Songs, @Employees, @Contributors, @Collaborations, @RecordLabels) IS NULL, 1, 0);
+
+    DECLARE @Refresh TABLE (Rollup VARCHAR(30) PRIMARY KEY);
+    INSERT INTO @Refresh (Rollup)
+    SELECT r.Rollup
+    FROM (VALUES ('genres'), ('contributors'), ('labels'), ('release_dates'), ('label_pairs')) AS r(Rollup)
+    WHERE @Rollups IS NULL
+       OR r.Rollup IN (SELECT LTRIM(RTRIM(value)) FROM STRING_SPLIT(@Rollups, ','));
+
+    -- The changed rows
+    DECLARE @SongKeys TABLE (ID INT PRIMARY KEY);
+    DECLARE @EmployeeKeys TABLE (ID INT PRIMARY KEY);
+    DECLARE @ContributorKeys TABLE (ID INT PRIMARY KEY);
+    DECLARE @CollaborationKeys TABLE (ID INT PRIMARY KEY);
+    DECLARE @LabelKeys TABLE (ID INT PRIMARY KEY);
+    INSERT INTO @SongKeys (ID) SELECT DISTINCT CAST(value AS INT) FROM STRING_SPLIT(@Songs, ',') WHERE value <> '';
+    INSERT INTO @EmployeeKeys (ID) SELECT DISTINCT CAST(value AS INT) FROM STRING_SPLIT(@Employees, ',') WHERE value <> '';
+    INSERT INTO @ContributorKeys (ID) SELECT DISTINCT CAST(value AS INT) FROM STRING_SPLIT(@Contributors, ',') WHERE value <> '';
+    INSERT INTO @CollaborationKeys (ID) SELECT DISTINCT CAST(value AS INT) FROM STRING_SPLIT(@Collaborations, ',') WHERE value <> '';
+    INSERT INTO @LabelKeys (ID) SELECT DISTINCT CAST(value AS INT) FROM STRING_SPLIT(@RecordLabels, ',') WHERE value <> '';
+
+    -- The groups to recompute (repeats are harmless)
+    DECLARE @Genres TABLE (Genre VARCHAR(50) NOT NULL);
+    DECLARE @ContributorGroups TABLE (ID INT NOT NULL);
+    DECLARE @LabelGroups TABLE (ID INT NOT NULL);
+    DECLARE @Months TABLE (ReleaseMonth DATE NOT NULL);
+    DECLARE @Pairs TABLE (RecordLabelID1 INT NOT NULL, RecordLabelID2 INT NOT NULL);
+
+    BEGIN TRANSACTION;
+    BEGIN TRY
+        -- Songs and total duration per genre
+        IF EXISTS (SELECT 1 FROM @Refresh WHERE Rollup = 'genres')
+        BEGIN
+            WITH t AS (
+                SELECT SongID, Genre FROM dbo.Stats_GenreSong
+                WHERE @All = 1 OR SongID IN (SELECT ID FROM @SongKeys)
+            )
+            MERGE t
+            USING (
+                SELECT Song_SongID AS SongID, Genre FROM dbo.Song_Genre
+                WHERE @All = 1 OR Song_SongID IN (SELECT ID FROM @SongKeys)
+            ) AS src
+               ON t.SongID = src.SongID AND t.Genre = src.Genre
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (SongID, Genre) VALUES (src.SongID, src.Genre)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OUTPUT COALESCE(inserted.Genre, deleted.Genre) INTO @Genres (Genre)
+            OPTION (RECOMPILE);
+
+            -- A changed duration changes the totals of the song's genres
+            INSERT INTO @Genres (Genre)
+            SELECT Genre FROM dbo.Stats_GenreSong WHERE SongID IN (SELECT ID FROM @SongKeys);
+
+            WITH t AS (
+                SELECT * FROM dbo.Stats_Genre
+                WHERE @All = 1 OR Genre IN (SELECT Genre FROM @Genres)
+            )
+            MERGE t
+            USING (
+                SELECT gs.Genre, COUNT(*) AS SongCount, SUM(s.Duration) AS TotalDuration
+                FROM dbo.Stats_GenreSong gs
+                JOIN dbo.Song s ON s.SongID = gs.SongID
+                WHERE @All = 1 OR gs.Genre IN (SELECT Genre FROM @Genres)
+                GROUP BY gs.Genre
+            ) AS src
+               ON t.Genre = src.Genre
+            WHEN MATCHED AND (t.SongCount <> src.SongCount OR t.TotalDuration <> src.TotalDuration) THEN
+                UPDATE SET SongCount = src.SongCount, TotalDuration = src.TotalDuration
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (Genre, SongCount, TotalDuration)
+                VALUES (src.Genre, src.SongCount, src.TotalDuration)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OPTION (RECOMPILE);
+        END;
+
+        -- Songs and total duration per contributor (contributors without songs included)
+        IF EXISTS (SELECT 1 FROM @Refresh WHERE Rollup = 'contributors')
+        BEGIN
+            WITH t AS (
+                SELECT SongID, ContributorID FROM dbo.Stats_ContributorSong
+                WHERE @All = 1
+                   OR SongID IN (SELECT ID FROM @SongKeys)
+                   OR ContributorID IN (SELECT ID FROM @ContributorKeys)
+            )
+            MERGE t
+            USING (
+                SELECT Song_SongID AS SongID, Contributor_ContributorID AS ContributorID
+                FROM dbo.Contributor_Song
+                WHERE @All = 1
+                   OR Song_SongID IN (SELECT ID FROM @SongKeys)
+                   OR Contributor_ContributorID IN (SELECT ID FROM @ContributorKeys)
+            ) AS src
+               ON t.SongID = src.SongID AND t.ContributorID = src.ContributorID
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (SongID, ContributorID) VALUES (src.SongID, src.ContributorID)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OUTPUT COALESCE(inserted.ContributorID, deleted.ContributorID) INTO @ContributorGroups (ID)
+            OPTION (RECOMPILE);
+
+            -- Changed contributors (name, added, removed) and the contributors of changed songs
+            INSERT INTO @ContributorGroups (ID)
+            SELECT ID FROM @ContributorKeys
+            UNION ALL
+            SELECT ContributorID FROM dbo.Stats_ContributorSong WHERE SongID IN (SELECT ID FROM @SongKeys);
+
+            WITH t AS (
+                SELECT * FROM dbo.Stats_Contributor
+                WHERE @All = 1 OR ContributorID IN (SELECT ID FROM @ContributorGroups)
+            )
+            MERGE t
+            USING (
+                SELECT c.ContributorID, p.Name,
+                       COUNT(s.SongID)          AS SongCount,
+                       ISNULL(SUM(s.Duration), 0) AS TotalDuration
+                FROM dbo.Contributor c
+                JOIN dbo.Person p ON p.NIF = c.Person_NIF
+                LEFT JOIN dbo.Stats_ContributorSong cs ON cs.ContributorID = c.ContributorID
+                LEFT JOIN dbo.Song s ON s.SongID = cs.SongID
+                WHERE @All = 1 OR c.ContributorID IN (SELECT ID FROM @ContributorGroups)
+                GROUP BY c.ContributorID, p.Name
+            ) AS src
+               ON t.ContributorID = src.ContributorID
+            WHEN MATCHED AND (t.Name <> src.Name OR t.SongCount <> src.SongCount
+                              OR t.TotalDuration <> src.TotalDuration) THEN
+                UPDATE SET Name = src.Name, SongCount = src.SongCount, TotalDuration = src.TotalDuration
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (ContributorID, Name, SongCount, TotalDuration)
+                VALUES (src.ContributorID, src.Name, src.SongCount, src.TotalDuration)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OPTION (RECOMPILE);
+        END;
+
+        -- Catalog size and duration per label: songs of its employees who are
+        -- contributors, and of the collaborations it takes part in (each song once).
+        -- A changed contributor's label links are found by the ContributorID they
+        -- were stored with, and by the employee that now shares its person.
+        IF EXISTS (SELECT 1 FROM @Refresh WHERE Rollup = 'labels')
+        BEGIN
+            WITH t AS (
+                SELECT RecordLabelID, SongID, Via, ViaID, ContributorID FROM dbo.Stats_LabelSong
+                WHERE @All = 1
+                   OR SongID IN (SELECT ID FROM @SongKeys)
+                   OR (Via = 'E' AND ViaID IN (SELECT ID FROM @EmployeeKeys))
+                   OR ContributorID IN (SELECT ID FROM @ContributorKeys)
+                   OR (Via = 'C' AND ViaID IN (SELECT ID FROM @CollaborationKeys))
+            )
+            MERGE t
+            USING (
+                SELECT e.RecordLabel_RecordLabelID AS RecordLabelID, cs.Song_SongID AS SongID,
+                       'E' AS Via, e.EmployeeID AS ViaID, c.ContributorID
+                FROM dbo.Employee e
+                JOIN dbo.Contributor c       ON c.Person_NIF = e.Person_NIF
+                JOIN dbo.Contributor_Song cs ON cs.Contributor_ContributorID = c.ContributorID
+                WHERE @All = 1
+                   OR cs.Song_SongID IN (SELECT ID FROM @SongKeys)
+                   OR e.EmployeeID IN (SELECT ID FROM @EmployeeKeys)
+                   OR c.ContributorID IN (SELECT ID FROM @ContributorKeys)
+                UNION
+                SELECT l.RecordLabelID, col.Song_SongID, 'C', col.CollaborationID, NULL
+                FROM dbo.RecordLabel_Collaboration rlc
+                JOIN dbo.Collaboration col ON col.CollaborationID = rlc.Collaboration_CollaborationID
+                CROSS APPLY (VALUES (rlc.RecordLabel_RecordLabelID1),
+                                    (rlc.RecordLabel_RecordLabelID2)) AS l(RecordLabelID)
+                WHERE col.Song_SongID IS NOT NULL
+                  AND (@All = 1
+                       OR col.Song_SongID IN (SELECT ID FROM @SongKeys)
+                       OR col.CollaborationID IN (SELECT ID FROM @CollaborationKeys))
+            ) AS src
+               ON t.RecordLabelID = src.RecordLabelID AND t.SongID = src.SongID
+              AND t.Via = src.Via AND t.ViaID = src.ViaID
+            WHEN MATCHED AND ISNULL(t.ContributorID, -1) <> ISNULL(src.ContributorID, -1) THEN
+                UPDATE SET ContributorID = src.ContributorID
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (RecordLabelID, SongID, Via, ViaID, ContributorID)
+                VALUES (src.RecordLabelID, src.SongID, src.Via, src.ViaID, src.ContributorID)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OUTPUT COALESCE(inserted.RecordLabelID, deleted.RecordLabelID) INTO @LabelGroups (ID)
+            OPTION (RECOMPILE);
+
+            -- Changed labels (name, added, removed) and the labels of changed songs
+            INSERT INTO @LabelGroups (ID)
+            SELECT ID FROM @LabelKeys
+            UNION ALL
+            SELECT RecordLabelID FROM dbo.Stats_LabelSong WHERE SongID IN (SELECT ID FROM @SongKeys);
+
+            WITH t AS (
+                SELECT * FROM dbo.Stats_Label
+                WHERE @All = 1 OR RecordLabelID IN (SELECT ID FROM @LabelGroups)
+            )
+            MERGE t
+            USING (
+                SELECT rl.RecordLabelID, rl.Name,
+                       COUNT(s.SongID)          AS SongCount,
+                       ISNULL(SUM(s.Duration), 0) AS TotalDuration
+                FROM dbo.RecordLabel rl
+                LEFT JOIN (SELECT DISTINCT RecordLabelID, SongID FROM dbo.Stats_LabelSong) AS ls
+                       ON ls.RecordLabelID = rl.RecordLabelID
+                LEFT JOIN dbo.Song s ON s.SongID = ls.SongID
+                WHERE @All = 1 OR rl.RecordLabelID IN (SELECT ID FROM @LabelGroups)
+                GROUP BY rl.RecordLabelID, rl.Name
+            ) AS src
+               ON t.RecordLabelID = src.RecordLabelID
+            WHEN MATCHED AND (t.Name <> src.Name OR t.SongCount <> src.SongCount
+                              OR t.TotalDuration <> src.TotalDuration) THEN
+                UPDATE SET Name = src.Name, SongCount = src.SongCount, TotalDuration = src.TotalDuration
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (RecordLabelID, Name, SongCount, TotalDuration)
+                VALUES (src.RecordLabelID, src.Name, src.SongCount, src.TotalDuration)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OPTION (RECOMPILE);
+        END;
+
+        -- Songs released per month (songs without a release date are left out)
+        IF EXISTS (SELECT 1 FROM @Refresh WHERE Rollup = 'release_dates')
+        BEGIN
+            WITH t AS (
+                SELECT SongID, ReleaseMonth FROM dbo.Stats_ReleaseMonthSong
+                WHERE @All = 1 OR SongID IN (SELECT ID FROM @SongKeys)
+            )
+            MERGE t
+            USING (
+                SELECT SongID, DATEFROMPARTS(YEAR(ReleaseDate), MONTH(ReleaseDate), 1) AS ReleaseMonth
+                FROM dbo.Song
+                WHERE ReleaseDate IS NOT NULL
+                  AND (@All = 1 OR SongID IN (SELECT ID FROM @SongKeys))
+            ) AS src
+               ON t.SongID = src.SongID AND t.ReleaseMonth = src.ReleaseMonth
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (SongID, ReleaseMonth) VALUES (src.SongID, src.ReleaseMonth)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OUTPUT COALESCE(inserted.ReleaseMonth, deleted.ReleaseMonth) INTO @Months (ReleaseMonth)
+            OPTION (RECOMPILE);
+
+            WITH t AS (
+                SELECT * FROM dbo.Stats_ReleaseMonth
+                WHERE @All = 1 OR ReleaseMonth IN (SELECT ReleaseMonth FROM @Months)
+            )
+            MERGE t
+            USING (
+                SELECT ReleaseMonth, COUNT(*) AS SongCount
+                FROM dbo.Stats_ReleaseMonthSong
+                WHERE @All = 1 OR ReleaseMonth IN (SELECT ReleaseMonth FROM @Months)
+                GROUP BY ReleaseMonth
+            ) AS src
+               ON t.ReleaseMonth = src.ReleaseMonth
+            WHEN MATCHED AND t.SongCount <> src.SongCount THEN
+                UPDATE SET SongCount = src.SongCount
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (ReleaseMonth, SongCount)
+                VALUES (src.ReleaseMonth, src.SongCount)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OPTION (RECOMPILE);
+        END;
+
+        -- Collaborations per pair of labels, whichever way round they were linked
+        IF EXISTS (SELECT 1 FROM @Refresh WHERE Rollup = 'label_pairs')
+        BEGIN
+            WITH t AS (
+                SELECT CollaborationID, RecordLabelID1, RecordLabelID2 FROM dbo.Stats_LabelPairCollaboration
+                WHERE @All = 1 OR CollaborationID IN (SELECT ID FROM @CollaborationKeys)
+            )
+            MERGE t
+            USING (
+                SELECT DISTINCT
+                       Collaboration_CollaborationID AS CollaborationID,
+                       IIF(RecordLabel_RecordLabelID1 < RecordLabel_RecordLabelID2,
+                           RecordLabel_RecordLabelID1, RecordLabel_RecordLabelID2) AS RecordLabelID1,
+                       IIF(RecordLabel_RecordLabelID1 < RecordLabel_RecordLabelID2,
+                           RecordLabel_RecordLabelID2, RecordLabel_RecordLabelID1) AS RecordLabelID2
+                FROM dbo.RecordLabel_Collaboration
+                WHERE @All = 1 OR Collaboration_CollaborationID IN (SELECT ID FROM @CollaborationKeys)
+            ) AS src
+               ON t.CollaborationID = src.CollaborationID
+              AND t.RecordLabelID1 = src.RecordLabelID1 AND t.RecordLabelID2 = src.RecordLabelID2
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (CollaborationID, RecordLabelID1, RecordLabelID2)
+                VALUES (src.CollaborationID, src.RecordLabelID1, src.RecordLabelID2)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OUTPUT COALESCE(inserted.RecordLabelID1, deleted.RecordLabelID1),
+                   COALESCE(inserted.RecordLabelID2, deleted.RecordLabelID2)
+              INTO @Pairs (RecordLabelID1, RecordLabelID2)
+            OPTION (RECOMPILE);
+
+            -- The pairs of renamed labels
+            INSERT INTO @Pairs (RecordLabelID1, RecordLabelID2)
+            SELECT RecordLabelID1, RecordLabelID2
+            FROM dbo.Stats_LabelPair
+            WHERE RecordLabelID1 IN (SELECT ID FROM @LabelKeys)
+               OR RecordLabelID2 IN (SELECT ID FROM @LabelKeys);
+
+            WITH t AS (
+                SELECT * FROM dbo.Stats_LabelPair sp
+                WHERE @All = 1
+                   OR EXISTS (SELECT 1 FROM @Pairs p
+                              WHERE p.RecordLabelID1 = sp.RecordLabelID1 AND p.RecordLabelID2 = sp.RecordLabelID2)
+            )
+            MERGE t
+            USING (
+                SELECT pc.RecordLabelID1, pc.RecordLabelID2,
+                       rl1.Name AS Name1, rl2.Name AS Name2,
+                       COUNT(*) AS CollaborationCount
+                FROM dbo.Stats_LabelPairCollaboration pc
+                JOIN dbo.RecordLabel rl1 ON rl1.RecordLabelID = pc.RecordLabelID1
+                JOIN dbo.RecordLabel rl2 ON rl2.RecordLabelID = pc.RecordLabelID2
+                WHERE @All = 1
+                   OR EXISTS (SELECT 1 FROM @Pairs p
+                              WHERE p.RecordLabelID1 = pc.RecordLabelID1 AND p.RecordLabelID2 = pc.RecordLabelID2)
+                GROUP BY pc.RecordLabelID1, pc.RecordLabelID2, rl1.Name, rl2.Name
+            ) AS src
+               ON t.RecordLabelID1 = src.RecordLabelID1 AND t.RecordLabelID2 = src.RecordLabelID2
+            WHEN MATCHED AND (t.Name1 <> src.Name1 OR t.Name2 <> src.Name2
+                              OR t.CollaborationCount <> src.CollaborationCount) THEN
+                UPDATE SET Name1 = src.Name1, Name2 = src.Name2, CollaborationCount = src.CollaborationCount
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (RecordLabelID1, RecordLabelID2, Name1, Name2, CollaborationCount)
+                VALUES (src.RecordLabelID1, src.RecordLabelID2, src.Name1, src.Name2, src.CollaborationCount)
+            WHEN NOT MATCHED BY SOURCE THEN
+                DELETE
+            OPTION (RECOMPILE);
+        END;
+
+        MERGE dbo.StatsRefresh AS t
+        USING @Refresh AS src
+           ON t.Rollup = src.Rollup
+        WHEN MATCHED THEN
+            UPDATE SET RefreshedAt = SYSUTCDATETIME()
+        WHEN NOT MATCHED THEN
+            INSERT (Rollup, RefreshedAt) VALUES (src.Rollup, SYSUTCDATETIME());
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        ROLLBACK;
+        THROW;
+    END CATCH
+END;
+GO
+
+
+-- ====================================================
+-- The GetXStats procedures below return two result sets: the rollup's
+-- RefreshedAt (no row if it was never refreshed), then its rows.
+-- ====================================================
+
+-- ====================================================
+-- GetGenreStats: Songs and total duration per genre
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetGenreStats
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT RefreshedAt FROM dbo.StatsRefresh WHERE Rollup = 'genres';
+
+    SELECT Genre, SongCount, TotalDuration
+    FROM dbo.Stats_Genre
+    ORDER BY SongCount DESC, Genre;
+END;
+GO
+
+
+-- ====================================================
+-- GetContributorStats: The @Limit contributors with the most songs
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetContributorStats
+    @Limit INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT RefreshedAt FROM dbo.StatsRefresh WHERE Rollup = 'contributors';
+
+    SELECT TOP (@Limit) ContributorID, Name, SongCount, TotalDuration
+    FROM dbo.Stats_Contributor
+    ORDER BY SongCount DESC, ContributorID;
+END;
+GO
+
+
+-- ====================================================
+-- GetLabelStats: Catalog size and duration per record label
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetLabelStats
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT RefreshedAt FROM dbo.StatsRefresh WHERE Rollup = 'labels';
+
+    SELECT RecordLabelID, Name, SongCount, TotalDuration
+    FROM dbo.Stats_Label
+    ORDER BY TotalDuration DESC, RecordLabelID;
+END;
+GO
+
+
+-- ====================================================
+-- GetReleaseDateStats: Release-date histogram
+--   @Bucket = 'month' or 'year'; Period is the first day of the bucket
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetReleaseDateStats
+    @Bucket VARCHAR(10)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT RefreshedAt FROM dbo.StatsRefresh WHERE Rollup = 'release_dates';
+
+    IF @Bucket = 'year'
+        SELECT DATEFROMPARTS(YEAR(ReleaseMonth), 1, 1) AS Period, SUM(SongCount) AS SongCount
+        FROM dbo.Stats_ReleaseMonth
+        GROUP BY YEAR(ReleaseMonth)
+        ORDER BY Period;
+    ELSE
+        SELECT ReleaseMonth AS Period, SongCount
+        FROM dbo.Stats_ReleaseMonth
+        ORDER BY Period;
+END;
+GO
+
+
+-- ====================================================
+-- GetLabelPairStats: The @Limit label pairs with the most collaborations
+-- ====================================================
+CREATE OR ALTER PROCEDURE dbo.sp_GetLabelPairStats
+    @Limit INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT RefreshedAt FROM dbo.StatsRefresh WHERE Rollup = 'label_pairs';
+
+    SELECT TOP (@Limit) RecordLabelID1, Name1, RecordLabelID2, Name2, CollaborationCount
+    FROM dbo.Stats_LabelPair
+    ORDER BY CollaborationCount DESC, RecordLabelID1, RecordLabelID2;
+END;
+GO
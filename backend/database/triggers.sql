@@ -64,3 +64,228 @@ BEGIN
     );
 END;
 GO
+
+
+-- =============================================================================
+-- Change feed: log every insert (I), update (U) and delete (D) of an entity's
+-- own table in ChangeLog.  Changes to its link and specialization tables are
+-- logged as an update of the entity, while it still exists.
+-- =============================================================================
+CREATE OR ALTER TRIGGER trg_ChangeLog_RecordLabel
+ON RecordLabel
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'record_labels',
+           CAST(COALESCE(i.RecordLabelID, d.RecordLabelID) AS VARCHAR(20)),
+           CASE WHEN d.RecordLabelID IS NULL THEN 'I'
+                WHEN i.RecordLabelID IS NULL THEN 'D'
+                ELSE 'U' END
+    FROM inserted AS i
+    FULL OUTER JOIN deleted AS d ON d.RecordLabelID = i.RecordLabelID;
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Song
+ON Song
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'songs',
+           CAST(COALESCE(i.SongID, d.SongID) AS VARCHAR(20)),
+           CASE WHEN d.SongID IS NULL THEN 'I'
+                WHEN i.SongID IS NULL THEN 'D'
+                ELSE 'U' END
+    FROM inserted AS i
+    FULL OUTER JOIN deleted AS d ON d.SongID = i.SongID;
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Collaboration
+ON Collaboration
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'collaborations',
+           CAST(COALESCE(i.CollaborationID, d.CollaborationID) AS VARCHAR(20)),
+           CASE WHEN d.CollaborationID IS NULL THEN 'I'
+                WHEN i.CollaborationID IS NULL THEN 'D'
+                ELSE 'U' END
+    FROM inserted AS i
+    FULL OUTER JOIN deleted AS d ON d.CollaborationID = i.CollaborationID;
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Person
+ON Person
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'persons',
+           CAST(COALESCE(i.NIF, d.NIF) AS VARCHAR(20)),
+           CASE WHEN d.NIF IS NULL THEN 'I'
+                WHEN i.NIF IS NULL THEN 'D'
+                ELSE 'U' END
+    FROM inserted AS i
+    FULL OUTER JOIN deleted AS d ON d.NIF = i.NIF;
+
+    -- Employees and contributors show their person's details
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'employees', CAST(e.EmployeeID AS VARCHAR(20)), 'U'
+    FROM inserted AS i
+    JOIN deleted AS d ON d.NIF = i.NIF
+    JOIN dbo.Employee AS e ON e.Person_NIF = i.NIF;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'contributors', CAST(c.ContributorID AS VARCHAR(20)), 'U'
+    FROM inserted AS i
+    JOIN deleted AS d ON d.NIF = i.NIF
+    JOIN dbo.Contributor AS c ON c.Person_NIF = i.NIF;
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Employee
+ON Employee
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'employees',
+           CAST(COALESCE(i.EmployeeID, d.EmployeeID) AS VARCHAR(20)),
+           CASE WHEN d.EmployeeID IS NULL THEN 'I'
+                WHEN i.EmployeeID IS NULL THEN 'D'
+                ELSE 'U' END
+    FROM inserted AS i
+    FULL OUTER JOIN deleted AS d ON d.EmployeeID = i.EmployeeID;
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Contributor
+ON Contributor
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'contributors',
+           CAST(COALESCE(i.ContributorID, d.ContributorID) AS VARCHAR(20)),
+           CASE WHEN d.ContributorID IS NULL THEN 'I'
+                WHEN i.ContributorID IS NULL THEN 'D'
+                ELSE 'U' END
+    FROM inserted AS i
+    FULL OUTER JOIN deleted AS d ON d.ContributorID = i.ContributorID;
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Song_Genre
+ON Song_Genre
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'songs', CAST(x.Song_SongID AS VARCHAR(20)), 'U'
+    FROM (SELECT Song_SongID FROM inserted UNION SELECT Song_SongID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Song AS p WHERE p.SongID = x.Song_SongID);
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Contributor_Song
+ON Contributor_Song
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'songs', CAST(x.Song_SongID AS VARCHAR(20)), 'U'
+    FROM (SELECT Song_SongID FROM inserted UNION SELECT Song_SongID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Song AS p WHERE p.SongID = x.Song_SongID);
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Artist
+ON Artist
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'contributors', CAST(x.Contributor_ContributorID AS VARCHAR(20)), 'U'
+    FROM (SELECT Contributor_ContributorID FROM inserted UNION SELECT Contributor_ContributorID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Contributor AS p WHERE p.ContributorID = x.Contributor_ContributorID);
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Producer
+ON Producer
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'contributors', CAST(x.Contributor_ContributorID AS VARCHAR(20)), 'U'
+    FROM (SELECT Contributor_ContributorID FROM inserted UNION SELECT Contributor_ContributorID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Contributor AS p WHERE p.ContributorID = x.Contributor_ContributorID);
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Songwriter
+ON Songwriter
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'contributors', CAST(x.Contributor_ContributorID AS VARCHAR(20)), 'U'
+    FROM (SELECT Contributor_ContributorID FROM inserted UNION SELECT Contributor_ContributorID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Contributor AS p WHERE p.ContributorID = x.Contributor_ContributorID);
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_Collaboration_Contributor
+ON Collaboration_Contributor
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'collaborations', CAST(x.Collaboration_CollaborationID AS VARCHAR(20)), 'U'
+    FROM (SELECT Collaboration_CollaborationID FROM inserted UNION SELECT Collaboration_CollaborationID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Collaboration AS p WHERE p.CollaborationID = x.Collaboration_CollaborationID);
+END;
+GO
+
+CREATE OR ALTER TRIGGER trg_ChangeLog_RecordLabel_Collaboration
+ON RecordLabel_Collaboration
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.ChangeLog (Entity, EntityKey, Operation)
+    SELECT 'collaborations', CAST(x.Collaboration_CollaborationID AS VARCHAR(20)), 'U'
+    FROM (SELECT Collaboration_CollaborationID FROM inserted UNION SELECT Collaboration_CollaborationID FROM deleted) AS x
+    WHERE EXISTS (SELECT 1 FROM dbo.Collaboration AS p WHERE p.CollaborationID = x.Collaboration_CollaborationID);
+END;
+GO
@@ -9,7 +9,8 @@ SELECT
     Location,
     Website,
     Email,
-    PhoneNumber
+    PhoneNumber,
+    CAST(RowVer AS VARBINARY(16)) AS RowVersion
 FROM dbo.RecordLabel;
 GO
 
@@ -62,7 +63,9 @@ SELECT
     p.Email,
     p.PhoneNumber,
     e.RecordLabel_RecordLabelID AS RecordLabelID,
-    rl.Name                AS RecordLabelName
+    rl.Name                AS RecordLabelName,
+    -- Employee fields live in two rows; either one changing bumps the version
+    CAST(e.RowVer AS BINARY(8)) + CAST(p.RowVer AS BINARY(8)) AS RowVersion
 FROM dbo.Employee e
 JOIN dbo.Person    p  ON p.NIF = e.Person_NIF
 JOIN dbo.RecordLabel rl ON rl.RecordLabelID = e.RecordLabel_RecordLabelID;
@@ -80,7 +83,8 @@ SELECT
     s.ReleaseDate,
     COALESCE(g.Genres, '')       AS Genres,
     COALESCE(c.Contributors, '') AS Contributors,
-    col.CollaborationName        AS CollaborationName
+    col.CollaborationName        AS CollaborationName,
+    CAST(s.RowVer AS VARBINARY(16)) AS RowVersion
 FROM dbo.Song AS s
 
 OUTER APPLY (
@@ -104,6 +108,22 @@ LEFT JOIN dbo.Collaboration AS col
 GO
 
 
+-- ================================================================
+-- vw_SongsBrief: vw_Songs without the genre/contributor aggregation
+-- (read for ?fields= projections that need none of them)
+-- ================================================================
+CREATE OR ALTER VIEW dbo.vw_SongsBrief
+AS
+SELECT
+    SongID,
+    Title,
+    Duration,
+    ReleaseDate,
+    CAST(RowVer AS VARBINARY(16)) AS RowVersion
+FROM dbo.Song;
+GO
+
+
 -- ================================================
 -- Contributors View
 -- ================================================
@@ -124,7 +144,8 @@ SELECT
       COALESCE(pr.Roles, '') +
       COALESCE(sw.Roles, ''),
       1, 2, ''
-    ) AS Roles
+    ) AS Roles,
+    CAST(c.RowVer AS BINARY(8)) + CAST(p.RowVer AS BINARY(8)) AS RowVersion
 FROM dbo.Contributor c
 JOIN dbo.Person p
   ON p.NIF = c.Person_NIF
@@ -156,6 +177,26 @@ OUTER APPLY (
 GO
 
 
+-- ================================================
+-- vw_ContributorsBrief: vw_Contributors without roles and record label
+-- (read for ?fields= projections that need neither)
+-- ================================================
+CREATE OR ALTER VIEW dbo.vw_ContributorsBrief
+AS
+SELECT
+    c.ContributorID,
+    p.NIF,
+    p.Name,
+    p.DateOfBirth,
+    p.Email,
+    p.PhoneNumber,
+    CAST(c.RowVer AS BINARY(8)) + CAST(p.RowVer AS BINARY(8)) AS RowVersion
+FROM dbo.Contributor c
+JOIN dbo.Person p
+  ON p.NIF = c.Person_NIF;
+GO
+
+
 -- ================================================================
 -- Collaborations View
 -- ================================================================
@@ -189,7 +230,29 @@ SELECT
         ON p.NIF = co.Person_NIF
       WHERE cc.Collaboration_CollaborationID = c.CollaborationID
       FOR XML PATH(''), TYPE
-    ).value('.', 'nvarchar(max)'), 1, 2, '') AS Contributors
+    ).value('.', 'nvarchar(max)'), 1, 2, '') AS Contributors,
+    CAST(c.RowVer AS VARBINARY(16)) AS RowVersion
+FROM dbo.Collaboration c
+LEFT JOIN dbo.Song s
+  ON s.SongID = c.Song_SongID;
+GO
+
+
+-- ================================================================
+-- vw_CollaborationsBrief: vw_Collaborations without the label/contributor lists
+-- (read for ?fields= projections that need neither)
+-- ================================================================
+CREATE OR ALTER VIEW dbo.vw_CollaborationsBrief
+AS
+SELECT
+    c.CollaborationID,
+    c.CollaborationName,
+    c.StartDate,
+    c.EndDate,
+    c.Description,
+    s.SongID,
+    s.Title AS SongTitle,
+    CAST(c.RowVer AS VARBINARY(16)) AS RowVersion
 FROM dbo.Collaboration c
 LEFT JOIN dbo.Song s
   ON s.SongID = c.Song_SongID;
@@ -0,0 +1,120 @@
+import json
+import time
+from datetime import timezone
+from flask import Blueprint, request, jsonify, abort, Response
+from config.config import Config
+from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.concurrency import row_version_hex
+
+changes_api = Blueprint(
+    'changes_api',
+    __name__,
+    url_prefix='/api/changes'
+)
+
+ENTITIES = ('songs', 'persons', 'employees', 'contributors', 'collaborations', 'record_labels')
+
+OPERATIONS = {'I': 'insert', 'U': 'update', 'D': 'delete'}
+
+# Send an SSE comment after this many empty polls, so proxies keep the stream open
+_KEEPALIVE_POLLS = 10
+
+
+def map_row_to_change(row):
+    """
+    Convert a sp_GetChanges row into a JSON-serializable dict.
+    Token is the entry's position in the feed: pass the last one seen as
+    ?since= to continue after it.
+    """
+    return {
+        "Token":     row_version_hex(row.RowVer),
+        "Entity":    row.Entity,
+        "Key":       row.EntityKey,
+        "Operation": OPERATIONS[row.Operation],
+        "ChangedAt": row.ChangedAt.replace(tzinfo=timezone.utc).isoformat()
+    }
+
+
+def _feed_args():
+    """Read and validate `since` (or Last-Event-ID), `entity` and `limit`."""
+    since = request.args.get('since') or request.headers.get('Last-Event-ID')
+    try:
+        since = bytes.fromhex(since) if since else None
+    except ValueError:
+        since = b''
+    if since is not None and len(since) != 8:
+        abort(400, description="since must be a Token returned by the change feed")
+
+    entity = request.args.get('entity')
+    if entity:
+        unknown = [e for e in entity.split(',') if e.strip() not in ENTITIES]
+        if unknown:
+            abort(400, description=f"Unknown entity {unknown[0]!r}. Expected any of: {', '.join(ENTITIES)}")
+
+    limit = request.args.get('limit', default=Config.MAX_PAGE_SIZE, type=int)
+    if not 1 <= limit <= Config.MAX_PAGE_SIZE:
+        abort(400, description=f"limit must be between 1 and {Config.MAX_PAGE_SIZE}")
+    return since, entity, limit
+
+
+def _read_changes(since, entity, limit):
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        call_procedure(cursor, 'sp_GetChanges', since, entity, limit)
+        return [map_row_to_change(r) for r in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+@changes_api.route('', methods=['GET'])
+def list_changes():
+    """
+    Inserts, updates and deletes after `since`, oldest first, at most `limit`.
+    `Next` is the token to pass as `since` on the following call; `HasMore`
+    says whether that call can return more straight away.
+    """
+    since, entity, limit = _feed_args()
+    changes = _read_changes(since, entity, limit)
+    return jsonify({
+        "Changes": changes,
+        "Next":    changes[-1]["Token"] if changes else row_version_hex(since),
+        "HasMore": len(changes) == limit
+    }), 200
+
+
+@changes_api.route('/stream', methods=['GET'])
+def stream_changes():
+    """
+    The same feed as Server-Sent Events: one `change` event per entry, with
+    the entry's token as the event id, so a reconnecting EventSource resumes
+    after the last one it received (Last-Event-ID).  The database is polled
+    every CHANGES_POLL_SECONDS.
+    """
+    since, entity, limit = _feed_args()
+
+    def generate():
+        # Sent first, so the client sees the stream open right away
+        yield f"retry: {max(1000, int(Config.CHANGES_POLL_SECONDS * 1000))}\n\n"
+        cursor_since = since
+        idle = 0
+        while True:
+            changes = _read_changes(cursor_since, entity, limit)
+            for change in changes:
+                yield f"id: {change['Token']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+            if changes:
+                cursor_since = bytes.fromhex(changes[-1]["Token"])
+                idle = 0
+                if len(changes) == limit:
+                    continue        # more are waiting
+            else:
+                idle += 1
+                if idle % _KEEPALIVE_POLLS == 0:
+                    yield ": keep-alive\n\n"
+            time.sleep(Config.CHANGES_POLL_SECONDS)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'     # no proxy buffering (nginx)
+    return response
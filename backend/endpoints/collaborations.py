@@ -1,5 +1,15 @@
 from flask import Blueprint, request, jsonify, abort
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.list_queries import (
+    date_range_args, fields_args, project, run_detail_query, run_list_query, sort_args,
+)
+from backend.services.includes import embed, include_args
+from backend.services.pagination import page_args
+from backend.services.references import resolve_collaboration_references
+from backend.services.concurrency import (
+    CONFLICT_ERROR, row_version_hex, expected_row_version, jsonify_versioned
+)
 import pyodbc
 from config.logger import get_logger
 
@@ -31,30 +41,40 @@ def map_row_to_collab(row):
         "SongID":            row.SongID,
         "SongTitle":         row.SongTitle,
         "RecordLabels":      labels,
-        "Contributors":      contribs
+        "Contributors":      contribs,
+        "RowVersion":        row_version_hex(row.RowVersion)
     }
 
-@collab_api.route('', methods=['GET'])
-def list_collaborations():
-    # Read optional filters from query string
+def collaboration_filters():
+    """
+    Read the optional list filters from the query string, in
+    sp_GetCollaborations parameter order (shared by the list and export endpoints).
+    """
     name        = request.args.get('name')
     start       = request.args.get('start')
     end         = request.args.get('end')
+    active_from, active_to = date_range_args('activeFrom', 'activeTo')  # overlaps [activeFrom, activeTo]
     song        = request.args.get('song')       # will match against SongTitle in the view
     label       = request.args.get('labels')     # a comma‐separated substring to match RecordLabels
     contributor = request.args.get('contributors')# a comma‐separated substring to match Contributors
+    return (name, start, end, active_from, active_to, song, label, contributor)
 
-    conn = DatabaseConfig.get_connection()
+@collab_api.route('', methods=['GET'])
+def list_collaborations():
+    filters = collaboration_filters()
+    after, limit = page_args()
+    sort = sort_args('collaborations')
+    fields = fields_args('collaborations')
+    includes = include_args('collaborations')
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetCollaborations "
-            "@Name=?, @Start=?, @End=?, @Song=?, @Label=?, @Contributor=?",
-            name, start, end, song, label, contributor
-        )
+        run_list_query(cursor, 'collaborations', *filters, after, limit, sort=sort, fields=fields)
         rows = cursor.fetchall()
-        results = [map_row_to_collab(r) for r in rows]
-        logger.info(f"sp_GetCollaborations returned {len(results)} rows")
+        results = [project(map_row_to_collab, r, fields) for r in rows]
+        embed(cursor, 'collaborations', results, includes)
+        logger.info(f"Collaborations list returned {len(results)} rows")
         return jsonify(results), 200
 
     except pyodbc.Error as e:
@@ -65,17 +85,22 @@ def list_collaborations():
 
 @collab_api.route('/<int:cid>', methods=['GET'])
 def get_collaboration(cid):
-    conn = DatabaseConfig.get_connection()
+    fields = fields_args('collaborations')
+    includes = include_args('collaborations')
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetCollaborationByID @ID=?",
-            cid
-        )
+        if fields:
+            run_detail_query(cursor, 'collaborations', cid, fields)
+        else:
+            call_procedure(cursor, 'sp_GetCollaborationByID', cid)
         row = cursor.fetchone()
         if not row:
             abort(404, description=f"Collaboration with ID {cid} not found")
-        return jsonify(map_row_to_collab(row)), 200
+        collab = project(map_row_to_collab, row, fields)
+        embed(cursor, 'collaborations', [collab], includes)
+        return jsonify_versioned(collab, row.RowVersion), 200
     finally:
         conn.close()
 
@@ -92,18 +117,16 @@ def create_collaboration():
     song_id    = data.get("SongID")            # integer or None
     labels     = data.get("RecordLabels")      # comma-separated RecordLabel names (string) or None
     contribs   = data.get("Contributors")      # comma-separated Person_NIFs (string) or None
+    # 400 on unknown names/NIFs before any transaction; the procedure gets the IDs
+    label_ids, contrib_ids = resolve_collaboration_references(labels, contribs)
 
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        result = cursor.execute(
-            "DECLARE @NewID INT; "
-            "EXEC dbo.sp_CreateCollaboration "
-            "@CollaborationName=?, @StartDate=?, @EndDate=?, @Description=?, "
-            "@SongID=?, @RecordLabels=?, @Contributors=?, @NewID=@NewID OUTPUT; "
-            "SELECT @NewID AS NewID;",
+        result = call_procedure(
+            cursor, 'sp_CreateCollaboration',
             name, start, end, desc,
-            song_id, labels, contribs
+            song_id, None, None, label_ids, contrib_ids
         )
         row = result.fetchone()
         new_id = row.NewID if row else None
@@ -131,20 +154,22 @@ def update_collaboration(cid):
     song_id    = data.get("SongID")          # integer or None
     labels     = data.get("RecordLabels")
     contribs   = data.get("Contributors")
+    expected_version = expected_row_version()
+    label_ids, contrib_ids = resolve_collaboration_references(labels, contribs)
 
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "EXEC dbo.sp_UpdateCollaboration "
-                "@ID=?, @CollaborationName=?, @StartDate=?, @EndDate=?, @Description=?, "
-                "@SongID=?, @RecordLabels=?, @Contributors=?",
+            row = call_procedure(
+                cursor, 'sp_UpdateCollaboration',
                 cid, name, start, end, desc,
-                song_id, labels, contribs
-            )
+                song_id, None, None, label_ids, contrib_ids, expected_version
+            ).fetchone()
             conn.commit()
         except pyodbc.ProgrammingError as pe:
+            if CONFLICT_ERROR in str(pe):
+                abort(412, description=f"Collaboration with ID {cid} was modified by another request")
             if '50030' in str(pe):
                 abort(404, description=f"Collaboration with ID {cid} not found")
             raise
@@ -154,7 +179,10 @@ def update_collaboration(cid):
     finally:
         conn.close()
 
-    return get_collaboration(cid)
+    # No row back: the collaboration was removed by a trigger (too few labels/contributors)
+    if not row:
+        abort(404, description=f"Collaboration with ID {cid} not found")
+    return jsonify_versioned(map_row_to_collab(row), row.RowVersion), 200
 
 @collab_api.route('/<int:cid>', methods=['DELETE'])
 def delete_collaboration(cid):
@@ -162,10 +190,7 @@ def delete_collaboration(cid):
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "EXEC dbo.sp_DeleteCollaboration @ID=?",
-                cid
-            )
+            call_procedure(cursor, 'sp_DeleteCollaboration', cid)
             conn.commit()
         except pyodbc.ProgrammingError as pe:
             if '50031' in str(pe):
@@ -1,5 +1,18 @@
 from flask import Blueprint, request, jsonify, abort
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.list_queries import (
+    fields_args, project, run_detail_query, run_list_query, sort_args,
+)
+from backend.services.includes import embed, include_args
+from backend.services.snapshot import snapshot_rows
+from backend.services.pagination import page_args
+from backend.services.concurrency import (
+    CONFLICT_ERROR, row_version_hex, expected_row_version, jsonify_versioned
+)
+from backend.endpoints.persons import (
+    abort_upsert_error, conflict_policy_from_request, map_row_to_existing_person,
+)
 import pyodbc
 from config.logger import get_logger
 
@@ -14,7 +27,8 @@ contributors_api = Blueprint(
 def map_row_to_contributor(row):
     """
     Convert a row from vw_Contributors into a JSON‐serializable dict.
-    Columns: ContributorID, NIF, Name, DateOfBirth, Email, PhoneNumber, RecordLabelName, Roles
+    Columns: ContributorID, NIF, Name, DateOfBirth, Email, PhoneNumber, RecordLabelName, Roles,
+             RowVersion
     """
     return {
         "ContributorID":   row.ContributorID,
@@ -24,47 +38,77 @@ def map_row_to_contributor(row):
         "Email":           row.Email,
         "PhoneNumber":     row.PhoneNumber,
         "RecordLabelName": row.RecordLabelName or "",
-        "Roles":           row.Roles or ""
+        "Roles":           row.Roles or "",
+        "RowVersion":      row_version_hex(row.RowVersion)
     }
 
-@contributors_api.route('', methods=['GET'])
-def list_contributors():
+def contributor_filters():
+    """
+    Read the optional list filters from the query string, in
+    sp_GetContributors parameter order (shared by the list and export endpoints).
+    """
     name  = request.args.get('name')
     role  = request.args.get('role')
     email = request.args.get('email')
     phone = request.args.get('phone')
+    nif   = request.args.get('nif')
+    label = request.args.get('label')   # substring of the employing record label's name
+    return (name, role, email, phone, nif, label)
 
-    conn = DatabaseConfig.get_connection()
+@contributors_api.route('', methods=['GET'])
+def list_contributors():
+    filters = contributor_filters()
+    after, limit = page_args()
+    sort = sort_args('contributors')
+    fields = fields_args('contributors')
+    includes = include_args('contributors')
+
+    # From the in-memory snapshot when it is enabled and can answer the request
+    rows = None if includes else snapshot_rows('contributors', *filters, after, limit, sort=sort, fields=fields)
+    if rows is not None:
+        return jsonify([project(map_row_to_contributor, r, fields) for r in rows]), 200
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetContributors "
-            "@Name=?, @Role=?, @Email=?, @Phone=?",
-            name, role, email, phone
-        )
+        run_list_query(cursor, 'contributors', *filters, after, limit, sort=sort, fields=fields)
         rows = cursor.fetchall()
-        return jsonify([map_row_to_contributor(r) for r in rows]), 200
+        contributors = [project(map_row_to_contributor, r, fields) for r in rows]
+        embed(cursor, 'contributors', contributors, includes)
+        return jsonify(contributors), 200
     finally:
         conn.close()
 
 @contributors_api.route('/<int:contrib_id>', methods=['GET'])
 def get_contributor(contrib_id):
-    conn = DatabaseConfig.get_connection()
+    fields = fields_args('contributors')
+    includes = include_args('contributors')
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetContributorByID @ID=?",
-            contrib_id
-        )
+        if fields:
+            run_detail_query(cursor, 'contributors', contrib_id, fields)
+        else:
+            call_procedure(cursor, 'sp_GetContributorByID', contrib_id)
         row = cursor.fetchone()
         if not row:
             abort(404, description=f"Contributor with ID {contrib_id} not found")
-        return jsonify(map_row_to_contributor(row)), 200
+        contributor = project(map_row_to_contributor, row, fields)
+        embed(cursor, 'contributors', [contributor], includes)
+        return jsonify_versioned(contributor, row.RowVersion), 200
     finally:
         conn.close()
 
 @contributors_api.route('', methods=['POST'])
 def create_contributor():
+    """
+    POST /api/contributors[?conflict=fail|reuse|overwrite]
+    Creates the Person (if new), the Contributor and its Roles in a single
+    sp_UpsertContributor call. If the NIF belongs to a Person with different
+    fields and the policy is 'fail' (the default), nothing is written and
+    HTTP 409 describes both versions.
+    """
     data = request.get_json() or {}
 
     # Basic validation
@@ -82,128 +126,29 @@ def create_contributor():
     phone = data.get('PhoneNumber')
     roles = data.get('Roles')
 
-    use_old_person     = request.args.get('useOldPerson', '').lower() == 'true'
-    overwrite_person   = request.args.get('overwritePerson', '').lower() == 'true'
-
-    # 1) Overwrite existing Person first, if requested
-    if overwrite_person:
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                EXEC dbo.sp_UpdatePerson
-                  @NIF=?, @Name=?, @DateOfBirth=?, @Email=?, @PhoneNumber=?
-                """,
-                nif, name, dob, email, phone
-            )
-            conn.commit()
-        except pyodbc.ProgrammingError as pe:
-            conn.rollback()
-            if '51010' in str(pe):
-                abort(404, description=f"Person with NIF {nif} not found")
-            raise
-        finally:
-            conn.close()
-
-        # now treat as "use old person"
-        use_old_person = True
-
-    # 2) If useOldPerson=true, skip sp_CreateContributor and call sp_AddContributorFromExistingPerson
-    if use_old_person:
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            result = cursor.execute(
-                """
-                DECLARE @NewCID INT;
-                EXEC dbo.sp_AddContributorFromExistingPerson
-                  @NIF=?, @Roles=?, @NewID=@NewCID OUTPUT;
-                SELECT @NewCID AS ContributorID;
-                """,
-                nif, roles
-            )
-            row = result.fetchone()
-            conn.commit()
-        except pyodbc.IntegrityError as e:
-            conn.rollback()
-            abort(400, description="Failed to add Contributor under existing Person: " + str(e))
-        except pyodbc.ProgrammingError as pe:
-            conn.rollback()
-            abort(404, description=f"Cannot add Contributor for NIF {nif}: {pe}")
-        finally:
-            conn.close()
-
-        if not row or row.ContributorID is None:
-            abort(500, description="Unexpected error: no ContributorID returned.")
-        return get_contributor(row.ContributorID)
+    policy = conflict_policy_from_request()
 
-    # 3) Normal path: call sp_CreateContributor
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        result = cursor.execute(
-            """
-            DECLARE @NewID       INT;
-            DECLARE @OutPersonNIF VARCHAR(20);
-            DECLARE @OutExisting  BIT;
-            DECLARE @OutConflict  BIT;
-
-            EXEC dbo.sp_CreateContributor
-                @NIF           = ?,
-                @Name          = ?,
-                @DateOfBirth   = ?,
-                @Email         = ?,
-                @PhoneNumber   = ?,
-                @Roles         = ?,
-                @ContributorID = @NewID OUTPUT,
-                @PersonNIF     = @OutPersonNIF OUTPUT,
-                @Existing      = @OutExisting OUTPUT,
-                @Conflict      = @OutConflict OUTPUT;
-
-            SELECT 
-              @NewID        AS NewID,
-              @OutPersonNIF AS PersonNIF,
-              @OutExisting  AS Existing,
-              @OutConflict  AS Conflict;
-            """,
-            nif, name, dob, email, phone, roles
-        )
-        row = result.fetchone()
+        row = call_procedure(
+            cursor, 'sp_UpsertContributor',
+            nif, name, dob, email, phone, roles, policy
+        ).fetchone()
         conn.commit()
-    except pyodbc.IntegrityError as e:
+    except pyodbc.Error as e:
         conn.rollback()
-        abort(400, description=str(e))
+        abort_upsert_error(e, 'Contributor', nif)
     finally:
         conn.close()
 
-    new_id      = row.NewID         # may be NULL if conflict
-    person_nif  = row.PersonNIF
-    existing    = bool(row.Existing)
-    conflict    = bool(row.Conflict)
+    if not row:
+        abort(500, description="Unexpected error: sp_UpsertContributor returned no row.")
 
-    # 3a) Conflict → return 409 + JSON
-    if conflict:
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "EXEC dbo.sp_GetPersonByNIF @NIF = ?",
-                person_nif
-            )
-            p = cursor.fetchone()
-            if not p:
-                abort(500, description="Person unexpectedly not found after conflict.")
-            existing_person = {
-                "NIF":          p.NIF,
-                "Name":         p.Name,
-                "DateOfBirth":  p.DateOfBirth.isoformat() if p.DateOfBirth else None,
-                "Email":        p.Email,
-                "PhoneNumber":  p.PhoneNumber,
-                "ContributorID": p.ContributorID  # may be NULL
-            }
-        finally:
-            conn.close()
+    # Conflict → return 409 + JSON
+    if row.Outcome == 'conflict':
+        existing_person = map_row_to_existing_person(row)
+        existing_person["ContributorID"] = row.ContributorID  # NULL on conflict
 
         incoming_data = {
             "NIF":          nif,
@@ -223,38 +168,9 @@ def create_contributor():
             409
         )
 
-    # 3b) Person existed & no new Contributor inserted → insert via sp_AddContributorFromExistingPerson
-    if existing and (new_id is None):
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            result2 = cursor.execute(
-                """
-                DECLARE @NewCID INT;
-                EXEC dbo.sp_AddContributorFromExistingPerson
-                  @NIF = ?,
-                  @Roles = ?,
-                  @NewID = @NewCID OUTPUT;
-                SELECT @NewCID AS ContributorID;
-                """,
-                person_nif, roles
-            )
-            row2 = result2.fetchone()
-            conn.commit()
-        except pyodbc.Error as e:
-            conn.rollback()
-            abort(500, description="Failed to add Contributor for existing Person: " + str(e))
-        finally:
-            conn.close()
-
-        if not row2 or row2.ContributorID is None:
-            abort(500, description="Unexpected error: no ContributorID returned on add‐existing path.")
-        return get_contributor(row2.ContributorID)
-
-    # 3c) Otherwise, new_id must be non‐NULL
-    if new_id is None:
+    if row.ContributorID is None:
         abort(500, description="Unexpected internal error: ContributorID is null.")
-    return get_contributor(new_id)
+    return jsonify(map_row_to_contributor(row)), 200
 
 
 @contributors_api.route('/<int:contrib_id>/dependencies', methods=['GET'])
@@ -263,13 +179,10 @@ def get_contributor_dependencies(contrib_id):
     GET /api/contributors/{id}/dependencies
     Returns JSON with { CollaborationCount, SongCount } for this contributor.
     """
-    conn = DatabaseConfig.get_connection()
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetContributorDependencies @ContributorID = ?",
-            contrib_id
-        )
+        call_procedure(cursor, 'sp_GetContributorDependencies', contrib_id)
         row = cursor.fetchone()
         if not row:
             # If procedure returned no rows, assume no dependencies
@@ -309,18 +222,22 @@ def update_contributor(contrib_id):
     email = data.get('Email')
     phone = data.get('PhoneNumber')
     roles = data.get('Roles')
+    expected_version = expected_row_version()
 
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-               "EXEC dbo.sp_UpdateContributor "
-               "@ID=?, @NewNIF=?, @Name=?, @DateOfBirth=?, @Email=?, @PhoneNumber=?, @Roles=?",
-               contrib_id, nif, name, dob, email, phone, roles
-            )
+            row = call_procedure(
+                cursor, 'sp_UpdateContributor',
+                contrib_id, nif, name, dob, email, phone, roles,
+                expected_version
+            ).fetchone()
             conn.commit()
         except pyodbc.ProgrammingError as pe:
+            if CONFLICT_ERROR in str(pe):
+                logger.info(f"update_contributor: Contributor ID={contrib_id} version mismatch")
+                abort(412, description=f"Contributor with ID {contrib_id} was modified by another request")
             if 'Contributor not found' in str(pe):
                 logger.info(f"update_contributor: Contributor ID={contrib_id} not found")
                 abort(404, description=f"Contributor with ID {contrib_id} not found")
@@ -332,7 +249,8 @@ def update_contributor(contrib_id):
     finally:
         conn.close()
 
-    return get_contributor(contrib_id)
+    # The procedure returns the updated row, with its new RowVersion
+    return jsonify_versioned(map_row_to_contributor(row), row.RowVersion), 200
 
 
 @contributors_api.route('/<int:contrib_id>', methods=['DELETE'])
@@ -341,10 +259,7 @@ def delete_contributor(contrib_id):
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "EXEC dbo.sp_DeleteContributor @ID=?",
-                contrib_id
-            )
+            call_procedure(cursor, 'sp_DeleteContributor', contrib_id)
             conn.commit()
         except pyodbc.ProgrammingError as pe:
             if 'Contributor not found' in str(pe) or '50020' in str(pe):
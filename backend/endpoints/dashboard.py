@@ -1,5 +1,11 @@
-from flask import Blueprint, jsonify, abort
+from datetime import date, timezone
+from flask import Blueprint, request, jsonify, abort
+from config.config import Config
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.jobs import job_queue
+from backend.services.rollups import refresh_rollups
+from backend.endpoints.jobs import accepted
 import pyodbc
 from config.logger import get_logger
 logger = get_logger(__name__)
@@ -13,10 +19,10 @@ dashboard_api = Blueprint(
 
 @dashboard_api.route('/counts', methods=['GET'])
 def get_counts():
-    conn = DatabaseConfig.get_connection()
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute("EXEC dbo.sp_GetDashboardCounts")
+        call_procedure(cursor, 'sp_GetDashboardCounts')
         row = cursor.fetchone()
         if not row:
             abort(500, description="Unexpected: no row from sp_GetDashboardCounts")
@@ -32,3 +38,84 @@ def get_counts():
         return jsonify(data), 200
     finally:
         conn.close()
+
+
+# ---------- Catalog statistics (precomputed rollups, see services/rollups.py) ----------
+
+def _stats_limit():
+    limit = request.args.get('limit', default=Config.MAX_PAGE_SIZE, type=int)
+    if not 1 <= limit <= Config.MAX_PAGE_SIZE:
+        abort(400, description=f"limit must be between 1 and {Config.MAX_PAGE_SIZE}")
+    return limit
+
+
+def _read_stats(key, procedure, *args):
+    """
+    Call a sp_Get*Stats procedure and return {RefreshedAt, <key>: rows}.
+    RefreshedAt is None until the rollup has been refreshed for the first time.
+    """
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        call_procedure(cursor, procedure, *args)
+        refreshed = cursor.fetchone()
+        cursor.nextset()
+        columns = [d[0] for d in cursor.description]
+        rows = [
+            {c: (v.isoformat() if isinstance(v, date) else v) for c, v in zip(columns, row)}
+            for row in cursor.fetchall()
+        ]
+    finally:
+        conn.close()
+    return jsonify({
+        "RefreshedAt": refreshed.RefreshedAt.replace(tzinfo=timezone.utc).isoformat() if refreshed else None,
+        key: rows
+    }), 200
+
+
+@dashboard_api.route('/stats/genres', methods=['GET'])
+def get_genre_stats():
+    """Songs and total duration (seconds) per genre."""
+    return _read_stats('Genres', 'sp_GetGenreStats')
+
+
+@dashboard_api.route('/stats/contributors', methods=['GET'])
+def get_contributor_stats():
+    """The `limit` contributors with the most songs, with their total duration."""
+    return _read_stats('Contributors', 'sp_GetContributorStats', _stats_limit())
+
+
+@dashboard_api.route('/stats/labels', methods=['GET'])
+def get_label_stats():
+    """
+    Catalog size and duration per record label: the songs of its employees
+    who are contributors and of the collaborations it takes part in.
+    """
+    return _read_stats('Labels', 'sp_GetLabelStats')
+
+
+@dashboard_api.route('/stats/release_dates', methods=['GET'])
+def get_release_date_stats():
+    """Release-date histogram, ?bucket=month (default) or year."""
+    bucket = request.args.get('bucket', 'month')
+    if bucket not in ('month', 'year'):
+        abort(400, description="bucket must be 'month' or 'year'")
+    return _read_stats('Periods', 'sp_GetReleaseDateStats', bucket)
+
+
+@dashboard_api.route('/stats/label_pairs', methods=['GET'])
+def get_label_pair_stats():
+    """The `limit` pairs of record labels with the most collaborations together."""
+    return _read_stats('LabelPairs', 'sp_GetLabelPairStats', _stats_limit())
+
+
+def _refresh_stats_job(job):
+    """Background job: refresh every rollup now."""
+    refresh_rollups()
+    return "Catalog statistics refreshed."
+
+
+@dashboard_api.route('/stats/refresh', methods=['POST'])
+def refresh_stats():
+    """Refresh all rollups now instead of waiting for the next scheduled refresh."""
+    return accepted(job_queue.submit('stats_refresh', _refresh_stats_job))
@@ -1,7 +1,9 @@
 # backend/endpoints/db_admin_routes.py
 import os
 from flask import Blueprint, jsonify, abort
-from config.database_config import DatabaseConfig
+from config.database_config import DatabaseConfig, READ_ISOLATION_MODES
+from backend.services.jobs import job_queue
+from backend.endpoints.jobs import accepted
 import pyodbc
 
 db_admin_api = Blueprint(
@@ -13,6 +15,7 @@ db_admin_api = Blueprint(
 def _exec_sql_file(cursor, path):
     """
     Read a .sql file, split on GO (on its own line), and execute each batch.
+    Returns the number of batches executed.
     """
     with open(path, 'r', encoding='utf-8') as f:
         sql = f.read()
@@ -29,9 +32,12 @@ def _exec_sql_file(cursor, path):
     if current:
         batches.append('\n'.join(current))
 
+    executed = 0
     for batch in batches:
         if batch.strip():
             cursor.execute(batch)
+            executed += 1
+    return executed
 
 
 @db_admin_api.route('/drop_tables', methods=['POST'])
@@ -52,6 +58,41 @@ def drop_all_tables():
         conn.close()
 
 
+def _init_schema_job(job, paths):
+    """
+    Background job: run every schema file in order on one connection and
+    commit once at the end.  Progress is the number of SQL batches executed.
+    Afterwards, enable the row-versioning option DB_READ_ISOLATION relies on,
+    if no other session is using the database.
+    """
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        executed = 0
+        for path in paths:
+            executed += _exec_sql_file(cursor, path)
+            job.report(executed, f"Executed {os.path.basename(path)}")
+        conn.commit()
+    except pyodbc.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    try:
+        option = DatabaseConfig.enable_row_versioning()
+    except pyodbc.Error as e:
+        _, option = READ_ISOLATION_MODES[DatabaseConfig.READ_ISOLATION]
+        return (
+            "Schema, views, stored procedures, and triggers initialized successfully, "
+            f"but {option} was not applied: other sessions are using the database ({e}). "
+            f"Run ALTER DATABASE CURRENT SET {option} when they have disconnected."
+        )
+    if option:
+        job.report(executed, f"Enabled {option}")
+    return "Schema, views, stored procedures, and triggers initialized successfully."
+
+
 @db_admin_api.route('/init', methods=['POST'])
 def init_schema():
     base         = os.path.dirname(os.path.dirname(__file__))  # backend/
@@ -60,34 +101,36 @@ def init_schema():
     sp_folder    = os.path.join(base, 'database', 'stored_procedures')
     triggers_path = os.path.join(base, 'database', 'triggers.sql')
 
-    conn = DatabaseConfig.get_connection()
-    try:
-        cursor = conn.cursor()
+    # 1) Create tables & constraints
+    # 2) Create views
+    paths = [ddl_path, views_path]
 
-        # 1) Create tables & constraints
-        _exec_sql_file(cursor, ddl_path)
+    # 3) Create all stored procedures
+    for filename in sorted(os.listdir(sp_folder)):
+        if filename.lower().endswith('.sql'):
+            paths.append(os.path.join(sp_folder, filename))
 
-        # 2) Create views
-        _exec_sql_file(cursor, views_path)
+    # 4) Create triggers (if triggers.sql exists)
+    if os.path.exists(triggers_path):
+        paths.append(triggers_path)
 
-        # 3) Create all stored procedures
-        for filename in sorted(os.listdir(sp_folder)):
-            if filename.lower().endswith('.sql'):
-                sp_path = os.path.join(sp_folder, filename)
-                _exec_sql_file(cursor, sp_path)
+    job = job_queue.submit('db_init', _init_schema_job, paths)
+    return accepted(job)
 
-        # 4) Create triggers (if triggers.sql exists)
-        if os.path.exists(triggers_path):
-            _exec_sql_file(cursor, triggers_path)
 
+def _populate_data_job(job, sql_path):
+    """
+    Background job: run insert_data.sql and commit.
+    """
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        job.report(_exec_sql_file(cursor, sql_path))
         conn.commit()
-        return jsonify({
-            "message": "Schema, views, stored procedures, and triggers initialized successfully."
-        }), 200
-
-    except pyodbc.Error as e:
+        return "Database populated successfully."
+    except pyodbc.Error:
         conn.rollback()
-        abort(500, description=f"Error initializing schema: {e}")
+        raise
     finally:
         conn.close()
 
@@ -97,14 +140,14 @@ def populate_data():
     base     = os.path.dirname(os.path.dirname(__file__))  # backend/
     sql_path = os.path.join(base, 'database', 'insert_data.sql')
 
-    conn = DatabaseConfig.get_connection()
-    try:
-        cursor = conn.cursor()
-        _exec_sql_file(cursor, sql_path)
-        conn.commit()
-        return jsonify({"message": "Database populated successfully."}), 200
-    except pyodbc.Error as e:
-        conn.rollback()
-        abort(500, description=f"Error populating data: {e}")
-    finally:
-        conn.close()
+    job = job_queue.submit('db_populate', _populate_data_job, sql_path)
+    return accepted(job)
+
+
+@db_admin_api.route('/routing', methods=['GET'])
+def routing_stats():
+    """
+    Per-endpoint connection counters: reads and writes routed to each server,
+    failed connection attempts, and whether a replica is currently ejected.
+    """
+    return jsonify(DatabaseConfig.routing_stats()), 200
@@ -1,5 +1,18 @@
 from flask import Blueprint, request, jsonify, abort
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.list_queries import (
+    date_range_args, fields_args, project, run_detail_query, run_list_query, sort_args,
+)
+from backend.services.includes import embed, include_args
+from backend.services.snapshot import snapshot_rows
+from backend.services.pagination import page_args
+from backend.services.concurrency import (
+    CONFLICT_ERROR, row_version_hex, expected_row_version, jsonify_versioned
+)
+from backend.endpoints.persons import (
+    abort_upsert_error, conflict_policy_from_request, map_row_to_existing_person,
+)
 import pyodbc
 from config.logger import get_logger
 
@@ -15,7 +28,8 @@ def map_row_to_employee(row):
     """
     Convert a row from vw_Employees into a JSON-serializable dict.
     Order: EmployeeID, NIF, Name, DateOfBirth, JobTitle, Department,
-           Salary, HireDate, Email, PhoneNumber, RecordLabelID, RecordLabelName
+           Salary, HireDate, Email, PhoneNumber, RecordLabelID, RecordLabelName,
+           RowVersion
     """
     return {
         "EmployeeID":      row.EmployeeID,
@@ -24,56 +38,85 @@ def map_row_to_employee(row):
         "DateOfBirth":     row.DateOfBirth.isoformat() if row.DateOfBirth else None,
         "JobTitle":        row.JobTitle,
         "Department":      row.Department,
-        "Salary":          float(row.Salary),
+        "Salary":          float(row.Salary) if row.Salary is not None else None,
         "HireDate":        row.HireDate.isoformat() if row.HireDate else None,
         "Email":           row.Email,
         "PhoneNumber":     row.PhoneNumber,
         "RecordLabelID":   row.RecordLabelID,
-        "RecordLabelName": row.RecordLabelName or ""
+        "RecordLabelName": row.RecordLabelName or "",
+        "RowVersion":      row_version_hex(row.RowVersion)
     }
 
-@employee_api.route('', methods=['GET'])
-def list_employees():
+def employee_filters():
+    """
+    Read the optional list filters from the query string, in sp_GetEmployees
+    parameter order (shared by the list and export endpoints).
+    """
     nif        = request.args.get('nif')
     name       = request.args.get('name')
     jobtitle   = request.args.get('jobtitle')
     department = request.args.get('department')
     email      = request.args.get('email')
     phone      = request.args.get('phone')
+    min_salary = request.args.get('minSalary', type=float)
+    hired_from, hired_to = date_range_args('hiredFrom', 'hiredTo')
+    label      = request.args.get('label')   # substring of the record label name
+    return (nif, name, jobtitle, department, email, phone,
+            min_salary, hired_from, hired_to, label)
 
-    conn = DatabaseConfig.get_connection()
+@employee_api.route('', methods=['GET'])
+def list_employees():
+    filters = employee_filters()
+    after, limit = page_args()
+    sort = sort_args('employees')
+    fields = fields_args('employees')
+    includes = include_args('employees')
+
+    # From the in-memory snapshot when it is enabled and can answer the request
+    rows = None if includes else snapshot_rows('employees', *filters, after, limit, sort=sort, fields=fields)
+    if rows is not None:
+        return jsonify([project(map_row_to_employee, r, fields) for r in rows]), 200
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetEmployees "
-            "@NIF=?, @Name=?, @JobTitle=?, @Department=?, @Email=?, @Phone=?",
-            nif, name, jobtitle, department, email, phone
-        )
+        run_list_query(cursor, 'employees', *filters, after, limit, sort=sort, fields=fields)
         rows = cursor.fetchall()
-        employees = [map_row_to_employee(r) for r in rows]
+        employees = [project(map_row_to_employee, r, fields) for r in rows]
+        embed(cursor, 'employees', employees, includes)
         return jsonify(employees), 200
     finally:
         conn.close()
 
 @employee_api.route('/<int:emp_id>', methods=['GET'])
 def get_employee(emp_id):
-    conn = DatabaseConfig.get_connection()
+    fields = fields_args('employees')
+    includes = include_args('employees')
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetEmployeeByID @ID=?",
-            emp_id
-        )
+        if fields:
+            run_detail_query(cursor, 'employees', emp_id, fields)
+        else:
+            call_procedure(cursor, 'sp_GetEmployeeByID', emp_id)
         row = cursor.fetchone()
         if not row:
             abort(404, description=f"Employee with ID {emp_id} not found")
-        emp = map_row_to_employee(row)
-        return jsonify(emp), 200
+        emp = project(map_row_to_employee, row, fields)
+        embed(cursor, 'employees', [emp], includes)
+        return jsonify_versioned(emp, row.RowVersion), 200
     finally:
         conn.close()
 
 @employee_api.route('', methods=['POST'])
 def create_employee():
+    """
+    POST /api/employees[?conflict=fail|reuse|overwrite]
+    Creates the Person (if new) and the Employee in a single sp_UpsertEmployee call.
+    If the NIF belongs to a Person with different fields and the policy is 'fail'
+    (the default), nothing is written and HTTP 409 describes both versions.
+    """
     data = request.get_json() or {}
 
     # Basic validation for required fields
@@ -95,141 +138,31 @@ def create_employee():
     hire_date  = data['HireDate']
     label_id   = data['RecordLabelID']
 
-    use_old_person   = request.args.get('useOldPerson', '').lower() == 'true'
-    overwrite_person = request.args.get('overwritePerson', '').lower() == 'true'
+    policy = conflict_policy_from_request()
 
-    # 1) If overwritePerson=true, first update the Person row to the new fields (name/dob/email/phone)
-    if overwrite_person:
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                EXEC dbo.sp_UpdatePerson
-                  @NIF=?, @Name=?, @DateOfBirth=?, @Email=?, @PhoneNumber=?
-                """,
-                nif, name, dob, email, phone
-            )
-            conn.commit()
-        except pyodbc.ProgrammingError as pe:
-            conn.rollback()
-            # SP throws 51010 if no Person found
-            if '51010' in str(pe) or 'Person not found' in str(pe):
-                abort(404, description=f"Person with NIF {nif} not found")
-            # re‐raise for any other error
-            raise
-        finally:
-            conn.close()
-        # Now behave as if use_old_person = true
-        use_old_person = True
-
-    # 2) If useOldPerson=true, skip sp_CreateEmployee entirely and call sp_AddEmployeeFromExistingPerson
-    if use_old_person:
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            result = cursor.execute(
-                """
-                DECLARE @NewEID INT;
-                EXEC dbo.sp_AddEmployeeFromExistingPerson
-                  @NIF           = ?,
-                  @JobTitle      = ?,
-                  @Department    = ?,
-                  @Salary        = ?,
-                  @HireDate      = ?,
-                  @RecordLabelID = ?,
-                  @NewID         = @NewEID OUTPUT;
-                SELECT @NewEID AS EmployeeID;
-                """,
-                nif, job_title, department, salary, hire_date, label_id
-            )
-            row = result.fetchone()
-            conn.commit()
-        except pyodbc.IntegrityError as e:
-            conn.rollback()
-            abort(400, description="Failed to add Employee under existing Person: " + str(e))
-        except pyodbc.ProgrammingError as pe:
-            conn.rollback()
-            abort(404, description=f"Cannot add Employee for NIF {nif}: {pe}")
-        finally:
-            conn.close()
-
-        if not row or row.EmployeeID is None:
-            abort(500, description="Unexpected error: no EmployeeID returned.")
-        return get_employee(row.EmployeeID)
-
-    # 3) Normal path: call sp_CreateEmployee and check for conflict
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        result = cursor.execute(
-            """
-            DECLARE @NewID       INT;
-            DECLARE @OutPersonNIF VARCHAR(20);
-            DECLARE @OutExisting  BIT;
-            DECLARE @OutConflict  BIT;
-
-            EXEC dbo.sp_CreateEmployee
-                @NIF           = ?,
-                @Name          = ?,
-                @DateOfBirth   = ?,
-                @Email         = ?,
-                @PhoneNumber   = ?,
-                @JobTitle      = ?,
-                @Department    = ?,
-                @Salary        = ?,
-                @HireDate      = ?,
-                @RecordLabelID = ?,
-                @EmployeeID    = @NewID OUTPUT,
-                @PersonNIF     = @OutPersonNIF OUTPUT,
-                @Existing      = @OutExisting OUTPUT,
-                @Conflict      = @OutConflict OUTPUT;
-
-            SELECT 
-              @NewID        AS NewID,
-              @OutPersonNIF AS PersonNIF,
-              @OutExisting  AS Existing,
-              @OutConflict  AS Conflict;
-            """,
+        row = call_procedure(
+            cursor, 'sp_UpsertEmployee',
             nif, name, dob, email, phone,
-            job_title, department, salary, hire_date, label_id
-        )
-        row = result.fetchone()
+            job_title, department, salary, hire_date, label_id,
+            policy
+        ).fetchone()
         conn.commit()
-    except pyodbc.IntegrityError as e:
+    except pyodbc.Error as e:
         conn.rollback()
-        abort(400, description=str(e))
+        abort_upsert_error(e, 'Employee', nif, label_id)
     finally:
         conn.close()
 
-    new_id     = row.NewID           # may be NULL if conflict
-    person_nif = row.PersonNIF
-    existing   = bool(row.Existing)
-    conflict   = bool(row.Conflict)
+    if not row:
+        abort(500, description="Unexpected error: sp_UpsertEmployee returned no row.")
 
-    # 3a) If conflict=1, return HTTP 409 + JSON describing existing Person vs incoming data
-    if conflict:
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "EXEC dbo.sp_GetPersonByNIF @NIF = ?",
-                person_nif
-            )
-            p = cursor.fetchone()
-            if not p:
-                abort(500, description="Person unexpectedly not found after conflict.")
-            existing_person = {
-                "NIF":          p.NIF,
-                "Name":         p.Name,
-                "DateOfBirth":  p.DateOfBirth.isoformat() if p.DateOfBirth else None,
-                "Email":        p.Email,
-                "PhoneNumber":  p.PhoneNumber,
-                # note: EmployeeID is not returned by sp_GetPersonByNIF; 
-                "EmployeeID":   None
-            }
-        finally:
-            conn.close()
+    # Person exists with different fields → return HTTP 409 + existing vs incoming data
+    if row.Outcome == 'conflict':
+        existing_person = map_row_to_existing_person(row)
+        existing_person["EmployeeID"] = None
 
         incoming_data = {
             "NIF":          nif,
@@ -253,43 +186,9 @@ def create_employee():
             409
         )
 
-    # 3b) If existing=1 and new_id is NULL → sp_CreateEmployee matched “fields exactly” 
-    #     and did not auto‐insert an Employee row. Now insert via sp_AddEmployeeFromExistingPerson.
-    if existing and (new_id is None):
-        conn = DatabaseConfig.get_connection()
-        try:
-            cursor = conn.cursor()
-            result2 = cursor.execute(
-                """
-                DECLARE @NewEID INT;
-                EXEC dbo.sp_AddEmployeeFromExistingPerson
-                  @NIF           = ?,
-                  @JobTitle      = ?,
-                  @Department    = ?,
-                  @Salary        = ?,
-                  @HireDate      = ?,
-                  @RecordLabelID = ?,
-                  @NewID         = @NewEID OUTPUT;
-                SELECT @NewEID AS EmployeeID;
-                """,
-                person_nif, job_title, department, salary, hire_date, label_id
-            )
-            row2 = result2.fetchone()
-            conn.commit()
-        except pyodbc.Error as e:
-            conn.rollback()
-            abort(500, description="Failed to add Employee for existing Person: " + str(e))
-        finally:
-            conn.close()
-
-        if not row2 or row2.EmployeeID is None:
-            abort(500, description="Unexpected error: no EmployeeID returned on add‐existing path.")
-        return get_employee(row2.EmployeeID)
-
-    # 3c) Otherwise, new_id must be non‐NULL now
-    if new_id is None:
+    if row.EmployeeID is None:
         abort(500, description="Unexpected internal error: EmployeeID is null.")
-    return get_employee(new_id)
+    return jsonify(map_row_to_employee(row)), 200
 
 
 @employee_api.route('/<int:emp_id>/dependencies', methods=['GET'])
@@ -298,13 +197,10 @@ def get_employee_dependencies(emp_id):
     GET /api/employees/{id}/dependencies
     Returns JSON with { CollaborationCount, SongCount } for this employee’s Person.
     """
-    conn = DatabaseConfig.get_connection()
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetEmployeeDependencies @EmployeeID = ?",
-            emp_id
-        )
+        call_procedure(cursor, 'sp_GetEmployeeDependencies', emp_id)
         row = cursor.fetchone()
         if not row:
             return jsonify({"CollaborationCount": 0, "SongCount": 0}), 200
@@ -348,15 +244,14 @@ def update_employee(emp_id):
     salary      = data['Salary']
     hire_date   = data['HireDate']
     label_id    = data['RecordLabelID']
+    expected_version = expected_row_version()
 
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "EXEC dbo.sp_UpdateEmployee "
-                "@EmployeeID=?, @NewNIF=?, @Name=?, @DateOfBirth=?, @Email=?, @PhoneNumber=?, "
-                "@JobTitle=?, @Department=?, @Salary=?, @HireDate=?, @RecordLabelID=?",
+            row = call_procedure(
+                cursor, 'sp_UpdateEmployee',
                 emp_id,
                 new_nif,
                 name,
@@ -367,11 +262,16 @@ def update_employee(emp_id):
                 department,
                 salary,
                 hire_date,
-                label_id
-            )
+                label_id,
+                expected_version
+            ).fetchone()
             conn.commit()
         except pyodbc.ProgrammingError as pe:
             str_pe = str(pe)
+            # SP throws 50412 if the row changed since the client read it (If-Match)
+            if CONFLICT_ERROR in str_pe:
+                logger.info(f"update_employee: Employee ID={emp_id} version mismatch")
+                abort(412, description=f"Employee with ID {emp_id} was modified by another request")
             # SP throws 50030 if Employee not found
             if '50030' in str_pe or 'Employee not found' in str_pe:
                 logger.info(f"update_employee: Employee ID={emp_id} not found")
@@ -387,7 +287,8 @@ def update_employee(emp_id):
     finally:
         conn.close()
 
-    return get_employee(emp_id)
+    # The procedure returns the updated row, with its new RowVersion
+    return jsonify_versioned(map_row_to_employee(row), row.RowVersion), 200
 
 
 @employee_api.route('/<int:emp_id>', methods=['DELETE'])
@@ -396,10 +297,7 @@ def delete_employee(emp_id):
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "EXEC dbo.sp_DeleteEmployee @ID=?",
-                emp_id
-            )
+            call_procedure(cursor, 'sp_DeleteEmployee', emp_id)
             conn.commit()
         except pyodbc.ProgrammingError as pe:
             str_pe = str(pe)
@@ -0,0 +1,48 @@
+from flask import Blueprint, Response
+from config.config import Config
+from backend.services.events import broadcaster, counts_feed, format_event
+
+events_api = Blueprint(
+    'events_api',
+    __name__,
+    url_prefix='/api/events'
+)
+
+
+@events_api.route('', methods=['GET'])
+def stream_events():
+    """
+    Live updates as Server-Sent Events, for as long as the client stays:
+
+      counts  {Counts, Deltas}            dashboard totals (sent first, then on change)
+      change  {Entity, Operation, Key}    an entity was created/updated/deleted,
+                                          imported, or the database was reset
+
+    All clients share one broadcaster and one dashboard counts query.
+    """
+    subscription = broadcaster.subscribe()
+    try:
+        counts = counts_feed.current()
+    except Exception:
+        broadcaster.unsubscribe(subscription)
+        raise
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            yield format_event('counts', {"Counts": counts, "Deltas": {}})
+            while True:
+                message = subscription.get(Config.EVENTS_KEEPALIVE_SECONDS)
+                if message is not None:
+                    yield message
+                elif subscription.dropped:
+                    return              # fell behind: the client reconnects and resyncs
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'     # no proxy buffering (nginx)
+    return response
@@ -0,0 +1,89 @@
+import uuid
+
+from flask import Blueprint, request, abort, jsonify, Response
+from config.database_config import DatabaseConfig
+from backend.services.list_queries import fields_args, run_list_query, sort_args
+from backend.services.export import FORMATS, pa, recent_exports, stream_export
+from backend.endpoints.songs import song_filters
+from backend.endpoints.employee import employee_filters
+from backend.endpoints.contributors import contributor_filters
+from backend.endpoints.collaborations import collaboration_filters
+from backend.endpoints.record_label import record_label_filters
+import pyodbc
+
+export_api = Blueprint(
+    'export_api',
+    __name__,
+    url_prefix='/api/export'
+)
+
+# Entity (its list query) → reader of its filters from the query string
+EXPORTS = {
+    'songs':          song_filters,
+    'employees':      employee_filters,
+    'contributors':   contributor_filters,
+    'collaborations': collaboration_filters,
+    'record_labels':  record_label_filters,
+}
+
+
+@export_api.route('/<entity>', methods=['GET'])
+def export_entity(entity):
+    """
+    Stream every row of the entity's view that matches the list endpoint's
+    filters, in its `sort` order, as CSV (default) or Parquet (?format=parquet).
+    `fields` limits the columns, as on the list endpoint.  The X-Export-ID
+    header names the export's entry in /api/export/stats.
+    """
+    if entity not in EXPORTS:
+        abort(404, description=f"Unknown export '{entity}'. Expected one of: {', '.join(EXPORTS)}")
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        abort(400, description=f"format must be one of: {', '.join(FORMATS)}")
+    if fmt == 'parquet' and pa is None:
+        abort(400, description="format=parquet requires the optional pyarrow package, which is not "
+                               "installed; use format=csv instead")
+
+    filters = EXPORTS[entity]()
+    sort = sort_args(entity)
+    fields = fields_args(entity)
+
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        # Whole filtered list (no keyset page), in the requested order
+        run_list_query(cursor, entity, *filters, None, None, sort=sort, fields=fields)
+    except pyodbc.Error as e:
+        conn.close()
+        abort(400, description=str(e))
+
+    export_id = uuid.uuid4().hex
+
+    def generate():
+        # The connection lives as long as the stream: closed once the last row
+        # is sent or when the client goes away.
+        try:
+            yield from stream_export(cursor, fmt, entity, export_id)
+        finally:
+            conn.close()
+
+    response = Response(generate(), content_type=FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{entity}.{fmt}"'
+    response.headers['X-Export-ID'] = export_id
+    return response
+
+
+@export_api.route('/stats', methods=['GET'])
+def export_stats():
+    """
+    Row count, bytes, duration and rows/s of the most recent exports, newest
+    first; `?id=` (an X-Export-ID) selects one export.
+    """
+    exports = list(reversed(recent_exports))
+    export_id = request.args.get('id')
+    if export_id is None:
+        return jsonify(exports), 200
+    for export in exports:
+        if export["ExportID"] == export_id:
+            return jsonify(export), 200
+    abort(404, description=f"No statistics for export {export_id} (still running, or too old)")
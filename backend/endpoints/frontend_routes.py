@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template
 from jinja2 import TemplateNotFound
+from backend.services.assets import send_asset
 
 frontend_blueprint = Blueprint('frontend', __name__)
 
@@ -42,3 +43,9 @@ def serve_page(page):
         return render_template(f'pages/{page}.html')
     except TemplateNotFound:
         return "Page not found", 404
+
+
+# Built bundles and page fragments (frontend/build_assets.py)
+@frontend_blueprint.route('/assets/<path:filename>')
+def serve_asset(filename):
+    return send_asset(filename)
@@ -0,0 +1,82 @@
+import os
+import shutil
+import uuid
+from flask import Blueprint, request, abort, send_from_directory
+from config.config import Config
+from backend.services.jobs import job_queue
+from backend.services.bulk_import import IMPORTS, FORMATS, format_for, rejects_filename, run_import
+from backend.endpoints.jobs import accepted
+
+import_api = Blueprint(
+    'import_api',
+    __name__,
+    url_prefix='/api/import'
+)
+
+# Content-Type of a raw request body → input format
+_CONTENT_TYPES = {
+    'text/csv':             'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl':    'ndjson',
+}
+
+_MIMETYPES = {
+    'csv':    'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _import_job(job, entity, path, fmt):
+    """
+    Background job: import the uploaded file, then delete it.  The
+    rejected-rows file stays in IMPORT_DIR for GET /api/import/<id>/rejected.
+    """
+    try:
+        return run_import(
+            job, entity, path, fmt,
+            os.path.join(Config.IMPORT_DIR, rejects_filename(job.id, fmt))
+        )
+    finally:
+        os.remove(path)
+
+
+@import_api.route('/<entity>', methods=['POST'])
+def import_entity(entity):
+    """
+    Queue a bulk import of a CSV or NDJSON file, sent either as the `file`
+    field of a multipart form or as the raw request body.  The format comes
+    from ?format=, else the file name, else the Content-Type.
+    """
+    if entity not in IMPORTS:
+        abort(404, description=f"Unknown import '{entity}'. Expected one of: {', '.join(IMPORTS)}")
+
+    upload = request.files.get('file')
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = format_for(upload.filename) if upload else _CONTENT_TYPES.get(request.mimetype)
+    if fmt not in FORMATS:
+        abort(400, description=f"Cannot tell the file format; pass ?format= one of: {', '.join(FORMATS)}")
+
+    # The job runs after this request has ended, so keep the file on disk
+    os.makedirs(Config.IMPORT_DIR, exist_ok=True)
+    path = os.path.join(Config.IMPORT_DIR, f"{uuid.uuid4()}.{fmt}")
+    if upload:
+        upload.save(path)
+    else:
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(request.stream, f)
+
+    job = job_queue.submit(f'import_{entity}', _import_job, entity, path, fmt)
+    return accepted(job)
+
+
+@import_api.route('/<job_id>/rejected', methods=['GET'])
+def get_rejected_rows(job_id):
+    """Download the rejected-rows file of an import job."""
+    for fmt, mimetype in _MIMETYPES.items():
+        filename = rejects_filename(job_id, fmt)
+        if os.path.isfile(os.path.join(Config.IMPORT_DIR, filename)):
+            return send_from_directory(
+                Config.IMPORT_DIR, filename, mimetype=mimetype, as_attachment=True
+            )
+    abort(404, description=f"No rejected-rows file for import {job_id}")
@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify, abort, url_for
+from backend.services.jobs import job_queue
+
+jobs_api = Blueprint(
+    'jobs_api',
+    __name__,
+    url_prefix='/api/jobs'
+)
+
+def accepted(job):
+    """
+    Build the 202 Accepted response for a freshly submitted job.
+    The Location header points at the job's status endpoint.
+    """
+    response = jsonify(job.to_dict())
+    response.status_code = 202
+    response.headers['Location'] = url_for('jobs_api.get_job', job_id=job.id)
+    return response
+
+@jobs_api.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        abort(404, description=f"Job with ID {job_id} not found")
+    return jsonify(job), 200
@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify, abort
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
 import pyodbc
 
 from config.logger import get_logger
@@ -13,6 +14,61 @@ persons_api = Blueprint(
     url_prefix='/api/persons'
 )
 
+CONFLICT_POLICIES = ('fail', 'reuse', 'overwrite')
+
+def conflict_policy_from_request():
+    """
+    Read the Person conflict policy for sp_UpsertEmployee / sp_UpsertContributor.
+    Uses ?conflict=fail|reuse|overwrite; the older ?useOldPerson=true and
+    ?overwritePerson=true flags map to 'reuse' and 'overwrite'.
+    """
+    policy = request.args.get('conflict')
+    if policy is None:
+        if request.args.get('overwritePerson', '').lower() == 'true':
+            return 'overwrite'
+        if request.args.get('useOldPerson', '').lower() == 'true':
+            return 'reuse'
+        return 'fail'
+
+    policy = policy.lower()
+    if policy not in CONFLICT_POLICIES:
+        abort(400, description=f"Invalid conflict policy '{policy}'; expected one of {', '.join(CONFLICT_POLICIES)}")
+    return policy
+
+def map_row_to_existing_person(row):
+    """
+    Build the 'existingPerson' part of a 409 response from an sp_Upsert* row
+    (PersonNIF + Existing* columns hold the Person as stored before the call).
+    """
+    return {
+        "NIF":         row.PersonNIF,
+        "Name":        row.ExistingName,
+        "DateOfBirth": row.ExistingDateOfBirth.isoformat() if row.ExistingDateOfBirth else None,
+        "Email":       row.ExistingEmail,
+        "PhoneNumber": row.ExistingPhoneNumber
+    }
+
+def abort_upsert_error(e: pyodbc.Error, role: str, nif: str, record_label_id=None):
+    """
+    Answer an error raised by sp_UpsertEmployee / sp_UpsertContributor:
+    400 for invalid input, 404 for an unknown RecordLabelID, 409 for a
+    duplicate row, 500 (logged) for anything else.
+    """
+    message = str(e)
+    # SP throws 51020 for a policy other than fail | reuse | overwrite
+    if '51020' in message or 'Invalid conflict policy' in message:
+        abort(400, description=f"Invalid conflict policy; expected one of {', '.join(CONFLICT_POLICIES)}")
+    if isinstance(e, pyodbc.IntegrityError):
+        if 'FOREIGN KEY' in message and 'RecordLabel' in message:
+            abort(404, description=f"RecordLabel with ID {record_label_id} not found")
+        if 'duplicate key' in message or 'UNIQUE KEY' in message:
+            abort(409, description=f"A {role} for NIF {nif} was created by another request")
+        abort(400, description=message)
+    if isinstance(e, (pyodbc.ProgrammingError, pyodbc.DataError)):
+        abort(400, description=f"Cannot add {role} for NIF {nif}: {message}")
+    logger.exception(f"Database error adding {role} for NIF={nif}")
+    abort(500, description=f"Internal error while adding {role}.")
+
 @persons_api.route('/<string:nif>', methods=['PUT'])
 def update_person(nif):
     """
@@ -35,9 +91,8 @@ def update_person(nif):
     try:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "EXEC dbo.sp_UpdatePerson "
-                "@NIF=?, @Name=?, @DateOfBirth=?, @Email=?, @PhoneNumber=?",
+            call_procedure(
+                cursor, 'sp_UpdatePerson',
                 nif, name, dob, email, phone
             )
             conn.commit()
@@ -58,11 +113,7 @@ def update_person(nif):
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT NIF, Name, DateOfBirth, Email, PhoneNumber "
-            "FROM dbo.Person WHERE NIF = ?",
-            nif
-        )
+        call_procedure(cursor, 'sp_GetPersonByNIF', nif)
         row = cursor.fetchone()
         if not row:
             logger.error(f"update_person: Person NIF={nif} disappeared after update")
@@ -1,5 +1,17 @@
-from flask import Blueprint, request, jsonify, abort
+from flask import Blueprint, request, jsonify, abort, current_app
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.list_queries import (
+    fields_args, project, run_detail_query, run_list_query, sort_args,
+)
+from backend.services.includes import embed, include_args
+from backend.services.snapshot import snapshot_rows
+from backend.services.pagination import page_args
+from backend.services.concurrency import (
+    CONFLICT_ERROR, row_version_hex, expected_row_version, jsonify_versioned
+)
+from backend.services.jobs import job_queue
+from backend.endpoints.jobs import accepted
 import pyodbc
 
 record_label_api = Blueprint(
@@ -12,7 +24,7 @@ def map_row_to_label(row):
     """
     Helper to convert a cursor row into our JSON dict.
     Assumes the SELECT * from vw_RecordLabels returns columns in this order:
-      RecordLabelID, Name, Location, Website, Email, PhoneNumber
+      RecordLabelID, Name, Location, Website, Email, PhoneNumber, RowVersion
     """
     return {
         "RecordLabelID": row.RecordLabelID,
@@ -20,46 +32,64 @@ def map_row_to_label(row):
         "Location":      row.Location,
         "Website":       row.Website,
         "Email":         row.Email,
-        "PhoneNumber":   row.PhoneNumber
+        "PhoneNumber":   row.PhoneNumber,
+        "RowVersion":    row_version_hex(row.RowVersion)
     }
 
-@record_label_api.route('', methods=['GET'])
-def list_record_labels():
-    # read optional filters
+def record_label_filters():
+    """
+    Read the optional list filters from the query string, in
+    sp_GetRecordLabels parameter order (shared by the list and export endpoints).
+    """
     name     = request.args.get('name')
     location = request.args.get('location')
     website  = request.args.get('website')
     email    = request.args.get('email')
     phone    = request.args.get('phone')
+    return (name, location, website, email, phone)
 
-    conn = DatabaseConfig.get_connection()
+@record_label_api.route('', methods=['GET'])
+def list_record_labels():
+    filters = record_label_filters()
+    after, limit = page_args()
+    sort = sort_args('record_labels')
+    fields = fields_args('record_labels')
+    includes = include_args('record_labels')
+
+    # From the in-memory snapshot when it is enabled and can answer the request
+    rows = None if includes else snapshot_rows('record_labels', *filters, after, limit, sort=sort, fields=fields)
+    if rows is not None:
+        return jsonify([project(map_row_to_label, r, fields) for r in rows]), 200
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetRecordLabels "
-            "@Name=?, @Location=?, @Website=?, @Email=?, @Phone=?",
-            name, location, website, email, phone
-        )
+        run_list_query(cursor, 'record_labels', *filters, after, limit, sort=sort, fields=fields)
         rows = cursor.fetchall()
-        labels = [map_row_to_label(r) for r in rows]
+        labels = [project(map_row_to_label, r, fields) for r in rows]
+        embed(cursor, 'record_labels', labels, includes)
         return jsonify(labels), 200
     finally:
         conn.close()
 
 @record_label_api.route('/<int:label_id>', methods=['GET'])
 def get_record_label(label_id):
-    conn = DatabaseConfig.get_connection()
+    fields = fields_args('record_labels')
+    includes = include_args('record_labels')
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetRecordLabelByID @ID=?",
-            label_id
-        )
+        if fields:
+            run_detail_query(cursor, 'record_labels', label_id, fields)
+        else:
+            call_procedure(cursor, 'sp_GetRecordLabelByID', label_id)
         row = cursor.fetchone()
         if not row:
             abort(404, description=f"RecordLabel with ID {label_id} not found")
-        label = map_row_to_label(row)
-        return jsonify(label), 200
+        label = project(map_row_to_label, row, fields)
+        embed(cursor, 'record_labels', [label], includes)
+        return jsonify_versioned(label, row.RowVersion), 200
     finally:
         conn.close()
 
@@ -73,12 +103,8 @@ def create_record_label():
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        new_id = cursor.execute(
-            "DECLARE @NewID INT; "
-            "EXEC dbo.sp_CreateRecordLabel "
-            "@Name=?, @Location=?, @Website=?, @Email=?, @PhoneNumber=?, "
-            "@NewID=@NewID OUTPUT; "
-            "SELECT @NewID AS NewID;",
+        new_id = call_procedure(
+            cursor, 'sp_CreateRecordLabel',
             data.get("Name"),
             data.get("Location"),
             data.get("Website"),
@@ -110,42 +136,60 @@ def update_record_label(label_id):
     # Basic validation
     if not data.get("Name") or not data.get("Email"):
         abort(400, description="Fields 'Name' and 'Email' are required")
+    expected_version = expected_row_version()
 
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
         # Call update proc; if it throws, we catch and map
         try:
-            cursor.execute(
-                "EXEC dbo.sp_UpdateRecordLabel "
-                "@ID=?, @Name=?, @Location=?, @Website=?, @Email=?, @PhoneNumber=?",
+            row = call_procedure(
+                cursor, 'sp_UpdateRecordLabel',
                 label_id,
                 data.get("Name"),
                 data.get("Location"),
                 data.get("Website"),
                 data.get("Email"),
-                data.get("PhoneNumber")
-            )
+                data.get("PhoneNumber"),
+                expected_version
+            ).fetchone()
             conn.commit()
         except pyodbc.ProgrammingError as pe:
             # SQL THROW errors come through as ProgrammingError
+            if CONFLICT_ERROR in str(pe):
+                abort(412, description=f"RecordLabel with ID {label_id} was modified by another request")
             if "50000" in str(pe):
                 abort(404, description=f"RecordLabel with ID {label_id} not found")
             raise
 
-        updated = {
-            "RecordLabelID": label_id,
-            "Name":          data.get("Name"),
-            "Location":      data.get("Location"),
-            "Website":       data.get("Website"),
-            "Email":         data.get("Email"),
-            "PhoneNumber":   data.get("PhoneNumber")
-        }
-        return jsonify(updated), 200
+        # The procedure returns the updated row, with its new RowVersion
+        return jsonify_versioned(map_row_to_label(row), row.RowVersion), 200
 
     finally:
         conn.close()
 
+def _cascade_delete_job(job, label_id, batch_size):
+    """
+    Background job: call sp_DeleteRecordLabel_CascadeBatch until it reports Done.
+    Each batch is committed on its own, so no transaction stays open for long.
+    """
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        deleted = 0
+        while True:
+            result = call_procedure(
+                cursor, 'sp_DeleteRecordLabel_CascadeBatch', label_id, batch_size
+            ).fetchone()
+            conn.commit()
+
+            if result.Done:
+                return f"RecordLabel {label_id} deleted along with {deleted} dependent rows."
+            deleted += result.Deleted
+            job.report(deleted)
+    finally:
+        conn.close()
+
 @record_label_api.route('/<int:label_id>', methods=['DELETE'])
 def delete_record_label(label_id):
     """
@@ -155,7 +199,8 @@ def delete_record_label(label_id):
           • If employeeCount or collaborationCount > 0 → HTTP 409 with JSON {employeeCount, collaborationCount}
           • Else → CALL sp_DeleteRecordLabel and return 204
       ‣ Cascade delete (if ?cascade=true):
-          • CALL sp_DeleteRecordLabel_Cascade and return 204
+          • Queue a background job that runs sp_DeleteRecordLabel_CascadeBatch
+            until done, and return 202 with the job (poll /api/jobs/<id>)
     """
     cascade_flag = request.args.get('cascade', 'false').lower() == 'true'
 
@@ -167,24 +212,16 @@ def delete_record_label(label_id):
             # 1) Check dependencies
             #    We expect sp_CheckRecordLabelDependencies to set two OUTPUT parameters:
             #       @EmployeeCount, @CollaborationCount
-            result = cursor.execute(
-                """
-                DECLARE @E INT, @C INT;
-                EXEC dbo.sp_CheckRecordLabelDependencies
-                    @ID=?, 
-                    @EmployeeCount=@E OUTPUT, 
-                    @CollaborationCount=@C OUTPUT;
-                SELECT @E AS Emp, @C AS Collab;
-                """,
-                label_id
+            result = call_procedure(
+                cursor, 'sp_CheckRecordLabelDependencies', label_id
             ).fetchone()
 
             # If no row returned, treat as “label not found”
             if result is None:
                 abort(404, description=f"RecordLabel with ID {label_id} not found")
 
-            employee_count      = result.Emp
-            collaboration_count = result.Collab
+            employee_count      = result.EmployeeCount
+            collaboration_count = result.CollaborationCount
 
             # 2a) If dependencies exist, return 409 + JSON counts
             if (employee_count or collaboration_count):
@@ -195,10 +232,7 @@ def delete_record_label(label_id):
 
             # 2b) Otherwise, strictly delete
             try:
-                cursor.execute(
-                    "EXEC dbo.sp_DeleteRecordLabel @ID=?",
-                    label_id
-                )
+                call_procedure(cursor, 'sp_DeleteRecordLabel', label_id)
                 conn.commit()
                 return '', 204
             except pyodbc.ProgrammingError as pe:
@@ -208,19 +242,18 @@ def delete_record_label(label_id):
                 raise
 
         else:
-            # 3) cascade=true → delete dependents & delete the label
-            try:
-                cursor.execute(
-                    "EXEC dbo.sp_DeleteRecordLabel_Cascade @ID=?",
-                    label_id
-                )
-                conn.commit()
-                return '', 204
-            except pyodbc.ProgrammingError as pe:
-                # If cascade SP threw “50001 → not found”
-                if "50001" in str(pe):
-                    abort(404, description=f"RecordLabel with ID {label_id} not found")
-                raise
+            # 3) cascade=true → fail fast on unknown IDs, then hand off to a job
+            call_procedure(cursor, 'sp_GetRecordLabelByID', label_id)
+            if cursor.fetchone() is None:
+                abort(404, description=f"RecordLabel with ID {label_id} not found")
+
+            job = job_queue.submit(
+                'record_label_cascade_delete',
+                _cascade_delete_job,
+                label_id,
+                current_app.config['CASCADE_BATCH_SIZE']
+            )
+            return accepted(job)
 
     finally:
         conn.close()
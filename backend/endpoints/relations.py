@@ -0,0 +1,88 @@
+from flask import Blueprint, jsonify, abort
+from config.database_config import DatabaseConfig
+from backend.services.list_queries import (
+    LIST_QUERIES, fields_args, project, run_detail_query, run_related_query, sort_args,
+)
+from backend.services.includes import embed, include_args
+from backend.services.pagination import page_args
+from backend.endpoints.songs import map_row_to_song, song_filters
+from backend.endpoints.employee import map_row_to_employee, employee_filters
+from backend.endpoints.contributors import map_row_to_contributor, contributor_filters
+from backend.endpoints.collaborations import map_row_to_collab, collaboration_filters
+
+relations_api = Blueprint(
+    'relations_api',
+    __name__,
+    url_prefix='/api'
+)
+
+# Child list → (row mapper, reader of its filters from the query string)
+CHILDREN = {
+    'songs':          (map_row_to_song, song_filters),
+    'employees':      (map_row_to_employee, employee_filters),
+    'contributors':   (map_row_to_contributor, contributor_filters),
+    'collaborations': (map_row_to_collab, collaboration_filters),
+}
+
+# Parent list → the name used in its 404 message
+PARENT_NAMES = {
+    'contributors':  'Contributor',
+    'record_labels': 'RecordLabel',
+    'songs':         'Song',
+}
+
+
+def related_list(parent, parent_id, child):
+    """
+    The `child` rows related to one `parent` row, as JSON.
+
+    Takes the child list's filters, `after`/`limit`, `sort`, `fields` and `include`;
+    404 if the parent does not exist.
+    """
+    mapper, read_filters = CHILDREN[child]
+    filters = read_filters()
+    after, limit = page_args()
+    sort = sort_args(child)
+    fields = fields_args(child)
+    includes = include_args(child)
+
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        run_detail_query(cursor, parent, parent_id, (LIST_QUERIES[parent].key,))
+        if cursor.fetchone() is None:
+            abort(404, description=f"{PARENT_NAMES[parent]} with ID {parent_id} not found")
+
+        run_related_query(cursor, parent, parent_id, child, *filters, after, limit,
+                          sort=sort, fields=fields)
+        rows = cursor.fetchall()
+        records = [project(mapper, r, fields) for r in rows]
+        embed(cursor, child, records, includes)
+        return jsonify(records), 200
+    finally:
+        conn.close()
+
+
+@relations_api.route('/contributors/<int:contrib_id>/songs', methods=['GET'])
+def list_contributor_songs(contrib_id):
+    return related_list('contributors', contrib_id, 'songs')
+
+
+@relations_api.route('/contributors/<int:contrib_id>/collaborations', methods=['GET'])
+def list_contributor_collaborations(contrib_id):
+    return related_list('contributors', contrib_id, 'collaborations')
+
+
+@relations_api.route('/record_labels/<int:label_id>/employees', methods=['GET'])
+def list_record_label_employees(label_id):
+    return related_list('record_labels', label_id, 'employees')
+
+
+@relations_api.route('/record_labels/<int:label_id>/collaborations', methods=['GET'])
+def list_record_label_collaborations(label_id):
+    return related_list('record_labels', label_id, 'collaborations')
+
+
+@relations_api.route('/songs/<int:song_id>/contributors', methods=['GET'])
+def list_song_contributors(song_id):
+    return related_list('songs', song_id, 'contributors')
@@ -1,5 +1,15 @@
 from flask import Blueprint, request, jsonify, abort
 from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.list_queries import (
+    date_range_args, fields_args, project, run_detail_query, run_list_query, sort_args,
+)
+from backend.services.includes import embed, include_args
+from backend.services.snapshot import snapshot_rows
+from backend.services.pagination import page_args
+from backend.services.concurrency import (
+    CONFLICT_ERROR, row_version_hex, expected_row_version, jsonify_versioned
+)
 import pyodbc
 
 songs_api = Blueprint('songs_api', __name__, url_prefix='/api/songs')
@@ -8,7 +18,8 @@ songs_api = Blueprint('songs_api', __name__, url_prefix='/api/songs')
 def map_row_to_song(row):
     """
     Convert a row from vw_Songs into a JSON‐serializable dict.
-    Columns in vw_Songs: SongID, Title, Duration, ReleaseDate, Genres, Contributors, CollaborationName
+    Columns in vw_Songs: SongID, Title, Duration, ReleaseDate, Genres, Contributors, CollaborationName,
+                         RowVersion
     """
     return {
         "SongID":            row.SongID,
@@ -17,38 +28,48 @@ def map_row_to_song(row):
         "ReleaseDate":       row.ReleaseDate.isoformat() if row.ReleaseDate else None,
         "Genres":            row.Genres or "",
         "Contributors":      row.Contributors or "",
-        "CollaborationName": row.CollaborationName or ""
+        "CollaborationName": row.CollaborationName or "",
+        "RowVersion":        row_version_hex(row.RowVersion)
     }
 
 
-@songs_api.route('', methods=['GET'])
-def list_songs():
-    # Read optional filters from query string
+def song_filters():
+    """
+    Read the optional list filters from the query string, in sp_GetSongs
+    parameter order (shared by the list and export endpoints).
+    """
     title         = request.args.get('title')
     min_duration  = request.args.get('minDuration', type=int)
     max_duration  = request.args.get('maxDuration', type=int)
     release_date  = request.args.get('releaseDate')  # expect YYYY-MM-DD or None
+    released_from, released_to = date_range_args('releasedFrom', 'releasedTo')
     genre         = request.args.get('genre')
     contributor   = request.args.get('contributor')
     collaboration = request.args.get('collaboration')
+    return (title, min_duration, max_duration, release_date,
+            released_from, released_to, genre, contributor, collaboration)
 
-    conn = DatabaseConfig.get_connection()
+
+@songs_api.route('', methods=['GET'])
+def list_songs():
+    filters = song_filters()
+    after, limit = page_args()
+    sort = sort_args('songs')
+    fields = fields_args('songs')
+    includes = include_args('songs')
+
+    # From the in-memory snapshot when it is enabled and can answer the request
+    rows = None if includes else snapshot_rows('songs', *filters, after, limit, sort=sort, fields=fields)
+    if rows is not None:
+        return jsonify([project(map_row_to_song, r, fields) for r in rows]), 200
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetSongs "
-            "@Title      = ?, "
-            "@MinDuration= ?, "
-            "@MaxDuration= ?, "
-            "@ReleaseDate= ?, "
-            "@Genre      = ?, "
-            "@Contributor= ?, "
-            "@Collaboration = ?",
-            title, min_duration, max_duration, release_date,
-            genre, contributor, collaboration
-        )
+        run_list_query(cursor, 'songs', *filters, after, limit, sort=sort, fields=fields)
         rows = cursor.fetchall()
-        songs = [map_row_to_song(r) for r in rows]
+        songs = [project(map_row_to_song, r, fields) for r in rows]
+        embed(cursor, 'songs', songs, includes)
         return jsonify(songs), 200
     finally:
         conn.close()
@@ -56,17 +77,22 @@ def list_songs():
 
 @songs_api.route('/<int:song_id>', methods=['GET'])
 def get_song(song_id):
-    conn = DatabaseConfig.get_connection()
+    fields = fields_args('songs')
+    includes = include_args('songs')
+
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetSongByID @ID = ?",
-            song_id
-        )
+        if fields:
+            run_detail_query(cursor, 'songs', song_id, fields)
+        else:
+            call_procedure(cursor, 'sp_GetSongByID', song_id)
         row = cursor.fetchone()
         if not row:
             abort(404, description=f"Song with ID {song_id} not found")
-        return jsonify(map_row_to_song(row)), 200
+        song = project(map_row_to_song, row, fields)
+        embed(cursor, 'songs', [song], includes)
+        return jsonify_versioned(song, row.RowVersion), 200
     finally:
         conn.close()
 
@@ -93,16 +119,8 @@ def create_song():
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        result = cursor.execute(
-            "DECLARE @NewID INT; "
-            "EXEC dbo.sp_CreateSong "
-            "@Title       = ?, "
-            "@Duration    = ?, "
-            "@ReleaseDate = ?, "
-            "@Genres      = ?, "
-            "@Contributors= ?, "
-            "@NewID       = @NewID OUTPUT; "
-            "SELECT @NewID AS NewID;",
+        result = call_procedure(
+            cursor, 'sp_CreateSong',
             title, duration, release_date,
             genres, contributors
         )
@@ -139,23 +157,20 @@ def update_song(song_id):
     release_date = data.get('ReleaseDate')   # may be None
     genres       = data.get('Genres')        # comma-separated or None
     contributors = data.get('Contributors')  # comma-separated or None
+    expected_version = expected_row_version()
 
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_UpdateSong "
-            "@ID          = ?, "
-            "@Title       = ?, "
-            "@Duration    = ?, "
-            "@ReleaseDate = ?, "
-            "@Genres      = ?, "
-            "@Contributors= ?",
+        row = call_procedure(
+            cursor, 'sp_UpdateSong',
             song_id, title, duration, release_date,
-            genres, contributors
-        )
+            genres, contributors, expected_version
+        ).fetchone()
         conn.commit()
-    except pyodbc.ProgrammingError:
+    except pyodbc.ProgrammingError as pe:
+        if CONFLICT_ERROR in str(pe):
+            abort(412, description=f"Song with ID {song_id} was modified by another request")
         # If the stored proc raised “Song not found” or similar
         abort(404, description=f"Song with ID {song_id} not found")
     except pyodbc.Error as e:
@@ -164,7 +179,10 @@ def update_song(song_id):
     finally:
         conn.close()
 
-    return get_song(song_id)
+    # No row back: the song was removed by a trigger (e.g. left without contributors)
+    if not row:
+        abort(404, description=f"Song with ID {song_id} not found")
+    return jsonify_versioned(map_row_to_song(row), row.RowVersion), 200
 
 
 @songs_api.route('/<int:song_id>', methods=['DELETE'])
@@ -172,10 +190,7 @@ def delete_song(song_id):
     conn = DatabaseConfig.get_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_DeleteSong @ID = ?",
-            song_id
-        )
+        call_procedure(cursor, 'sp_DeleteSong', song_id)
         conn.commit()
     except pyodbc.ProgrammingError:
         abort(404, description=f"Song with ID {song_id} not found")
@@ -191,13 +206,10 @@ def get_song_dependencies(song_id):
     GET /api/songs/{id}/dependencies
     Returns JSON with { CollaborationCount, ContributorCount } for this song.
     """
-    conn = DatabaseConfig.get_connection()
+    conn = DatabaseConfig.get_read_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            "EXEC dbo.sp_GetSongDependencies @SongID = ?",
-            song_id
-        )
+        call_procedure(cursor, 'sp_GetSongDependencies', song_id)
         row = cursor.fetchone()
         if not row:
             # If the stored proc returned no rows, treat as zero dependencies
@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify, abort
+from backend.services.suggest import INDEXES, suggestions
+
+suggest_api = Blueprint(
+    'suggest_api',
+    __name__,
+    url_prefix='/api/suggest'
+)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+@suggest_api.route('', methods=['GET'])
+def suggest():
+    """
+    GET /api/suggest?entity=person|contributor|label|genre&q=<prefix>&limit=10
+    Records whose name (or any word of it), NIF or email starts with `q`,
+    case- and accent-insensitive, from the in-memory indexes.  An empty `q`
+    returns the first `limit` records in alphabetical order.
+    """
+    entity = request.args.get('entity', '')
+    if entity not in INDEXES:
+        abort(400, description=f"entity must be one of: {', '.join(INDEXES)}")
+    limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+    if not 1 <= limit <= MAX_LIMIT:
+        abort(400, description=f"limit must be between 1 and {MAX_LIMIT}")
+
+    return jsonify(suggestions.search(entity, request.args.get('q', ''), limit)), 200
@@ -0,0 +1,47 @@
+# backend/import_data.py
+"""
+Bulk import from the command line, with progress printed as it goes.
+
+    python -m backend.import_data songs songs.csv
+    python -m backend.import_data employees staff.ndjson --rejects staff-rejected.ndjson
+
+Same pipeline as POST /api/import/<entity> (backend/services/bulk_import.py),
+run in the foreground.
+"""
+import argparse
+import os
+
+from backend.services.jobs import Job
+from backend.services.bulk_import import IMPORTS, FORMATS, format_for, run_import
+
+
+class ConsoleJob(Job):
+    """A Job that prints its progress, for running an import from the shell."""
+
+    def report(self, progress: int, message: str = None):
+        super().report(progress, message)
+        print(f"{progress:>10}  {self.message or ''}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import a CSV or NDJSON file.')
+    parser.add_argument('entity', choices=list(IMPORTS))
+    parser.add_argument('path', help='CSV (with a header row) or NDJSON file')
+    parser.add_argument('--format', choices=list(FORMATS),
+                        help='input format (default: from the file extension)')
+    parser.add_argument('--rejects', help='rejected-rows file (default: <path>.rejected<ext>)')
+    args = parser.parse_args()
+
+    fmt = args.format or format_for(args.path)
+    if fmt is None:
+        parser.error('cannot tell the format from the file name; pass --format')
+    root, extension = os.path.splitext(args.path)
+    rejects_path = args.rejects or f"{root}.rejected{extension or '.' + fmt}"
+
+    job = ConsoleJob(f"import_{args.entity}")
+    print(run_import(job, args.entity, args.path, fmt, rejects_path))
+    print(f"Rejected rows: {rejects_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# backend/services/assets.py
+"""
+Serving the built frontend (frontend/build_assets.py).
+
+When frontend/static/dist/manifest.json exists, index.html links the hashed,
+minified bundles it lists and main.js loads page fragments and modules from
+them; otherwise the unbuilt sources are used, as in development.  The manifest
+is read once at startup, so restart the app after a build.
+
+Built files never change under a given name, so they are served with a
+one-year `immutable` Cache-Control, and as their precompressed .br / .gz copy
+when the client accepts that encoding.
+"""
+import json
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+DIST_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'frontend', 'static', 'dist'
+))
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# Precompressed variants, best first
+_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def load_manifest():
+    """The build manifest, or None when the frontend has not been built."""
+    path = os.path.join(DIST_DIR, 'manifest.json')
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    logger.info(f"Serving built frontend assets ({len(manifest['pages'])} pages)")
+    return manifest
+
+
+def send_asset(filename: str):
+    """Response for one built file, preferring a precompressed copy."""
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in _ENCODINGS:
+        compressed = safe_join(DIST_DIR, filename + suffix)
+        if request.accept_encodings[encoding] and compressed and os.path.isfile(compressed):
+            response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype)
+    response.headers['Cache-Control'] = IMMUTABLE
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def register_assets(app):
+    """Expose the manifest (or None) to templates as `assets`."""
+    app.jinja_env.globals['assets'] = load_manifest()
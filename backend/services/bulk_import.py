@@ -0,0 +1,291 @@
+# backend/services/bulk_import.py
+"""
+Bulk import of record labels, employees, contributors and songs from CSV or
+NDJSON files.
+
+An import runs in three steps on one connection:
+
+  1. Stage: the file is read record by record and loaded into the entity's
+     Import_* staging table with `fast_executemany`, Config.IMPORT_BATCH_SIZE
+     rows per round trip and commit.  Values stay text; only records that
+     cannot be staged at all (malformed lines, values longer than the column)
+     are rejected here.
+  2. Validate and merge: the entity's sp_Import* procedure checks every rule
+     set-wise (required fields, types, unknown NIFs / record labels, the
+     UNIQUE constraints of ddl.sql against the tables and within the file)
+     and inserts the valid rows in one transaction.
+  3. Report: rejected rows are written to a rejected-rows file in the input's
+     format, with their record number and the reason in front of the
+     original values, so it can be corrected and imported again.  The staged
+     rows are then removed.
+
+Records use the field names of the POST bodies (and of the export columns);
+other fields are ignored.  Progress is reported through the job, so imports
+run on the job queue like other long operations (POST /api/import/<entity>),
+or synchronously from the command line (backend/import_data.py).
+"""
+import csv
+import json
+import os
+import time
+
+import pyodbc
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.jobs import Job
+from backend.services.procedures import Param, call_procedure
+
+logger = get_logger(__name__)
+
+# Input formats by name, with the file extensions that imply them
+FORMATS = {
+    'csv':    ('.csv',),
+    'ndjson': ('.ndjson', '.jsonl'),
+}
+
+
+class StagingTable:
+    """
+    An Import_* staging table and the procedure that validates and merges it.
+
+    Args:
+        table: Staging table name (schema 'dbo' is implied).
+        procedure: The sp_Import* procedure for it.
+        *columns: The staged fields, as VARCHAR Params named like the record fields.
+    """
+
+    def __init__(self, table: str, procedure: str, *columns: Param):
+        self.table = table
+        self.procedure = procedure
+        self.columns = columns
+        self.fields = [c.name for c in columns]
+        self.sql = (
+            f"INSERT INTO dbo.{table} (ImportID, RowNumber, {', '.join(self.fields)}) "
+            f"VALUES ({', '.join('?' for _ in range(len(columns) + 2))})"
+        )
+        self.input_sizes = [(pyodbc.SQL_VARCHAR, 36, 0), (pyodbc.SQL_INTEGER, 0, 0)] + [
+            c.binding for c in columns
+        ]
+
+    def values(self, record: dict):
+        """
+        The staged values of `record`, in column order.
+
+        Returns:
+            (values, None), or (None, reason) when the record cannot be staged.
+        """
+        values = []
+        for column in self.columns:
+            value = record.get(column.name)
+            if isinstance(value, list):     # NDJSON may give Genres/Roles/... as arrays
+                value = ', '.join(str(v) for v in value)
+            value = str(value).strip() if value is not None else ''
+            size = column.binding[1]
+            if size and len(value) > size:
+                return None, f"{column.name} is longer than {size} characters"
+            values.append(value or None)
+        return values, None
+
+    def stage(self, cursor, rows):
+        """Insert `rows` of (ImportID, RowNumber, *values) in one round trip."""
+        cursor.setinputsizes(self.input_sizes)
+        cursor.executemany(self.sql, rows)
+
+
+IMPORTS = {
+    'record_labels': StagingTable(
+        'Import_RecordLabel', 'sp_ImportRecordLabels',
+        Param('Name', 'VARCHAR(255)'),
+        Param('Location', 'VARCHAR(255)'),
+        Param('Website', 'VARCHAR(255)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+    ),
+    'employees': StagingTable(
+        'Import_Employee', 'sp_ImportEmployees',
+        Param('NIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'VARCHAR(10)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('JobTitle', 'VARCHAR(100)'),
+        Param('Department', 'VARCHAR(100)'),
+        Param('Salary', 'VARCHAR(20)'),
+        Param('HireDate', 'VARCHAR(10)'),
+        Param('RecordLabelID', 'VARCHAR(20)'),
+        Param('RecordLabelName', 'VARCHAR(255)'),
+    ),
+    'contributors': StagingTable(
+        'Import_Contributor', 'sp_ImportContributors',
+        Param('NIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'VARCHAR(10)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('Roles', 'VARCHAR(255)'),
+    ),
+    'songs': StagingTable(
+        'Import_Song', 'sp_ImportSongs',
+        Param('Title', 'VARCHAR(255)'),
+        Param('Duration', 'VARCHAR(20)'),
+        Param('ReleaseDate', 'VARCHAR(10)'),
+        Param('Genres', 'VARCHAR(4000)'),
+        Param('Contributors', 'VARCHAR(4000)'),
+    ),
+}
+
+
+def rejects_filename(import_id: str, fmt: str) -> str:
+    """Name of an import's rejected-rows file in Config.IMPORT_DIR."""
+    return f"{import_id}.rejected.{fmt}"
+
+
+def format_for(filename: str):
+    """The input format implied by a file name's extension, or None."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    for fmt, extensions in FORMATS.items():
+        if extension in extensions:
+            return fmt
+    return None
+
+
+def read_records(path: str, fmt: str):
+    """
+    Yield (record number, record dict or None, error or None) for every
+    record of the file.  CSV records are numbered from 1 after the header
+    row; NDJSON records by line (blank lines are skipped).
+    """
+    if fmt == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for number, record in enumerate(csv.DictReader(f), start=1):
+                yield number, record, None
+        return
+
+    with open(path, encoding='utf-8-sig') as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield number, record, None
+            else:
+                yield number, None, "Not a JSON object"
+
+
+class RejectsFile:
+    """
+    The rejected-rows file: RowNumber, Error and the entity's fields, as CSV
+    or NDJSON.
+    """
+
+    def __init__(self, path: str, fmt: str, fields):
+        self.path = path
+        self.count = 0
+        self._fields = ['RowNumber', 'Error'] + list(fields)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(self._file, self._fields, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, row_number: int, error: str, record: dict = None):
+        row = {f: (record or {}).get(f) for f in self._fields}
+        row.update(RowNumber=row_number, Error=error)
+        if self._csv:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row, default=str) + '\n')
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+def run_import(job: Job, entity: str, path: str, fmt: str, rejects_path: str) -> str:
+    """
+    Import the records of `path` (format `fmt`) as `entity`, staging them
+    under the job's ID.  Progress is the number of records read.  Returns
+    the summary message; rejected records go to `rejects_path`.
+    """
+    table = IMPORTS[entity]
+    start = time.perf_counter()
+    rejects = RejectsFile(rejects_path, fmt, table.fields)
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+
+        # 1) Stage
+        read = 0
+        batch = []
+        for row_number, record, error in read_records(path, fmt):
+            read += 1
+            values = None
+            if error is None:
+                values, error = table.values(record)
+            if error is not None:
+                rejects.write(row_number, error, record)
+            else:
+                batch.append((job.id, row_number, *values))
+            if len(batch) >= Config.IMPORT_BATCH_SIZE:
+                table.stage(cursor, batch)
+                conn.commit()
+                batch = []
+                job.report(read, f"Staged {read} records")
+        if batch:
+            table.stage(cursor, batch)
+            conn.commit()
+        job.report(read, f"Staged {read} records; validating and merging")
+
+        # 2) Validate and merge
+        call_procedure(cursor, table.procedure, job.id)
+        imported = cursor.fetchone().Imported
+        cursor.nextset()
+
+        # 3) Report the rows the procedure rejected, then drop the staged rows
+        columns = [d[0] for d in cursor.description]
+        while True:
+            rows = cursor.fetchmany(Config.IMPORT_BATCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                record = dict(zip(columns, row))
+                rejects.write(record['RowNumber'], record['Error'], record)
+        call_procedure(cursor, 'sp_ClearImport', job.id)
+        conn.commit()
+    except pyodbc.Error:
+        conn.rollback()
+        _clear_staging(job.id)
+        raise
+    finally:
+        conn.close()
+        rejects.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Import {job.id}: {read} {entity} records, {imported} imported, "
+        f"{rejects.count} rejected in {elapsed:.1f}s ({read / max(elapsed, 1e-9):.0f} records/s)"
+    )
+    return f"Imported {imported} of {read} records into {entity}; {rejects.count} rejected."
+
+
+def _clear_staging(import_id: str):
+    """Best-effort removal of a failed import's staged rows."""
+    try:
+        conn = DatabaseConfig.get_connection()
+    except pyodbc.Error as e:
+        logger.warning(f"Could not clear staged rows of import {import_id}: {e}")
+        return
+    try:
+        call_procedure(conn.cursor(), 'sp_ClearImport', import_id)
+        conn.commit()
+    except pyodbc.Error as e:
+        logger.warning(f"Could not clear staged rows of import {import_id}: {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,87 @@
+# backend/services/compression.py
+"""
+Negotiated compression of /api/* responses.
+
+The encoding is chosen from Accept-Encoding: brotli when the client accepts
+it and the optional `brotli` package is installed, otherwise gzip.  Buffered
+responses smaller than Config.COMPRESS_MIN_BYTES are sent as they are, since
+compressing them saves less than it costs.  Streamed responses (whose size is
+unknown up front) are compressed chunk by chunk and flushed after every
+chunk, so the client keeps receiving data as it is produced.
+"""
+import zlib
+
+from flask import request
+
+from config.config import Config
+
+try:
+    import brotli
+except ImportError:     # optional: gzip only without it
+    brotli = None
+
+# Encodings we can produce, best first
+ENCODINGS = (['br'] if brotli else []) + ['gzip']
+
+
+def negotiate_encoding():
+    """The best encoding the client accepts, or None."""
+    accepted = request.accept_encodings
+    for encoding in ENCODINGS:
+        if accepted[encoding]:
+            return encoding
+    return None
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """Compress a whole body with the API's settings for `encoding` ('br' or 'gzip')."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.BROTLI_QUALITY)
+    compressor = zlib.compressobj(Config.GZIP_LEVEL, zlib.DEFLATED, 31)   # 31: gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks, encoding: str):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=Config.BROTLI_QUALITY)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(Config.GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def _compress_response(response):
+    if not request.path.startswith('/api/'):
+        return response
+    response.vary.add('Accept-Encoding')
+    if (request.method == 'HEAD' or response.status_code in (204, 304)
+            or response.direct_passthrough or 'Content-Encoding' in response.headers):
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < Config.COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def register_compression(app):
+    """
+    Install the response hook on `app`.  Flask runs after_request hooks in
+    reverse order of registration, so register this before any hook that
+    needs the uncompressed body (ETags, 304s).
+    """
+    app.after_request(_compress_response)
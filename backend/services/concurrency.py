@@ -0,0 +1,56 @@
+# backend/services/concurrency.py
+"""
+Optimistic concurrency for the PUT endpoints.
+
+Every editable entity exposes a RowVersion column in its view, built from the
+ROWVERSION columns of the tables behind it.  Reads return it as the strong
+ETag of the detail response and as the "RowVersion" field of each row (hex).
+A client that sends it back in `If-Match` gets its update applied only if the
+row is still at that version; the update procedure otherwise throws 50412 and
+the handler answers 412 Precondition Failed.  Requests without `If-Match`
+keep last-writer-wins behaviour.
+"""
+from flask import request, jsonify, abort
+
+# THROW number used by the sp_Update* procedures on a version mismatch
+CONFLICT_ERROR = '50412'
+
+
+def row_version_hex(row_version):
+    """Render a RowVersion column (bytes) as the hex string used in JSON and ETags."""
+    return row_version.hex() if row_version is not None else None
+
+
+def expected_row_version():
+    """
+    Read the `If-Match` header of the current request.
+
+    Returns:
+        The expected RowVersion as bytes, or None when the header is absent or '*'.
+
+    Aborts:
+        412 if only weak ETags were sent (they never match for If-Match);
+        400 if the header holds several ETags or a value that is not a RowVersion.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+
+    tags = if_match.as_set()
+    if not tags:
+        abort(412, description="Weak ETags cannot be used with If-Match")
+    if len(tags) > 1:
+        abort(400, description="If-Match must contain a single ETag")
+
+    try:
+        return bytes.fromhex(tags.pop())
+    except ValueError:
+        abort(400, description="Malformed If-Match header")
+
+
+def jsonify_versioned(data: dict, row_version):
+    """jsonify `data` and set its ETag from `row_version`."""
+    response = jsonify(data)
+    if row_version is not None:
+        response.set_etag(row_version_hex(row_version))
+    return response
@@ -0,0 +1,246 @@
+# backend/services/events.py
+"""
+Live events for the frontend: entity changes and dashboard count deltas,
+pushed to every open GET /api/events stream (Server-Sent Events).
+
+One in-process Broadcaster fans each event out to all subscribers.  An
+event is serialized once and the same text is queued for every client, so
+a publish costs one append per client however many are connected; a client
+that stops reading and fills its buffer (Config.EVENTS_CLIENT_BUFFER) is
+dropped and reconnects by itself.
+
+Events come from the writers, not from polling:
+
+  * every successful POST/PUT/DELETE of an entity blueprint publishes a
+    `change` event once its response is ready (the after_request hook below);
+  * every background job that succeeds publishes one for the entity it
+    worked on (cascade deletes, imports, schema init / population).
+
+After any change the CountsFeed re-reads sp_GetDashboardCounts once (after
+Config.EVENTS_COUNTS_DELAY, so a burst of writes costs a single query) and
+publishes a `counts` event with the new totals and their deltas.  It only
+does so while someone is listening.
+
+Only writes made through this server process are seen; writes from other
+processes or directly in the database show up in /api/changes instead.
+"""
+import json
+import queue
+import threading
+import time
+
+from flask import g, request
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.procedures import call_procedure
+
+logger = get_logger(__name__)
+
+# Blueprint → the entity its writes change (the names used by /api/<entity>)
+BLUEPRINT_ENTITIES = {
+    'record_label_api': 'record_labels',
+    'employee_api':     'employees',
+    'songs_api':        'songs',
+    'contributors_api': 'contributors',
+    'collab_api':       'collaborations',
+    'persons_api':      'persons',
+    'db_admin_api':     'db',
+}
+
+OPERATIONS = {'POST': 'create', 'PUT': 'update', 'DELETE': 'delete'}
+
+# Job kind → (entity, operation) published when such a job succeeds
+JOB_CHANGES = {
+    'record_label_cascade_delete': ('record_labels', 'delete'),
+    'db_init':                     ('db', 'reset'),
+    'db_populate':                 ('db', 'reset'),
+}
+
+COUNT_KEYS = (
+    'RecordLabelCount', 'EmployeeCount', 'SongCount', 'ContributorCount', 'CollaborationCount'
+)
+
+
+def format_event(event: str, data) -> str:
+    """One SSE message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class Subscription:
+    """One client's buffer of pending messages."""
+
+    def __init__(self, size: int):
+        self._queue = queue.Queue(maxsize=size)
+        self.dropped = False
+
+    def put(self, message: str) -> bool:
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            self.dropped = True
+            return False
+
+    def get(self, timeout: float):
+        """The next message, or None if none arrived within `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class Broadcaster:
+    """Publish/subscribe hub shared by every GET /api/events stream."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(Config.EVENTS_CLIENT_BUFFER)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def listening(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, event: str, data):
+        """Queue `event` for every subscriber; drop those that have fallen behind."""
+        message = format_event(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if not subscription.put(message):
+                self.unsubscribe(subscription)
+                logger.info("Dropped a live events client that fell behind")
+
+
+def read_dashboard_counts() -> dict:
+    """Current totals from sp_GetDashboardCounts, read on the primary so they include the latest write."""
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        call_procedure(cursor, 'sp_GetDashboardCounts')
+        row = cursor.fetchone()
+        if not row:
+            raise RuntimeError("Unexpected: no row from sp_GetDashboardCounts")
+        return {key: getattr(row, key) for key in COUNT_KEYS}
+    finally:
+        conn.close()
+
+
+class CountsFeed:
+    """
+    Dashboard totals shared by all live clients.  `touch()` marks them stale;
+    a background thread then re-reads them once and publishes the deltas.
+    """
+
+    def __init__(self, broadcaster: Broadcaster):
+        self._broadcaster = broadcaster
+        self._counts = None
+        self._lock = threading.Lock()
+        self._stale = threading.Event()
+        self._thread = None
+
+    def current(self) -> dict:
+        """The latest totals, read now if none are known."""
+        with self._lock:
+            counts = self._counts
+        if counts is None:
+            counts = read_dashboard_counts()
+            with self._lock:
+                if self._counts is None:
+                    self._counts = counts
+        return counts
+
+    def touch(self):
+        """Something changed: refresh the totals if anyone is listening."""
+        if not self._broadcaster.listening:
+            with self._lock:
+                self._counts = None     # unknown until the next client asks
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='dashboard-counts', daemon=True
+                )
+                self._thread.start()
+        self._stale.set()
+
+    def _run(self):
+        while True:
+            self._stale.wait()
+            time.sleep(Config.EVENTS_COUNTS_DELAY)     # coalesce a burst
+            self._stale.clear()
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.warning(f"Could not refresh dashboard counts: {e}")
+
+    def _refresh(self):
+        counts = read_dashboard_counts()
+        with self._lock:
+            previous, self._counts = self._counts, counts
+        if previous is None:
+            deltas = {}
+        else:
+            deltas = {k: counts[k] - previous[k] for k in COUNT_KEYS if counts[k] != previous[k]}
+            if not deltas:
+                return
+        self._broadcaster.publish('counts', {"Counts": counts, "Deltas": deltas})
+
+
+broadcaster = Broadcaster()
+counts_feed = CountsFeed(broadcaster)
+
+
+_change_listeners = []
+
+
+def add_change_listener(fn):
+    """Also call `fn(entity, operation)` for every published change (e.g. to refresh rollups)."""
+    if fn not in _change_listeners:
+        _change_listeners.append(fn)
+
+
+def publish_change(entity: str, operation: str, key=None):
+    """Tell live clients that `entity` changed, and refresh the dashboard totals."""
+    broadcaster.publish('change', {"Entity": entity, "Operation": operation, "Key": key})
+    counts_feed.touch()
+    for listener in _change_listeners:
+        listener(entity, operation)
+
+
+def publish_job(kind: str):
+    """Publish the change made by a succeeded job of `kind` (import_<entity> included)."""
+    if kind.startswith('import_'):
+        publish_change(kind[len('import_'):], 'import')
+    elif kind in JOB_CHANGES:
+        publish_change(*JOB_CHANGES[kind])
+
+
+def _publish_write(response):
+    entity = BLUEPRINT_ENTITIES.get(request.blueprint)
+    if g.get('idempotent_replay'):
+        return response     # a stored response (idempotency.py): published the first time
+    if (entity and request.method in OPERATIONS and response.status_code < 400
+            and response.status_code != 202):   # 202: a job does it, and publishes when done
+        if entity == 'db':
+            publish_change(entity, 'reset')
+        else:
+            keys = list((request.view_args or {}).values())
+            publish_change(entity, OPERATIONS[request.method], keys[0] if keys else None)
+    return response
+
+
+def register_live_events(app):
+    """Install the after_request hook that publishes writes on `app`."""
+    app.after_request(_publish_write)
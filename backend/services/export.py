@@ -0,0 +1,173 @@
+# backend/services/export.py
+"""
+Streaming export of query results as CSV or Parquet.
+
+Rows are pulled from an executed cursor with `fetchmany` in batches of
+Config.EXPORT_BATCH_SIZE.  SQL Server sends a result set as a forward-only
+stream that pyodbc reads as it goes, so only one batch is held in memory at a
+time however large the table is.  Every batch is encoded and handed to the
+client straight away: as CSV lines, or as one Parquet row group (the Parquet
+footer follows the last one).
+
+Columns are taken from the cursor description, minus `RowVersion` (a
+concurrency token, not catalog data).  Parquet needs the optional `pyarrow`
+package (requirements-optional.txt); its column types are derived from the
+SQL types.
+
+The row count, size and throughput of the most recent exports are kept in
+`recent_exports` for GET /api/export/stats, and logged.
+"""
+import csv
+import datetime
+import decimal
+import io
+import time
+from collections import deque
+
+from config.config import Config
+from config.logger import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:     # optional: CSV only without it
+    pa = pq = None
+
+logger = get_logger(__name__)
+
+# Format → Content-Type
+FORMATS = {
+    'csv':     'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+_EXCLUDED_COLUMNS = {'RowVersion'}
+
+# Throughput of the most recent exports, oldest first
+recent_exports = deque(maxlen=100)
+
+
+def _columns(cursor):
+    """(index, description) of the exported columns."""
+    return [(i, d) for i, d in enumerate(cursor.description) if d[0] not in _EXCLUDED_COLUMNS]
+
+
+def _batches(cursor, indexes, stats):
+    while True:
+        rows = cursor.fetchmany(Config.EXPORT_BATCH_SIZE)
+        if not rows:
+            return
+        stats['rows'] += len(rows)
+        yield [[row[i] for i in indexes] for row in rows]
+
+
+def _csv_chunks(cursor, stats):
+    columns = _columns(cursor)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow([d[0] for _, d in columns])
+    for batch in _batches(cursor, [i for i, _ in columns], stats):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():   # header only: empty result
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _arrow_type(description):
+    """Parquet column type for a pyodbc cursor description entry."""
+    _, type_code, _, _, precision, scale, _ = description
+    if type_code is bool:
+        return pa.bool_()
+    if type_code is int:
+        return pa.int64()
+    if type_code is float:
+        return pa.float64()
+    if type_code is decimal.Decimal:
+        return pa.decimal128(precision, scale)
+    if type_code is datetime.datetime:
+        return pa.timestamp('us')
+    if type_code is datetime.date:
+        return pa.date32()
+    if type_code is datetime.time:
+        return pa.time64('us')
+    if type_code in (bytes, bytearray):
+        return pa.binary()
+    return pa.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects what the Parquet writer produces until drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_chunks(cursor, stats):
+    columns = _columns(cursor)
+    schema = pa.schema([(d[0], _arrow_type(d)) for _, d in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for batch in _batches(cursor, [i for i, _ in columns], stats):
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(cursor, fmt: str, name: str, export_id: str):
+    """
+    Encoded chunks of the rows of an executed `cursor` in format `fmt`
+    ('csv' or 'parquet').  When the stream ends, or the client goes away, its
+    row count and throughput are added to `recent_exports` under `export_id`
+    and logged under `name`.
+    """
+    stats = {'rows': 0}
+    chunks = _parquet_chunks(cursor, stats) if fmt == 'parquet' else _csv_chunks(cursor, stats)
+    start = time.perf_counter()
+    size = 0
+    completed = False
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+        completed = True
+    finally:
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        recent_exports.append({
+            "ExportID":      export_id,
+            "Entity":        name,
+            "Format":        fmt,
+            "Completed":     completed,
+            "Rows":          stats['rows'],
+            "Bytes":         size,
+            "Seconds":       round(elapsed, 3),
+            "RowsPerSecond": round(stats['rows'] / elapsed),
+            "FinishedAt":    datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        })
+        logger.info(
+            f"Exported {name} as {fmt}{'' if completed else ' (cut short)'}: {stats['rows']} rows, "
+            f"{size} bytes in {elapsed:.2f}s ({stats['rows'] / elapsed:.0f} rows/s)"
+        )
@@ -0,0 +1,88 @@
+# backend/services/formats.py
+"""
+Compact representations of API payloads, negotiated with `Accept`.
+
+Every handler still returns `jsonify(...)`; the app's JSON provider picks the
+representation the client prefers among:
+
+  application/json                     the default
+  application/vnd.columnar+json        lists of rows as one header row plus
+                                       value arrays, instead of repeating every
+                                       key in every row:
+                                         {"columns": ["SongID", "Title", ...],
+                                          "rows": [[1, "Intro", ...], ...]}
+                                       Anything that is not a list of objects
+                                       is sent as plain JSON.
+  application/msgpack                  MessagePack, only offered when the
+                                       optional `msgpack` package is installed
+                                       (requirements-optional.txt); without
+                                       it, a client that accepts nothing else
+                                       gets 406 Not Acceptable
+
+The Content-Type of the response always names the representation used.
+`Accept: */*` (what browsers and fetch() send) keeps plain JSON.
+"""
+from flask import abort, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import msgpack
+except ImportError:     # optional: MessagePack is simply not offered
+    msgpack = None
+
+JSON     = 'application/json'
+COLUMNAR = 'application/vnd.columnar+json'
+MSGPACK  = 'application/msgpack'
+
+# In order of preference when the client rates several equally
+AVAILABLE = [JSON, COLUMNAR] + ([MSGPACK] if msgpack else [])
+
+
+def to_columnar(obj):
+    """
+    Columnar form of a list of dicts that all have the same keys, or None if
+    `obj` is not such a list.
+    """
+    if not isinstance(obj, list) or not all(isinstance(row, dict) for row in obj):
+        return None
+    columns = list(obj[0]) if obj else []
+    if any(row.keys() != obj[0].keys() for row in obj):
+        return None
+    return {"columns": columns, "rows": [[row[c] for c in columns] for row in obj]}
+
+
+class NegotiatingJSONProvider(DefaultJSONProvider):
+    """JSON provider whose `response()` (behind jsonify) honours Accept on /api/*."""
+
+    def response(self, *args, **kwargs):
+        if not (has_request_context() and request.path.startswith('/api/')):
+            return super().response(*args, **kwargs)
+
+        response = self._negotiated(args, kwargs)
+        response.vary.add('Accept')
+        return response
+
+    def _negotiated(self, args, kwargs):
+        mimetype = request.accept_mimetypes.best_match(AVAILABLE)
+        if mimetype is None and msgpack is None and request.accept_mimetypes[MSGPACK]:
+            abort(406, description=f"{MSGPACK} requires the optional msgpack package, which is not "
+                                   f"installed; accept {JSON} or {COLUMNAR} instead")
+        if mimetype in (None, JSON):
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        if mimetype == MSGPACK:
+            return self._app.response_class(
+                msgpack.packb(obj, default=self.default), mimetype=MSGPACK
+            )
+        columnar = to_columnar(obj)
+        if columnar is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(
+            f"{self.dumps(columnar, separators=(',', ':'))}\n", mimetype=COLUMNAR
+        )
+
+
+def register_formats(app):
+    """Make `app`'s jsonify negotiate the representation."""
+    app.json = NegotiatingJSONProvider(app)
@@ -0,0 +1,29 @@
+# backend/services/http_cache.py
+"""
+Conditional GET for the JSON API.
+
+Successful GET /api/* responses that do not already carry an ETag get a weak
+one derived from the (uncompressed) body, and a request whose If-None-Match
+matches it is answered `304 Not Modified` without a body.  The tag is weak
+because the same content is also sent gzip/brotli-compressed.  The frontend
+fetch layer (main.js) revalidates its cached lists this way instead of
+downloading them again.  Detail endpoints keep their RowVersion ETag (used
+for If-Match on PUT), so they are always sent in full.
+"""
+from flask import request
+
+
+def _conditional_get(response):
+    if (request.method == 'GET' and request.path.startswith('/api/')
+            and response.status_code == 200 and not response.is_streamed
+            and 'ETag' not in response.headers):
+        response.add_etag(weak=True)
+        # Clients must revalidate rather than reuse the body on their own
+        response.headers['Cache-Control'] = 'no-cache'
+        response.make_conditional(request)
+    return response
+
+
+def register_conditional_get(app):
+    """Install the response hook on `app`."""
+    app.after_request(_conditional_get)
@@ -0,0 +1,255 @@
+# backend/services/idempotency.py
+"""
+`Idempotency-Key` support for the create and update endpoints.
+
+A client that times out on POST /api/employees cannot tell whether the
+employee was created, and retrying blindly can create it twice (or re-run a
+whole collaboration update).  A client that sends the same
+`Idempotency-Key: <unique string>` header on every attempt of one logical
+request is answered from the stored response instead:
+
+  * the first request with a key claims it, runs normally, and its response
+    (status, headers and body, zlib-compressed) is kept for
+    Config.IDEMPOTENCY_TTL_SECONDS, unless it is a 5xx, which frees the key
+    so that a retry runs again;
+  * a later request with the same key and the same method, path and body is
+    answered with the stored response and `Idempotent-Replayed: true`,
+    without running the handler (no procedure is called and no change is
+    published);
+  * the same key with a different method, path or body is a 422, and a
+    request whose key is still being processed by another attempt is a 409.
+    A claim that never completes (a crashed worker) lapses after
+    Config.IDEMPOTENCY_LOCK_SECONDS.
+
+It applies to POST and PUT on the entity blueprints (events.BLUEPRINT_ENTITIES);
+requests without the header are untouched.  Keys are kept in process (at most
+Config.IDEMPOTENCY_MAX_KEYS, oldest evicted first).  With several workers,
+set Config.IDEMPOTENCY_SHARED so that the claims and responses live in the
+dbo.IdempotencyKey table and a retry landing on another worker is still
+recognized; completed responses are then also kept in process, so a retry on
+the same worker needs no query.
+"""
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from flask import abort, current_app, g, request
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.events import BLUEPRINT_ENTITIES
+from backend.services.procedures import call_procedure
+
+logger = get_logger(__name__)
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+MAX_KEY_LENGTH = 255
+
+_METHODS = ('POST', 'PUT')
+
+# The entity blueprints (not the schema admin actions)
+_BLUEPRINTS = {bp for bp, entity in BLUEPRINT_ENTITIES.items() if entity != 'db'}
+
+# Set by the server on the way out; never part of a stored response
+_UNSTORED_HEADERS = {'set-cookie', 'content-length', 'content-encoding'}
+
+# claim() outcomes
+CLAIMED, REPLAY, IN_PROGRESS, MISMATCH = 'claimed', 'replay', 'in_progress', 'mismatch'
+
+
+class StoredResponse:
+    """A response as kept in the store: compressed body and the headers to replay."""
+
+    def __init__(self, status: int, headers, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @classmethod
+    def of(cls, response):
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _UNSTORED_HEADERS]
+        return cls(response.status_code, headers, zlib.compress(response.get_data(), 1))
+
+    def to_response(self, app):
+        response = app.response_class(zlib.decompress(self.body), status=self.status, headers=self.headers)
+        response.headers[REPLAYED_HEADER] = 'true'
+        return response
+
+
+class MemoryStore:
+    """In-process claims and responses, expired lazily and evicted oldest first."""
+
+    def __init__(self):
+        self._entries = OrderedDict()   # key → [fingerprint, expires, StoredResponse or None]
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry and entry[1] <= now:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key):
+        """(fingerprint, StoredResponse) of a completed key, or None."""
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+        return (entry[0], entry[2]) if entry and entry[2] else None
+
+    def claim(self, key, fingerprint):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is None:
+                self._entries[key] = [fingerprint, now + Config.IDEMPOTENCY_LOCK_SECONDS, None]
+                while len(self._entries) > Config.IDEMPOTENCY_MAX_KEYS:
+                    self._entries.popitem(last=False)
+                return CLAIMED, None
+        if entry[0] != fingerprint:
+            return MISMATCH, None
+        return (REPLAY, entry[2]) if entry[2] else (IN_PROGRESS, None)
+
+    def save(self, key, fingerprint, stored: StoredResponse):
+        with self._lock:
+            self._entries[key] = [fingerprint, time.monotonic() + Config.IDEMPOTENCY_TTL_SECONDS, stored]
+            self._entries.move_to_end(key)
+            while len(self._entries) > Config.IDEMPOTENCY_MAX_KEYS:
+                self._entries.popitem(last=False)
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[2] is None:
+                del self._entries[key]
+
+
+class DatabaseStore:
+    """Claims and responses in dbo.IdempotencyKey, shared by every worker."""
+
+    def claim(self, key, fingerprint):
+        conn = DatabaseConfig.get_connection()
+        try:
+            row = call_procedure(
+                conn.cursor(), 'sp_ClaimIdempotencyKey', key, fingerprint,
+                int(Config.IDEMPOTENCY_TTL_SECONDS), int(Config.IDEMPOTENCY_LOCK_SECONDS)
+            ).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        if row.Claimed:
+            return CLAIMED, None
+        if bytes(row.Fingerprint) != fingerprint:
+            return MISMATCH, None
+        if row.StatusCode is None:
+            return IN_PROGRESS, None
+        return REPLAY, StoredResponse(row.StatusCode, json.loads(row.Headers), bytes(row.Body))
+
+    def save(self, key, fingerprint, stored: StoredResponse):
+        self._call('sp_SaveIdempotentResponse', key, stored.status, json.dumps(stored.headers), stored.body)
+
+    def release(self, key):
+        self._call('sp_ReleaseIdempotencyKey', key)
+
+    def _call(self, name, *args):
+        conn = DatabaseConfig.get_connection()
+        try:
+            call_procedure(conn.cursor(), name, *args)
+            conn.commit()
+        finally:
+            conn.close()
+
+
+memory_store = MemoryStore()
+database_store = DatabaseStore()
+
+
+def _fingerprint() -> bytes:
+    """What makes two attempts the same request: method, path with query, body."""
+    digest = hashlib.sha256(f"{request.method} {request.full_path}\n".encode())
+    digest.update(request.get_data(cache=True))
+    return digest.digest()
+
+
+def _claim_key():
+    if request.method not in _METHODS or request.blueprint not in _BLUEPRINTS:
+        return None
+    key = request.headers.get(HEADER)
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        abort(400, description=f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters")
+
+    fingerprint = _fingerprint()
+    completed = memory_store.get(key)
+    if completed:
+        outcome, stored = (REPLAY, completed[1]) if completed[0] == fingerprint else (MISMATCH, None)
+    elif Config.IDEMPOTENCY_SHARED:
+        outcome, stored = database_store.claim(key, fingerprint)
+        if outcome == REPLAY:
+            memory_store.save(key, fingerprint, stored)
+    else:
+        outcome, stored = memory_store.claim(key, fingerprint)
+
+    if outcome == MISMATCH:
+        abort(422, description=f"{HEADER} {key!r} was already used for a different request")
+    if outcome == IN_PROGRESS:
+        abort(409, description=f"A request with {HEADER} {key!r} is still in progress; retry later")
+    if outcome == REPLAY:
+        # Tells the after_request hooks (e.g. events._publish_write) not to act again
+        g.idempotent_replay = True
+        return stored.to_response(current_app)
+    g.idempotency_claim = (key, fingerprint)
+    return None
+
+
+def _store_response(response):
+    claim = g.pop('idempotency_claim', None)
+    if claim is None:
+        return response
+    key, fingerprint = claim
+    try:
+        if response.status_code >= 500 or response.is_streamed:
+            _release(key)
+        else:
+            stored = StoredResponse.of(response)
+            memory_store.save(key, fingerprint, stored)
+            if Config.IDEMPOTENCY_SHARED:
+                database_store.save(key, fingerprint, stored)
+    except Exception as e:
+        # The write itself succeeded; a retry will simply run again
+        logger.warning(f"Could not store the response for {HEADER} {key!r}: {e}")
+    return response
+
+
+def _release_unstored(exc=None):
+    """A claimed request that ended without a response (unhandled error) frees its key."""
+    claim = g.pop('idempotency_claim', None)
+    if claim is not None:
+        try:
+            _release(claim[0])
+        except Exception as e:
+            logger.warning(f"Could not release {HEADER} {claim[0]!r}: {e}")
+
+
+def _release(key):
+    memory_store.release(key)
+    if Config.IDEMPOTENCY_SHARED:
+        database_store.release(key)
+
+
+def register_idempotency(app):
+    """
+    Install the hooks on `app`.  Register this after every other response
+    hook: Flask runs after_request hooks in reverse order, so the response is
+    stored before compression, and a replay still goes through the others.
+    """
+    app.before_request(_claim_key)
+    app.after_request(_store_response)
+    app.teardown_request(_release_unstored)
@@ -0,0 +1,262 @@
+# backend/services/includes.py
+"""
+Embedded related records for the list, detail and relationship endpoints.
+
+`GET /api/songs/5?include=contributors,genres,collaboration,dependencies`
+returns the song with its related records nested under those names, so a
+client needs one request instead of one per relation (and, for a list, one
+per row and relation).
+
+Each include is one set-based statement for the whole response, however many
+rows it holds: the keys of the rows are bound as a single comma-separated
+parameter, split server-side with STRING_SPLIT, and the related rows are
+grouped by key in Python.  A page of 50 songs with two includes is three
+statements, not 101.  Since the key list is one parameter, the statement text
+does not depend on the page size and each include keeps a single cached plan;
+each one seeks an index that leads with the parent's key (ddl.sql).
+"""
+from datetime import date
+from decimal import Decimal
+
+import pyodbc
+from flask import request, abort
+
+from backend.services.list_queries import LIST_QUERIES
+from backend.services.procedures import Param, execute_bound
+
+# The parent keys of one request, as a set of INT
+_KEYS = "SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ',')"
+_KEYS_PARAM = Param('Keys', 'VARCHAR(MAX)')
+
+
+def _json_value(value):
+    """Render a column value the way the endpoints' row mappers do."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class Include:
+    """
+    One relation that can be embedded in the rows of a list.
+
+    Args:
+        sql: SELECT whose `ParentKey` column is the key of the parent row,
+            restricted to the requested parents with `IN ({keys})`.
+        columns: Columns of each related record, in order.
+        kind: 'many' (a list of records), 'one' (a record or None) or
+            'values' (a list of the single column's values).
+    """
+
+    def __init__(self, sql: str, columns, kind: str = 'many'):
+        self.sql = sql.format(keys=_KEYS)
+        self.columns = tuple(columns)
+        self.kind = kind
+
+    @property
+    def empty(self):
+        """The value embedded for a parent without related rows."""
+        return None if self.kind == 'one' else []
+
+    def fetch(self, cursor: pyodbc.Cursor, keys) -> dict:
+        """
+        Read the related rows of every parent in `keys` in one statement.
+
+        Returns:
+            Parent key → embedded value; parents without related rows are absent.
+        """
+        execute_bound(cursor, self.sql, [_KEYS_PARAM.binding], ','.join(str(k) for k in dict.fromkeys(keys)))
+        related = {}
+        for row in cursor.fetchall():
+            if self.kind == 'values':
+                item = _json_value(getattr(row, self.columns[0]))
+            else:
+                item = {c: _json_value(getattr(row, c)) for c in self.columns}
+            if self.kind == 'one':
+                related[row.ParentKey] = item
+            else:
+                related.setdefault(row.ParentKey, []).append(item)
+        return related
+
+
+_CONTRIBUTOR = ('ContributorID', 'NIF', 'Name')
+_COLLABORATION = ('CollaborationID', 'CollaborationName', 'StartDate', 'EndDate')
+
+# List → include name → Include
+INCLUDES = {
+    'songs': {
+        'contributors': Include(
+            "SELECT cs.Song_SongID AS ParentKey, c.ContributorID, p.NIF, p.Name, cs.Date"
+            " FROM dbo.Contributor_Song cs"
+            " JOIN dbo.Contributor c ON c.ContributorID = cs.Contributor_ContributorID"
+            " JOIN dbo.Person p ON p.NIF = c.Person_NIF"
+            " WHERE cs.Song_SongID IN ({keys})"
+            " ORDER BY cs.Song_SongID, p.Name",
+            _CONTRIBUTOR + ('Date',)),
+        'genres': Include(
+            "SELECT Song_SongID AS ParentKey, Genre FROM dbo.Song_Genre"
+            " WHERE Song_SongID IN ({keys})"
+            " ORDER BY Song_SongID, Genre",
+            ('Genre',), 'values'),
+        'collaboration': Include(
+            "SELECT Song_SongID AS ParentKey, CollaborationID, CollaborationName, StartDate, EndDate"
+            " FROM dbo.Collaboration"
+            " WHERE Song_SongID IN ({keys})",
+            _COLLABORATION, 'one'),
+        # Same counts as sp_GetSongDependencies
+        'dependencies': Include(
+            "SELECT s.SongID AS ParentKey,"
+            " (SELECT COUNT(*) FROM dbo.Collaboration c WHERE c.Song_SongID = s.SongID) AS CollaborationCount,"
+            " (SELECT COUNT(*) FROM dbo.Contributor_Song cs WHERE cs.Song_SongID = s.SongID) AS ContributorCount"
+            " FROM dbo.Song s"
+            " WHERE s.SongID IN ({keys})",
+            ('CollaborationCount', 'ContributorCount'), 'one'),
+    },
+    'collaborations': {
+        'song': Include(
+            "SELECT c.CollaborationID AS ParentKey, s.SongID, s.Title, s.Duration, s.ReleaseDate"
+            " FROM dbo.Collaboration c"
+            " JOIN dbo.Song s ON s.SongID = c.Song_SongID"
+            " WHERE c.CollaborationID IN ({keys})",
+            ('SongID', 'Title', 'Duration', 'ReleaseDate'), 'one'),
+        'contributors': Include(
+            "SELECT cc.Collaboration_CollaborationID AS ParentKey, c.ContributorID, p.NIF, p.Name"
+            " FROM dbo.Collaboration_Contributor cc"
+            " JOIN dbo.Contributor c ON c.ContributorID = cc.Contributor_ContributorID"
+            " JOIN dbo.Person p ON p.NIF = c.Person_NIF"
+            " WHERE cc.Collaboration_CollaborationID IN ({keys})"
+            " ORDER BY cc.Collaboration_CollaborationID, p.Name",
+            _CONTRIBUTOR),
+        # A label takes part in a collaboration on either side of the pair
+        'record_labels': Include(
+            "SELECT DISTINCT rlc.Collaboration_CollaborationID AS ParentKey, rl.RecordLabelID, rl.Name"
+            " FROM dbo.RecordLabel_Collaboration rlc"
+            " JOIN dbo.RecordLabel rl"
+            "   ON rl.RecordLabelID IN (rlc.RecordLabel_RecordLabelID1, rlc.RecordLabel_RecordLabelID2)"
+            " WHERE rlc.Collaboration_CollaborationID IN ({keys})"
+            " ORDER BY ParentKey, rl.Name",
+            ('RecordLabelID', 'Name')),
+    },
+    'contributors': {
+        'songs': Include(
+            "SELECT cs.Contributor_ContributorID AS ParentKey, s.SongID, s.Title, s.ReleaseDate, cs.Date"
+            " FROM dbo.Contributor_Song cs"
+            " JOIN dbo.Song s ON s.SongID = cs.Song_SongID"
+            " WHERE cs.Contributor_ContributorID IN ({keys})"
+            " ORDER BY cs.Contributor_ContributorID, s.Title",
+            ('SongID', 'Title', 'ReleaseDate', 'Date')),
+        'collaborations': Include(
+            "SELECT cc.Contributor_ContributorID AS ParentKey,"
+            " c.CollaborationID, c.CollaborationName, c.StartDate, c.EndDate"
+            " FROM dbo.Collaboration_Contributor cc"
+            " JOIN dbo.Collaboration c ON c.CollaborationID = cc.Collaboration_CollaborationID"
+            " WHERE cc.Contributor_ContributorID IN ({keys})"
+            " ORDER BY cc.Contributor_ContributorID, c.StartDate",
+            _COLLABORATION),
+        # Same counts as sp_GetContributorDependencies
+        'dependencies': Include(
+            "SELECT c.ContributorID AS ParentKey,"
+            " (SELECT COUNT(*) FROM dbo.Collaboration_Contributor cc"
+            "   WHERE cc.Contributor_ContributorID = c.ContributorID) AS CollaborationCount,"
+            " (SELECT COUNT(*) FROM dbo.Contributor_Song cs"
+            "   WHERE cs.Contributor_ContributorID = c.ContributorID) AS SongCount"
+            " FROM dbo.Contributor c"
+            " WHERE c.ContributorID IN ({keys})",
+            ('CollaborationCount', 'SongCount'), 'one'),
+    },
+    'employees': {
+        'record_label': Include(
+            "SELECT e.EmployeeID AS ParentKey, rl.RecordLabelID, rl.Name, rl.Location"
+            " FROM dbo.Employee e"
+            " JOIN dbo.RecordLabel rl ON rl.RecordLabelID = e.RecordLabel_RecordLabelID"
+            " WHERE e.EmployeeID IN ({keys})",
+            ('RecordLabelID', 'Name', 'Location'), 'one'),
+        # Same counts as sp_GetEmployeeDependencies (through the Person's Contributor)
+        'dependencies': Include(
+            "SELECT e.EmployeeID AS ParentKey,"
+            " (SELECT COUNT(*) FROM dbo.Collaboration_Contributor cc"
+            "   JOIN dbo.Contributor co ON co.ContributorID = cc.Contributor_ContributorID"
+            "   WHERE co.Person_NIF = e.Person_NIF) AS CollaborationCount,"
+            " (SELECT COUNT(*) FROM dbo.Contributor_Song cs"
+            "   JOIN dbo.Contributor co ON co.ContributorID = cs.Contributor_ContributorID"
+            "   WHERE co.Person_NIF = e.Person_NIF) AS SongCount"
+            " FROM dbo.Employee e"
+            " WHERE e.EmployeeID IN ({keys})",
+            ('CollaborationCount', 'SongCount'), 'one'),
+    },
+    'record_labels': {
+        'employees': Include(
+            "SELECT e.RecordLabel_RecordLabelID AS ParentKey, e.EmployeeID, p.NIF, p.Name, e.JobTitle"
+            " FROM dbo.Employee e"
+            " JOIN dbo.Person p ON p.NIF = e.Person_NIF"
+            " WHERE e.RecordLabel_RecordLabelID IN ({keys})"
+            " ORDER BY e.RecordLabel_RecordLabelID, p.Name",
+            ('EmployeeID', 'NIF', 'Name', 'JobTitle')),
+        'collaborations': Include(
+            "SELECT l.RecordLabelID AS ParentKey,"
+            " c.CollaborationID, c.CollaborationName, c.StartDate, c.EndDate"
+            " FROM (SELECT RecordLabel_RecordLabelID1 AS RecordLabelID, Collaboration_CollaborationID"
+            "       FROM dbo.RecordLabel_Collaboration"
+            "       UNION SELECT RecordLabel_RecordLabelID2, Collaboration_CollaborationID"
+            "       FROM dbo.RecordLabel_Collaboration) AS l"
+            " JOIN dbo.Collaboration c ON c.CollaborationID = l.Collaboration_CollaborationID"
+            " WHERE l.RecordLabelID IN ({keys})"
+            " ORDER BY l.RecordLabelID, c.StartDate",
+            _COLLABORATION),
+        # Same counts as vw_RecordLabelDependencies
+        'dependencies': Include(
+            "SELECT rl.RecordLabelID AS ParentKey,"
+            " (SELECT COUNT(*) FROM dbo.Employee e"
+            "   WHERE e.RecordLabel_RecordLabelID = rl.RecordLabelID) AS EmployeeCount,"
+            " (SELECT COUNT(*) FROM dbo.RecordLabel_Collaboration rlc"
+            "   WHERE rlc.RecordLabel_RecordLabelID2 = rl.RecordLabelID) AS CollaborationCount"
+            " FROM dbo.RecordLabel rl"
+            " WHERE rl.RecordLabelID IN ({keys})",
+            ('EmployeeCount', 'CollaborationCount'), 'one'),
+    },
+}
+
+
+def include_args(name: str):
+    """
+    Read and validate the `include` query parameter for list `name`.
+
+    Returns:
+        The include names, in request order without repeats (400 if one is unknown).
+    """
+    available = INCLUDES.get(name, {})
+    requested = []
+    for item in request.args.get('include', '').split(','):
+        item = item.strip().lower()
+        if not item or item in requested:
+            continue
+        if item not in available:
+            abort(400, description=(f"Unknown include {item!r}. "
+                                    f"Includes: {', '.join(available) or 'none'}"))
+        requested.append(item)
+    return tuple(requested)
+
+
+def embed(cursor: pyodbc.Cursor, name: str, records, includes) -> list:
+    """
+    Attach the related records of each include to `records`, in place.
+
+    Args:
+        cursor: An open cursor (its pending results are discarded).
+        name: The list the records come from, e.g. 'songs'.
+        records: Dicts from the list's row mapper; each holds the list's key.
+        includes: Include names, from include_args().
+
+    Returns:
+        `records`, each with one more key per include.
+    """
+    key = LIST_QUERIES[name].key
+    keys = [r[key] for r in records]
+    for include_name in includes:
+        include = INCLUDES[name][include_name]
+        related = include.fetch(cursor, keys) if keys else {}
+        for record in records:
+            record[include_name] = related.get(record[key], include.empty)
+    return records
@@ -0,0 +1,195 @@
+# backend/services/jobs.py
+"""
+Background job queue for long-running maintenance work.
+
+Cascade deletes, schema initialization and data population can take far
+longer than an HTTP request should stay open.  Their endpoints submit the work
+here and answer `202 Accepted` with the job's ID straight away; clients then
+poll `GET /api/jobs/<id>` until the job has succeeded or failed.
+
+Jobs run on a small local thread pool (Config.JOB_WORKERS).  The in-process
+registry is the source of truth while the server is up; every status change
+is also written to dbo.Job so finished jobs can still be looked up after a
+restart.  Persistence is best-effort: the table does not exist until the
+schema has been initialized, and a failed write never fails the job itself.
+Progress updates are kept in memory only, so a job that holds an open
+transaction never waits on its own status write.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pyodbc
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.procedures import call_procedure
+from backend.services.events import publish_job
+
+logger = get_logger(__name__)
+
+QUEUED    = 'queued'
+RUNNING   = 'running'
+SUCCEEDED = 'succeeded'
+FAILED    = 'failed'
+
+# Finished jobs kept in memory before the oldest are evicted
+_MAX_FINISHED = 500
+
+
+class Job:
+    """
+    State of one submitted job.  The job function receives it as its first
+    argument and calls `report()` to publish progress.
+    """
+
+    def __init__(self, kind: str):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0
+        self.message = None
+        self.created_at = datetime.now(timezone.utc)
+        self.updated_at = self.created_at
+
+    def report(self, progress: int, message: str = None):
+        """Record units of work done so far (rows deleted, SQL batches run, ...)."""
+        self.progress = progress
+        if message is not None:
+            self.message = message
+        self.updated_at = datetime.now(timezone.utc)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "JobID":     self.id,
+            "Kind":      self.kind,
+            "Status":    self.status,
+            "Progress":  self.progress,
+            "Message":   self.message,
+            "CreatedAt": self.created_at.isoformat(),
+            "UpdatedAt": self.updated_at.isoformat()
+        }
+
+
+def map_row_to_job(row) -> dict:
+    """Convert a sp_GetJob row into the same shape as Job.to_dict()."""
+    return {
+        "JobID":     row.JobID,
+        "Kind":      row.Kind,
+        "Status":    row.Status,
+        "Progress":  row.Progress,
+        "Message":   row.Message,
+        "CreatedAt": row.CreatedAt.replace(tzinfo=timezone.utc).isoformat(),
+        "UpdatedAt": row.UpdatedAt.replace(tzinfo=timezone.utc).isoformat()
+    }
+
+
+class JobQueue:
+    """
+    Local worker pool plus the registry of submitted jobs.
+
+    Args:
+        max_workers: Number of jobs that may run concurrently.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='job'
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn, *args) -> Job:
+        """
+        Queue `fn(job, *args)` for execution and return its Job immediately.
+
+        Whatever `fn` returns (a str) becomes the job's final message; any
+        exception marks the job as failed with the exception text.
+        """
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self._persist(job)
+        self._executor.submit(self._run, job, fn, args)
+        logger.info(f"Queued job {job.id} ({kind})")
+        return job
+
+    def get(self, job_id: str):
+        """
+        Return the job as a dict, looking in memory first and then in dbo.Job.
+        Returns None if the job is unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+
+        try:
+            conn = DatabaseConfig.get_read_connection()
+        except pyodbc.Error as e:
+            logger.warning(f"Could not look up job {job_id}: {e}")
+            return None
+        try:
+            cursor = conn.cursor()
+            row = call_procedure(cursor, 'sp_GetJob', job_id).fetchone()
+            return map_row_to_job(row) if row else None
+        except pyodbc.Error as e:
+            # dbo.Job does not exist before the schema is initialized
+            logger.warning(f"Could not look up job {job_id}: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def _run(self, job: Job, fn, args):
+        job.status = RUNNING
+        job.updated_at = datetime.now(timezone.utc)
+        self._persist(job)
+        try:
+            message = fn(job, *args)
+            if message is not None:
+                job.message = message
+            job.status = SUCCEEDED
+            logger.info(f"Job {job.id} ({job.kind}) succeeded")
+        except Exception as e:
+            job.status = FAILED
+            job.message = str(e)
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+        job.updated_at = datetime.now(timezone.utc)
+        self._persist(job)
+        if job.status == SUCCEEDED:
+            publish_job(job.kind)
+
+    def _persist(self, job: Job):
+        try:
+            conn = DatabaseConfig.get_connection()
+        except pyodbc.Error as e:
+            logger.warning(f"Could not persist job {job.id}: {e}")
+            return
+        try:
+            cursor = conn.cursor()
+            call_procedure(
+                cursor, 'sp_SaveJob',
+                job.id, job.kind, job.status, job.progress, job.message
+            )
+            conn.commit()
+        except pyodbc.Error as e:
+            logger.warning(f"Could not persist job {job.id}: {e}")
+        finally:
+            conn.close()
+
+    def _evict_finished(self):
+        finished = [jid for jid, j in self._jobs.items() if j.finished]
+        for jid in finished[:max(0, len(finished) - _MAX_FINISHED)]:
+            del self._jobs[jid]
+
+
+job_queue = JobQueue(max_workers=Config.JOB_WORKERS)
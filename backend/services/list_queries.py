@@ -0,0 +1,543 @@
+# backend/services/list_queries.py
+"""
+Compiled list queries for the list and export endpoints.
+
+The sp_Get* list procedures filter with catch-all predicates,
+`(@X IS NULL OR col LIKE ...)`, so one cached plan has to serve every
+combination of filters.  It is compiled for whichever combination happened
+to run first, and it can never seek on the primary key for `after`, because
+the plan must also work when @AfterID is NULL.
+
+Instead, each list is declared here once: its view, its columns and its
+filters, with the same SQL types as the procedure's parameters.  A request
+is compiled into a parameterized statement that contains only the predicates
+actually supplied (plus the keyset condition and TOP when paging).  The
+statement text and its parameter bindings are cached per *shape*, i.e. the
+set of supplied filters, so:
+
+  * every request of a shape sends byte-identical text with identical
+    parameter types, and SQL Server keeps one plan per shape, compiled for
+    that shape (pyodbc runs it through sp_prepexec / sp_executesql);
+  * compiling costs one string build per shape for the process' lifetime.
+
+Filter values are always bound as parameters, never spliced into the text.
+`python -m benchmarks.list_filters` compares plans and timings against the
+catch-all procedures, filter combination by filter combination.
+
+Date ranges are a `min` and a `max` filter on the bare column (releasedFrom/
+releasedTo, hiredFrom/hiredTo), and "collaborations active during a window"
+is the interval overlap `StartDate <= ActiveTo AND (EndDate >= ActiveFrom OR
+EndDate IS NULL)`.  None of them wraps the column in a function, so each is a
+range seek on the column's index (ddl.sql).
+
+Lists are ordered by primary key unless `?sort=field,-field` names columns
+from the list's sortable whitelist (a leading '-' sorts descending); the key
+is then the final tie-breaker.  Only whitelisted column names ever reach the
+ORDER BY, and each of them has a supporting index (ddl.sql), so a first page
+such as "newest 50 songs" is an ordered index scan plus TOP.  `after=<ID>`
+keeps working under any sort: the next page starts after that row's position
+in the sort order, read from the row itself.  If it has been deleted since
+(by another request, between pages), that position is unknown, and rather
+than an empty page that would end the client's paging, the statement throws
+ANCHOR_GONE_ERROR and the request is a 410 (Gone): the client starts again
+from the first page.
+
+`?fields=A,B` returns only those columns (the key is always included).  Songs,
+contributors and collaborations also declare a *brief* view without their
+aggregate columns (genre/contributor lists, roles, label/contributor lists);
+when the requested fields, the supplied filters and the sort only touch
+columns of the brief view, the statement reads that view instead, so a
+dropdown asking for `SongID,Title` never computes a STRING_AGG.  The detail
+endpoints use the same projection through `run_detail_query`.
+
+Relationship endpoints (`/api/contributors/<id>/songs`, ...) run the child's
+list query with one more predicate from RELATIONS, a semi-join on the
+association table by the parent's key, so they page, sort, filter and
+project exactly like the child's own list.
+"""
+from datetime import date
+
+import pyodbc
+from flask import request, abort
+
+from backend.services.procedures import Param, execute_bound
+
+# Predicate templates; `?` is the filter's bound value
+PREDICATES = {
+    'contains': "{column} LIKE '%' + ? + '%'",
+    'equals':   "{column} = ?",
+    'min':      "{column} >= ?",
+    'max':      "{column} <= ?",
+    # Interval end: an open interval (NULL end) reaches every date
+    'min_or_open': "({column} >= ? OR {column} IS NULL)",
+}
+
+_KEY_BINDING = (pyodbc.SQL_INTEGER, 0, 0)
+
+# THROW number of a sorted page whose `after` row no longer exists
+ANCHOR_GONE_ERROR = '50410'
+
+
+class Filter:
+    """
+    One optional list filter.
+
+    Args:
+        name: Filter name (the matching sp_Get* parameter, without '@').
+        sql_type: T-SQL type of the value, as declared on the procedure.
+        column: View column it applies to.
+        predicate: Key of PREDICATES.
+    """
+
+    def __init__(self, name: str, sql_type: str, column: str, predicate: str = 'contains'):
+        self.param = Param(name, sql_type)
+        self.name = name
+        self.column = column
+        self.predicate = predicate
+        self.sql = PREDICATES[predicate].format(column=column)
+
+
+class ListQuery:
+    """
+    A filterable, sortable, keyset-paged list over one view.
+
+    Args:
+        view: View name (schema 'dbo' is implied).
+        key: Primary key column; the default order and final tie-breaker.
+        columns: Columns returned, in order.
+        *filters: Filters in the order the endpoints pass their values
+            (the order of the matching procedure's parameters).
+        sortable: Columns `sort` may name besides the key.
+        brief: Optional (view, columns): a cheaper view holding a subset of
+            `columns`, read whenever a request needs nothing else.
+    """
+
+    def __init__(self, view: str, key: str, columns, *filters: Filter, sortable=(), brief=None):
+        self.view = view
+        self.key = key
+        self.columns = tuple(columns)
+        self.filters = filters
+        self.sortable = (key,) + tuple(sortable)
+        self.brief_view, brief_columns = brief or (None, ())
+        self.brief_columns = frozenset(brief_columns)
+        self._shapes = {}
+        self._details = {}
+
+    def parse_fields(self, text: str):
+        """
+        Parse `A,B` into the projected columns, in view order and with the key.
+
+        Returns:
+            A tuple of columns, or None (all columns) if `text` is empty.
+
+        Raises:
+            ValueError: For a field that is not a column of the list.
+        """
+        requested = [f.strip() for f in text.split(',') if f.strip()]
+        if not requested:
+            return None
+        by_name = {c.lower(): c for c in self.columns}
+        wanted = {self.key}
+        for field in requested:
+            column = by_name.get(field.lower())
+            if column is None:
+                raise ValueError(f"Unknown field {field!r}. Fields: {', '.join(self.columns)}")
+            wanted.add(column)
+        return tuple(c for c in self.columns if c in wanted)
+
+    def parse_sort(self, text: str):
+        """
+        Parse `field,-field` into ((column, descending), ...).
+
+        Raises:
+            ValueError: For a field that is not sortable or is repeated.
+        """
+        by_name = {c.lower(): c for c in self.sortable}
+        order = []
+        for field in (f.strip() for f in text.split(',')):
+            if not field:
+                continue
+            descending = field.startswith('-')
+            column = by_name.get(field.lstrip('+-').lower())
+            if column is None:
+                raise ValueError(
+                    f"Cannot sort by {field.lstrip('+-')!r}. Sortable fields: {', '.join(self.sortable)}"
+                )
+            if any(c == column for c, _ in order):
+                raise ValueError(f"{column} appears twice in sort")
+            order.append((column, descending))
+            if column == self.key:
+                break       # unique: later fields could never apply
+        return tuple(order)
+
+    def compile(self, shape):
+        """
+        The statement text and parameter bindings for `shape`.
+
+        Args:
+            shape: (supplied, paged, limited, sort, fields, within): a tuple
+                of one bool per filter, whether `after` is given, whether
+                `limit` is given, the parsed sort, the projected fields (None:
+                all) and the RELATIONS predicate restricting the rows (or None).
+
+        Returns:
+            (sql, input_sizes), built once per shape and cached.
+        """
+        compiled = self._shapes.get(shape)
+        if compiled is None:
+            compiled = self._shapes[shape] = self._build(*shape)
+        return compiled
+
+    @property
+    def shapes(self) -> int:
+        """Number of shapes compiled so far."""
+        return len(self._shapes)
+
+    def _order(self, sort):
+        order = list(sort)
+        if all(c != self.key for c, _ in order):
+            order.append((self.key, False))
+        return order
+
+    def _source(self, columns):
+        """The brief view if it holds every column in `columns`, else the full view."""
+        if self.brief_view and self.brief_columns.issuperset(columns):
+            return self.brief_view
+        return self.view
+
+    def _build(self, supplied, paged, limited, sort, fields, within):
+        order = self._order(sort)
+        keyset_on_key = order == [(self.key, False)]
+        columns = fields or self.columns
+        view = self._source({*columns, *(c for c, _ in order),
+                             *(f.column for f, s in zip(self.filters, supplied) if s)})
+
+        # Parameters are bound in the order their markers appear in the text
+        input_sizes = []
+        sql = ""
+        if paged and not keyset_on_key:
+            # Without the `after` row its position is unknown: fail instead of returning nothing
+            sql += (f"IF NOT EXISTS (SELECT 1 FROM dbo.{view} WHERE {self.key} = ?) "
+                    f"THROW {ANCHOR_GONE_ERROR}, 'The after row no longer exists', 1; ")
+            input_sizes.append(_KEY_BINDING)
+        sql += "SELECT "
+        if limited:
+            sql += "TOP (?) "
+            input_sizes.append(_KEY_BINDING)
+        sql += f"{', '.join(columns)} FROM dbo.{view}"
+        if paged and not keyset_on_key:
+            # The sort values of the `after` row, to continue from its position
+            anchors = ', '.join(f"{c} AS Anchor{i}" for i, (c, _) in enumerate(order))
+            sql += f" CROSS JOIN (SELECT {anchors} FROM dbo.{view} WHERE {self.key} = ?) AS anchor"
+            input_sizes.append(_KEY_BINDING)
+
+        predicates = []
+        if within:
+            predicates.append(within)
+            input_sizes += [_KEY_BINDING] * within.count('?')
+        for f, s in zip(self.filters, supplied):
+            if s:
+                predicates.append(f.sql)
+                input_sizes.append(f.param.binding)
+        if paged and keyset_on_key:
+            predicates.append(f"{self.key} > ?")
+            input_sizes.append(_KEY_BINDING)
+        elif paged:
+            predicates.append(self._after_anchor(order))
+        if predicates:
+            sql += " WHERE " + " AND ".join(predicates)
+
+        sql += " ORDER BY " + ", ".join(f"{c}{' DESC' if d else ''}" for c, d in order)
+        return sql, input_sizes
+
+    def _after_anchor(self, order):
+        """
+        Rows after the anchor row in `order`, NULL-safe (SQL Server sorts NULLs
+        first ascending, last descending): for some column, all earlier columns
+        are equal and this one comes later.
+        """
+        def equal(c, a):        # never the key: it is always last
+            return f"({c} = {a} OR ({c} IS NULL AND {a} IS NULL))"
+
+        def later(c, a, descending):
+            if c == self.key:
+                return f"{c} {'<' if descending else '>'} {a}"
+            if descending:
+                return f"({c} < {a} OR ({c} IS NULL AND {a} IS NOT NULL))"
+            return f"({c} > {a} OR ({c} IS NOT NULL AND {a} IS NULL))"
+
+        branches = []
+        for i, (column, descending) in enumerate(order):
+            terms = [equal(c, f"anchor.Anchor{j}") for j, (c, _) in enumerate(order[:i])]
+            terms.append(later(column, f"anchor.Anchor{i}", descending))
+            branches.append(" AND ".join(terms))
+        return "(" + " OR ".join(f"({b})" for b in branches) + ")"
+
+    def execute(self, cursor: pyodbc.Cursor, *args, sort=(), fields=None, within=None) -> pyodbc.Cursor:
+        """
+        Run the list query.
+
+        Args:
+            *args: One value per filter (None: not filtered), then `after`
+                and `limit`, like the matching sp_Get* procedure.
+            sort: Parsed sort (see parse_sort); empty for key order.
+            fields: Projected columns (see parse_fields); None for all.
+            within: Optional (predicate, parent key): only the rows related to
+                that parent, with a predicate from RELATIONS.
+
+        Raises:
+            TypeError: If the number of arguments does not match.
+            410 (via abort): If `after` is given with a sort and that row
+                no longer exists.
+        """
+        if len(args) != len(self.filters) + 2:
+            raise TypeError(
+                f"{self.view} list expects {len(self.filters) + 2} arguments, got {len(args)}"
+            )
+        *values, after, limit = args
+        values = [f.param.coerce(v) for f, v in zip(self.filters, values)]
+        predicate, parent = within or (None, None)
+        shape = (tuple(v is not None for v in values), after is not None, limit is not None,
+                 tuple(sort), fields, predicate)
+        sql, input_sizes = self.compile(shape)
+
+        anchored = after is not None and self._order(sort) != [(self.key, False)]
+        params = [after] if anchored else []        # the anchor row's existence check
+        if limit is not None:
+            params.append(limit)
+        if anchored:
+            params.append(after)                    # the anchor row
+        if predicate:
+            params += [parent] * predicate.count('?')
+        params += [v for v in values if v is not None]
+        if after is not None and not anchored:
+            params.append(after)
+        try:
+            return execute_bound(cursor, sql, input_sizes, *params)
+        except pyodbc.Error as e:
+            if ANCHOR_GONE_ERROR in str(e):
+                abort(410, description=f"Row {after} no longer exists; request the list again from the start")
+            raise
+
+    def get(self, cursor: pyodbc.Cursor, key_value, fields) -> pyodbc.Cursor:
+        """
+        Read the row with key `key_value`, projected to `fields`.
+
+        RowVersion is always read too, for the response's ETag.
+        """
+        columns = tuple(fields)
+        if 'RowVersion' in self.columns and 'RowVersion' not in columns:
+            columns += ('RowVersion',)
+        sql = self._details.get(columns)
+        if sql is None:
+            sql = self._details[columns] = (
+                f"SELECT {', '.join(columns)} FROM dbo.{self._source(columns)} WHERE {self.key} = ?"
+            )
+        return execute_bound(cursor, sql, [_KEY_BINDING], key_value)
+
+
+class _PartialRow:
+    """A projected row: the columns left out of the projection read as None."""
+
+    def __init__(self, row):
+        self._row = row
+
+    def __getattr__(self, name):
+        return getattr(self._row, name, None)
+
+
+def project(mapper, row, fields):
+    """
+    Map `row` with the endpoint's row mapper, keeping only `fields`.
+
+    Args:
+        mapper: The endpoint's map_row_to_* function (its keys are the column names).
+        row: A row read with the same projection.
+        fields: Projected columns, from fields_args(); None keeps every key.
+    """
+    if fields is None:
+        return mapper(row)
+    mapped = mapper(_PartialRow(row))
+    return {k: v for k, v in mapped.items() if k in fields}
+
+
+LIST_QUERIES = {
+    'record_labels': ListQuery(
+        'vw_RecordLabels', 'RecordLabelID',
+        ('RecordLabelID', 'Name', 'Location', 'Website', 'Email', 'PhoneNumber', 'RowVersion'),
+        Filter('Name', 'VARCHAR(255)', 'Name'),
+        Filter('Location', 'VARCHAR(255)', 'Location'),
+        Filter('Website', 'VARCHAR(255)', 'Website'),
+        Filter('Email', 'VARCHAR(255)', 'Email'),
+        Filter('Phone', 'VARCHAR(50)', 'PhoneNumber'),
+        sortable=('Name',),
+    ),
+    'employees': ListQuery(
+        'vw_Employees', 'EmployeeID',
+        ('EmployeeID', 'NIF', 'Name', 'DateOfBirth', 'JobTitle', 'Department', 'Salary',
+         'HireDate', 'Email', 'PhoneNumber', 'RecordLabelID', 'RecordLabelName', 'RowVersion'),
+        Filter('NIF', 'VARCHAR(20)', 'NIF'),
+        Filter('Name', 'VARCHAR(255)', 'Name'),
+        Filter('JobTitle', 'VARCHAR(100)', 'JobTitle'),
+        Filter('Department', 'VARCHAR(100)', 'Department'),
+        Filter('Email', 'VARCHAR(255)', 'Email'),
+        Filter('Phone', 'VARCHAR(50)', 'PhoneNumber'),
+        Filter('MinSalary', 'DECIMAL(10,2)', 'Salary', 'min'),
+        Filter('HiredFrom', 'DATE', 'HireDate', 'min'),
+        Filter('HiredTo', 'DATE', 'HireDate', 'max'),
+        Filter('RecordLabel', 'VARCHAR(255)', 'RecordLabelName'),
+        sortable=('Name', 'Salary', 'HireDate'),
+    ),
+    'contributors': ListQuery(
+        'vw_Contributors', 'ContributorID',
+        ('ContributorID', 'NIF', 'Name', 'DateOfBirth', 'Email', 'PhoneNumber',
+         'RecordLabelName', 'Roles', 'RowVersion'),
+        Filter('Name', 'VARCHAR(255)', 'Name'),
+        Filter('Role', 'VARCHAR(50)', 'Roles'),
+        Filter('Email', 'VARCHAR(255)', 'Email'),
+        Filter('Phone', 'VARCHAR(50)', 'PhoneNumber'),
+        Filter('NIF', 'VARCHAR(20)', 'NIF'),
+        Filter('RecordLabel', 'VARCHAR(255)', 'RecordLabelName'),
+        sortable=('Name',),
+        brief=('vw_ContributorsBrief',
+               ('ContributorID', 'NIF', 'Name', 'DateOfBirth', 'Email', 'PhoneNumber', 'RowVersion')),
+    ),
+    'songs': ListQuery(
+        'vw_Songs', 'SongID',
+        ('SongID', 'Title', 'Duration', 'ReleaseDate', 'Genres', 'Contributors',
+         'CollaborationName', 'RowVersion'),
+        Filter('Title', 'VARCHAR(255)', 'Title'),
+        Filter('MinDuration', 'INT', 'Duration', 'min'),
+        Filter('MaxDuration', 'INT', 'Duration', 'max'),
+        Filter('ReleaseDate', 'DATE', 'ReleaseDate', 'equals'),
+        Filter('ReleasedFrom', 'DATE', 'ReleaseDate', 'min'),
+        Filter('ReleasedTo', 'DATE', 'ReleaseDate', 'max'),
+        Filter('Genre', 'VARCHAR(50)', 'Genres'),
+        Filter('Contributor', 'VARCHAR(255)', 'Contributors'),
+        Filter('Collaboration', 'VARCHAR(255)', 'CollaborationName'),
+        sortable=('Title', 'Duration', 'ReleaseDate'),
+        brief=('vw_SongsBrief', ('SongID', 'Title', 'Duration', 'ReleaseDate', 'RowVersion')),
+    ),
+    'collaborations': ListQuery(
+        'vw_Collaborations', 'CollaborationID',
+        ('CollaborationID', 'CollaborationName', 'StartDate', 'EndDate', 'Description',
+         'SongID', 'SongTitle', 'RecordLabels', 'Contributors', 'RowVersion'),
+        Filter('Name', 'VARCHAR(255)', 'CollaborationName'),
+        Filter('Start', 'DATE', 'StartDate', 'equals'),
+        Filter('End', 'DATE', 'EndDate', 'equals'),
+        # Active at some point in [ActiveFrom, ActiveTo]: the windows overlap
+        Filter('ActiveFrom', 'DATE', 'EndDate', 'min_or_open'),
+        Filter('ActiveTo', 'DATE', 'StartDate', 'max'),
+        Filter('Song', 'VARCHAR(255)', 'SongTitle'),
+        Filter('Label', 'VARCHAR(255)', 'RecordLabels'),
+        Filter('Contributor', 'VARCHAR(255)', 'Contributors'),
+        sortable=('CollaborationName', 'StartDate', 'EndDate'),
+        brief=('vw_CollaborationsBrief',
+               ('CollaborationID', 'CollaborationName', 'StartDate', 'EndDate', 'Description',
+                'SongID', 'SongTitle', 'RowVersion')),
+    ),
+}
+
+# (parent list, child list) → predicate on the child's view selecting the rows
+# related to one parent; every `?` is bound to the parent's key.  Each one is
+# a key-based semi-join on the association table, backed by an index that
+# leads with the parent's column (ddl.sql).
+RELATIONS = {
+    ('contributors', 'songs'):
+        "SongID IN (SELECT Song_SongID FROM dbo.Contributor_Song"
+        " WHERE Contributor_ContributorID = ?)",
+    ('contributors', 'collaborations'):
+        "CollaborationID IN (SELECT Collaboration_CollaborationID FROM dbo.Collaboration_Contributor"
+        " WHERE Contributor_ContributorID = ?)",
+    ('record_labels', 'employees'):
+        "RecordLabelID = ?",
+    # A label takes part in a collaboration on either side of the pair
+    ('record_labels', 'collaborations'):
+        "CollaborationID IN (SELECT Collaboration_CollaborationID FROM dbo.RecordLabel_Collaboration"
+        " WHERE RecordLabel_RecordLabelID1 = ?"
+        " UNION SELECT Collaboration_CollaborationID FROM dbo.RecordLabel_Collaboration"
+        " WHERE RecordLabel_RecordLabelID2 = ?)",
+    ('songs', 'contributors'):
+        "ContributorID IN (SELECT Contributor_ContributorID FROM dbo.Contributor_Song"
+        " WHERE Song_SongID = ?)",
+}
+
+
+def sort_args(name: str):
+    """Read and validate the `sort` query parameter for list `name` (400 if invalid)."""
+    try:
+        return LIST_QUERIES[name].parse_sort(request.args.get('sort', ''))
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+def fields_args(name: str):
+    """Read and validate the `fields` query parameter for list `name` (400 if invalid)."""
+    try:
+        return LIST_QUERIES[name].parse_fields(request.args.get('fields', ''))
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+def date_range_args(low: str, high: str):
+    """
+    Read two optional YYYY-MM-DD query parameters bounding a date range.
+
+    Returns:
+        (low, high) as dates, each None when absent (400 if malformed or reversed).
+    """
+    bounds = []
+    for name in (low, high):
+        value = request.args.get(name)
+        try:
+            bounds.append(date.fromisoformat(value) if value else None)
+        except ValueError:
+            abort(400, description=f"{name} must be a date (YYYY-MM-DD), got {value!r}")
+    if None not in bounds and bounds[0] > bounds[1]:
+        abort(400, description=f"{low} must not be after {high}")
+    return tuple(bounds)
+
+
+def run_list_query(cursor: pyodbc.Cursor, name: str, *args, sort=(), fields=None) -> pyodbc.Cursor:
+    """
+    Run a registered list query.
+
+    Args:
+        cursor: An open cursor.
+        name: Entity name, e.g. 'songs'.
+        *args: Filter values in declaration order, then `after` and `limit`.
+        sort: Parsed sort, from sort_args(); empty for primary key order.
+        fields: Projected columns, from fields_args(); None for all.
+
+    Returns:
+        The cursor, ready for fetchone()/fetchall().
+
+    Raises:
+        KeyError: If the list is not registered.
+    """
+    return LIST_QUERIES[name].execute(cursor, *args, sort=sort, fields=fields)
+
+
+def run_related_query(cursor: pyodbc.Cursor, parent: str, parent_key, child: str, *args,
+                      sort=(), fields=None) -> pyodbc.Cursor:
+    """
+    Run the `child` list query restricted to the rows related to one `parent`
+    row (see RELATIONS), e.g. the songs of contributor 7.
+
+    Args:
+        *args: The child list's filter values, then `after` and `limit`.
+
+    Raises:
+        KeyError: If the relation is not registered.
+    """
+    within = (RELATIONS[(parent, child)], parent_key)
+    return LIST_QUERIES[child].execute(cursor, *args, sort=sort, fields=fields, within=within)
+
+
+def run_detail_query(cursor: pyodbc.Cursor, name: str, key_value, fields) -> pyodbc.Cursor:
+    """
+    Read one row of a registered list by key, projected to `fields`
+    (from fields_args()).  Without a projection the detail endpoints call
+    their sp_Get*ByID procedure instead.
+    """
+    return LIST_QUERIES[name].get(cursor, key_value, fields)
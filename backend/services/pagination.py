@@ -0,0 +1,29 @@
+# backend/services/pagination.py
+"""
+Keyset pagination for the list endpoints.
+
+`GET /api/<entity>?limit=N` returns at most N rows ordered by primary key;
+`&after=<ID>` continues after the last ID of the previous page.  A page
+shorter than `limit` is the last one.  Without `limit` the whole filtered
+list is returned, as before.  Keyset pages stay cheap however deep the client
+scrolls (the list queries seek on the clustered primary key instead of
+counting past an OFFSET) and never skip or repeat rows when others insert
+or delete meanwhile.
+"""
+from flask import request, abort
+
+from config.config import Config
+
+
+def page_args():
+    """
+    Read the `after` and `limit` query parameters.
+
+    Returns:
+        (after, limit): Both None when the client asked for the full list.
+    """
+    after = request.args.get('after', type=int)
+    limit = request.args.get('limit', type=int)
+    if limit is not None and not 1 <= limit <= Config.MAX_PAGE_SIZE:
+        abort(400, description=f"limit must be between 1 and {Config.MAX_PAGE_SIZE}")
+    return after, limit
@@ -0,0 +1,456 @@
+# backend/services/procedures.py
+"""
+Central registry of the stored procedures called by the API blueprints.
+
+Each procedure is declared once, with the SQL type of every parameter.  From
+that declaration we build the call text a single time and bind parameters with
+`cursor.setinputsizes`, so every request sends SQL Server byte-identical text
+with identical parameter types.  That keeps one cached plan per procedure
+instead of one per (literal length, Python type) combination.  pyodbc keeps
+a cursor's input sizes for every later statement, so execute_bound() clears
+them once the statement has run: the next one on the cursor never inherits
+them.
+
+Procedures without OUTPUT parameters are invoked through the ODBC escape
+`{CALL dbo.sp_X (?, ...)}`.  pyodbc cannot read OUTPUT parameters directly, so
+procedures that have them are wrapped in a fixed DECLARE / EXEC / SELECT batch
+whose single result row has one column per OUTPUT parameter, named after it.
+"""
+import re
+
+import pyodbc
+
+_SQL_TYPES = {
+    'INT':       pyodbc.SQL_INTEGER,
+    'BIT':       pyodbc.SQL_BIT,
+    'DATE':      pyodbc.SQL_TYPE_DATE,
+    'DECIMAL':   pyodbc.SQL_DECIMAL,
+    'VARCHAR':   pyodbc.SQL_VARCHAR,
+    'TEXT':      pyodbc.SQL_LONGVARCHAR,
+    'BINARY':    pyodbc.SQL_BINARY,
+    'VARBINARY': pyodbc.SQL_VARBINARY,
+}
+
+# Column sizes for types that take no length argument
+_FIXED_SIZES = {'DATE': 10}
+
+_CHARACTER_TYPES = {'VARCHAR', 'TEXT'}
+
+_TYPE_RE = re.compile(r'^(\w+)(?:\((MAX|\d+)(?:\s*,\s*(\d+))?\))?$', re.IGNORECASE)
+
+
+class Param:
+    """
+    A single stored-procedure parameter.
+
+    Args:
+        name: Parameter name, without the leading '@'.
+        sql_type: T-SQL type exactly as declared in the procedure, e.g. 'VARCHAR(20)',
+            'DECIMAL(10,2)', 'VARCHAR(MAX)' or 'DATE'.
+        output: True if the parameter is declared OUTPUT.
+    """
+
+    def __init__(self, name: str, sql_type: str, output: bool = False):
+        match = _TYPE_RE.match(sql_type.strip())
+        if not match or match.group(1).upper() not in _SQL_TYPES:
+            raise ValueError(f"Unsupported SQL type for @{name}: {sql_type!r}")
+
+        base, size, scale = match.groups()
+        base = base.upper()
+
+        self.name = name
+        self.sql_type = sql_type
+        self.output = output
+        self.is_character = base in _CHARACTER_TYPES
+        # VARCHAR(MAX) is bound with size 0
+        size = 0 if size is None or size.upper() == 'MAX' else int(size)
+        self.binding = (_SQL_TYPES[base], size or _FIXED_SIZES.get(base, 0), int(scale or 0))
+
+    def coerce(self, value):
+        """
+        Normalise a request value before binding.
+
+        Empty strings coming from HTML forms are sent as NULL for non-character
+        parameters, since they cannot be converted to INT/DATE/DECIMAL.
+        """
+        if value == '' and not self.is_character:
+            return None
+        return value
+
+
+class StoredProcedure:
+    """
+    A stored procedure with a fixed parameter list and prebuilt call text.
+
+    Args:
+        name: Procedure name (schema 'dbo' is implied).
+        *params: Parameters in declaration order.
+    """
+
+    def __init__(self, name: str, *params: Param):
+        self.name = name
+        self.params = params
+        self.inputs = [p for p in params if not p.output]
+        self.outputs = [p for p in params if p.output]
+        self.input_sizes = [p.binding for p in self.inputs]
+        self.sql = self._build_sql()
+
+    def _build_sql(self) -> str:
+        if not self.outputs:
+            if not self.inputs:
+                return f"{{CALL dbo.{self.name}}}"
+            placeholders = ', '.join('?' for _ in self.inputs)
+            return f"{{CALL dbo.{self.name} ({placeholders})}}"
+
+        declares = ' '.join(f"DECLARE @{p.name} {p.sql_type};" for p in self.outputs)
+        assignments = ', '.join(
+            f"@{p.name} = @{p.name} OUTPUT" if p.output else f"@{p.name} = ?"
+            for p in self.params
+        )
+        selects = ', '.join(f"@{p.name} AS {p.name}" for p in self.outputs)
+        return (
+            f"SET NOCOUNT ON; {declares} "
+            f"EXEC dbo.{self.name} {assignments}; "
+            f"SELECT {selects};"
+        )
+
+    def execute(self, cursor: pyodbc.Cursor, *args) -> pyodbc.Cursor:
+        """
+        Bind `args` (one per input parameter, in declaration order) and run the procedure.
+
+        Returns:
+            The cursor, positioned on the procedure's first result set (or on the
+            OUTPUT-parameter row for procedures that have OUTPUT parameters).
+
+        Raises:
+            TypeError: If the number of arguments does not match the input parameters.
+        """
+        if len(args) != len(self.inputs):
+            raise TypeError(
+                f"{self.name} expects {len(self.inputs)} arguments, got {len(args)}"
+            )
+        values = [p.coerce(v) for p, v in zip(self.inputs, args)]
+        return execute_bound(cursor, self.sql, self.input_sizes, *values)
+
+
+def execute_bound(cursor: pyodbc.Cursor, sql: str, input_sizes, *params) -> pyodbc.Cursor:
+    """
+    Run `sql` with its parameters bound as `input_sizes`, then clear them.
+
+    The input sizes would otherwise apply to the next statement run on the
+    cursor, e.g. a key list bound as sp_GetChanges' BINARY(8) @Since.
+    """
+    cursor.setinputsizes(input_sizes)
+    try:
+        return cursor.execute(sql, *params)
+    finally:
+        cursor.setinputsizes(None)
+
+
+PROCEDURES = {sp.name: sp for sp in (
+    # ---------- Record labels ----------
+    StoredProcedure(
+        'sp_GetRecordLabels',
+        Param('Name', 'VARCHAR(255)'),
+        Param('Location', 'VARCHAR(255)'),
+        Param('Website', 'VARCHAR(255)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('Phone', 'VARCHAR(50)'),
+        Param('AfterID', 'INT'),
+        Param('Limit', 'INT'),
+    ),
+    StoredProcedure('sp_GetRecordLabelByID', Param('ID', 'INT')),
+    StoredProcedure(
+        'sp_CreateRecordLabel',
+        Param('Name', 'VARCHAR(255)'),
+        Param('Location', 'VARCHAR(255)'),
+        Param('Website', 'VARCHAR(255)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('NewID', 'INT', output=True),
+    ),
+    StoredProcedure(
+        'sp_UpdateRecordLabel',
+        Param('ID', 'INT'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('Location', 'VARCHAR(255)'),
+        Param('Website', 'VARCHAR(255)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('ExpectedRowVersion', 'VARBINARY(16)'),
+    ),
+    StoredProcedure('sp_DeleteRecordLabel', Param('ID', 'INT')),
+    StoredProcedure(
+        'sp_CheckRecordLabelDependencies',
+        Param('ID', 'INT'),
+        Param('EmployeeCount', 'INT', output=True),
+        Param('CollaborationCount', 'INT', output=True),
+    ),
+    StoredProcedure('sp_DeleteRecordLabel_Cascade', Param('ID', 'INT')),
+    StoredProcedure(
+        'sp_DeleteRecordLabel_CascadeBatch',
+        Param('ID', 'INT'),
+        Param('BatchSize', 'INT'),
+        Param('Deleted', 'INT', output=True),
+        Param('Done', 'BIT', output=True),
+    ),
+
+    # ---------- Persons ----------
+    StoredProcedure('sp_GetPersonByNIF', Param('NIF', 'VARCHAR(20)')),
+    StoredProcedure(
+        'sp_UpdatePerson',
+        Param('NIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'DATE'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+    ),
+
+    # ---------- Employees ----------
+    StoredProcedure(
+        'sp_GetEmployees',
+        Param('NIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('JobTitle', 'VARCHAR(100)'),
+        Param('Department', 'VARCHAR(100)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('Phone', 'VARCHAR(50)'),
+        Param('MinSalary', 'DECIMAL(10,2)'),
+        Param('HiredFrom', 'DATE'),
+        Param('HiredTo', 'DATE'),
+        Param('RecordLabel', 'VARCHAR(255)'),
+        Param('AfterID', 'INT'),
+        Param('Limit', 'INT'),
+    ),
+    StoredProcedure('sp_GetEmployeeByID', Param('ID', 'INT')),
+    StoredProcedure(
+        'sp_UpsertEmployee',
+        Param('NIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'DATE'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('JobTitle', 'VARCHAR(100)'),
+        Param('Department', 'VARCHAR(100)'),
+        Param('Salary', 'DECIMAL(10,2)'),
+        Param('HireDate', 'DATE'),
+        Param('RecordLabelID', 'INT'),
+        Param('ConflictPolicy', 'VARCHAR(10)'),
+    ),
+    StoredProcedure(
+        'sp_UpdateEmployee',
+        Param('EmployeeID', 'INT'),
+        Param('NewNIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'DATE'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('JobTitle', 'VARCHAR(100)'),
+        Param('Department', 'VARCHAR(100)'),
+        Param('Salary', 'DECIMAL(10,2)'),
+        Param('HireDate', 'DATE'),
+        Param('RecordLabelID', 'INT'),
+        Param('ExpectedRowVersion', 'VARBINARY(16)'),
+    ),
+    StoredProcedure('sp_DeleteEmployee', Param('ID', 'INT')),
+    StoredProcedure('sp_GetEmployeeDependencies', Param('EmployeeID', 'INT')),
+
+    # ---------- Contributors ----------
+    StoredProcedure(
+        'sp_GetContributors',
+        Param('Name', 'VARCHAR(255)'),
+        Param('Role', 'VARCHAR(50)'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('Phone', 'VARCHAR(50)'),
+        Param('NIF', 'VARCHAR(20)'),
+        Param('RecordLabel', 'VARCHAR(255)'),
+        Param('AfterID', 'INT'),
+        Param('Limit', 'INT'),
+    ),
+    StoredProcedure('sp_GetContributorByID', Param('ID', 'INT')),
+    StoredProcedure(
+        'sp_UpsertContributor',
+        Param('NIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'DATE'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('Roles', 'VARCHAR(MAX)'),
+        Param('ConflictPolicy', 'VARCHAR(10)'),
+    ),
+    StoredProcedure(
+        'sp_UpdateContributor',
+        Param('ID', 'INT'),
+        Param('NewNIF', 'VARCHAR(20)'),
+        Param('Name', 'VARCHAR(255)'),
+        Param('DateOfBirth', 'DATE'),
+        Param('Email', 'VARCHAR(255)'),
+        Param('PhoneNumber', 'VARCHAR(50)'),
+        Param('Roles', 'VARCHAR(MAX)'),
+        Param('ExpectedRowVersion', 'VARBINARY(16)'),
+    ),
+    StoredProcedure('sp_DeleteContributor', Param('ID', 'INT')),
+    StoredProcedure('sp_GetContributorDependencies', Param('ContributorID', 'INT')),
+
+    # ---------- Songs ----------
+    StoredProcedure(
+        'sp_GetSongs',
+        Param('Title', 'VARCHAR(255)'),
+        Param('MinDuration', 'INT'),
+        Param('MaxDuration', 'INT'),
+        Param('ReleaseDate', 'DATE'),
+        Param('ReleasedFrom', 'DATE'),
+        Param('ReleasedTo', 'DATE'),
+        Param('Genre', 'VARCHAR(50)'),
+        Param('Contributor', 'VARCHAR(255)'),
+        Param('Collaboration', 'VARCHAR(255)'),
+        Param('AfterID', 'INT'),
+        Param('Limit', 'INT'),
+    ),
+    StoredProcedure('sp_GetSongByID', Param('ID', 'INT')),
+    StoredProcedure('sp_GetSongDependencies', Param('SongID', 'INT')),
+    StoredProcedure(
+        'sp_CreateSong',
+        Param('Title', 'VARCHAR(255)'),
+        Param('Duration', 'INT'),
+        Param('ReleaseDate', 'DATE'),
+        Param('Genres', 'VARCHAR(MAX)'),
+        Param('Contributors', 'VARCHAR(MAX)'),
+        Param('NewID', 'INT', output=True),
+    ),
+    StoredProcedure(
+        'sp_UpdateSong',
+        Param('ID', 'INT'),
+        Param('Title', 'VARCHAR(255)'),
+        Param('Duration', 'INT'),
+        Param('ReleaseDate', 'DATE'),
+        Param('Genres', 'VARCHAR(MAX)'),
+        Param('Contributors', 'VARCHAR(MAX)'),
+        Param('ExpectedRowVersion', 'VARBINARY(16)'),
+    ),
+    StoredProcedure('sp_DeleteSong', Param('ID', 'INT')),
+
+    # ---------- Collaborations ----------
+    StoredProcedure(
+        'sp_GetCollaborations',
+        Param('Name', 'VARCHAR(255)'),
+        Param('Start', 'DATE'),
+        Param('End', 'DATE'),
+        Param('ActiveFrom', 'DATE'),
+        Param('ActiveTo', 'DATE'),
+        Param('Song', 'VARCHAR(255)'),
+        Param('Label', 'VARCHAR(255)'),
+        Param('Contributor', 'VARCHAR(255)'),
+        Param('AfterID', 'INT'),
+        Param('Limit', 'INT'),
+    ),
+    StoredProcedure('sp_GetCollaborationByID', Param('ID', 'INT')),
+    StoredProcedure(
+        'sp_CreateCollaboration',
+        Param('CollaborationName', 'VARCHAR(255)'),
+        Param('StartDate', 'DATE'),
+        Param('EndDate', 'DATE'),
+        Param('Description', 'TEXT'),
+        Param('SongID', 'INT'),
+        Param('RecordLabels', 'VARCHAR(MAX)'),
+        Param('Contributors', 'VARCHAR(MAX)'),
+        Param('RecordLabelIDs', 'VARCHAR(MAX)'),
+        Param('ContributorIDs', 'VARCHAR(MAX)'),
+        Param('NewID', 'INT', output=True),
+    ),
+    StoredProcedure(
+        'sp_UpdateCollaboration',
+        Param('ID', 'INT'),
+        Param('CollaborationName', 'VARCHAR(255)'),
+        Param('StartDate', 'DATE'),
+        Param('EndDate', 'DATE'),
+        Param('Description', 'TEXT'),
+        Param('SongID', 'INT'),
+        Param('RecordLabels', 'VARCHAR(MAX)'),
+        Param('Contributors', 'VARCHAR(MAX)'),
+        Param('RecordLabelIDs', 'VARCHAR(MAX)'),
+        Param('ContributorIDs', 'VARCHAR(MAX)'),
+        Param('ExpectedRowVersion', 'VARBINARY(16)'),
+    ),
+    StoredProcedure('sp_DeleteCollaboration', Param('ID', 'INT')),
+
+    # ---------- Dashboard ----------
+    StoredProcedure('sp_GetDashboardCounts'),
+
+    # ---------- Catalog statistics ----------
+    StoredProcedure(
+        'sp_RefreshStats',
+        Param('Rollups', 'VARCHAR(255)'),
+        Param('Songs', 'VARCHAR(MAX)'),
+        Param('Employees', 'VARCHAR(MAX)'),
+        Param('Contributors', 'VARCHAR(MAX)'),
+        Param('Collaborations', 'VARCHAR(MAX)'),
+        Param('RecordLabels', 'VARCHAR(MAX)'),
+    ),
+    StoredProcedure('sp_GetGenreStats'),
+    StoredProcedure('sp_GetContributorStats', Param('Limit', 'INT')),
+    StoredProcedure('sp_GetLabelStats'),
+    StoredProcedure('sp_GetReleaseDateStats', Param('Bucket', 'VARCHAR(10)')),
+    StoredProcedure('sp_GetLabelPairStats', Param('Limit', 'INT')),
+
+    # ---------- Background jobs ----------
+    StoredProcedure(
+        'sp_SaveJob',
+        Param('JobID', 'VARCHAR(36)'),
+        Param('Kind', 'VARCHAR(50)'),
+        Param('Status', 'VARCHAR(20)'),
+        Param('Progress', 'INT'),
+        Param('Message', 'VARCHAR(MAX)'),
+    ),
+    StoredProcedure('sp_GetJob', Param('JobID', 'VARCHAR(36)')),
+
+    # ---------- Change feed ----------
+    StoredProcedure(
+        'sp_GetChanges',
+        Param('Since', 'BINARY(8)'),
+        Param('Entity', 'VARCHAR(255)'),
+        Param('Limit', 'INT'),
+    ),
+
+    # ---------- Idempotency keys ----------
+    StoredProcedure(
+        'sp_ClaimIdempotencyKey',
+        Param('IdempotencyKey', 'VARCHAR(255)'),
+        Param('Fingerprint', 'BINARY(32)'),
+        Param('TTLSeconds', 'INT'),
+        Param('LockSeconds', 'INT'),
+    ),
+    StoredProcedure(
+        'sp_SaveIdempotentResponse',
+        Param('IdempotencyKey', 'VARCHAR(255)'),
+        Param('StatusCode', 'INT'),
+        Param('Headers', 'VARCHAR(MAX)'),
+        Param('Body', 'VARBINARY(MAX)'),
+    ),
+    StoredProcedure('sp_ReleaseIdempotencyKey', Param('IdempotencyKey', 'VARCHAR(255)')),
+
+    # ---------- Bulk import ----------
+    StoredProcedure('sp_ImportRecordLabels', Param('ImportID', 'VARCHAR(36)')),
+    StoredProcedure('sp_ImportEmployees', Param('ImportID', 'VARCHAR(36)')),
+    StoredProcedure('sp_ImportContributors', Param('ImportID', 'VARCHAR(36)')),
+    StoredProcedure('sp_ImportSongs', Param('ImportID', 'VARCHAR(36)')),
+    StoredProcedure('sp_ClearImport', Param('ImportID', 'VARCHAR(36)')),
+)}
+
+
+def call_procedure(cursor: pyodbc.Cursor, name: str, *args) -> pyodbc.Cursor:
+    """
+    Execute a registered stored procedure on `cursor`.
+
+    Args:
+        cursor: An open cursor (from DatabaseConfig.get_connection()).
+        name: Registered procedure name, e.g. 'sp_GetSongs'.
+        *args: Input parameter values in declaration order.
+
+    Returns:
+        The cursor, ready for fetchone()/fetchall().
+
+    Raises:
+        KeyError: If the procedure is not registered.
+    """
+    return PROCEDURES[name].execute(cursor, *args)
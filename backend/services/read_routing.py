@@ -0,0 +1,50 @@
+# backend/services/read_routing.py
+"""
+Read-your-writes on top of DatabaseConfig's replica routing.
+
+GET handlers read from replicas, which may lag behind the primary.  So that a
+client always sees its own changes, every successful write response sets a
+short-lived cookie (DB_READ_YOUR_WRITES_SECONDS); while it is present, that
+client's reads are pinned to the primary.  Reads made inside a write request
+itself (e.g. returning the created row) always use the primary.
+
+The in-process list snapshot (snapshot.py) lags like a replica for writes
+made by other workers, so the cookie is also set when it is enabled, and the
+snapshot is bypassed while reads are pinned.
+"""
+import math
+import time
+
+from flask import request
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+
+PIN_COOKIE = 'primary_until'
+
+_READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _pin_reads():
+    if request.method not in _READ_METHODS:
+        DatabaseConfig.read_from_primary(True)
+        return
+    pinned_until = request.cookies.get(PIN_COOKIE, type=float)
+    DatabaseConfig.read_from_primary(bool(pinned_until and pinned_until > time.time()))
+
+
+def _pin_after_write(response):
+    window = DatabaseConfig.READ_YOUR_WRITES_SECONDS
+    if (request.method not in _READ_METHODS and response.status_code < 400
+            and (DatabaseConfig.REPLICAS or Config.SNAPSHOT_LISTS) and window > 0):
+        response.set_cookie(
+            PIN_COOKIE, f"{time.time() + window:.3f}",
+            max_age=math.ceil(window), httponly=True, samesite='Lax'
+        )
+    return response
+
+
+def register_read_your_writes(app):
+    """Install the request hooks on `app`."""
+    app.before_request(_pin_reads)
+    app.after_request(_pin_after_write)
@@ -0,0 +1,194 @@
+# backend/services/references.py
+"""
+In-process reference data for the collaboration write paths: RecordLabel
+name → RecordLabelID and Person NIF → ContributorID.
+
+sp_CreateCollaboration and sp_UpdateCollaboration used to take the labels
+and contributors as comma-separated names and NIFs and resolve them inside
+their transaction, one by one, silently skipping any that did not match (a
+typo only showed up later, e.g. as a collaboration removed by a link-count
+trigger).  The handlers now resolve them here first: an unknown name or NIF
+is a 400 listing all of them before any transaction starts, and the
+procedures receive the resolved IDs (@RecordLabelIDs, @ContributorIDs).
+
+Each ReferenceMap is versioned by its position in the change feed
+(dbo.ChangeLog).  Before every resolution it reads the feed entries of its
+entity after that position, a seek on IX_ChangeLog_RowVer that normally
+returns nothing, and re-reads only the keys they name, so writes made by any
+worker are seen at once.  Every Config.REFERENCE_CACHE_SECONDS a map is
+reloaded anyway (rows removed without a feed entry, e.g. by a schema reset
+in another process), and a local reset (`db`) clears it.
+"""
+import threading
+import time
+
+from flask import abort
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.events import add_change_listener
+from backend.services.procedures import call_procedure
+
+logger = get_logger(__name__)
+
+_KEYS = "SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ',')"
+
+# Feed entries read per round trip
+_FEED_PAGE = 5000
+
+
+def _normalize(name: str) -> str:
+    """Names compare like the database does: trimmed, case-insensitive."""
+    return name.strip().casefold()
+
+
+def split_names(value):
+    """The distinct non-empty items of a comma-separated string (or list), in order."""
+    items = value.split(',') if isinstance(value, str) else value
+    return list(dict.fromkeys(str(item).strip() for item in items if str(item).strip()))
+
+
+class ReferenceMap:
+    """
+    Name → ID map of one entity, kept current from the change feed.
+
+    Args:
+        entity: Feed entity whose entries change the map (keyed by ID).
+        sql: Query returning (ID, name) rows; `{where}` is replaced by a
+            filter on the IDs when only some of them are re-read.
+        id_column: The ID column, for that filter.
+    """
+
+    def __init__(self, entity: str, sql: str, id_column: str):
+        self.entity = entity
+        self.sql = sql
+        self.id_column = id_column
+        self._ids = {}          # normalized name → ID
+        self._names = {}        # ID → normalized name
+        self._position = None   # feed position the map includes
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def resolve(self, cursor, names):
+        """
+        IDs of `names`.
+
+        Returns:
+            (ids, missing): the IDs in the order of `names`, and the names
+            that match nothing.
+        """
+        with self._lock:
+            self._refresh(cursor)
+            ids = [self._ids.get(_normalize(n)) for n in names]
+        return [i for i in ids if i is not None], [n for n, i in zip(names, ids) if i is None]
+
+    def _read(self, cursor, where: str = '', *params):
+        cursor.execute(self.sql.format(where=where), *params)
+        return cursor.fetchall()
+
+    def _refresh(self, cursor):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > Config.REFERENCE_CACHE_SECONDS:
+            self._load(cursor)
+            return
+
+        changed, position = set(), self._position
+        while True:
+            entries = call_procedure(cursor, 'sp_GetChanges', position, self.entity, _FEED_PAGE).fetchall()
+            changed |= {int(e.EntityKey) for e in entries}
+            if entries:
+                position = bytes(entries[-1].RowVer)
+            if len(entries) < _FEED_PAGE:
+                break
+        if not changed:
+            return
+
+        # Deleted IDs are simply not found again
+        rows = self._read(cursor, f" WHERE {self.id_column} IN ({_KEYS})", ','.join(map(str, sorted(changed))))
+        for key in changed:
+            name = self._names.pop(key, None)
+            if name is not None and self._ids.get(name) == key:
+                del self._ids[name]
+        for key, name in rows:
+            self._ids[_normalize(name)] = key
+            self._names[key] = _normalize(name)
+        self._position = position
+
+    def _load(self, cursor):
+        cursor.execute("SELECT MAX(RowVer) FROM dbo.ChangeLog WHERE RowVer < MIN_ACTIVE_ROWVERSION()")
+        row = cursor.fetchone()
+        position = bytes(row[0]) if row and row[0] is not None else None
+        rows = self._read(cursor)
+        self._ids = {_normalize(name): key for key, name in rows}
+        self._names = {key: _normalize(name) for key, name in rows}
+        self._position = position
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(rows)} {self.entity} references")
+
+
+RECORD_LABELS = ReferenceMap(
+    'record_labels', "SELECT RecordLabelID, Name FROM dbo.RecordLabel{where}", 'RecordLabelID'
+)
+CONTRIBUTORS = ReferenceMap(
+    'contributors', "SELECT ContributorID, Person_NIF FROM dbo.Contributor{where}", 'ContributorID'
+)
+
+
+def _resolve(cursor, references: ReferenceMap, value):
+    """(comma-separated IDs of the names in `value`, names not found); None stays None."""
+    if value is None:
+        return None, []
+    ids, missing = references.resolve(cursor, split_names(value))
+    return ','.join(map(str, ids)), missing
+
+
+def resolve_collaboration_references(record_labels, contributors):
+    """
+    Resolve a collaboration's record label names and contributor NIFs.
+
+    Args:
+        record_labels: Comma-separated RecordLabel names (or a list), or None.
+        contributors: Comma-separated Person NIFs (or a list), or None.
+
+    Returns:
+        (record_label_ids, contributor_ids), comma-separated, for the
+        procedures' @RecordLabelIDs and @ContributorIDs (None where the input
+        is None).
+
+    Raises:
+        400 (via abort) naming every label and NIF that matches nothing.
+    """
+    if record_labels is None and contributors is None:
+        return None, None
+    conn = DatabaseConfig.get_connection()     # primary: must see the latest writes
+    try:
+        conn.autocommit = True
+        cursor = conn.cursor()
+        label_ids, unknown_labels = _resolve(cursor, RECORD_LABELS, record_labels)
+        contributor_ids, unknown_contributors = _resolve(cursor, CONTRIBUTORS, contributors)
+    finally:
+        conn.close()
+
+    unknown = []
+    if unknown_labels:
+        unknown.append(f"Unknown record labels: {', '.join(unknown_labels)}")
+    if unknown_contributors:
+        unknown.append(f"Unknown contributors (NIF): {', '.join(unknown_contributors)}")
+    if unknown:
+        abort(400, description='; '.join(unknown))
+    return label_ids, contributor_ids
+
+
+def _clear_on_reset(entity: str, operation: str = None):
+    if entity == 'db':
+        RECORD_LABELS.clear()
+        CONTRIBUTORS.clear()
+
+
+def register_references(app):
+    """Forget the reference maps when the database is reset through `app`."""
+    add_change_listener(_clear_on_reset)
@@ -0,0 +1,187 @@
+# backend/services/rollups.py
+"""
+Catalog statistics rollups behind /api/dashboard/stats/*.
+
+Songs per genre, songs per contributor, catalog duration per label, the
+release-date histogram and collaborations per label pair are joins over the
+whole catalog.  They are kept precomputed in the Stats_* tables instead, so
+reading one is a scan of a few summary rows.  sp_RefreshStats recomputes
+either every group of the rollups it is given or, given the keys of the rows
+that changed, only the groups those rows are in or were in before the change,
+and MERGEs them in, writing only the rows that changed.
+
+The RollupRefresher keeps them current from a single background thread:
+
+  * after every published change (backend/services/events.py) it waits
+    Config.STATS_REFRESH_DELAY, reads the change feed (dbo.ChangeLog) from
+    where it last stopped and refreshes the rollups for the changed keys, so
+    a burst of writes or an import costs one refresh, in proportion to the
+    rows it touched rather than to the catalog;
+  * at startup, after a schema reset and every Config.STATS_REFRESH_SECONDS
+    all rollups are recomputed in full, which also repairs anything the feed
+    does not show.
+
+Each stats response carries the rollup's RefreshedAt, so clients can tell
+how current it is.
+"""
+import threading
+import time
+
+import pyodbc
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.events import add_change_listener
+from backend.services.procedures import call_procedure
+
+logger = get_logger(__name__)
+
+# Rollup → the change feed entities whose keys it is refreshed for (Person
+# writes are logged to the feed as updates of their employees and contributors)
+ROLLUP_SOURCES = {
+    'genres':        ('songs',),
+    'contributors':  ('songs', 'contributors'),
+    'labels':        ('songs', 'employees', 'contributors', 'collaborations', 'record_labels'),
+    'release_dates': ('songs',),
+    'label_pairs':   ('collaborations', 'record_labels'),
+}
+
+ROLLUPS = tuple(ROLLUP_SOURCES)
+
+# The feed entities of sp_RefreshStats' key parameters, in parameter order
+KEY_ENTITIES = ('songs', 'employees', 'contributors', 'collaborations', 'record_labels')
+
+# Feed entries read per round trip
+_FEED_PAGE = 5000
+
+
+def rollups_reading(entity: str) -> set:
+    """The rollups a change to `entity` can make stale ('db': all of them)."""
+    if entity == 'db':
+        return set(ROLLUPS)
+    return {rollup for rollup, sources in ROLLUP_SOURCES.items() if entity in sources}
+
+
+def refresh_rollups(rollups=None, changed=None):
+    """
+    Run sp_RefreshStats and commit.
+
+    Args:
+        rollups: Rollups to refresh (None: all).
+        changed: Feed entity → keys of its changed rows, to refresh only the
+            groups they touch; None recomputes every group.
+    """
+    start = time.perf_counter()
+    keys = [','.join(map(str, sorted(changed[e]))) if changed and changed.get(e) else None
+            for e in KEY_ENTITIES]
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        call_procedure(cursor, 'sp_RefreshStats', ','.join(sorted(rollups)) if rollups else None, *keys)
+        conn.commit()
+    except pyodbc.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    scope = f"for {sum(len(k) for k in changed.values())} changed rows" if changed else "in full"
+    logger.info(
+        f"Refreshed stats rollups {', '.join(sorted(rollups or ROLLUPS))} {scope} "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+
+class RollupRefresher:
+    """
+    Background thread that refreshes the rollups for the changes in the feed
+    after writes, and recomputes all of them on a schedule.
+    """
+
+    def __init__(self):
+        self._full = True           # recomputed once at startup
+        self._position = None       # feed position the rollups include
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stats-rollups', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def mark_stale(self, entity: str, operation: str = None):
+        """Refresh the rollups for the changes in the feed shortly (in full after a reset)."""
+        if entity == 'db':
+            with self._lock:
+                self._full = True
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            woken = self._wake.wait(timeout=Config.STATS_REFRESH_SECONDS or None)
+            if woken:
+                time.sleep(Config.STATS_REFRESH_DELAY)     # coalesce a burst of writes
+                self._wake.clear()
+            with self._lock:
+                full = self._full or not woken
+                self._full = False
+            try:
+                if full:
+                    self._refresh_all()
+                else:
+                    self._apply_changes()
+            except Exception as e:
+                # e.g. the Stats_* tables do not exist before the schema is initialized
+                logger.warning(f"Could not refresh stats rollups: {e}")
+                if full:
+                    with self._lock:
+                        self._full = True
+
+    def _refresh_all(self):
+        """Recompute every rollup, from the feed position before it started."""
+        conn = DatabaseConfig.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(RowVer) FROM dbo.ChangeLog WHERE RowVer < MIN_ACTIVE_ROWVERSION()")
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+        refresh_rollups()
+        # Changes after `position` may already be counted; refreshing them again is harmless
+        self._position = bytes(row[0]) if row and row[0] is not None else None
+
+    def _apply_changes(self):
+        """Refresh the rollups for the feed entries after the current position."""
+        changed, position = {}, self._position
+        conn = DatabaseConfig.get_connection()  # primary: the feed must include the local writes
+        try:
+            cursor = conn.cursor()
+            while True:
+                entries = call_procedure(
+                    cursor, 'sp_GetChanges', position, ','.join(KEY_ENTITIES), _FEED_PAGE
+                ).fetchall()
+                for entry in entries:
+                    changed.setdefault(entry.Entity, set()).add(int(entry.EntityKey))
+                if entries:
+                    position = bytes(entries[-1].RowVer)
+                if len(entries) < _FEED_PAGE:
+                    break
+        finally:
+            conn.close()
+
+        rollups = set().union(*(rollups_reading(entity) for entity in changed))
+        if rollups:
+            refresh_rollups(rollups, changed)
+        self._position = position
+
+
+refresher = RollupRefresher()
+
+
+def register_rollups(app):
+    """Keep the rollups current while `app` serves requests."""
+    add_change_listener(refresher.mark_stale)
+    refresher.start()
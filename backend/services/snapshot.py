@@ -0,0 +1,574 @@
+# backend/services/snapshot.py
+"""
+Optional in-process columnar snapshot of the songs, contributors, employees
+and record label lists (Config.SNAPSHOT_LISTS; needs NumPy 2).
+
+The list pages are read far more often than the catalog changes, and every
+read costs a round trip and a query even with the compiled list queries.
+With the snapshot enabled, each listed view is held in memory as a NumPy
+structured array, one field per view column, sorted by key:
+
+  * strings are interned per column: the field holds an int32 code into the
+    column's vocabulary (-1: NULL), and `contains` filters are a single
+    vectorized substring search over the (lower-cased) vocabulary, mapped
+    back to the rows through the codes;
+  * dates are datetime64[D] (NaT: NULL), Salary is float64 (NaN: NULL),
+    keys and durations int64, RowVersion the raw 8 bytes.
+
+snapshot_rows() answers a list request from it: every filter of the list
+(list_queries.LIST_QUERIES) becomes a boolean mask with the predicate's SQL
+NULL semantics, then `after` and `limit` are applied in key order.  It
+returns None, and the endpoint reads SQL Server as usual, whenever the
+snapshot cannot answer exactly as the database would:
+
+  * the list is not enabled or not loaded yet, or has local writes that
+    the refresher has not applied yet (so a process reads its own writes);
+  * reads of the request are pinned to the primary (read_routing.py, which
+    sets the pin after writes whenever the snapshot is enabled too);
+  * `sort` is given (collation order is the database's business), or a
+    `contains` value holds a LIKE wildcard, or a value does not convert.
+
+The SnapshotRefresher keeps the snapshot current from one background thread,
+through the change feed (dbo.ChangeLog, see /api/changes) rather than by
+reloading:
+
+  * after a local write (backend/services/events.py) it wakes after
+    Config.SNAPSHOT_REFRESH_DELAY; otherwise it polls the feed every
+    Config.SNAPSHOT_POLL_SECONDS, which picks up other workers' writes;
+  * changed keys of the list's own entity are re-read from the view and
+    patched in; changes to entities the view joins (DEPENDENCIES) are mapped
+    to the list keys they affect, or reload the list when they cannot be
+    traced (e.g. a deleted collaboration no longer names its song).
+
+Each list is saved to Config.SNAPSHOT_DIR as `<list>.<generation>.npy` plus
+`<list>.json` (vocabularies and feed position), replaced atomically, at most
+every Config.SNAPSHOT_SAVE_SECONDS.  A starting worker memory-maps the saved
+array and catches up from the saved position, so it starts warm instead of
+reading every view.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:     # optional: the lists are read from SQL Server without it
+    np = None
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.events import add_change_listener
+from backend.services.list_queries import LIST_QUERIES
+from backend.services.procedures import call_procedure
+
+logger = get_logger(__name__)
+
+# List → its columns that are not strings (every other column is interned)
+TYPED_COLUMNS = {
+    'record_labels': {'RecordLabelID': 'int', 'RowVersion': 'bytes'},
+    'employees': {
+        'EmployeeID': 'int', 'DateOfBirth': 'date', 'Salary': 'decimal', 'HireDate': 'date',
+        'RecordLabelID': 'int', 'RowVersion': 'bytes',
+    },
+    'contributors': {'ContributorID': 'int', 'DateOfBirth': 'date', 'RowVersion': 'bytes'},
+    'songs': {'SongID': 'int', 'Duration': 'int', 'ReleaseDate': 'date', 'RowVersion': 'bytes'},
+}
+
+SNAPSHOT_LISTS = tuple(TYPED_COLUMNS)
+
+_DTYPES = {'int': 'i8', 'date': 'M8[D]', 'decimal': 'f8', 'bytes': 'V8', 'str': 'i4'}
+
+_KEYS = "SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ',')"
+
+# List → changed entity → (query mapping that entity's keys to the list's
+# keys, or None; the operations that reload the whole list instead).
+# Changes to the list's own entity are always patched by key.
+DEPENDENCIES = {
+    'record_labels': {},
+    'employees': {
+        'record_labels': (
+            f"SELECT EmployeeID FROM dbo.Employee WHERE RecordLabel_RecordLabelID IN ({_KEYS})", ''
+        ),
+    },
+    'contributors': {
+        'record_labels': (
+            "SELECT c.ContributorID FROM dbo.Contributor c "
+            "JOIN dbo.Employee e ON e.Person_NIF = c.Person_NIF "
+            f"WHERE e.RecordLabel_RecordLabelID IN ({_KEYS})", ''
+        ),
+        # A deleted employee no longer leads to its contributor
+        'employees': (
+            "SELECT c.ContributorID FROM dbo.Contributor c "
+            "JOIN dbo.Employee e ON e.Person_NIF = c.Person_NIF "
+            f"WHERE e.EmployeeID IN ({_KEYS})", 'D'
+        ),
+    },
+    'songs': {
+        'contributors': (
+            f"SELECT Song_SongID FROM dbo.Contributor_Song WHERE Contributor_ContributorID IN ({_KEYS})", ''
+        ),
+        # A collaboration moved to another song or deleted no longer names the old one
+        'collaborations': (None, 'IUD'),
+    },
+}
+
+# List → entities whose local writes can change it (Person writes are logged
+# to the feed as updates of their employees and contributors)
+SOURCES = {
+    'record_labels': ('record_labels',),
+    'employees': ('employees', 'persons', 'record_labels'),
+    'contributors': ('contributors', 'persons', 'employees', 'record_labels'),
+    'songs': ('songs', 'persons', 'contributors', 'collaborations'),
+}
+
+# Changes read from the feed per round trip
+_FEED_PAGE = 5000
+
+_LIKE_WILDCARDS = ('%', '_', '[')
+
+
+def lists_reading(entity: str) -> set:
+    """The snapshot lists a change to `entity` can make stale ('db': all of them)."""
+    if entity == 'db':
+        return set(SNAPSHOT_LISTS)
+    return {name for name, entities in SOURCES.items() if entity in entities}
+
+
+def feed_position(cursor):
+    """The RowVer of the last committed ChangeLog entry (None: the log is empty)."""
+    cursor.execute("SELECT MAX(RowVer) FROM dbo.ChangeLog WHERE RowVer < MIN_ACTIVE_ROWVERSION()")
+    row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else None
+
+
+class _State:
+    """An immutable version of one list: its rows and string vocabularies."""
+
+    def __init__(self, rows, vocab):
+        self.rows = rows
+        self.vocab = vocab
+        self.folded = {c: np.strings.lower(v) for c, v in vocab.items()}
+
+
+class ColumnarList:
+    """
+    The snapshot of one list.  Only the refresher thread loads or patches it;
+    requests read `state`, which is replaced in a single assignment.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.query = LIST_QUERIES[name]
+        self.kinds = {c: TYPED_COLUMNS[name].get(c, 'str') for c in self.query.columns}
+        self.dtype = np.dtype([(c, _DTYPES[k]) for c, k in self.kinds.items()])
+        self.state = None
+        self._codes = {}        # column → {string: code}, for patching
+
+    def __len__(self):
+        return 0 if self.state is None else len(self.state.rows)
+
+    # ---------- Loading ----------
+
+    def _read(self, cursor, where: str = '', *params):
+        cursor.execute(
+            f"SELECT {', '.join(self.query.columns)} FROM dbo.{self.query.view}{where} "
+            f"ORDER BY {self.query.key}", *params
+        )
+        columns = {c: [] for c in self.query.columns}
+        while True:
+            batch = cursor.fetchmany(Config.EXPORT_BATCH_SIZE)
+            if not batch:
+                return columns
+            for row in batch:
+                for c, values in columns.items():
+                    values.append(getattr(row, c))
+
+    def _encode(self, columns, vocab):
+        """A structured array of the read `columns`, interning new strings into `vocab`."""
+        n = len(next(iter(columns.values())))
+        rows = np.empty(n, dtype=self.dtype)
+        for c, kind in self.kinds.items():
+            values = columns[c]
+            if kind == 'str':
+                codes = self._codes.setdefault(c, {s: i for i, s in enumerate(vocab[c])})
+                added = []
+                for s in values:
+                    if s is not None and s not in codes:
+                        codes[s] = len(codes)
+                        added.append(s)
+                if added:
+                    vocab[c] = np.concatenate([vocab[c], np.array(added, dtype=vocab[c].dtype)])
+                rows[c] = [-1 if s is None else codes[s] for s in values]
+            elif kind == 'decimal':
+                rows[c] = [np.nan if v is None else float(v) for v in values]
+            elif kind == 'bytes':
+                rows[c] = [bytes(v or b'').ljust(8, b'\0') for v in values]
+            else:
+                rows[c] = values
+        return rows
+
+    def load(self, cursor):
+        """Read the whole view and replace the snapshot."""
+        self._codes = {}
+        vocab = {c: np.array([], dtype=np.dtypes.StringDType())
+                 for c, k in self.kinds.items() if k == 'str'}
+        rows = self._encode(self._read(cursor), vocab)
+        self.state = _State(rows, vocab)
+
+    def patch(self, cursor, keys):
+        """Re-read the rows with `keys` (deleted ones are simply not found) and patch them in."""
+        state = self.state
+        vocab = dict(state.vocab)
+        try:
+            fresh = self._encode(self._read(cursor, f" WHERE {self.query.key} IN ({_KEYS})",
+                                            ','.join(map(str, sorted(keys)))), vocab)
+        except Exception:
+            self._codes = {}    # may hold codes past the current vocabularies
+            raise
+        key = self.query.key
+        kept = state.rows[~np.isin(state.rows[key], np.fromiter(keys, dtype='i8'))]
+        rows = np.concatenate([kept, fresh])
+        self.state = _State(rows[np.argsort(rows[key], kind='stable')], vocab)
+
+    # ---------- Persistence ----------
+
+    def save(self, directory: str, position):
+        """Write the snapshot next to the previous one and switch `<list>.json` to it."""
+        state = self.state
+        data_file = f"{self.name}.{uuid.uuid4().hex}.npy"
+        np.save(os.path.join(directory, data_file), state.rows)
+        meta = {
+            "Columns": list(self.query.columns),
+            "File": data_file,
+            "Position": position.hex() if position else None,
+            "Vocab": {c: v.tolist() for c, v in state.vocab.items()},
+        }
+        meta_path = os.path.join(directory, f"{self.name}.json")
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+        for old in os.listdir(directory):
+            if old.startswith(f"{self.name}.") and old.endswith('.npy') and old != data_file:
+                try:
+                    os.remove(os.path.join(directory, old))
+                except OSError:
+                    pass    # still mapped by another worker (Windows): removed next time
+
+    def restore(self, directory: str):
+        """
+        Map a saved snapshot.
+
+        Returns:
+            The saved feed position (bytes), or None if there is no usable
+            saved snapshot (the caller then loads the view).
+        """
+        try:
+            with open(os.path.join(directory, f"{self.name}.json"), encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta["Columns"] != list(self.query.columns) or not meta["Position"]:
+                return None
+            rows = np.load(os.path.join(directory, meta["File"]), mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            return None
+        if rows.dtype != self.dtype:
+            return None
+        self._codes = {}
+        vocab = {c: np.array(meta["Vocab"][c], dtype=np.dtypes.StringDType())
+                 for c, k in self.kinds.items() if k == 'str'}
+        self.state = _State(rows, vocab)
+        return bytes.fromhex(meta["Position"])
+
+    # ---------- Queries ----------
+
+    def _mask(self, state, f, value):
+        """Rows matching filter `f` with `value`, or None if it must go to SQL Server."""
+        kind = self.kinds[f.column]
+        column = state.rows[f.column]
+        if kind == 'str':
+            if f.predicate != 'contains' or any(w in value for w in _LIKE_WILDCARDS):
+                return None
+            folded = state.folded[f.column]
+            if not len(folded):
+                return np.zeros(len(column), dtype=bool)
+            hits = np.strings.find(folded, str(value).lower()) >= 0
+            return (column >= 0) & hits[np.maximum(column, 0)]
+        try:
+            if kind == 'date':
+                value = np.datetime64(value if isinstance(value, date) else date.fromisoformat(str(value)), 'D')
+            elif kind == 'decimal':
+                value = float(value)
+            else:
+                value = int(value)
+        except (TypeError, ValueError):
+            return None
+        # Comparisons with NaT/NaN are False, like comparisons with NULL
+        if f.predicate == 'equals':
+            return column == value
+        if f.predicate == 'min':
+            return column >= value
+        if f.predicate == 'max':
+            return column <= value
+        if f.predicate == 'min_or_open':
+            return (column >= value) | np.isnat(column) if kind == 'date' else (column >= value) | np.isnan(column)
+        return None
+
+    def select(self, *args, fields=None):
+        """
+        The rows matching `args` (filter values, then `after` and `limit`), in
+        key order, as objects with one attribute per projected column; None if
+        a filter cannot be answered here.
+        """
+        state = self.state
+        *values, after, limit = args
+        mask = np.ones(len(state.rows), dtype=bool)
+        for f, value in zip(self.query.filters, values):
+            value = f.param.coerce(value)
+            if value is None:
+                continue
+            matched = self._mask(state, f, value)
+            if matched is None:
+                return None
+            mask &= matched
+        if after is not None:
+            mask &= state.rows[self.query.key] > int(after)
+        positions = np.flatnonzero(mask)
+        if limit is not None:
+            positions = positions[:limit]
+
+        picked = state.rows[positions]
+        columns = fields or self.query.columns
+        values = [self._column_values(state, picked, c) for c in columns]
+        return [_Row(zip(columns, row)) for row in zip(*values)]
+
+    def _column_values(self, state, picked, column):
+        kind = self.kinds[column]
+        values = picked[column]
+        if kind == 'str':
+            vocab = state.vocab[column]
+            if not len(vocab):
+                return [None] * len(values)
+            strings = vocab[np.maximum(values, 0)].tolist()
+            return [s if code >= 0 else None for s, code in zip(strings, values.tolist())]
+        if kind == 'decimal':
+            return [None if v != v else v for v in values.tolist()]
+        if kind == 'bytes':
+            return [bytes(v) for v in values]
+        return values.tolist()      # datetime64[D] → date, NaT → None
+
+
+class _Row(dict):
+    """A snapshot row, read like a pyodbc row (row.Column)."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class SnapshotRefresher:
+    """The enabled snapshot lists, kept current from a background thread."""
+
+    def __init__(self):
+        self._lists = {}
+        self._position = None       # feed position every list includes
+        self._pending = set()       # lists with local writes not applied yet
+        self._applying = set()
+        self._reload = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._saved_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._lists)
+
+    def start(self, names):
+        with self._lock:
+            if self._thread is None:
+                self._lists = {name: ColumnarList(name) for name in names}
+                self._thread = threading.Thread(target=self._run, name='list-snapshot', daemon=True)
+                self._thread.start()
+
+    def mark_stale(self, entity: str, operation: str = None):
+        """Bypass and refresh the lists that read `entity` (local writes)."""
+        names = lists_reading(entity) & set(self._lists)
+        if names:
+            with self._lock:
+                self._pending |= names
+                if entity == 'db':
+                    self._reload |= names
+            self._wake.set()
+
+    def rows(self, name: str, *args, sort=(), fields=None):
+        """See snapshot_rows()."""
+        snapshot = self._lists.get(name)
+        if (snapshot is None or snapshot.state is None or sort
+                or name in self._pending or name in self._applying
+                or DatabaseConfig.reads_on_primary()):
+            return None
+        return snapshot.select(*args, fields=fields)
+
+    # ---------- Background thread ----------
+
+    def _run(self):
+        while True:
+            try:
+                self._warm_start()
+                break
+            except Exception as e:
+                # e.g. the tables do not exist before the schema is initialized
+                logger.warning(f"Could not load the list snapshot: {e}")
+                self._wake.wait(timeout=Config.SNAPSHOT_POLL_SECONDS or 30)
+                self._wake.clear()
+
+        while True:
+            if self._wake.wait(timeout=Config.SNAPSHOT_POLL_SECONDS or None):
+                time.sleep(Config.SNAPSHOT_REFRESH_DELAY)   # coalesce a burst of writes
+                self._wake.clear()
+            with self._lock:
+                self._applying, self._pending = self._pending, set()
+                reload, self._reload = self._reload, set()
+            try:
+                self._save(due=self._catch_up(reload))
+            except Exception as e:
+                logger.warning(f"Could not refresh the list snapshot: {e}")
+                with self._lock:
+                    self._pending |= self._applying
+                    self._reload |= reload
+            with self._lock:
+                self._applying = set()
+
+    def _warm_start(self):
+        """Map the saved lists (or load them), then catch up from the oldest position."""
+        start = time.perf_counter()
+        os.makedirs(Config.SNAPSHOT_DIR, exist_ok=True)
+        conn = DatabaseConfig.get_connection()
+        try:
+            cursor = conn.cursor()
+            positions, loaded = [], []
+            for name, snapshot in self._lists.items():
+                saved = snapshot.restore(Config.SNAPSHOT_DIR)
+                if saved is not None and self._in_feed(cursor, saved):
+                    positions.append(saved)
+                    continue
+                positions.append(feed_position(cursor))
+                snapshot.load(cursor)
+                loaded.append(name)
+            # Replaying changes is idempotent, so the oldest position covers every list
+            self._position = None if None in positions else min(positions)
+            changed = self._apply_changes(cursor, set())
+        finally:
+            conn.close()
+        self._save(due=bool(loaded) or changed)
+        logger.info(
+            f"List snapshot ready in {time.perf_counter() - start:.2f}s: "
+            f"{', '.join(f'{n} ({len(s)})' for n, s in self._lists.items())}"
+            f"{'; loaded ' + ', '.join(loaded) if loaded else ''}"
+        )
+
+    def _in_feed(self, cursor, position) -> bool:
+        """Whether `position` is still in the change feed (not after a schema reset)."""
+        cursor.execute("SELECT 1 FROM dbo.ChangeLog WHERE RowVer = ?", position)
+        return cursor.fetchone() is not None
+
+    def _catch_up(self, reload):
+        conn = DatabaseConfig.get_connection()  # primary: the feed must include the local writes
+        try:
+            return self._apply_changes(conn.cursor(), reload)
+        finally:
+            conn.close()
+
+    def _apply_changes(self, cursor, reload) -> bool:
+        """
+        Apply the feed entries after the current position, and reload the
+        lists in `reload`.  Returns whether any list changed.
+        """
+        reload = set(reload)
+        changed = {}        # entity → operation → keys
+        position = self._position
+        while True:
+            entries = call_procedure(cursor, 'sp_GetChanges', position, None, _FEED_PAGE).fetchall()
+            for entry in entries:
+                changed.setdefault(entry.Entity, {}).setdefault(entry.Operation, set()).add(entry.EntityKey)
+            if entries:
+                position = bytes(entries[-1].RowVer)
+            if len(entries) < _FEED_PAGE:
+                break
+        if 'db' in changed:
+            reload |= set(self._lists)
+
+        for name, snapshot in self._lists.items():
+            keys = self._affected_keys(cursor, name, changed)
+            if name in reload or snapshot.state is None or keys is None:
+                snapshot.load(cursor)
+                reload.add(name)
+            elif keys:
+                snapshot.patch(cursor, keys)
+        self._position = position
+        return bool(changed or reload)
+
+    def _affected_keys(self, cursor, name, changed):
+        """The keys of list `name` that `changed` touches, or None if it must be reloaded."""
+        keys = {int(k) for op_keys in changed.get(name, {}).values() for k in op_keys}
+        for entity, (sql, reload_on) in DEPENDENCIES[name].items():
+            ops = changed.get(entity, {})
+            if any(op in reload_on for op in ops):
+                return None
+            entity_keys = {k for op_keys in ops.values() for k in op_keys}
+            if entity_keys:
+                cursor.execute(sql, ','.join(sorted(entity_keys)))
+                keys |= {row[0] for row in cursor.fetchall()}
+        return keys
+
+    def _save(self, due: bool):
+        """Save every list, if `due` and the last save is older than SNAPSHOT_SAVE_SECONDS."""
+        if not due or time.monotonic() - self._saved_at < Config.SNAPSHOT_SAVE_SECONDS:
+            return
+        self._saved_at = time.monotonic()
+        try:
+            for snapshot in self._lists.values():
+                snapshot.save(Config.SNAPSHOT_DIR, self._position)
+        except OSError as e:
+            logger.warning(f"Could not save the list snapshot: {e}")
+
+
+snapshots = SnapshotRefresher()
+
+
+def snapshot_rows(name: str, *args, sort=(), fields=None):
+    """
+    Answer a list request from the snapshot.
+
+    Args:
+        name: Entity name, e.g. 'songs'.
+        *args: Filter values in declaration order, then `after` and `limit`
+            (as for run_list_query).
+        sort: Parsed sort; the snapshot only answers key order.
+        fields: Projected columns; None for all.
+
+    Returns:
+        The rows (read like pyodbc rows), or None: read the list from SQL Server.
+    """
+    return snapshots.rows(name, *args, sort=sort, fields=fields)
+
+
+def register_snapshot(app):
+    """Load the lists of Config.SNAPSHOT_LISTS and keep them current while `app` serves requests."""
+    names = [n for n in Config.SNAPSHOT_LISTS if n in SNAPSHOT_LISTS]
+    unknown = set(Config.SNAPSHOT_LISTS) - set(names)
+    if unknown:
+        logger.warning(f"SNAPSHOT_LISTS: ignoring {', '.join(sorted(unknown))}; "
+                       f"lists: {', '.join(SNAPSHOT_LISTS)}")
+    if not names:
+        return
+    if np is None or not hasattr(np, 'strings'):
+        logger.warning("SNAPSHOT_LISTS is set but NumPy 2 is not installed; lists are read from SQL Server")
+        return
+    add_change_listener(snapshots.mark_stale)
+    snapshots.start(names)
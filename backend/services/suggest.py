@@ -0,0 +1,226 @@
+# backend/services/suggest.py
+"""
+In-memory prefix indexes behind GET /api/suggest (form typeahead).
+
+The song and collaboration forms take comma-separated contributor NIFs and
+record label names, and a typo only shows up as a failed transaction.  The
+forms ask /api/suggest as the user types instead, and that must not cost a
+query per keystroke, so each suggestion list is held in process:
+
+  person       every Person, by name (and each word of it), NIF and email
+  contributor  the Persons that are Contributors, by the same terms
+  label        every RecordLabel, by name (and each word of it)
+  genre        every song or artist genre
+
+A PrefixIndex is an immutable sorted array of (folded term, record) pairs;
+a lookup is a bisect to the first term starting with the prefix and a walk
+forward, O(log n + results), well under a millisecond at catalog sizes.
+Terms are case- and accent-folded, so "jose" finds "José".
+
+The SuggestRefresher loads every index at startup and keeps them current
+from a single background thread, like the statistics rollups:
+
+  * after every published change (backend/services/events.py), the indexes
+    that read the changed entity are rebuilt once Config.SUGGEST_REFRESH_DELAY
+    has passed, so a burst of writes or an import costs one rebuild;
+  * every Config.SUGGEST_REFRESH_SECONDS all of them are rebuilt, which also
+    picks up writes made by other processes or workers.
+
+A rebuilt index replaces the old one in a single assignment, so lookups
+never wait for a rebuild and never see a half-built index.
+"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from config.config import Config
+from config.database_config import DatabaseConfig
+from config.logger import get_logger
+from backend.services.events import add_change_listener
+
+logger = get_logger(__name__)
+
+
+def fold(text: str) -> str:
+    """Case- and accent-insensitive form of `text`, as stored in the indexes."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class PrefixIndex:
+    """
+    Immutable prefix index over a list of records.
+
+    Args:
+        records: The suggestions (JSON-serializable dicts), in any order.
+        terms_of: record → the strings it can be found by.
+    """
+
+    def __init__(self, records, terms_of):
+        pairs = sorted(
+            {(fold(term), i) for i, record in enumerate(records) for term in terms_of(record) if term}
+        )
+        self._terms = [term for term, _ in pairs]
+        self._positions = [i for _, i in pairs]
+        self._records = records
+
+    def __len__(self):
+        return len(self._records)
+
+    def search(self, prefix: str, limit: int) -> list:
+        """Up to `limit` records with a term starting with `prefix`, in term order."""
+        prefix = fold(prefix.strip())
+        found, seen = [], set()
+        for at in range(bisect_left(self._terms, prefix), len(self._terms)):
+            if not self._terms[at].startswith(prefix):
+                break
+            position = self._positions[at]
+            if position not in seen:
+                seen.add(position)
+                found.append(self._records[position])
+                if len(found) == limit:
+                    break
+        return found
+
+
+def _name_terms(name):
+    """A name and each of its words, so "sil" finds "Ana Silva"."""
+    return [name, *name.split()[1:]] if name else []
+
+
+def _person(row):
+    return {"NIF": row.NIF, "Name": row.Name, "Email": row.Email, "ContributorID": row.ContributorID}
+
+
+def _person_terms(record):
+    return [*_name_terms(record["Name"]), record["NIF"], record["Email"]]
+
+
+_PERSONS = """
+    SELECT p.NIF, p.Name, p.Email, c.ContributorID
+    FROM dbo.Person p
+    {join} dbo.Contributor c ON c.Person_NIF = p.NIF"""
+
+# Index → (query, row → record, record → terms, entities whose changes alter it)
+SOURCES = {
+    'person': (
+        _PERSONS.format(join='LEFT JOIN'), _person, _person_terms,
+        ('persons', 'employees', 'contributors', 'record_labels'),
+    ),
+    'contributor': (
+        _PERSONS.format(join='JOIN'), _person, _person_terms,
+        ('persons', 'employees', 'contributors', 'record_labels'),
+    ),
+    'label': (
+        "SELECT RecordLabelID, Name FROM dbo.RecordLabel",
+        lambda row: {"RecordLabelID": row.RecordLabelID, "Name": row.Name},
+        lambda record: _name_terms(record["Name"]),
+        ('record_labels',),
+    ),
+    'genre': (
+        "SELECT Genre FROM dbo.Song_Genre UNION SELECT Genre FROM dbo.Artist_Genre",
+        lambda row: {"Genre": row.Genre},
+        lambda record: _name_terms(record["Genre"]),
+        ('songs', 'contributors'),
+    ),
+}
+
+INDEXES = tuple(SOURCES)
+
+
+def indexes_reading(entity: str) -> set:
+    """The indexes a change to `entity` can make stale ('db': all of them)."""
+    if entity == 'db':
+        return set(INDEXES)
+    return {name for name, source in SOURCES.items() if entity in source[3]}
+
+
+def load_index(cursor, name: str) -> PrefixIndex:
+    """Read the records of index `name` and build it."""
+    sql, to_record, terms_of, _ = SOURCES[name]
+    cursor.execute(sql)
+    return PrefixIndex([to_record(row) for row in cursor.fetchall()], terms_of)
+
+
+class SuggestRefresher:
+    """The current indexes, rebuilt from a background thread when stale."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._stale = set(INDEXES)      # all built once at startup
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='suggest-indexes', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def mark_stale(self, entity: str, operation: str = None):
+        """Rebuild the indexes that read `entity` shortly."""
+        names = indexes_reading(entity)
+        if names:
+            with self._lock:
+                self._stale |= names
+            self._wake.set()
+
+    def search(self, name: str, prefix: str, limit: int) -> list:
+        """
+        Look `prefix` up in index `name`.  An index that has not been built
+        yet (a request arriving before the startup load finished) is built now.
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            self.rebuild({name})
+            index = self._indexes[name]
+        return index.search(prefix, limit)
+
+    def rebuild(self, names):
+        """
+        Reload the indexes in `names` and swap them in.  Read on the primary,
+        so a rebuild after a write includes it.
+        """
+        start = time.perf_counter()
+        conn = DatabaseConfig.get_connection()
+        try:
+            cursor = conn.cursor()
+            built = {name: load_index(cursor, name) for name in sorted(names)}
+        finally:
+            conn.close()
+        with self._lock:
+            self._indexes = {**self._indexes, **built}
+        logger.info(
+            f"Rebuilt suggest indexes "
+            f"{', '.join(f'{name} ({len(index)})' for name, index in built.items())} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    def _run(self):
+        while True:
+            woken = self._wake.wait(timeout=Config.SUGGEST_REFRESH_SECONDS or None)
+            if woken:
+                time.sleep(Config.SUGGEST_REFRESH_DELAY)   # coalesce a burst of writes
+                self._wake.clear()
+            with self._lock:
+                names = self._stale if woken else set(INDEXES)
+                self._stale = set()
+            if not names:
+                continue
+            try:
+                self.rebuild(names)
+            except Exception as e:
+                # e.g. the tables do not exist before the schema is initialized
+                logger.warning(f"Could not rebuild suggest indexes: {e}")
+
+
+suggestions = SuggestRefresher()
+
+
+def register_suggest(app):
+    """Load the suggest indexes and keep them current while `app` serves requests."""
+    add_change_listener(suggestions.mark_stale)
+    suggestions.start()
@@ -0,0 +1,141 @@
+# benchmarks/list_filters.py
+"""
+Catch-all list procedures vs. compiled per-shape list queries.
+
+For every list and every combination of up to --max-filters of its filters,
+the same page (--limit rows, optionally after --after) is read --repeat times
+through the sp_Get* procedure, whose `(@X IS NULL OR ...)` predicates share
+one plan across all combinations, and through the list query compiled for
+just that combination (backend/services/list_queries.py).  Filter values are
+taken from an existing row, so every combination matches something.
+
+Each line shows the median time of both, and with --plans a summary of the
+actual plan's data access (seeks and scans per object), read with
+SET STATISTICS XML.
+
+Usage (from the project root, with .env filled in and data populated):
+    python -m benchmarks.list_filters --lists songs employees --max-filters 2 --plans
+"""
+import argparse
+import itertools
+import statistics
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+from dotenv import load_dotenv
+load_dotenv()   # Must run before DatabaseConfig is imported
+
+from config.database_config import DatabaseConfig
+from backend.services.procedures import call_procedure
+from backend.services.list_queries import LIST_QUERIES, run_list_query
+
+PROCEDURES = {
+    'record_labels':  'sp_GetRecordLabels',
+    'employees':      'sp_GetEmployees',
+    'contributors':   'sp_GetContributors',
+    'songs':          'sp_GetSongs',
+    'collaborations': 'sp_GetCollaborations',
+}
+
+_SHOWPLAN = '{http://schemas.microsoft.com/sqlserver/2004/07/showplan}'
+
+
+def sample_values(cursor, name):
+    """A value per filter, taken from the first row of the list (None if the row has none)."""
+    query = LIST_QUERIES[name]
+    row = run_list_query(cursor, name, *[None] * len(query.filters), None, 1).fetchone()
+    if row is None:
+        raise SystemExit(f"The {name} list is empty; populate the database first")
+    values = []
+    for f in query.filters:
+        value = getattr(row, f.column)
+        if value is not None and f.predicate == 'contains':
+            value = str(value)[:3]      # a substring, as typed into a filter box
+        values.append(value)
+    return values
+
+
+def run(cursor, name, use_procedure, args):
+    if use_procedure:
+        return call_procedure(cursor, PROCEDURES[name], *args)
+    return run_list_query(cursor, name, *args)
+
+
+def time_it(cursor, name, use_procedure, args, repeat):
+    """(rows, median ms) of `repeat` runs after one warm-up."""
+    rows = len(run(cursor, name, use_procedure, args).fetchall())
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(cursor, name, use_procedure, args).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return rows, statistics.median(timings)
+
+
+def plan_summary(cursor, name, use_procedure, args):
+    """Seeks and scans per object in the actual plan, e.g. 'Seek Song×1, Scan Song_Genre×1'."""
+    cursor.execute("SET STATISTICS XML ON")
+    try:
+        run(cursor, name, use_procedure, args).fetchall()
+        plans = []
+        while cursor.nextset():
+            plans += [r[0] for r in cursor.fetchall()]
+    finally:
+        cursor.execute("SET STATISTICS XML OFF")
+
+    access = Counter()
+    for plan in plans:
+        for relop in ET.fromstring(plan).iter(f'{_SHOWPLAN}RelOp'):
+            op = relop.get('PhysicalOp', '')
+            if 'Seek' not in op and 'Scan' not in op:
+                continue
+            obj = relop.find(f'.//{_SHOWPLAN}Object')
+            table = obj.get('Table', '?').strip('[]') if obj is not None else '?'
+            access[f"{'Seek' if 'Seek' in op else 'Scan'} {table}"] += 1
+    return ', '.join(f"{k}×{n}" for k, n in sorted(access.items())) or '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lists', nargs='+', default=list(LIST_QUERIES), choices=list(LIST_QUERIES))
+    parser.add_argument('--max-filters', type=int, default=2,
+                        help='largest filter combination to try')
+    parser.add_argument('--limit', type=int, default=50, help='page size (0: whole list)')
+    parser.add_argument('--after', type=int, default=None, help='keyset position of the page')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--plans', action='store_true', help='also summarize the actual plans')
+    args = parser.parse_args()
+
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        print(f"{'list':<15} {'filters':<36} {'rows':>6} {'catch-all ms':>13} "
+              f"{'compiled ms':>12} {'speedup':>8}")
+        for name in args.lists:
+            query = LIST_QUERIES[name]
+            values = sample_values(cursor, name)
+            usable = [i for i, v in enumerate(values) if v is not None]
+
+            for k in range(args.max_filters + 1):
+                for combo in itertools.combinations(usable, k):
+                    filter_args = [values[i] if i in combo else None for i in range(len(values))]
+                    call_args = (*filter_args, args.after, args.limit or None)
+                    label = ','.join(query.filters[i].name for i in combo) or '(none)'
+
+                    rows, sp_ms = time_it(cursor, name, True, call_args, args.repeat)
+                    compiled_rows, q_ms = time_it(cursor, name, False, call_args, args.repeat)
+                    if rows != compiled_rows:
+                        print(f"  ! {name} {label}: {rows} rows vs {compiled_rows} rows")
+                    print(f"{name:<15} {label:<36} {rows:>6} {sp_ms:>13.2f} "
+                          f"{q_ms:>12.2f} {sp_ms / max(q_ms, 1e-9):>7.1f}x")
+                    if args.plans:
+                        print(f"    catch-all: {plan_summary(cursor, name, True, call_args)}")
+                        print(f"    compiled:  {plan_summary(cursor, name, False, call_args)}")
+            print(f"{name}: {query.shapes} compiled shapes cached")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
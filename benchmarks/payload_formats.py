@@ -0,0 +1,144 @@
+# benchmarks/payload_formats.py
+"""
+Size and encode time of list payloads per representation and compression.
+
+For each payload (a songs list and a contributors list, shaped exactly like
+the API's map_row_to_song / map_row_to_contributor output) every available
+representation (JSON, columnar JSON, MessagePack if installed) is encoded and
+then compressed with every available encoding (identity, gzip, brotli if
+installed), with the levels the API uses (Config.GZIP_LEVEL /
+Config.BROTLI_QUALITY).  Reported: bytes on the wire, ratio to plain JSON and
+the median time to produce them (serialize + compress).
+
+Payloads are synthetic by default (--rows rows each, realistic field
+lengths); --from-db reads the real lists through the list procedures instead.
+
+Usage (from the project root):
+    python -m benchmarks.payload_formats --rows 10000
+    python -m benchmarks.payload_formats --from-db
+"""
+import argparse
+import json
+import random
+import statistics
+import string
+import time
+from datetime import date, timedelta
+
+from dotenv import load_dotenv
+load_dotenv()   # Must run before Config is imported
+
+from backend.services.compression import compress_body, ENCODINGS
+from backend.services.formats import to_columnar, msgpack
+
+GENRES = ['Pop', 'Rock', 'Jazz', 'Hip-Hop', 'Classical', 'Electronic', 'Folk', 'Metal']
+ROLES  = ['Artist', 'Producer', 'Songwriter']
+
+
+def _word(rng, low=4, high=10):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(low, high))).title()
+
+
+def _name(rng):
+    return f"{_word(rng)} {_word(rng)}"
+
+
+def synthetic_songs(rows, rng):
+    return [{
+        "SongID":            i,
+        "Title":             ' '.join(_word(rng) for _ in range(rng.randint(1, 4))),
+        "Duration":          rng.randint(90, 420),
+        "ReleaseDate":       (date(1990, 1, 1) + timedelta(days=rng.randint(0, 12000))).isoformat(),
+        "Genres":            ', '.join(rng.sample(GENRES, rng.randint(1, 3))),
+        "Contributors":      ', '.join(_name(rng) for _ in range(rng.randint(1, 4))),
+        "CollaborationName": _word(rng) if rng.random() < 0.3 else "",
+        "RowVersion":        f"{rng.getrandbits(64):016x}"
+    } for i in range(1, rows + 1)]
+
+
+def synthetic_contributors(rows, rng):
+    return [{
+        "ContributorID":   i,
+        "NIF":             f"{rng.randint(100000000, 999999999)}",
+        "Name":            _name(rng),
+        "DateOfBirth":     (date(1950, 1, 1) + timedelta(days=rng.randint(0, 20000))).isoformat(),
+        "Email":           f"{_word(rng).lower()}@{_word(rng).lower()}.com",
+        "PhoneNumber":     f"+351 9{rng.randint(10000000, 99999999)}",
+        "RecordLabelName": _word(rng) if rng.random() < 0.5 else "",
+        "Roles":           ', '.join(rng.sample(ROLES, rng.randint(1, 3))),
+        "RowVersion":      f"{rng.getrandbits(128):032x}"
+    } for i in range(1, rows + 1)]
+
+
+def db_payloads():
+    from config.database_config import DatabaseConfig
+    from backend.services.procedures import call_procedure
+    from backend.endpoints.songs import map_row_to_song
+    from backend.endpoints.contributors import map_row_to_contributor
+
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        songs = [map_row_to_song(r) for r in
+                 call_procedure(cursor, 'sp_GetSongs', *[None] * 11).fetchall()]
+        contributors = [map_row_to_contributor(r) for r in
+                        call_procedure(cursor, 'sp_GetContributors', *[None] * 8).fetchall()]
+    finally:
+        conn.close()
+    return {'songs': songs, 'contributors': contributors}
+
+
+# Representation name → obj -> bytes, as the API would produce them
+def representations():
+    formats = {
+        'json':     lambda obj: json.dumps(obj, separators=(',', ':')).encode(),
+        'columnar': lambda obj: json.dumps(to_columnar(obj), separators=(',', ':')).encode(),
+    }
+    if msgpack is not None:
+        formats['msgpack'] = msgpack.packb
+    return formats
+
+
+def measure(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=5000, help='rows per synthetic payload')
+    parser.add_argument('--from-db', action='store_true', help='use the real lists instead')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (median)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.from_db:
+        payloads = db_payloads()
+    else:
+        rng = random.Random(args.seed)
+        payloads = {
+            'songs':        synthetic_songs(args.rows, rng),
+            'contributors': synthetic_contributors(args.rows, rng),
+        }
+
+    print(f"{'payload':<14} {'rows':>6} {'format':<9} {'encoding':<9} "
+          f"{'bytes':>10} {'vs json':>8} {'ms':>8}")
+    for name, obj in payloads.items():
+        baseline = None
+        for fmt, encode in representations().items():
+            for encoding in ['identity'] + ENCODINGS:
+                def produce():
+                    body = encode(obj)
+                    return body if encoding == 'identity' else compress_body(body, encoding)
+                body, ms = measure(produce, args.repeat)
+                baseline = baseline or len(body)
+                print(f"{name:<14} {len(obj):>6} {fmt:<9} {encoding:<9} "
+                      f"{len(body):>10} {len(body) / baseline:>8.2f} {ms:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
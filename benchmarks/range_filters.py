@@ -0,0 +1,172 @@
+# benchmarks/range_filters.py
+"""
+Date range and interval-overlap filters, checked and timed at scale.
+
+Covers the range filters of the list endpoints: songs releasedFrom/releasedTo,
+employees hiredFrom/hiredTo and collaborations activeFrom/activeTo (interval
+overlap, an open EndDate counting as still running).
+
+With --scale N, N synthetic songs, collaborations and employees are inserted
+first, inside a transaction that is rolled back at the end, so the database is
+left as it was.  Then, for windows of growing width around the middle of each
+list's date span (one day up to the whole span):
+
+  * the compiled list query's rows are compared with the same filter applied
+    in Python to the full list, and any difference is reported;
+  * its median time is shown next to reading the whole list, which is what a
+    client had to do before these filters existed;
+  * with --plans, the seeks and scans of the actual plan are summarized
+    (a range filter should show a Seek on the date index, not a Scan).
+
+Usage (from the project root, with .env filled in and data populated):
+    python -m benchmarks.range_filters --scale 200000 --plans
+"""
+import argparse
+from datetime import timedelta
+
+from dotenv import load_dotenv
+load_dotenv()   # Must run before DatabaseConfig is imported
+
+from config.database_config import DatabaseConfig
+from backend.services.list_queries import LIST_QUERIES, run_list_query
+from benchmarks.list_filters import plan_summary, time_it
+
+# List → its (from, to) range filters
+RANGE_FILTERS = {
+    'songs':          ('ReleasedFrom', 'ReleasedTo'),
+    'employees':      ('HiredFrom', 'HiredTo'),
+    'collaborations': ('ActiveFrom', 'ActiveTo'),
+}
+
+# List → the date columns its range filter reads
+DATE_COLUMNS = {
+    'songs':          ('ReleaseDate',),
+    'employees':      ('HireDate',),
+    'collaborations': ('StartDate', 'EndDate'),
+}
+
+# Window widths, as fractions of the list's date span (0: a single day)
+WIDTHS = (0, 0.01, 0.1, 0.5, 1)
+
+_NUMBERS = """
+    (SELECT TOP (?) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS n
+     FROM sys.all_columns AS a CROSS JOIN sys.all_columns AS b) AS numbers"""
+
+# Synthetic rows over the last 50 years; the list order follows FK dependencies
+SEED = [
+    ('songs', f"""
+        INSERT INTO dbo.Song (Title, Duration, ReleaseDate)
+        SELECT CONCAT('Range bench song ', n), 60 + n % 400,
+               CASE WHEN n % 20 = 0 THEN NULL
+                    ELSE DATEADD(DAY, -(ABS(CHECKSUM(NEWID())) % 18250), CAST(GETDATE() AS DATE)) END
+        FROM {_NUMBERS}"""),
+    ('collaborations', f"""
+        INSERT INTO dbo.Collaboration (CollaborationName, StartDate, EndDate)
+        SELECT CONCAT('Range bench collaboration ', n), StartDate,
+               CASE WHEN n % 10 = 0 THEN NULL
+                    ELSE DATEADD(DAY, ABS(CHECKSUM(NEWID())) % 730, StartDate) END
+        FROM (SELECT n, DATEADD(DAY, -(ABS(CHECKSUM(NEWID())) % 18250), CAST(GETDATE() AS DATE)) AS StartDate
+              FROM {_NUMBERS}) AS s"""),
+    ('persons', f"""
+        INSERT INTO dbo.Person (NIF, Name, Email, PhoneNumber)
+        SELECT CONCAT('RB', n), CONCAT('Range bench person ', n),
+               CONCAT('range.bench.', n, '@example.com'), CONCAT('+000', n)
+        FROM {_NUMBERS}"""),
+    ('employees', f"""
+        INSERT INTO dbo.Employee (JobTitle, HireDate, RecordLabel_RecordLabelID, Person_NIF)
+        SELECT 'Range bench', DATEADD(DAY, -(ABS(CHECKSUM(NEWID())) % 18250), CAST(GETDATE() AS DATE)),
+               (SELECT MIN(RecordLabelID) FROM dbo.RecordLabel), CONCAT('RB', n)
+        FROM {_NUMBERS}
+        WHERE EXISTS (SELECT 1 FROM dbo.RecordLabel)"""),
+]
+
+
+def seed(cursor, rows):
+    """Insert `rows` synthetic rows per table (uncommitted)."""
+    for table, sql in SEED:
+        cursor.execute(sql, rows)
+        print(f"seeded {cursor.rowcount} {table}")
+
+
+def matches(name, row, low, high):
+    """The range filter of list `name`, evaluated in Python."""
+    if name == 'collaborations':
+        return row.StartDate <= high and (row.EndDate is None or row.EndDate >= low)
+    value = getattr(row, DATE_COLUMNS[name][0])
+    return value is not None and low <= value <= high
+
+
+def date_span(name, rows):
+    """(earliest, latest) date in the list, or None if it has no dates."""
+    dates = [getattr(r, c) for r in rows for c in DATE_COLUMNS[name] if getattr(r, c) is not None]
+    return (min(dates), max(dates)) if dates else None
+
+
+def windows(low, high):
+    """(from, to) windows of each of WIDTHS, centred on the span."""
+    days = (high - low).days + 1
+    for width in WIDTHS:
+        span = max(int(days * width), 1)
+        start = low + timedelta(days=(days - span) // 2)
+        yield start, start + timedelta(days=span - 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lists', nargs='+', default=list(RANGE_FILTERS), choices=list(RANGE_FILTERS))
+    parser.add_argument('--scale', type=int, default=0,
+                        help='synthetic rows to add per table (rolled back afterwards)')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--plans', action='store_true', help='also summarize the actual plans')
+    args = parser.parse_args()
+
+    # Seeded rows are only visible to the transaction that inserted them
+    conn = DatabaseConfig.get_connection() if args.scale else DatabaseConfig.get_read_connection()
+    failures = 0
+    try:
+        cursor = conn.cursor()
+        if args.scale:
+            seed(cursor, args.scale)
+
+        print(f"{'list':<15} {'window':<24} {'rows':>8} {'range ms':>9} {'full list ms':>13} {'check':>6}")
+        for name in args.lists:
+            query = LIST_QUERIES[name]
+            names = [f.name for f in query.filters]
+            low_at, high_at = (names.index(f) for f in RANGE_FILTERS[name])
+            none = [None] * len(query.filters)
+
+            everything = run_list_query(cursor, name, *none, None, None).fetchall()
+            _, full_ms = time_it(cursor, name, False, (*none, None, None), args.repeat)
+            span = date_span(name, everything)
+            if span is None:
+                print(f"{name}: no dated rows, skipped")
+                continue
+
+            for low, high in windows(*span):
+                filter_args = list(none)
+                filter_args[low_at], filter_args[high_at] = low, high
+                call_args = (*filter_args, None, None)
+
+                got = {r[0] for r in run_list_query(cursor, name, *call_args).fetchall()}
+                expected = {r[0] for r in everything if matches(name, r, low, high)}
+                ok = got == expected
+                failures += not ok
+
+                rows, range_ms = time_it(cursor, name, False, call_args, args.repeat)
+                print(f"{name:<15} {f'{low}..{high}':<24} {rows:>8} {range_ms:>9.2f} "
+                      f"{full_ms:>13.2f} {'ok' if ok else 'FAIL':>6}")
+                if not ok:
+                    print(f"    {len(got - expected)} unexpected, {len(expected - got)} missing")
+                if args.plans:
+                    print(f"    plan: {plan_summary(cursor, name, False, call_args)}")
+    finally:
+        if args.scale:
+            conn.rollback()
+        conn.close()
+
+    if failures:
+        raise SystemExit(f"{failures} window(s) returned the wrong rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/read_contention.py
+"""
+Read latency under write contention, per read isolation mode.
+
+A writer thread repeatedly runs sp_UpdateSong on one song and holds its
+transaction open for --hold-ms before committing, while --readers threads run
+sp_GetSongs (the vw_Songs list behind GET /api/songs) on read connections
+opened with DatabaseConfig.get_read_connection(mode).  Each mode is measured
+twice: idle (no writer) and contended.
+
+Under read_committed, readers that touch the locked song wait for the writer's
+commit; under read_committed_snapshot / snapshot they read the last committed
+row version instead.  Note that once READ_COMMITTED_SNAPSHOT is ON for the
+database, plain read_committed reads are versioned too, so compare locking
+reads against snapshot with only ALLOW_SNAPSHOT_ISOLATION enabled.
+
+Usage (from the project root, with .env filled in and data populated):
+    python -m benchmarks.read_contention --song-id 1 --modes read_committed snapshot
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from dotenv import load_dotenv
+load_dotenv()   # Must run before DatabaseConfig is imported
+
+from config.database_config import DatabaseConfig, READ_ISOLATION_MODES
+from backend.services.procedures import call_procedure
+
+
+def load_song(song_id):
+    """Return the sp_UpdateSong arguments that rewrite `song_id` with its current values."""
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        song = call_procedure(cursor, 'sp_GetSongByID', song_id).fetchone()
+        if song is None:
+            raise SystemExit(f"Song {song_id} not found")
+        # vw_Songs lists contributor names; sp_UpdateSong takes their NIFs
+        cursor.execute(
+            "SELECT c.Person_NIF FROM dbo.Contributor_Song cs "
+            "JOIN dbo.Contributor c ON c.ContributorID = cs.Contributor_ContributorID "
+            "WHERE cs.Song_SongID = ?", song_id
+        )
+        nifs = ','.join(r.Person_NIF for r in cursor.fetchall())
+        return (song.Title, song.Duration, song.ReleaseDate, song.Genres or None, nifs or None)
+    finally:
+        conn.close()
+
+
+def writer(song_id, values, hold, stop, counter):
+    title, duration, release_date, genres, contributors = values
+    conn = DatabaseConfig.get_connection()
+    try:
+        cursor = conn.cursor()
+        while not stop.is_set():
+            call_procedure(
+                cursor, 'sp_UpdateSong',
+                song_id, title, duration, release_date, genres, contributors, None
+            ).fetchall()
+            time.sleep(hold)        # keep the row locks while "doing work"
+            conn.commit()
+            counter[0] += 1
+    finally:
+        conn.close()
+
+
+def reader(mode, stop, latencies):
+    conn = DatabaseConfig.get_read_connection(mode)
+    try:
+        cursor = conn.cursor()
+        while not stop.is_set():
+            start = time.perf_counter()
+            call_procedure(cursor, 'sp_GetSongs', *[None] * 11).fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        conn.close()
+
+
+def run_phase(mode, args, values, contended):
+    stop = threading.Event()
+    latencies, writes = [], [0]
+    threads = [
+        threading.Thread(target=reader, args=(mode, stop, latencies))
+        for _ in range(args.readers)
+    ]
+    if contended:
+        threads.append(threading.Thread(
+            target=writer,
+            args=(args.song_id, values, args.hold_ms / 1000, stop, writes)
+        ))
+
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return latencies, writes[0]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--song-id', type=int, default=1)
+    parser.add_argument('--modes', nargs='+', default=list(READ_ISOLATION_MODES),
+                        choices=list(READ_ISOLATION_MODES))
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10, help='seconds per phase')
+    parser.add_argument('--hold-ms', type=float, default=50,
+                        help='how long the writer keeps its transaction open')
+    parser.add_argument('--enable-row-versioning', action='store_true',
+                        help='ALTER DATABASE to enable the option each mode needs first')
+    args = parser.parse_args()
+
+    values = load_song(args.song_id)
+
+    print(f"{'mode':<24} {'writer':<7} {'reads':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'writes':>7}")
+    for mode in args.modes:
+        if args.enable_row_versioning:
+            DatabaseConfig.enable_row_versioning(mode)
+        for contended in (False, True):
+            latencies, writes = run_phase(mode, args, values, contended)
+            latencies.sort()
+            print(
+                f"{mode:<24} {'yes' if contended else 'no':<7} {len(latencies):>7} "
+                f"{statistics.median(latencies) if latencies else float('nan'):>8.2f} "
+                f"{percentile(latencies, 95):>8.2f} {percentile(latencies, 99):>8.2f} "
+                f"{(latencies[-1] if latencies else float('nan')):>8.2f} {writes:>7}"
+            )
+
+
+if __name__ == '__main__':
+    main()
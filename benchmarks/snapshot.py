@@ -0,0 +1,80 @@
+# benchmarks/snapshot.py
+"""
+Compiled list queries vs. the in-process columnar snapshot.
+
+Each list is loaded into a snapshot (backend/services/snapshot.py), as the
+server does at startup, and every single filter of the list, with a value
+taken from an existing row, is answered --repeat times both by the compiled
+list query and by the snapshot.  Each line shows both median times and
+flags any difference in the returned keys, so it doubles as a check that the
+vectorized predicates agree with SQL Server's.  Needs NumPy 2.
+
+Usage (from the project root, with .env filled in and data populated):
+    python -m benchmarks.snapshot --lists songs employees --limit 50
+"""
+import argparse
+import statistics
+import time
+
+from dotenv import load_dotenv
+load_dotenv()   # Must run before DatabaseConfig is imported
+
+from config.database_config import DatabaseConfig
+from backend.services.list_queries import LIST_QUERIES, run_list_query
+from backend.services.snapshot import SNAPSHOT_LISTS, ColumnarList
+from benchmarks.list_filters import sample_values
+
+
+def median_ms(fn, repeat):
+    """(result of one warm-up run, median ms of `repeat` runs)."""
+    result = fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lists', nargs='+', default=list(SNAPSHOT_LISTS), choices=list(SNAPSHOT_LISTS))
+    parser.add_argument('--limit', type=int, default=50, help='page size (0: whole list)')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        print(f"{'list':<15} {'filter':<15} {'rows':>6} {'sql ms':>9} {'snapshot ms':>12} {'speedup':>8}")
+        for name in args.lists:
+            query = LIST_QUERIES[name]
+            snapshot = ColumnarList(name)
+            start = time.perf_counter()
+            snapshot.load(cursor)
+            print(f"{name}: {len(snapshot)} rows loaded in {time.perf_counter() - start:.2f}s")
+
+            values = sample_values(cursor, name)
+            for i, f in [(None, None), *enumerate(query.filters)]:
+                if i is not None and values[i] is None:
+                    continue
+                call_args = (*[values[j] if j == i else None for j in range(len(values))],
+                             None, args.limit or None)
+                sql_rows, sql_ms = median_ms(
+                    lambda: run_list_query(cursor, name, *call_args).fetchall(), args.repeat)
+                rows, snap_ms = median_ms(lambda: snapshot.select(*call_args), args.repeat)
+                label = f.name if f else '(none)'
+                if rows is None:
+                    print(f"{name:<15} {label:<15}  (not answered by the snapshot)")
+                    continue
+                sql_keys = [getattr(r, query.key) for r in sql_rows]
+                if sql_keys != [getattr(r, query.key) for r in rows]:
+                    print(f"  ! {name} {label}: keys differ from SQL Server's")
+                print(f"{name:<15} {label:<15} {len(rows):>6} {sql_ms:>9.2f} {snap_ms:>12.3f} "
+                      f"{sql_ms / max(snap_ms, 1e-9):>7.1f}x")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/suggest.py
+"""
+Lookup latency of the /api/suggest prefix indexes.
+
+Each index is built from the database, as the server does at startup
+(backend/services/suggest.py), and optionally padded with --synthetic extra
+in-memory records to see how it scales.  Then every prefix of length 1 to
+--max-prefix taken from the indexed terms is looked up, and the build time
+and the median, p99 and worst lookup time are printed per index.  The target
+is a p99 well under 5 ms: the index is only worth having if it is faster
+than any query.
+
+Usage (from the project root, with .env filled in and data populated):
+    python -m benchmarks.suggest --synthetic 200000
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+
+from dotenv import load_dotenv
+load_dotenv()   # Must run before DatabaseConfig is imported
+
+from config.database_config import DatabaseConfig
+from backend.services.suggest import INDEXES, SOURCES, PrefixIndex
+
+
+def synthetic_record(name: str, n: int) -> dict:
+    """A made-up record shaped like those of index `name`."""
+    word = lambda: ''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9))).title()
+    if name in ('person', 'contributor'):
+        return {"NIF": f"SY{n:09d}", "Name": f"{word()} {word()}",
+                "Email": f"synthetic.{n}@example.com", "ContributorID": n}
+    if name == 'label':
+        return {"RecordLabelID": n, "Name": f"{word()} Records {n}"}
+    return {"Genre": f"{word()} {n}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--indexes', nargs='+', default=list(INDEXES), choices=list(INDEXES))
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='extra in-memory records per index')
+    parser.add_argument('--max-prefix', type=int, default=4)
+    parser.add_argument('--lookups', type=int, default=5000, help='prefixes looked up per index')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    conn = DatabaseConfig.get_read_connection()
+    try:
+        cursor = conn.cursor()
+        print(f"{'index':<12} {'records':>9} {'build s':>8} {'median ms':>10} {'p99 ms':>8} {'max ms':>8}")
+        for name in args.indexes:
+            sql, to_record, terms_of, _ = SOURCES[name]
+            cursor.execute(sql)
+            records = [to_record(row) for row in cursor.fetchall()]
+            records += [synthetic_record(name, n) for n in range(args.synthetic)]
+
+            start = time.perf_counter()
+            index = PrefixIndex(records, terms_of)
+            build_s = time.perf_counter() - start
+            if not records:
+                print(f"{name:<12} {0:>9}  (empty, skipped)")
+                continue
+
+            terms = [t for r in random.sample(records, min(len(records), 1000)) for t in terms_of(r) if t]
+            prefixes = [t[:random.randint(1, args.max_prefix)] for t in random.choices(terms, k=args.lookups)]
+            timings = []
+            for prefix in prefixes:
+                start = time.perf_counter()
+                index.search(prefix, args.limit)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            timings.sort()
+            p99 = timings[int(len(timings) * 0.99) - 1]
+            print(f"{name:<12} {len(index):>9} {build_s:>8.2f} {statistics.median(timings):>10.3f} "
+                  f"{p99:>8.3f} {timings[-1]:>8.3f}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
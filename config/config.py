@@ -1,5 +1,82 @@
+import os
+import tempfile
+
 from .env_loader import get_env_variable
 
 class Config: 
     HOST = get_env_variable("HOST", default="localhost")
     PORT = get_env_variable("PORT", default=5000, cast=int)
+
+    # Background jobs (cascade deletes, schema init, data population)
+    JOB_WORKERS = get_env_variable("JOB_WORKERS", default=2, cast=int)
+    CASCADE_BATCH_SIZE = get_env_variable("CASCADE_BATCH_SIZE", default=500, cast=int)
+
+    # Largest page a list endpoint returns for ?limit= (keyset pagination)
+    MAX_PAGE_SIZE = get_env_variable("MAX_PAGE_SIZE", default=1000, cast=int)
+
+    # Compression of /api/* responses
+    COMPRESS_MIN_BYTES = get_env_variable("COMPRESS_MIN_BYTES", default=1024, cast=int)
+    GZIP_LEVEL = get_env_variable("GZIP_LEVEL", default=6, cast=int)
+    BROTLI_QUALITY = get_env_variable("BROTLI_QUALITY", default=5, cast=int)
+
+    # Rows fetched per round trip by /api/export (also the Parquet row group size)
+    EXPORT_BATCH_SIZE = get_env_variable("EXPORT_BATCH_SIZE", default=5000, cast=int)
+
+    # Change feed: how often GET /api/changes/stream looks for new entries
+    CHANGES_POLL_SECONDS = get_env_variable("CHANGES_POLL_SECONDS", default=2, cast=float)
+
+    # Live events (GET /api/events): messages buffered per client before a slow
+    # client is dropped, seconds between keep-alives, and how long a dashboard
+    # counts refresh waits so that a burst of writes costs one query
+    EVENTS_CLIENT_BUFFER = get_env_variable("EVENTS_CLIENT_BUFFER", default=100, cast=int)
+    EVENTS_KEEPALIVE_SECONDS = get_env_variable("EVENTS_KEEPALIVE_SECONDS", default=15, cast=float)
+    EVENTS_COUNTS_DELAY = get_env_variable("EVENTS_COUNTS_DELAY", default=0.5, cast=float)
+
+    # Catalog statistics rollups: how long the incremental refresh after a
+    # write waits to coalesce a burst of writes, and the interval of the
+    # scheduled full recompute (0: off)
+    STATS_REFRESH_DELAY = get_env_variable("STATS_REFRESH_DELAY", default=2, cast=float)
+    STATS_REFRESH_SECONDS = get_env_variable("STATS_REFRESH_SECONDS", default=300, cast=float)
+
+    # Typeahead indexes (GET /api/suggest): the same two settings, for their
+    # rebuild after a write and their scheduled rebuild (0: off)
+    SUGGEST_REFRESH_DELAY = get_env_variable("SUGGEST_REFRESH_DELAY", default=0.5, cast=float)
+    SUGGEST_REFRESH_SECONDS = get_env_variable("SUGGEST_REFRESH_SECONDS", default=300, cast=float)
+
+    # Bulk import: rows staged per round trip, and where uploads and
+    # rejected-rows files are kept
+    IMPORT_BATCH_SIZE = get_env_variable("IMPORT_BATCH_SIZE", default=5000, cast=int)
+    IMPORT_DIR = get_env_variable(
+        "IMPORT_DIR", default=os.path.join(tempfile.gettempdir(), 'record_label_imports')
+    )
+
+    # Collaboration label/contributor resolution (backend/services/references.py):
+    # seconds before the name → ID maps are reloaded in full, besides being
+    # caught up from the change feed before every use
+    REFERENCE_CACHE_SECONDS = get_env_variable("REFERENCE_CACHE_SECONDS", default=3600, cast=float)
+
+    # In-process columnar snapshot of the lists (backend/services/snapshot.py,
+    # needs NumPy 2): comma-separated lists to hold (songs, contributors,
+    # employees, record_labels; empty: off), where workers share it on disk,
+    # how long an update after a local write waits, how often the change feed
+    # is polled for other processes' writes, and the least time between saves
+    SNAPSHOT_LISTS = get_env_variable(
+        "SNAPSHOT_LISTS", default="", cast=lambda v: [n.strip() for n in v.split(',') if n.strip()]
+    )
+    SNAPSHOT_DIR = get_env_variable(
+        "SNAPSHOT_DIR", default=os.path.join(tempfile.gettempdir(), 'record_label_snapshot')
+    )
+    SNAPSHOT_REFRESH_DELAY = get_env_variable("SNAPSHOT_REFRESH_DELAY", default=0.2, cast=float)
+    SNAPSHOT_POLL_SECONDS = get_env_variable("SNAPSHOT_POLL_SECONDS", default=2, cast=float)
+    SNAPSHOT_SAVE_SECONDS = get_env_variable("SNAPSHOT_SAVE_SECONDS", default=60, cast=float)
+
+    # Idempotency-Key on POST/PUT (backend/services/idempotency.py): how long a
+    # response is replayed, how long an unfinished claim blocks its key, how
+    # many keys are kept in process, and whether claims and responses are
+    # shared with the other workers through dbo.IdempotencyKey
+    IDEMPOTENCY_TTL_SECONDS = get_env_variable("IDEMPOTENCY_TTL_SECONDS", default=86400, cast=float)
+    IDEMPOTENCY_LOCK_SECONDS = get_env_variable("IDEMPOTENCY_LOCK_SECONDS", default=60, cast=float)
+    IDEMPOTENCY_MAX_KEYS = get_env_variable("IDEMPOTENCY_MAX_KEYS", default=10000, cast=int)
+    IDEMPOTENCY_SHARED = get_env_variable(
+        "IDEMPOTENCY_SHARED", default="false", cast=lambda v: v.strip().lower() in ('1', 'true', 'yes')
+    )
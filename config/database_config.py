@@ -1,20 +1,184 @@
+import threading
+import time
+from contextvars import ContextVar
+
 import pyodbc
 from .env_loader import get_env_variable
 
+# Isolation modes for the read path (GET handlers), mapped to
+# (SET TRANSACTION ISOLATION LEVEL value, database option the mode relies on).
+#   read_committed          – server default; readers wait on writers' locks
+#   read_committed_snapshot – READ COMMITTED served from row versions
+#   snapshot                – transaction-consistent SNAPSHOT reads
+READ_ISOLATION_MODES = {
+    'read_committed':          ('READ COMMITTED', None),
+    'read_committed_snapshot': ('READ COMMITTED', 'READ_COMMITTED_SNAPSHOT ON WITH NO_WAIT'),
+    'snapshot':                ('SNAPSHOT',       'ALLOW_SNAPSHOT_ISOLATION ON'),
+}
+
+def read_isolation_mode(value: str) -> str:
+    mode = value.strip().lower()
+    if mode not in READ_ISOLATION_MODES:
+        raise ValueError(f"expected one of {', '.join(READ_ISOLATION_MODES)}")
+    return mode
+
+def server_list(value: str) -> list:
+    return [server.strip() for server in value.split(',') if server.strip()]
+
+
+class DatabaseEndpoint:
+    """
+    One SQL Server the application connects to, with its routing counters.
+    A replica whose connection attempt fails is ejected from read routing
+    until `ejected_until` (a time.monotonic() value) has passed.
+    """
+
+    def __init__(self, server: str, role: str):
+        self.server = server
+        self.role = role
+        self.reads = 0
+        self.writes = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def to_dict(self) -> dict:
+        return {
+            "Server":   self.server,
+            "Role":     self.role,
+            "Healthy":  self.healthy,
+            "Reads":    self.reads,
+            "Writes":   self.writes,
+            "Failures": self.failures
+        }
+
+
 class DatabaseConfig:
     DB_USER = get_env_variable("DB_USER", default="")
     DB_PASSWORD = get_env_variable("DB_PASSWORD", default="")
     DB_NAME = get_env_variable("DB_NAME", default="")
     CONN_STRING = get_env_variable("DB_CONN_STRING", default="")
+    READ_ISOLATION = get_env_variable("DB_READ_ISOLATION", default="read_committed", cast=read_isolation_mode)
 
-    def get_connection():
+    # Read replicas: comma-separated servers that serve GET handlers.
+    # Without any, reads go to the primary (DB_CONN_STRING).
+    READ_CONN_STRINGS = get_env_variable("DB_READ_CONN_STRINGS", default="", cast=server_list)
+    REPLICA_EJECT_SECONDS = get_env_variable("DB_REPLICA_EJECT_SECONDS", default=30, cast=float)
+    READ_YOUR_WRITES_SECONDS = get_env_variable("DB_READ_YOUR_WRITES_SECONDS", default=5, cast=float)
+
+    PRIMARY = DatabaseEndpoint(CONN_STRING, 'primary')
+    REPLICAS = [DatabaseEndpoint(server, 'replica') for server in READ_CONN_STRINGS]
+
+    _lock = threading.Lock()
+    _next_replica = 0
+    # Set per request: True sends this context's reads to the primary
+    _reads_on_primary = ContextVar('reads_on_primary', default=False)
+
+    def connect(endpoint: DatabaseEndpoint):
         # use the variables that are set in the environment
         conn_str = (
             "DRIVER={ODBC Driver 17 for SQL Server};"
-            f"SERVER={DatabaseConfig.CONN_STRING};"
+            f"SERVER={endpoint.server};"
             f"DATABASE={DatabaseConfig.DB_NAME};"
             f"UID={DatabaseConfig.DB_USER};"
             f"PWD={DatabaseConfig.DB_PASSWORD};"
             "Encrypt=no;"  # Disable if encryption causes issues
         )
         return pyodbc.connect(conn_str)
+
+    def get_connection():
+        """Connection to the primary, for writes (and anything else that must see them)."""
+        conn = DatabaseConfig.connect(DatabaseConfig.PRIMARY)
+        with DatabaseConfig._lock:
+            DatabaseConfig.PRIMARY.writes += 1
+        return conn
+
+    def get_read_connection(mode: str = None):
+        """
+        Connection for read-only handlers.
+
+        Routed to a healthy read replica (round-robin), or to the primary when
+        there are none, when all are ejected, or when reads of the current
+        request are pinned there (see read_from_primary).  Runs in autocommit
+        (no transaction is left open between statements) at the isolation
+        level of `mode` (default: DB_READ_ISOLATION), so that with a snapshot
+        mode GET requests read row versions instead of waiting on the locks
+        of concurrent writers.
+        """
+        level, _ = READ_ISOLATION_MODES[mode or DatabaseConfig.READ_ISOLATION]
+        conn = DatabaseConfig._connect_for_read()
+        try:
+            conn.autocommit = True
+            conn.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
+        except pyodbc.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _connect_for_read():
+        if not DatabaseConfig._reads_on_primary.get():
+            for endpoint in DatabaseConfig._replica_rotation():
+                try:
+                    conn = DatabaseConfig.connect(endpoint)
+                except pyodbc.Error:
+                    # Eject the replica for a while and try the next one
+                    with DatabaseConfig._lock:
+                        endpoint.failures += 1
+                        endpoint.ejected_until = time.monotonic() + DatabaseConfig.REPLICA_EJECT_SECONDS
+                    continue
+                with DatabaseConfig._lock:
+                    endpoint.reads += 1
+                return conn
+
+        conn = DatabaseConfig.connect(DatabaseConfig.PRIMARY)
+        with DatabaseConfig._lock:
+            DatabaseConfig.PRIMARY.reads += 1
+        return conn
+
+    def _replica_rotation():
+        """Healthy replicas, starting one further along at every call."""
+        with DatabaseConfig._lock:
+            healthy = [r for r in DatabaseConfig.REPLICAS if r.healthy]
+            if not healthy:
+                return []
+            start = DatabaseConfig._next_replica % len(healthy)
+            DatabaseConfig._next_replica += 1
+        return healthy[start:] + healthy[:start]
+
+    def read_from_primary(pinned: bool):
+        """Route the read connections of the current context to the primary (or not)."""
+        DatabaseConfig._reads_on_primary.set(pinned)
+
+    def reads_on_primary() -> bool:
+        """Whether the read connections of the current context go to the primary."""
+        return DatabaseConfig._reads_on_primary.get()
+
+    def routing_stats():
+        """Per-endpoint routing counters, primary first."""
+        with DatabaseConfig._lock:
+            return [e.to_dict() for e in [DatabaseConfig.PRIMARY, *DatabaseConfig.REPLICAS]]
+
+    def enable_row_versioning(mode: str = None):
+        """
+        Turn on the database option the read isolation `mode` relies on
+        (default: DB_READ_ISOLATION).  ALTER DATABASE cannot run inside a
+        transaction, so this uses its own autocommit connection.
+        Returns the option that was set, or None if the mode needs none.
+
+        READ_COMMITTED_SNAPSHOT needs the database to itself; WITH NO_WAIT makes
+        the ALTER fail (pyodbc.Error) rather than roll back other sessions'
+        transactions when it does not have it.
+        """
+        _, option = READ_ISOLATION_MODES[mode or DatabaseConfig.READ_ISOLATION]
+        if option is None:
+            return None
+        conn = DatabaseConfig.get_connection()
+        try:
+            conn.autocommit = True
+            conn.execute(f"ALTER DATABASE CURRENT SET {option}")
+            return option
+        finally:
+            conn.close()
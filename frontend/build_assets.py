@@ -0,0 +1,309 @@
+# frontend/build_assets.py
+"""
+Build the frontend for production into frontend/static/dist/.
+
+  * main.js (the classic loader script) is minified.
+  * Every page module (static/js/<page>.js) is bundled with the modules it
+    imports into a single file, so a page costs one request instead of one per
+    module, and minified.  Pages import these bundles on first navigation.
+  * The stylesheets are concatenated into one minified app.css.
+  * The page fragments (templates/pages/*.html) are rendered once to static
+    HTML, so the server no longer runs Jinja for every navigation.
+
+Every output file is named after a hash of its content (song.1a2b3c4d5e.js),
+so the server can let browsers cache it forever; a precompressed .gz copy,
+and a .br copy when the optional `brotli` package is installed, are written
+next to it.  manifest.json maps the logical names to the hashed URLs; the app
+reads it at startup (backend/services/assets.py) and falls back to the
+unbuilt sources when it is missing.
+
+Usage (from the project root):
+    python frontend/build_assets.py
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from jinja2 import Environment, FileSystemLoader
+
+try:
+    import brotli
+except ImportError:     # optional: only gzip copies are written without it
+    brotli = None
+
+FRONTEND_DIR  = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR    = os.path.join(FRONTEND_DIR, 'static')
+JS_DIR        = os.path.join(STATIC_DIR, 'js')
+TEMPLATES_DIR = os.path.join(FRONTEND_DIR, 'templates')
+DIST_DIR      = os.path.join(STATIC_DIR, 'dist')
+
+# URL prefix the dist directory is served under (frontend_routes.serve_asset)
+ASSET_URL = '/assets'
+
+# Stylesheets in cascade order (as index.html links them unbuilt)
+STYLESHEETS = ['css/style.css', 'css/record_label.css', 'css/contributor.css']
+
+# Smallest file worth a compressed copy
+COMPRESS_MIN_BYTES = 512
+
+
+class BuildError(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Minification
+# ---------------------------------------------------------------------------
+
+# After these characters (or at the start of a line) a '/' starts a regex literal
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def minify_js(source: str) -> str:
+    """
+    Conservative minifier: drops comments, indentation and blank lines but
+    keeps line breaks, so automatic semicolon insertion behaves as before.
+    Strings, template literals and regex literals are copied untouched.
+    """
+    out = []
+    i, n = 0, len(source)
+    last = ''           # last significant character written
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+        if c == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+            continue
+        if c == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if c in '\'"`':
+            j = _skip_string(source, i)
+            out.append(source[i:j])
+            last = c
+            i = j
+            continue
+        if c == '/' and (last in _REGEX_PRECEDERS or last == '' or _after_keyword(out)):
+            j = _skip_regex(source, i)
+            out.append(source[i:j])
+            last = '/'
+            i = j
+            continue
+        out.append(c)
+        if not c.isspace():
+            last = c
+        i += 1
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+def _skip_string(source: str, i: int) -> int:
+    """Index just past the string / template literal starting at `i`."""
+    quote = source[i]
+    i += 1
+    depth = 0   # brace nesting inside a template literal's ${ ... }
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if depth:
+            # Inside ${ ... }: ordinary code, possibly with its own strings
+            if c in '\'"`':
+                i = _skip_string(source, i)
+                continue
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+        elif quote == '`' and c == '$' and source[i + 1:i + 2] == '{':
+            depth = 1
+            i += 2
+            continue
+        elif c == quote:
+            return i + 1
+        i += 1
+    raise BuildError('unterminated string literal')
+
+
+def _skip_regex(source: str, i: int) -> int:
+    """Index just past the regex literal (and its flags) starting at `i`."""
+    i += 1
+    in_class = False
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            raise BuildError('unterminated regex literal')
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < len(source) and source[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    raise BuildError('unterminated regex literal')
+
+
+def _after_keyword(out) -> bool:
+    tail = ''.join(out[-8:]).rstrip()
+    return re.search(r'\b(return|typeof|case|do|else|in|of)$', tail) is not None
+
+
+def minify_css(source: str) -> str:
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r'\s*:\s*(?=[^{}]*;|[^{}]*})', ':', source)   # declarations only
+    return source.replace(';}', '}').strip() + '\n'
+
+
+def minify_html(source: str) -> str:
+    source = re.sub(r'<!--.*?-->', '', source, flags=re.S)
+    return re.sub(r'\s+', ' ', source).strip() + '\n'
+
+
+# ---------------------------------------------------------------------------
+# Module bundling
+# ---------------------------------------------------------------------------
+
+_IMPORT_RE = re.compile(
+    r"^import\s*\{([^}]*)\}\s*from\s*(['\"])([^'\"]+)\2;?[^\n]*$", re.M
+)
+_EXPORT_RE = re.compile(
+    r"^export\s+(?:async\s+)?(?:function\*?|class|const|let|var)\s+([A-Za-z_$][\w$]*)", re.M
+)
+_UNSUPPORTED_RE = re.compile(r"^(?:export\s+default|export\s*\{|export\s*\*|import\s+[^{\s])", re.M)
+
+
+def _module_var(path: str) -> str:
+    rel = os.path.relpath(path, JS_DIR)
+    return '__mod_' + re.sub(r'\W', '_', os.path.splitext(rel)[0])
+
+
+def bundle_module(entry: str) -> str:
+    """
+    Bundle the ES module `entry` and everything it imports (named imports
+    only, which is all this codebase uses) into one script.  Each module
+    becomes an IIFE returning its exports, ordered so dependencies come first.
+    """
+    order, seen = [], set()
+
+    def visit(path, stack):
+        if path in stack:
+            raise BuildError(f"import cycle: {' -> '.join(stack + [path])}")
+        if path in seen:
+            return
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        if _UNSUPPORTED_RE.search(source):
+            raise BuildError(f"{path}: only named imports/exports can be bundled")
+        for match in _IMPORT_RE.finditer(source):
+            dep = os.path.normpath(os.path.join(os.path.dirname(path), match.group(3)))
+            visit(dep, stack + [path])
+        seen.add(path)
+        order.append((path, source))
+
+    visit(os.path.normpath(entry), [])
+
+    parts = []
+    for path, source in order:
+        def to_destructure(match, path=path):
+            dep = os.path.normpath(os.path.join(os.path.dirname(path), match.group(3)))
+            names = ', '.join(
+                re.sub(r'\s+as\s+', ': ', name.strip())
+                for name in match.group(1).split(',') if name.strip()
+            )
+            return f"const {{ {names} }} = {_module_var(dep)};"
+
+        exports = _EXPORT_RE.findall(source)
+        body = _IMPORT_RE.sub(to_destructure, source)
+        body = re.sub(r'^export\s+', '', body, flags=re.M)
+        if path == order[-1][0]:
+            parts.append(f"(() => {{\n{body}\n}})();\n")
+        else:
+            parts.append(
+                f"const {_module_var(path)} = (() => {{\n{body}\n"
+                f"return {{ {', '.join(exports)} }};\n}})();\n"
+            )
+    return ''.join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def write_asset(logical_name: str, content: str) -> str:
+    """Write `content` under a content-hashed name (plus compressed copies); return its URL."""
+    data = content.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    stem, ext = os.path.splitext(logical_name)
+    hashed = f"{stem}.{digest}{ext}"
+    path = os.path.join(DIST_DIR, hashed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    if len(data) >= COMPRESS_MIN_BYTES:
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(data))
+    print(f"  {hashed:<40} {len(data):>8} bytes")
+    return f"{ASSET_URL}/{hashed}"
+
+
+def read(path: str) -> str:
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def build() -> dict:
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+
+    manifest = {
+        'main': write_asset('main.js', minify_js(read(os.path.join(JS_DIR, 'main.js')))),
+        'css': write_asset('app.css', ''.join(
+            minify_css(read(os.path.join(STATIC_DIR, name))) for name in STYLESHEETS
+        )),
+        'pages': {},
+    }
+
+    jinja = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+    pages_dir = os.path.join(TEMPLATES_DIR, 'pages')
+    for filename in sorted(os.listdir(pages_dir)):
+        page, ext = os.path.splitext(filename)
+        if ext != '.html':
+            continue
+        entry = {
+            'html': write_asset(
+                f'pages/{filename}',
+                minify_html(jinja.get_template(f'pages/{filename}').render())
+            )
+        }
+        module = os.path.join(JS_DIR, f'{page}.js')
+        if os.path.isfile(module):
+            entry['js'] = write_asset(f'{page}.js', minify_js(bundle_module(module)))
+        manifest['pages'][page] = entry
+
+    with open(os.path.join(DIST_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == '__main__':
+    print(f"Building frontend assets into {DIST_DIR}")
+    build()
+    print("Done. Restart the app to pick up the new manifest.")
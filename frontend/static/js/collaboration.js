@@ -10,6 +10,9 @@ import {
   listSongs
 } from './endpoints/song_api.js'; // to populate the Song dropdown
 
+import { VirtualTable } from './virtual_table.js';
+import { attachSuggest } from './suggest.js';
+
 function debounce(fn, delay = 300) {
   let timer;
   return (...args) => {
@@ -34,6 +37,8 @@ async function collaborationInit() {
     name:         document.getElementById('filter-name'),
     start:        document.getElementById('filter-start'),
     end:          document.getElementById('filter-end'),
+    activeFrom:   document.getElementById('filter-active-from'),
+    activeTo:     document.getElementById('filter-active-to'),
     song:         document.getElementById('filter-song'),
     labels:       document.getElementById('filter-labels'),
     contributors: document.getElementById('filter-contributors')
@@ -42,14 +47,13 @@ async function collaborationInit() {
   // “Song” dropdown inside the form (must exist in HTML)
   const songDropdown = document.getElementById('song-dropdown');
 
-  // State arrays
-  let collaborations = [];
+  // State
   let songsList = [];
 
   // Populate the <select> of existing songs
   async function populateSongDropdown() {
     try {
-      const allSongs = await listSongs({});
+      const allSongs = await listSongs({ fields: 'SongID,Title' });
       songsList = allSongs;
       // Clear existing options (except placeholder)
       songDropdown.innerHTML = `
@@ -67,11 +71,10 @@ async function collaborationInit() {
     }
   }
 
-  // Render collaborations table
-  function renderTable(data) {
-    const tbody = document.querySelector('#collab-list-table tbody');
-    tbody.innerHTML = data.map(c => `
-      <tr data-id="${c.CollaborationID}">
+  // Collaborations list: only the visible rows are rendered, further pages load on scroll
+  const table = new VirtualTable(document.getElementById('collab-list-table'), {
+    key: 'CollaborationID',
+    renderRow: c => `
         <td>${c.CollaborationID}</td>
         <td>${c.CollaborationName}</td>
         <td>${c.StartDate}</td>
@@ -80,32 +83,26 @@ async function collaborationInit() {
         <td>${c.RecordLabels.join(', ')}</td>
         <td>${c.Contributors.join(', ')}</td>
         <td>${c.Description || ''}</td>
-      </tr>
-    `).join('');
-
-    document.querySelectorAll('#collab-list-table tbody tr')
-      .forEach(row => row.onclick = () => showDetails(+row.dataset.id));
-  }
+    `,
+    onRowClick: id => showDetails(+id)
+  });
 
   // Fetch & render (with current filters)
-  let fetchId = 0;
   async function fetchAndRender() {
-    const myFetch = ++fetchId;
     const params = {};
     if (filters.name.value)         params.name = filters.name.value;
     if (filters.start.value)        params.start = filters.start.value;
     if (filters.end.value)          params.end = filters.end.value;
+    if (filters.activeFrom.value)   params.activeFrom = filters.activeFrom.value;
+    if (filters.activeTo.value)     params.activeTo = filters.activeTo.value;
     if (filters.song.value)         params.song = filters.song.value;
     if (filters.labels.value)       params.labels = filters.labels.value;
     if (filters.contributors.value) params.contributors = filters.contributors.value;
 
     try {
-      const data = await listCollaborations(params);
-      console.log('[collabInit] listCollaborations returned:', data);
-      if (myFetch !== fetchId) return; // stale response
-      collaborations = data;
-      renderTable(collaborations);
+      await table.setQuery(params, page => listCollaborations({ ...params, ...page }, { supersede: 'collaborations' }));
     } catch (err) {
+      if (err.name === 'AbortError') return; // superseded by a newer filter
       console.error('[API] listCollaborations failed', err);
       alert('Failed to load collaborations.');
     }
@@ -158,7 +155,7 @@ async function collaborationInit() {
     detailsSection.classList.add('hidden');
     listSection.classList.remove('hidden');
     modal.classList.add('hidden');
-    renderTable(collaborations);
+    table.render();
   }
 
   // Open Add/Edit form
@@ -167,6 +164,7 @@ async function collaborationInit() {
     form.reset();
 
     form.elements['CollaborationID'].value   = c.CollaborationID || '';
+    form.elements['RowVersion'].value        = c.RowVersion || '';
     form.elements['CollaborationName'].value = c.CollaborationName || '';
     form.elements['StartDate'].value         = c.StartDate || '';
     form.elements['EndDate'].value           = c.EndDate || '';
@@ -191,6 +189,13 @@ async function collaborationInit() {
     modal.classList.add('hidden');
   };
 
+  // Typeahead for the comma-separated label names and contributor NIFs
+  attachSuggest(form.elements['RecordLabels'], 'label', { valueOf: l => l.Name });
+  attachSuggest(form.elements['Contributors'], 'contributor', {
+    valueOf: c => c.NIF,
+    labelOf: c => c.Name,
+  });
+
   // Form submission: create or update
   form.onsubmit = async e => {
     e.preventDefault();
@@ -209,7 +214,7 @@ async function collaborationInit() {
 
     try {
       if (data.CollaborationID) {
-        await updateCollaboration(parseInt(data.CollaborationID, 10), payload);
+        await updateCollaboration(parseInt(data.CollaborationID, 10), payload, data.RowVersion);
       } else {
         await createCollaboration(payload);
       }
@@ -217,6 +222,14 @@ async function collaborationInit() {
       await fetchAndRender();
       backToList();
     } catch (err) {
+      if (err instanceof Response && err.status === 412) {
+        // Someone else saved this collaboration after we loaded it
+        alert('This collaboration was changed by someone else. The list has been refreshed; please reopen it and try again.');
+        modal.classList.add('hidden');
+        await fetchAndRender();
+        backToList();
+        return;
+      }
       console.error('[API] saveCollaboration failed', err);
       alert('Failed to save collaboration.');
     }
@@ -226,6 +239,9 @@ async function collaborationInit() {
   const deb = debounce(fetchAndRender, 300);
   Object.values(filters).forEach(inp => { if (inp) inp.oninput = deb; });
 
+  // Reload when another client (or a job) changes the listed data
+  window.api.onChange('collaborations', debounce(fetchAndRender, 500), listSection);
+
   // Initial load: populate song dropdown, then fetch collaborations
   await populateSongDropdown();
   await fetchAndRender();
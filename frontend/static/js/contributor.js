@@ -6,6 +6,7 @@ import {
   updateContributor,
   deleteContributor
 } from './endpoints/contributor_api.js';
+import { VirtualTable } from './virtual_table.js';
 
 function debounce(fn, delay = 300) {
   let timer;
@@ -51,13 +52,11 @@ async function contributorInit() {
     nif:   document.getElementById('filter-nif')
   };
 
-  let contributors = [];
-
-  // (Re)render table
-  function renderTable(data) {
-    const tbody = document.querySelector('#contrib-list-table tbody');
-    tbody.innerHTML = data.map(c => `
-      <tr data-id="${c.ContributorID}">
+  // Contributor list (ordered by ContributorID, so new ones appear at the bottom):
+  // only the visible rows are rendered, further pages load on scroll
+  const table = new VirtualTable(document.getElementById('contrib-list-table'), {
+    key: 'ContributorID',
+    renderRow: c => `
         <td>${c.ContributorID}</td>
         <td>${c.Name}</td>
         <td>${c.Roles}</td>
@@ -66,47 +65,23 @@ async function contributorInit() {
         <td>${c.PhoneNumber || ''}</td>
         <td>${c.DateOfBirth || ''}</td>
         <td>${c.NIF}</td>
-      </tr>
-    `).join('');
-    document.querySelectorAll('#contrib-list-table tbody tr')
-      .forEach(row => row.onclick = () => showDetails(+row.dataset.id));
-  }
+    `,
+    onRowClick: id => showDetails(+id)
+  });
 
-  // Fetch from API, sort by ContributorID, then apply client‐side filters
-  let fetchId = 0;
   async function fetchAndRender() {
-    const myFetch = ++fetchId;
     const params = {};
-    if (filters.name.value)  params.name  = filters.name.value;
-    if (filters.roles.value) params.role  = filters.roles.value;
-    if (filters.email.value) params.email = filters.email.value;
-    if (filters.phone.value) params.phone = filters.phone.value;
+    if (filters.name.value)         params.name  = filters.name.value;
+    if (filters.roles.value)        params.role  = filters.roles.value;
+    if (filters.email.value)        params.email = filters.email.value;
+    if (filters.phone.value)        params.phone = filters.phone.value;
+    if (filters.nif.value.trim())   params.nif   = filters.nif.value.trim();
+    if (filters.label.value.trim()) params.label = filters.label.value.trim();
 
     try {
-      let data = await listContributors(params);
-      if (myFetch !== fetchId) return; // stale
-
-      // Sort ascending by ContributorID so new ones appear at the bottom
-      data.sort((a, b) => a.ContributorID - b.ContributorID);
-
-      // Filter by Record Label (client‐side)
-      const labelTerm = filters.label.value.trim().toLowerCase();
-      if (labelTerm) {
-        data = data.filter(c =>
-          (c.RecordLabelName || '').toLowerCase().includes(labelTerm)
-        );
-      }
-      // Filter by NIF (client‐side)
-      const nifTerm = filters.nif.value.trim().toLowerCase();
-      if (nifTerm) {
-        data = data.filter(c =>
-          (c.NIF || '').toLowerCase().includes(nifTerm)
-        );
-      }
-
-      contributors = data;
-      renderTable(contributors);
+      await table.setQuery(params, page => listContributors({ ...params, ...page }, { supersede: 'contributors' }));
     } catch (err) {
+      if (err.name === 'AbortError') return; // superseded by a newer filter
       console.error('[API] listContributors failed', err);
       alert('Failed to load contributors.');
     }
@@ -197,7 +172,7 @@ async function contributorInit() {
     listSection.classList.remove('hidden');
     modal.classList.add('hidden');
     if (conflictModal) conflictModal.classList.add('hidden');
-    renderTable(contributors);
+    table.render();
   }
 
   // Open “Add/Edit Contributor” modal
@@ -208,6 +183,7 @@ async function contributorInit() {
 
     // If editing, pre‐fill fields
     form.elements['ContributorID'].value = c.ContributorID || '';
+    form.elements['RowVersion'].value    = c.RowVersion || '';
     form.elements['NIF'].value           = c.NIF || '';
     form.elements['Name'].value          = c.Name || '';
     form.elements['DateOfBirth'].value   = c.DateOfBirth || '';
@@ -244,7 +220,7 @@ async function contributorInit() {
     try {
       // 1) If editing, just call updateContributor
       if (data.ContributorID) {
-        await updateContributor(data.ContributorID, data);
+        await updateContributor(data.ContributorID, data, data.RowVersion);
         modal.classList.add('hidden');
         await fetchAndRender();
         backToList();
@@ -293,7 +269,7 @@ async function contributorInit() {
           keepBtn.onclick = async () => {
             conflictModal.classList.add('hidden');
             try {
-              await createContributor(incomingData, '?useOldPerson=true');
+              await createContributor(incomingData, '?conflict=reuse');
               await fetchAndRender();
               backToList();
             } catch (err2) {
@@ -302,29 +278,10 @@ async function contributorInit() {
             }
           };
 
-          // Choice B: Overwrite Person fields, then add Contributor under that NIF
+          // Choice B: Overwrite Person fields and add Contributor under that NIF (one request)
           overwriteBtn.onclick = async () => {
             try {
-              // 1) Update Person via PUT /api/persons/:nif
-              const updatePersonRes = await fetch(
-                `/api/persons/${existingPerson.NIF}`,
-                {
-                  method: 'PUT',
-                  headers: { 'Content-Type': 'application/json' },
-                  body: JSON.stringify({
-                    Name:         incomingData.Name,
-                    DateOfBirth:  incomingData.DateOfBirth,
-                    Email:        incomingData.Email,
-                    PhoneNumber:  incomingData.PhoneNumber
-                  })
-                }
-              );
-              if (!updatePersonRes.ok) {
-                throw updatePersonRes;
-              }
-
-              // 2) Now add Contributor under that same NIF
-              await createContributor(incomingData, '?useOldPerson=true');
+              await createContributor(incomingData, '?conflict=overwrite');
               conflictModal.classList.add('hidden');
               await fetchAndRender();
               backToList();
@@ -346,6 +303,14 @@ async function contributorInit() {
         }
       }
     } catch (err) {
+      if (err instanceof Response && err.status === 412) {
+        // Someone else saved this contributor after we loaded it
+        alert('This contributor was changed by someone else. The list has been refreshed; please reopen it and try again.');
+        modal.classList.add('hidden');
+        await fetchAndRender();
+        backToList();
+        return;
+      }
       console.error('[API] saveContributor failed (unexpected)', err);
       alert('Failed to save contributor.');
     }
@@ -355,6 +320,9 @@ async function contributorInit() {
   const deb = debounce(fetchAndRender, 300);
   Object.values(filters).forEach(inp => { if (inp) inp.oninput = deb; });
 
+  // Reload when another client (or a job) changes the listed data
+  window.api.onChange('contributors', debounce(fetchAndRender, 500), listSection);
+
   // Initial load
   await fetchAndRender();
   console.log('[contributorInit] done');
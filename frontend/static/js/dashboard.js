@@ -1,20 +1,36 @@
+// Dashboard count elements by sp_GetDashboardCounts column
+const COUNT_ELEMENTS = {
+  RecordLabelCount:   'count-record_label',
+  EmployeeCount:      'count-employee',
+  SongCount:          'count-song',
+  ContributorCount:   'count-contributor',
+  CollaborationCount: 'count-collaboration'
+};
+
+function renderCounts(counts, deltas = {}) {
+  for (const [key, id] of Object.entries(COUNT_ELEMENTS)) {
+    const el = document.getElementById(id);
+    if (!el || counts[key] === undefined) continue;
+    el.textContent = counts[key];
+    if (deltas[key]) el.title = `${deltas[key] > 0 ? '+' : ''}${deltas[key]} just now`;
+  }
+}
+
 async function dashboardInit() {
   try {
-    const res = await fetch('/api/dashboard/counts');
-    if (!res.ok) throw res;
-    const stats = await res.json();
-
     // Populate each card’s count
-    document.getElementById('count-record_label').textContent   = stats.RecordLabelCount;
-    document.getElementById('count-employee').textContent       = stats.EmployeeCount;
-    document.getElementById('count-song').textContent           = stats.SongCount;
-    document.getElementById('count-contributor').textContent    = stats.ContributorCount;
-    document.getElementById('count-collaboration').textContent  = stats.CollaborationCount;
+    renderCounts(await window.api.getJSON('/api/dashboard/counts'));
   } catch (err) {
     console.error('[API] fetch dashboard counts failed', err);
     alert('Unable to load dashboard counts.');
   }
 
+  // Then keep them live: totals and deltas pushed by GET /api/events
+  window.api.onCounts(
+    ({ Counts, Deltas }) => renderCounts(Counts, Deltas),
+    document.querySelector('.cards-container')
+  );
+
   // Card click navigation (unchanged)
   document.querySelectorAll('.card').forEach(card => {
     card.addEventListener('click', e => {
@@ -7,6 +7,7 @@ import {
 } from './endpoints/employee_api.js';
 
 import { listLabels } from './endpoints/record_label_api.js';
+import { VirtualTable } from './virtual_table.js';
 
 function debounce(fn, delay = 300) {
   let timer;
@@ -49,20 +50,25 @@ async function employeeInit() {
     jobtitle:   document.getElementById('filter-jobtitle'),
     department: document.getElementById('filter-department'),
     salary:     document.getElementById('filter-salary'),
+    hiredFrom:  document.getElementById('filter-hired-from'),
+    hiredTo:    document.getElementById('filter-hired-to'),
     email:      document.getElementById('filter-email'),
     phone:      document.getElementById('filter-phone'),
     nif:        document.getElementById('filter-nif'),
   };
 
-  // Keys that go to server‐side filtering
-  const serverKeys = ['name', 'jobtitle', 'department', 'email', 'phone', 'nif'];
+  // Filter inputs and the query parameter each one maps to
+  const filterParams = {
+    name: 'name', label: 'label', jobtitle: 'jobtitle', department: 'department',
+    salary: 'minSalary', hiredFrom: 'hiredFrom', hiredTo: 'hiredTo',
+    email: 'email', phone: 'phone', nif: 'nif'
+  };
 
-  let employees = [];
   let labels = [];
 
   // Populate Record Label <select> inside form
   async function populateLabelDropdown() {
-    labels = await listLabels();
+    labels = await listLabels({ fields: 'RecordLabelID,Name' });
     const select = form.elements['RecordLabelID'];
     labels.forEach(lbl => {
       const opt = document.createElement('option');
@@ -72,11 +78,10 @@ async function employeeInit() {
     });
   }
 
-  // Render employees into table
-  function renderTable(data) {
-    const tbody = document.querySelector('#emp-list-table tbody');
-    tbody.innerHTML = data.map(e => `
-      <tr data-id="${e.EmployeeID}">
+  // Employee list: only the visible rows are rendered, further pages load on scroll
+  const table = new VirtualTable(document.getElementById('emp-list-table'), {
+    key: 'EmployeeID',
+    renderRow: e => `
         <td>${e.EmployeeID}</td>
         <td>${e.Name}</td>
         <td>${e.RecordLabelName || ''}</td>
@@ -88,40 +93,21 @@ async function employeeInit() {
         <td>${e.PhoneNumber || ''}</td>
         <td>${e.DateOfBirth || ''}</td>
         <td>${e.NIF}</td>
-      </tr>
-    `).join('');
-    document
-      .querySelectorAll('#emp-list-table tbody tr')
-      .forEach(row => row.onclick = () => showDetails(+row.dataset.id));
-  }
+    `,
+    onRowClick: id => showDetails(+id)
+  });
 
-  let fetchId = 0;
   async function fetchAndRender() {
-    const myFetch = ++fetchId;
     const params = {};
-    serverKeys.forEach(k => {
-      const v = filters[k].value.trim();
-      if (v) params[k] = v;
+    Object.entries(filterParams).forEach(([input, param]) => {
+      const v = filters[input].value.trim();
+      if (v) params[param] = v;
     });
 
     try {
-      let data = await listEmployees(params);
-      if (myFetch !== fetchId) return; // stale
-
-      // Client‐side filter: minimum salary
-      const minSalary = parseFloat(filters.salary.value) || 0;
-      // Client‐side filter: record label substring
-      const labelTerm = filters.label.value.trim().toLowerCase();
-
-      data = data.filter(e => {
-        if (filters.salary.value && e.Salary < minSalary) return false;
-        if (labelTerm && !(e.RecordLabelName || '').toLowerCase().includes(labelTerm)) return false;
-        return true;
-      });
-
-      employees = data;
-      renderTable(employees);
+      await table.setQuery(params, page => listEmployees({ ...params, ...page }, { supersede: 'employees' }));
     } catch (err) {
+      if (err.name === 'AbortError') return; // superseded by a newer filter
       console.error('[API] listEmployees failed', err);
       alert('Failed to load employees.');
     }
@@ -176,7 +162,7 @@ async function employeeInit() {
     detailsSection.classList.add('hidden');
     listSection.classList.remove('hidden');
     modal.classList.add('hidden');
-    renderTable(employees);
+    table.render();
   }
 
   // Open “Add/Edit Employee” modal
@@ -187,6 +173,7 @@ async function employeeInit() {
 
     // Pre-fill fields if editing
     form.elements['EmployeeID'].value     = emp.EmployeeID || '';
+    form.elements['RowVersion'].value     = emp.RowVersion || '';
     form.elements['NIF'].value            = emp.NIF || '';
     form.elements['Name'].value           = emp.Name || '';
     form.elements['DateOfBirth'].value    = emp.DateOfBirth || '';
@@ -237,7 +224,7 @@ async function employeeInit() {
     try {
       // 1) If editing, just call updateEmployee
       if (data.EmployeeID) {
-        await updateEmployee(data.EmployeeID, data);
+        await updateEmployee(data.EmployeeID, data, data.RowVersion);
         modal.classList.add('hidden');
         await fetchAndRender();
         backToList();
@@ -286,7 +273,7 @@ async function employeeInit() {
           keepBtn.onclick = async () => {
             conflictModal.classList.add('hidden');
             try {
-              await createEmployee(incomingData, '?useOldPerson=true');
+              await createEmployee(incomingData, '?conflict=reuse');
               await fetchAndRender();
               backToList();
             } catch (err2) {
@@ -295,29 +282,10 @@ async function employeeInit() {
             }
           };
 
-          // Choice B: Overwrite Person fields, then add Employee under that NIF
+          // Choice B: Overwrite Person fields and add Employee under that NIF (one request)
           overwriteBtn.onclick = async () => {
             try {
-              // 1) Update Person via PUT /api/persons/:nif
-              const updatePersonRes = await fetch(
-                `/api/persons/${existingPerson.NIF}`,
-                {
-                  method: 'PUT',
-                  headers: { 'Content-Type': 'application/json' },
-                  body: JSON.stringify({
-                    Name:         incomingData.Name,
-                    DateOfBirth:  incomingData.DateOfBirth,
-                    Email:        incomingData.Email,
-                    PhoneNumber:  incomingData.PhoneNumber
-                  })
-                }
-              );
-              if (!updatePersonRes.ok) {
-                throw updatePersonRes;
-              }
-
-              // 2) Now add Employee under that same NIF
-              await createEmployee(incomingData, '?useOldPerson=true');
+              await createEmployee(incomingData, '?conflict=overwrite');
               conflictModal.classList.add('hidden');
               await fetchAndRender();
               backToList();
@@ -339,6 +307,14 @@ async function employeeInit() {
         }
       }
     } catch (err) {
+      if (err instanceof Response && err.status === 412) {
+        // Someone else saved this employee after we loaded it
+        alert('This employee was changed by someone else. The list has been refreshed; please reopen it and try again.');
+        modal.classList.add('hidden');
+        await fetchAndRender();
+        backToList();
+        return;
+      }
       console.error('[API] saveEmployee failed (unexpected)', err);
       alert('Failed to save employee.');
     }
@@ -348,6 +324,9 @@ async function employeeInit() {
   const deb = debounce(fetchAndRender, 300);
   Object.values(filters).forEach(inp => { if (inp) inp.oninput = deb; });
 
+  // Reload when another client (or a job) changes the listed data
+  window.api.onChange('employees', debounce(fetchAndRender, 500), listSection);
+
   // Initial population
   await populateLabelDropdown();
   await fetchAndRender();
@@ -3,20 +3,31 @@ const BASE = ''; // same-origin
 /**
  * List collaborations, with optional filters.
  * Supported filter keys:
- *   name, start, end, song, labels, contributors
+ *   name, start, end, song, labels, contributors,
+ *   activeFrom, activeTo (YYYY-MM-DD: collaborations running at some point in that window)
+ * Paging keys (optional): limit (page size), after (last CollaborationID of the previous page)
+ * Sorting key (optional): sort, e.g. '-EndDate,CollaborationName'
+ *   (CollaborationID, CollaborationName, StartDate, EndDate; '-' for descending)
+ * Projection key (optional): fields, e.g. 'CollaborationID,CollaborationName'; only those columns are
+ *   returned (the ID always is), which lets dropdowns skip the aggregated ones
+ * Embedding key (optional): include, any of 'song,contributors,record_labels';
+ *   each row gets those related records nested under the same names
+ *
+ * `options` go to the shared fetch layer (main.js), e.g. { supersede: 'page' }
+ * to abort the previous list request of that page.
  */
-export async function listCollaborations(filters = {}) {
+export async function listCollaborations(filters = {}, options = {}) {
   const params = new URLSearchParams(filters);
-  const res = await fetch(`${BASE}/api/collaborations?${params.toString()}`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/collaborations?${params.toString()}`, options);
 }
 
-/** Get a single collaboration by ID */
-export async function getCollaboration(id) {
-  const res = await fetch(`${BASE}/api/collaborations/${id}`);
-  if (!res.ok) throw res;
-  return res.json();
+/**
+ * Get a single collaboration by ID.
+ * `include` (optional) embeds related records, as on the list, e.g. 'record_labels'.
+ */
+export async function getCollaboration(id, include = '') {
+  const query = include ? `?include=${encodeURIComponent(include)}` : '';
+  return window.api.getJSON(`${BASE}/api/collaborations/${id}${query}`, { ttl: 0 });
 }
 
 /**
@@ -26,7 +37,7 @@ export async function getCollaboration(id) {
  *   Description, SongID, RecordLabels, Contributors
  */
 export async function createCollaboration(data) {
-  const res = await fetch(`${BASE}/api/collaborations`, {
+  const res = await window.api.send(`${BASE}/api/collaborations`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(data),
@@ -38,11 +49,17 @@ export async function createCollaboration(data) {
 /**
  * Update an existing collaboration.
  * `id` is the CollaborationID; `data` same shape as for createCollaboration.
+ *
+ * Pass the `rowVersion` the record was read with to send it as If-Match;
+ * if someone else changed the record since, the server answers 412 (thrown as the Response).
  */
-export async function updateCollaboration(id, data) {
-  const res = await fetch(`${BASE}/api/collaborations/${id}`, {
+export async function updateCollaboration(id, data, rowVersion = null) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (rowVersion) headers['If-Match'] = `"${rowVersion}"`;
+
+  const res = await window.api.send(`${BASE}/api/collaborations/${id}`, {
     method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
+    headers,
     body: JSON.stringify(data),
   });
   if (!res.ok) throw res;
@@ -51,7 +68,7 @@ export async function updateCollaboration(id, data) {
 
 /** Delete a collaboration by ID */
 export async function deleteCollaboration(id) {
-  const res = await fetch(`${BASE}/api/collaborations/${id}`, {
+  const res = await window.api.send(`${BASE}/api/collaborations/${id}`, {
     method: 'DELETE',
   });
   if (!res.ok) throw res;
@@ -2,28 +2,46 @@ const BASE = ''; // same-origin
 
 /**
  * List contributors with optional filters.
- * Supported filter keys: name, role, email, phone
+ * Supported filter keys: name, role, email, phone, nif,
+ *   label (name substring of the record label the contributor works for)
+ * Paging keys (optional): limit (page size), after (last ContributorID of the previous page)
+ * Sorting key (optional): sort, e.g. '-Name'
+ *   (ContributorID, Name; '-' for descending)
+ * Projection key (optional): fields, e.g. 'ContributorID,NIF,Name'; only those columns are
+ *   returned (the ID always is), which lets dropdowns skip the aggregated ones
+ * Embedding key (optional): include, any of 'songs,collaborations,dependencies';
+ *   each row gets those related records nested under the same names
  * Each returned object includes:
  *   ContributorID, NIF, Name, DateOfBirth,
  *   Email, PhoneNumber, RecordLabelName, Roles
+ *
+ * `options` go to the shared fetch layer (main.js), e.g. { supersede: 'page' }
+ * to abort the previous list request of that page.
  */
-export async function listContributors(filters = {}) {
+export async function listContributors(filters = {}, options = {}) {
   const params = new URLSearchParams();
   if (filters.name)  params.set('name', filters.name);
   if (filters.role)  params.set('role', filters.role);
   if (filters.email) params.set('email', filters.email);
   if (filters.phone) params.set('phone', filters.phone);
+  if (filters.nif)   params.set('nif', filters.nif);
+  if (filters.label) params.set('label', filters.label);
+  if (filters.after != null) params.set('after', filters.after);
+  if (filters.limit) params.set('limit', filters.limit);
+  if (filters.sort)  params.set('sort', filters.sort);
+  if (filters.fields) params.set('fields', filters.fields);
+  if (filters.include) params.set('include', filters.include);
 
-  const res = await fetch(`${BASE}/api/contributors?${params.toString()}`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/contributors?${params.toString()}`, options);
 }
 
-/** Get a single contributor by ID */
-export async function getContributor(id) {
-  const res = await fetch(`${BASE}/api/contributors/${id}`);
-  if (!res.ok) throw res;
-  return res.json();
+/**
+ * Get a single contributor by ID.
+ * `include` (optional) embeds related records, as on the list, e.g. 'dependencies'.
+ */
+export async function getContributor(id, include = '') {
+  const query = include ? `?include=${encodeURIComponent(include)}` : '';
+  return window.api.getJSON(`${BASE}/api/contributors/${id}${query}`, { ttl: 0 });
 }
 
 /**
@@ -31,16 +49,16 @@ export async function getContributor(id) {
  * Returns { CollaborationCount, SongCount }.
  */
 export async function getContributorDependencies(id) {
-  const res = await fetch(`${BASE}/api/contributors/${id}/dependencies`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/contributors/${id}/dependencies`, { ttl: 0 });
 }
 
 /**
  * Create a new contributor.
  * Expects an object with keys:
  *   NIF, Name, DateOfBirth, Email, PhoneNumber, Roles
- * Optionally append a query string, e.g. '?useOldPerson=true' or '?overwritePerson=true'.
+ * Optionally append a query string to choose how an existing Person with the
+ * same NIF but different fields is handled:
+ *   '?conflict=fail' (default), '?conflict=reuse' or '?conflict=overwrite'.
  *
  * If the server finds a conflicting Person (same NIF but different fields),
  * it will return HTTP 409 Conflict with JSON payload describing:
@@ -51,7 +69,7 @@ export async function getContributorDependencies(id) {
  */
 export async function createContributor(data, queryString = '') {
   const url = `${BASE}/api/contributors${queryString}`;
-  const res = await fetch(url, {
+  const res = await window.api.send(url, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(data),
@@ -65,11 +83,17 @@ export async function createContributor(data, queryString = '') {
  * `id` is the ContributorID; `data` has same keys as createContributor.
  *
  * Returns the updated contributor object.
+ *
+ * Pass the `rowVersion` the record was read with to send it as If-Match;
+ * if someone else changed the record since, the server answers 412 (thrown as the Response).
  */
-export async function updateContributor(id, data) {
-  const res = await fetch(`${BASE}/api/contributors/${id}`, {
+export async function updateContributor(id, data, rowVersion = null) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (rowVersion) headers['If-Match'] = `"${rowVersion}"`;
+
+  const res = await window.api.send(`${BASE}/api/contributors/${id}`, {
     method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
+    headers,
     body: JSON.stringify(data),
   });
   if (!res.ok) throw res;
@@ -78,7 +102,7 @@ export async function updateContributor(id, data) {
 
 /** Delete a contributor by ID */
 export async function deleteContributor(id) {
-  const res = await fetch(`${BASE}/api/contributors/${id}`, {
+  const res = await window.api.send(`${BASE}/api/contributors/${id}`, {
     method: 'DELETE',
   });
   if (!res.ok) throw res;
@@ -1,8 +1,6 @@
 async function dashboardInit() {
   try {
-    const res = await fetch('/api/dashboard/counts');
-    if (!res.ok) throw res;
-    const stats = await res.json();
+    const stats = await window.api.getJSON('/api/dashboard/counts');
 
     // Populate each card’s count
     document.getElementById('count-record_label').textContent   = stats.RecordLabelCount;
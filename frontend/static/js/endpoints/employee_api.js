@@ -2,10 +2,21 @@ const BASE = ''; // same-origin
 
 /**
  * List employees, with optional filters.
- * Supported filter keys: nif, name, jobtitle, department, email, phone
- * (Record-label filtering can be done client-side if desired.)
+ * Supported filter keys: nif, name, jobtitle, department, email, phone,
+ *   minSalary, hiredFrom, hiredTo (YYYY-MM-DD, inclusive),
+ *   label (record label name substring)
+ * Paging keys (optional): limit (page size), after (last EmployeeID of the previous page)
+ * Sorting key (optional): sort, e.g. '-HireDate,Name'
+ *   (EmployeeID, Name, Salary, HireDate; '-' for descending)
+ * Projection key (optional): fields, e.g. 'EmployeeID,Name'; only those columns are
+ *   returned (the ID always is), which lets dropdowns skip the aggregated ones
+ * Embedding key (optional): include, any of 'record_label,dependencies';
+ *   each row gets those related records nested under the same names
+ *
+ * `options` go to the shared fetch layer (main.js), e.g. { supersede: 'page' }
+ * to abort the previous list request of that page.
  */
-export async function listEmployees(filters = {}) {
+export async function listEmployees(filters = {}, options = {}) {
   const params = new URLSearchParams();
   if (filters.nif)        params.set('nif', filters.nif);
   if (filters.name)       params.set('name', filters.name);
@@ -13,17 +24,26 @@ export async function listEmployees(filters = {}) {
   if (filters.department) params.set('department', filters.department);
   if (filters.email)      params.set('email', filters.email);
   if (filters.phone)      params.set('phone', filters.phone);
+  if (filters.minSalary)  params.set('minSalary', filters.minSalary);
+  if (filters.hiredFrom)  params.set('hiredFrom', filters.hiredFrom);
+  if (filters.hiredTo)    params.set('hiredTo', filters.hiredTo);
+  if (filters.label)      params.set('label', filters.label);
+  if (filters.after != null) params.set('after', filters.after);
+  if (filters.limit)      params.set('limit', filters.limit);
+  if (filters.sort)       params.set('sort', filters.sort);
+  if (filters.fields)     params.set('fields', filters.fields);
+  if (filters.include)    params.set('include', filters.include);
 
-  const res = await fetch(`${BASE}/api/employees?${params.toString()}`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/employees?${params.toString()}`, options);
 }
 
-/** Get a single employee by ID */
-export async function getEmployee(id) {
-  const res = await fetch(`${BASE}/api/employees/${id}`);
-  if (!res.ok) throw res;
-  return res.json();
+/**
+ * Get a single employee by ID.
+ * `include` (optional) embeds related records, as on the list, e.g. 'dependencies'.
+ */
+export async function getEmployee(id, include = '') {
+  const query = include ? `?include=${encodeURIComponent(include)}` : '';
+  return window.api.getJSON(`${BASE}/api/employees/${id}${query}`, { ttl: 0 });
 }
 
 /**
@@ -32,8 +52,9 @@ export async function getEmployee(id) {
  *   NIF, Name, DateOfBirth, Email, PhoneNumber,
  *   JobTitle, Department, Salary, HireDate, RecordLabelID
  *
- * Optionally append a query string (e.g. '?useOldPerson=true' or '?overwritePerson=true')
- * to handle the “existing Person” workflows.
+ * Optionally append a query string to choose how an existing Person with the
+ * same NIF but different fields is handled:
+ *   '?conflict=fail' (default), '?conflict=reuse' or '?conflict=overwrite'.
  *
  * If the server finds a conflicting Person (same NIF but different fields),
  * it will return HTTP 409 Conflict with JSON describing:
@@ -41,7 +62,7 @@ export async function getEmployee(id) {
  */
 export async function createEmployee(data, queryString = '') {
   const url = `${BASE}/api/employees${queryString}`;
-  const res = await fetch(url, {
+  const res = await window.api.send(url, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(data),
@@ -56,11 +77,17 @@ export async function createEmployee(data, queryString = '') {
  * `data` has the same shape as for createEmployee, including a (possibly new) NIF.
  *
  * If you attempt to change NIF to one that already exists, the server returns 409.
+ *
+ * Pass the `rowVersion` the record was read with to send it as If-Match;
+ * if someone else changed the record since, the server answers 412 (thrown as the Response).
  */
-export async function updateEmployee(id, data) {
-  const res = await fetch(`${BASE}/api/employees/${id}`, {
+export async function updateEmployee(id, data, rowVersion = null) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (rowVersion) headers['If-Match'] = `"${rowVersion}"`;
+
+  const res = await window.api.send(`${BASE}/api/employees/${id}`, {
     method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
+    headers,
     body: JSON.stringify(data),
   });
   if (!res.ok) throw res;
@@ -69,7 +96,7 @@ export async function updateEmployee(id, data) {
 
 /** Delete an employee by ID */
 export async function deleteEmployee(id) {
-  const res = await fetch(`${BASE}/api/employees/${id}`, {
+  const res = await window.api.send(`${BASE}/api/employees/${id}`, {
     method: 'DELETE',
   });
   if (!res.ok) throw res;
@@ -82,7 +109,5 @@ export async function deleteEmployee(id) {
  * Returns { CollaborationCount, SongCount } for that Employee’s Person.
  */
 export async function getEmployeeDependencies(id) {
-  const res = await fetch(`${BASE}/api/employees/${id}/dependencies`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/employees/${id}/dependencies`, { ttl: 0 });
 }
@@ -0,0 +1,20 @@
+const BASE = ''; // same-origin
+
+/** Get the current state of a background job by ID */
+export async function getJob(id) {
+  return window.api.getJSON(`${BASE}/api/jobs/${id}`, { ttl: 0 });
+}
+
+/**
+ * Poll a background job until it finishes.
+ * Resolves with the final job object when Status is 'succeeded';
+ * rejects with the job object when Status is 'failed'.
+ */
+export async function waitForJob(id, { interval = 1000 } = {}) {
+  while (true) {
+    const job = await getJob(id);
+    if (job.Status === 'succeeded') return job;
+    if (job.Status === 'failed') throw job;
+    await new Promise(resolve => setTimeout(resolve, interval));
+  }
+}
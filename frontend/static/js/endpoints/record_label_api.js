@@ -1,21 +1,33 @@
+import { waitForJob } from './job_api.js';
+
 const BASE = ''; // same-origin
 
 /**
  * List all record labels with optional filters.
  * Supported filter keys: name, location, website, email, phone
+ * Paging keys (optional): limit (page size), after (last RecordLabelID of the previous page)
+ * Sorting key (optional): sort, e.g. '-Name'
+ *   (RecordLabelID, Name; '-' for descending)
+ * Projection key (optional): fields, e.g. 'RecordLabelID,Name'; only those columns are
+ *   returned (the ID always is), which lets dropdowns skip the aggregated ones
+ * Embedding key (optional): include, any of 'employees,collaborations,dependencies';
+ *   each row gets those related records nested under the same names
+ *
+ * `options` go to the shared fetch layer (main.js), e.g. { supersede: 'page' }
+ * to abort the previous list request of that page.
  */
-export async function listLabels(filters = {}) {
+export async function listLabels(filters = {}, options = {}) {
   const params = new URLSearchParams(filters);
-  const res = await fetch(`${BASE}/api/record_labels?${params.toString()}`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/record_labels?${params.toString()}`, options);
 }
 
-/** Get a single record label by ID */
-export async function getLabel(id) {
-  const res = await fetch(`${BASE}/api/record_labels/${id}`);
-  if (!res.ok) throw res;
-  return res.json();
+/**
+ * Get a single record label by ID.
+ * `include` (optional) embeds related records, as on the list, e.g. 'dependencies'.
+ */
+export async function getLabel(id, include = '') {
+  const query = include ? `?include=${encodeURIComponent(include)}` : '';
+  return window.api.getJSON(`${BASE}/api/record_labels/${id}${query}`, { ttl: 0 });
 }
 
 /**
@@ -23,7 +35,7 @@ export async function getLabel(id) {
  * Expects an object with keys: Name, Location, Website, Email, PhoneNumber
  */
 export async function createLabel(data) {
-  const res = await fetch(`${BASE}/api/record_labels`, {
+  const res = await window.api.send(`${BASE}/api/record_labels`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(data)
@@ -35,11 +47,17 @@ export async function createLabel(data) {
 /**
  * Update an existing record label.
  * `id` is the RecordLabelID; `data` has keys Name, Location, Website, Email, PhoneNumber
+ *
+ * Pass the `rowVersion` the record was read with to send it as If-Match;
+ * if someone else changed the record since, the server answers 412 (thrown as the Response).
  */
-export async function updateLabel(id, data) {
-  const res = await fetch(`${BASE}/api/record_labels/${id}`, {
+export async function updateLabel(id, data, rowVersion = null) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (rowVersion) headers['If-Match'] = `"${rowVersion}"`;
+
+  const res = await window.api.send(`${BASE}/api/record_labels/${id}`, {
     method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
+    headers,
     body: JSON.stringify(data)
   });
   if (!res.ok) throw res;
@@ -48,7 +66,8 @@ export async function updateLabel(id, data) {
 
 /**
  * Delete a record label by ID.
- * If `cascade` is true, we append ?cascade=true so the server runs sp_DeleteRecordLabel_Cascade.
+ * If `cascade` is true, we append ?cascade=true; the server answers 202 with a background job
+ * that deletes the dependents in batches, and we wait for that job to finish.
  * Otherwise, it runs the simple sp_DeleteRecordLabel (which first checks for dependencies via sp_CheckRecordLabelDependencies).
  */
 export async function deleteLabel(id, { cascade = false } = {}) {
@@ -56,7 +75,7 @@ export async function deleteLabel(id, { cascade = false } = {}) {
     ? `${BASE}/api/record_labels/${id}?cascade=true`
     : `${BASE}/api/record_labels/${id}`;
 
-  const res = await fetch(url, {
+  const res = await window.api.send(url, {
     method: 'DELETE'
   });
 
@@ -66,6 +85,17 @@ export async function deleteLabel(id, { cascade = false } = {}) {
     throw res;
   }
 
+  // 202 Accepted: cascade delete runs as a job; rejects with the job if it fails
+  if (res.status === 202) {
+    const job = await res.json();
+    try {
+      await waitForJob(job.JobID);
+    } finally {
+      // Batches committed by the job (even a failed one) changed the dependents too
+      window.api.changed('record_labels');
+    }
+  }
+
   // 204 No Content on a successful delete
   return;
 }
@@ -4,28 +4,46 @@ const BASE = ''; // same-origin
  * List songs with optional filters.
  * Supported filter keys (all optional):
  *   title, minDuration, maxDuration, releaseDate,
+ *   releasedFrom, releasedTo (YYYY-MM-DD, inclusive),
  *   genre, contributor, collaboration
+ * Paging keys (optional): limit (page size), after (last SongID of the previous page)
+ * Sorting key (optional): sort, e.g. '-ReleaseDate,Title'
+ *   (SongID, Title, Duration, ReleaseDate; '-' for descending)
+ * Projection key (optional): fields, e.g. 'SongID,Title'; only those columns are
+ *   returned (the ID always is), which lets dropdowns skip the aggregated ones
+ * Embedding key (optional): include, any of 'contributors,genres,collaboration,dependencies';
+ *   each row gets those related records nested under the same names
+ *
+ * `options` go to the shared fetch layer (main.js), e.g. { supersede: 'page' }
+ * to abort the previous list request of that page.
  */
-export async function listSongs(filters = {}) {
+export async function listSongs(filters = {}, options = {}) {
   const params = new URLSearchParams();
   if (filters.title)         params.set('title', filters.title);
   if (filters.minDuration)   params.set('minDuration', filters.minDuration);
   if (filters.maxDuration)   params.set('maxDuration', filters.maxDuration);
   if (filters.releaseDate)   params.set('releaseDate', filters.releaseDate);
+  if (filters.releasedFrom)  params.set('releasedFrom', filters.releasedFrom);
+  if (filters.releasedTo)    params.set('releasedTo', filters.releasedTo);
   if (filters.genre)         params.set('genre', filters.genre);
   if (filters.contributor)   params.set('contributor', filters.contributor);
   if (filters.collaboration) params.set('collaboration', filters.collaboration);
+  if (filters.after != null) params.set('after', filters.after);
+  if (filters.limit)         params.set('limit', filters.limit);
+  if (filters.sort)          params.set('sort', filters.sort);
+  if (filters.fields)        params.set('fields', filters.fields);
+  if (filters.include)       params.set('include', filters.include);
 
-  const res = await fetch(`${BASE}/api/songs?${params.toString()}`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/songs?${params.toString()}`, options);
 }
 
-/** Get a single song by ID */
-export async function getSong(id) {
-  const res = await fetch(`${BASE}/api/songs/${id}`);
-  if (!res.ok) throw res;
-  return res.json();
+/**
+ * Get a single song by ID.
+ * `include` (optional) embeds related records, as on the list, e.g. 'dependencies'.
+ */
+export async function getSong(id, include = '') {
+  const query = include ? `?include=${encodeURIComponent(include)}` : '';
+  return window.api.getJSON(`${BASE}/api/songs/${id}${query}`, { ttl: 0 });
 }
 
 /**
@@ -34,7 +52,7 @@ export async function getSong(id) {
  *   Title, Duration, ReleaseDate, Genres, Contributors
  */
 export async function createSong(data) {
-  const res = await fetch(`${BASE}/api/songs`, {
+  const res = await window.api.send(`${BASE}/api/songs`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(data),
@@ -46,11 +64,17 @@ export async function createSong(data) {
 /**
  * Update an existing song.
  * `id` is the SongID, `data` same shape as createSong.
+ *
+ * Pass the `rowVersion` the record was read with to send it as If-Match;
+ * if someone else changed the record since, the server answers 412 (thrown as the Response).
  */
-export async function updateSong(id, data) {
-  const res = await fetch(`${BASE}/api/songs/${id}`, {
+export async function updateSong(id, data, rowVersion = null) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (rowVersion) headers['If-Match'] = `"${rowVersion}"`;
+
+  const res = await window.api.send(`${BASE}/api/songs/${id}`, {
     method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
+    headers,
     body: JSON.stringify(data),
   });
   if (!res.ok) throw res;
@@ -59,7 +83,7 @@ export async function updateSong(id, data) {
 
 /** Delete a song by ID */
 export async function deleteSong(id) {
-  const res = await fetch(`${BASE}/api/songs/${id}`, {
+  const res = await window.api.send(`${BASE}/api/songs/${id}`, {
     method: 'DELETE',
   });
   if (!res.ok) throw res;
@@ -69,7 +93,5 @@ export async function deleteSong(id) {
 
 /** Get dependency counts for a given song ID */
 export async function getSongDependencies(id) {
-  const res = await fetch(`${BASE}/api/songs/${id}/dependencies`);
-  if (!res.ok) throw res;
-  return res.json();
+  return window.api.getJSON(`${BASE}/api/songs/${id}/dependencies`, { ttl: 0 });
 }
@@ -0,0 +1,18 @@
+const BASE = ''; // same-origin
+
+/**
+ * Typeahead suggestions for a prefix, from GET /api/suggest.
+ * `entity` is one of 'person', 'contributor', 'label', 'genre'; `q` matches the
+ * start of a name (or of any word of it), NIF or email, ignoring case and accents.
+ * Returns records such as { NIF, Name, Email, ContributorID },
+ * { RecordLabelID, Name } or { Genre }.
+ *
+ * A newer lookup for the same entity aborts the previous one (AbortError).
+ */
+export async function suggest(entity, q, limit = 10) {
+  const params = new URLSearchParams({ entity, q, limit });
+  return window.api.getJSON(`${BASE}/api/suggest?${params.toString()}`, {
+    ttl: 0,
+    supersede: `suggest-${entity}`,
+  });
+}
@@ -1,15 +1,207 @@
+// ---------------------------------------------------------------------------
+// Shared fetch layer, used by every endpoints/*_api.js module.
+//
+//   api.getJSON(url, { ttl, supersede })
+//     GET returning parsed JSON (each caller gets its own copy).
+//     - identical requests already in flight share one fetch
+//     - results are cached in memory for `ttl` ms; after that the next call
+//       revalidates with If-None-Match and a 304 keeps the cached copy
+//     - a new request with the same `supersede` key aborts the previous one
+//       (its caller gets an AbortError), so only the latest filter survives
+//   api.send(url, options)
+//     Any mutating request.  Returns the Response and drops the cached GETs
+//     of the URL's entity and of the entities a change to it affects.
+//     POST/PUT carry a fresh Idempotency-Key and are retried once with it if
+//     the connection fails, so the retry cannot write twice.
+//   api.changed(entity)
+//     The same invalidation, for changes finished outside api.send (jobs).
+//   api.onChange(entity, handler, owner)
+//   api.onCounts(handler, owner)
+//     Live updates from GET /api/events: `handler` runs when another client
+//     (or a job) changes data shown as `entity`, or with each new set of
+//     dashboard totals.  The whole app shares one EventSource, opened on the
+//     first subscription; a handler is dropped once its `owner` element has
+//     left the page.  Live changes invalidate the cache like api.send does.
+//
+// A non-ok GET is thrown as the Response, like the API modules always did.
+// ---------------------------------------------------------------------------
+window.api = (() => {
+  const DEFAULT_TTL = 15000;
+
+  // Cached entities whose data a change to the key can alter (joined names,
+  // counts, ON DELETE cascades)
+  const AFFECTS = {
+    record_labels:  ['employees', 'contributors', 'collaborations', 'dashboard'],
+    employees:      ['contributors', 'collaborations', 'dashboard'],
+    contributors:   ['employees', 'songs', 'collaborations', 'dashboard'],
+    persons:        ['employees', 'contributors', 'songs', 'collaborations'],
+    songs:          ['contributors', 'collaborations', 'dashboard'],
+    collaborations: ['songs', 'record_labels', 'contributors', 'dashboard'],
+  };
+
+  const cache = new Map();       // url → { data, etag, expires }
+  const inFlight = new Map();    // url → { promise, controller }
+  const superseding = new Map(); // supersede key → AbortController
+  let generation = 0;            // bumped by every invalidation
+
+  const entityOf = (url) => (url.match(/\/api\/([^/?]+)/) || [])[1];
+
+  function invalidate(entities) {
+    generation++;
+    for (const map of [cache, inFlight]) {
+      for (const url of [...map.keys()]) {
+        if (entities.includes(entityOf(url))) map.delete(url);
+      }
+    }
+  }
+
+  function changed(entity) {
+    if (entity === 'db') {
+      // Schema reset / repopulation: nothing cached is valid any more
+      generation++;
+      cache.clear();
+      inFlight.clear();
+      return;
+    }
+    invalidate([entity, ...(AFFECTS[entity] || [])]);
+  }
+
+  function request(url, ttl) {
+    const cached = cache.get(url);
+    const started = generation;
+    const controller = new AbortController();
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+
+    const promise = fetch(url, { headers, signal: controller.signal })
+      .then(async (res) => {
+        let data;
+        if (res.status === 304 && cached) {
+          data = cached.data;
+        } else if (res.ok) {
+          data = await res.json();
+        } else {
+          throw res;
+        }
+        // Data read before an invalidation may predate the change: use, don't keep
+        if (started === generation) {
+          cache.set(url, { data, etag: res.headers.get('ETag'), expires: Date.now() + ttl });
+        }
+        return data;
+      })
+      .finally(() => {
+        if (inFlight.get(url) === entry) inFlight.delete(url);
+      });
+
+    const entry = { promise, controller };
+    inFlight.set(url, entry);
+    return entry;
+  }
+
+  async function getJSON(url, { ttl = DEFAULT_TTL, supersede = null } = {}) {
+    const cached = cache.get(url);
+    if (cached && cached.expires > Date.now()) return structuredClone(cached.data);
+
+    const entry = inFlight.get(url) || request(url, ttl);
+    if (supersede) {
+      const previous = superseding.get(supersede);
+      if (previous && previous !== entry.controller) previous.abort();
+      superseding.set(supersede, entry.controller);
+    }
+    return structuredClone(await entry.promise);
+  }
+
+  const newKey = () => (crypto.randomUUID
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`);
+
+  async function send(url, options = {}) {
+    const method = (options.method || 'GET').toUpperCase();
+    const idempotent = method === 'POST' || method === 'PUT';
+    if (idempotent) {
+      options = { ...options, headers: { ...options.headers, 'Idempotency-Key': newKey() } };
+    }
+    let res;
+    try {
+      res = await fetch(url, options);
+    } catch (err) {
+      // Lost connection: the server may have written already, and answers
+      // the same key from its stored response
+      if (!idempotent || err.name === 'AbortError') throw err;
+      res = await fetch(url, options);
+    }
+    // Even a failed write (e.g. 412) means our copy may be stale
+    changed(entityOf(url));
+    return res;
+  }
+
+  // ---- Live events ----
+  const listeners = new Set();   // { type, entity, handler, owner }
+  let source = null;
+
+  // Does a change to `entity` alter what is shown as `shown`?
+  const touches = (entity, shown) =>
+    entity === 'db' || entity === shown || (AFFECTS[entity] || []).includes(shown);
+
+  function dispatch(type, data) {
+    for (const l of [...listeners]) {
+      if (!l.owner.isConnected) {
+        listeners.delete(l);
+      } else if (l.type === type && (type === 'counts' || touches(data.Entity, l.entity))) {
+        l.handler(data);
+      }
+    }
+  }
+
+  function listen(listener) {
+    listeners.add(listener);
+    if (source) return;
+    source = new EventSource('/api/events');
+    source.addEventListener('change', (e) => {
+      const data = JSON.parse(e.data);
+      changed(data.Entity);
+      dispatch('change', data);
+    });
+    source.addEventListener('counts', (e) => dispatch('counts', JSON.parse(e.data)));
+  }
+
+  const onChange = (entity, handler, owner) => listen({ type: 'change', entity, handler, owner });
+  const onCounts = (handler, owner) => listen({ type: 'counts', handler, owner });
+
+  return { getJSON, send, changed, onChange, onCounts };
+})();
+
 document.addEventListener("DOMContentLoaded", () => {
   const content = document.getElementById("content");
 
+  // Where each page's HTML fragment and module live: the hashed bundles
+  // listed by the build manifest (window.ASSETS, see frontend/build_assets.py),
+  // or the unbuilt sources
+  const built = window.ASSETS ? window.ASSETS.pages : {};
+  const pageUrl   = (page) => (built[page] || {}).html || `/pages/${page}.html`;
+  const moduleUrl = (page) => (built[page] || {}).js   || `/static/js/${page}.js`;
+
+  // Page modules are imported on first navigation only (import() caches them)
+  const modules = new Map();
+  function loadModule(page) {
+    if (!modules.has(page)) {
+      modules.set(page, import(moduleUrl(page)).catch((err) => {
+        modules.delete(page);
+        throw err;
+      }));
+    }
+    return modules.get(page);
+  }
+
   // Expose loadPage globally
   window.loadPage = (page) => {
-    fetch(`/pages/${page}.html`)
-      .then((res) => {
-        if (!res.ok) throw new Error("Page not found");
-        return res.text();
-      })
-      .then((html) => {
-        content.innerHTML = html;
+    const html = fetch(pageUrl(page)).then((res) => {
+      if (!res.ok) throw new Error("Page not found");
+      return res.text();
+    });
+    // Fetch the fragment and the module in parallel
+    Promise.all([html, loadModule(page)])
+      .then(([markup]) => {
+        content.innerHTML = markup;
         // Call the page's init if defined
         if (typeof window[`${page}Init`] === "function") {
           window[`${page}Init`]();
@@ -5,6 +5,7 @@ import {
   updateLabel,
   deleteLabel
 } from './endpoints/record_label_api.js';
+import { VirtualTable } from './virtual_table.js';
 
 async function record_labelInit() {
   console.log("[record_labelInit] Init");
@@ -31,25 +32,19 @@ async function record_labelInit() {
   detailsSection.classList.add("hidden");
   modal.classList.add("hidden");
 
-  let labels = [];
-
-  // Render table helper
-  function renderTable(data) {
-    const tbody = document.querySelector("#label-list-table tbody");
-    tbody.innerHTML = data.map(l => `
-      <tr data-id="${l.RecordLabelID}">
+  // Record label list: only the visible rows are rendered, further pages load on scroll
+  const table = new VirtualTable(document.getElementById("label-list-table"), {
+    key: "RecordLabelID",
+    renderRow: l => `
         <td>${l.RecordLabelID}</td>
         <td>${l.Name}</td>
         <td>${l.Location}</td>
         <td><a href="${l.Website}" target="_blank">${l.Website}</a></td>
         <td>${l.Email}</td>
         <td>${l.PhoneNumber}</td>
-      </tr>
-    `).join("");
-    document.querySelectorAll("#label-list-table tbody tr").forEach(row => {
-      row.onclick = () => showDetails(+row.dataset.id);
-    });
-  }
+    `,
+    onRowClick: id => showDetails(+id)
+  });
 
   // Debounce helper
   function debounce(fn, delay = 300) {
@@ -61,21 +56,16 @@ async function record_labelInit() {
   }
 
   // Fetch & render with current filter values
-  let currentFetchId = 0;
   async function fetchAndRender() {
-    const fetchId = ++currentFetchId;
     const params = {};
     for (let key in filters) {
       const val = filters[key].value.trim();
       if (val) params[key] = val;
     }
     try {
-      const data = await listLabels(params);
-      // ignore out-of-order responses
-      if (fetchId !== currentFetchId) return;
-      labels = data;
-      renderTable(labels);
+      await table.setQuery(params, page => listLabels({ ...params, ...page }, { supersede: 'record_labels' }));
     } catch (err) {
+      if (err.name === 'AbortError') return; // superseded by a newer filter
       console.error("[API] fetch failed", err);
       alert("Failed to fetch record labels.");
     }
@@ -175,7 +165,7 @@ async function record_labelInit() {
     listSection.classList.remove("hidden");
     detailsSection.classList.add("hidden");
     modal.classList.add("hidden");
-    renderTable(labels);
+    table.render();
   }
 
   // Open modal
@@ -183,6 +173,7 @@ async function record_labelInit() {
     document.getElementById("modal-title").textContent = title;
     form.reset();
     form.elements["RecordLabelID"].value = label ? label.RecordLabelID : "";
+    form.elements["RowVersion"].value    = label ? label.RowVersion || "" : "";
     if (label) {
       Object.entries(label).forEach(([k, v]) => {
         if (form.elements[k]) form.elements[k].value = v;
@@ -210,7 +201,7 @@ async function record_labelInit() {
     const isEdit = Boolean(obj.RecordLabelID);
     try {
       if (isEdit) {
-        await updateLabel(obj.RecordLabelID, obj);
+        await updateLabel(obj.RecordLabelID, obj, obj.RowVersion);
       } else {
         await createLabel(obj);
       }
@@ -218,11 +209,22 @@ async function record_labelInit() {
       await fetchAndRender();
       backToList();
     } catch (err) {
+      if (err instanceof Response && err.status === 412) {
+        // Someone else saved this label after we loaded it
+        alert("This label was changed by someone else. The list has been refreshed; please reopen it and try again.");
+        modal.classList.add("hidden");
+        await fetchAndRender();
+        backToList();
+        return;
+      }
       console.error("[API] save failed", err);
       alert("Failed to save label.");
     }
   };
 
+  // Reload when another client (or a job) changes the listed data
+  window.api.onChange("record_labels", debounce(fetchAndRender, 500), listSection);
+
   // Initial load
   await fetchAndRender();
   console.log("[record_labelInit] Done");
@@ -6,6 +6,8 @@ import {
   updateSong,
   deleteSong
 } from './endpoints/song_api.js';
+import { VirtualTable } from './virtual_table.js';
+import { attachSuggest } from './suggest.js';
 
 function debounce(fn, delay = 300) {
   let timer;
@@ -31,19 +33,17 @@ async function songInit() {
     title:         document.getElementById('filter-title'),
     minDuration:   document.getElementById('filter-duration'),
     releaseDate:   document.getElementById('filter-release'),
+    releasedFrom:  document.getElementById('filter-released-from'),
+    releasedTo:    document.getElementById('filter-released-to'),
     genre:         document.getElementById('filter-genre'),
     contributor:   document.getElementById('filter-contributor'),
     collaboration: document.getElementById('filter-collaboration')
   };
 
-  // State
-  let songs = [];
-
-  // Render table rows
-  function renderTable(data) {
-    const tbody = document.querySelector('#song-list-table tbody');
-    tbody.innerHTML = data.map(s => `
-      <tr data-id="${s.SongID}">
+  // Song list: only the visible rows are rendered, further pages load on scroll
+  const table = new VirtualTable(document.getElementById('song-list-table'), {
+    key: 'SongID',
+    renderRow: s => `
         <td>${s.SongID}</td>
         <td>${s.Title}</td>
         <td>${s.Duration}</td>
@@ -51,30 +51,26 @@ async function songInit() {
         <td>${s.Genres}</td>
         <td>${s.Contributors}</td>
         <td>${s.CollaborationName || ''}</td>
-      </tr>
-    `).join('');
-    document.querySelectorAll('#song-list-table tbody tr')
-      .forEach(row => row.onclick = () => showDetails(+row.dataset.id));
-  }
+    `,
+    onRowClick: id => showDetails(+id)
+  });
 
   // Fetch from server with current filters
-  let fetchId = 0;
   async function fetchAndRender() {
-    const myFetch = ++fetchId;
     const params = {};
     if (filters.title.value)         params.title = filters.title.value;
     if (filters.minDuration.value)   params.minDuration = filters.minDuration.value;
     if (filters.releaseDate.value)   params.releaseDate = filters.releaseDate.value;
+    if (filters.releasedFrom.value)  params.releasedFrom = filters.releasedFrom.value;
+    if (filters.releasedTo.value)    params.releasedTo = filters.releasedTo.value;
     if (filters.genre.value)         params.genre = filters.genre.value;
     if (filters.contributor.value)   params.contributor = filters.contributor.value;
     if (filters.collaboration.value) params.collaboration = filters.collaboration.value;
 
     try {
-      const data = await listSongs(params);
-      if (myFetch !== fetchId) return; // stale
-      songs = data;
-      renderTable(songs);
+      await table.setQuery(params, page => listSongs({ ...params, ...page }, { supersede: 'songs' }));
     } catch (err) {
+      if (err.name === 'AbortError') return; // superseded by a newer filter
       console.error('[API] listSongs failed', err);
       alert('Failed to load songs.');
     }
@@ -162,7 +158,7 @@ async function songInit() {
     detailsSection.classList.add('hidden');
     listSection.classList.remove('hidden');
     modal.classList.add('hidden');
-    renderTable(songs);
+    table.render();
   }
 
   // Open Add/Edit form (no CollaborationName field here)
@@ -170,6 +166,7 @@ async function songInit() {
     document.getElementById('song-modal-title').textContent = title;
     form.reset();
     form.elements['SongID'].value       = s.SongID || '';
+    form.elements['RowVersion'].value   = s.RowVersion || '';
     form.elements['Title'].value        = s.Title || '';
     form.elements['Duration'].value     = s.Duration != null ? s.Duration : '';
     form.elements['ReleaseDate'].value  = s.ReleaseDate || '';
@@ -183,6 +180,13 @@ async function songInit() {
   addBtn.onclick = e => { e.preventDefault(); openForm('Add Song'); };
   cancelBtn.onclick = e => { e.preventDefault(); modal.classList.add('hidden'); };
 
+  // Typeahead for the comma-separated genres and contributor NIFs
+  attachSuggest(form.elements['Genres'], 'genre', { valueOf: g => g.Genre });
+  attachSuggest(form.elements['Contributors'], 'contributor', {
+    valueOf: c => c.NIF,
+    labelOf: c => c.Name,
+  });
+
   // Form submit → create/update
   form.onsubmit = async e => {
     e.preventDefault();
@@ -203,7 +207,7 @@ async function songInit() {
 
     try {
       if (payload.SongID) {
-        await updateSong(payload.SongID, payload);
+        await updateSong(payload.SongID, payload, data.RowVersion);
       } else {
         await createSong(payload);
       }
@@ -211,6 +215,14 @@ async function songInit() {
       await fetchAndRender();
       backToList();
     } catch (err) {
+      if (err instanceof Response && err.status === 412) {
+        // Someone else saved this song after we loaded it
+        alert('This song was changed by someone else. The list has been refreshed; please reopen it and try again.');
+        modal.classList.add('hidden');
+        await fetchAndRender();
+        backToList();
+        return;
+      }
       console.error('[API] save song failed', err);
       alert('Failed to save song.');
     }
@@ -220,6 +232,9 @@ async function songInit() {
   const deb = debounce(fetchAndRender, 300);
   Object.values(filters).forEach(inp => { if (inp) inp.oninput = deb; });
 
+  // Reload when another client (or a job) changes the listed data
+  window.api.onChange('songs', debounce(fetchAndRender, 500), listSection);
+
   // Initial load
   await fetchAndRender();
   console.log('[songInit] done');
@@ -0,0 +1,53 @@
+/**
+ * Typeahead for the comma-separated inputs of the forms (contributor NIFs,
+ * record label names, genres), backed by GET /api/suggest.
+ *
+ * The input gets a <datalist> whose options are the whole input value with
+ * its last, partly typed item completed, so picking one keeps the items
+ * already entered.  Suggestions are looked up as the user types, after a
+ * short pause; items already in the input are not suggested again.
+ *
+ * Usage:
+ *   attachSuggest(form.elements['Contributors'], 'contributor', {
+ *     valueOf: c => c.NIF,
+ *     labelOf: c => c.Name,
+ *   });
+ */
+import { suggest } from './endpoints/suggest_api.js';
+
+let datalists = 0;
+
+export function attachSuggest(input, entity, { valueOf, labelOf = () => '', delay = 150 }) {
+  const datalist = document.createElement('datalist');
+  datalist.id = `suggest-${entity}-${++datalists}`;
+  input.after(datalist);
+  input.setAttribute('list', datalist.id);
+  input.setAttribute('autocomplete', 'off');
+
+  let timer;
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const items = input.value.split(',').map(s => s.trim());
+      const partial = items.pop();
+      const kept = items.filter(Boolean);
+
+      let found;
+      try {
+        found = await suggest(entity, partial);
+      } catch (err) {
+        if (err.name !== 'AbortError') console.error('[API] suggest failed', err);
+        return;
+      }
+
+      datalist.replaceChildren(...found
+        .filter(record => !kept.includes(valueOf(record)))
+        .map(record => {
+          const option = document.createElement('option');
+          option.value = [...kept, valueOf(record)].join(', ');
+          option.label = labelOf(record);
+          return option;
+        }));
+    }, delay);
+  });
+}
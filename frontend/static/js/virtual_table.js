@@ -0,0 +1,188 @@
+/**
+ * Virtual-scrolling table shared by the list pages.
+ *
+ * The <table> sits in a fixed-height `.table-scroll` container.  Only the rows
+ * in (or near) the visible part of the container are in the DOM; two spacer
+ * rows stand in for the rest so the scrollbar keeps its true size.  Rows are
+ * keyed by primary key: when the window moves or the data is refreshed, rows
+ * whose data did not change keep their existing <tr>.
+ *
+ * Data comes in keyset pages (`?limit=N&after=<last ID>`, see
+ * backend/services/pagination.py); the next page is requested when the user
+ * scrolls close to the end of what has been loaded.
+ *
+ * Usage:
+ *   const table = new VirtualTable(document.getElementById('song-list-table'), {
+ *     key:        'SongID',
+ *     renderRow:  s => `<td>${s.SongID}</td><td>${s.Title}</td>`,
+ *     onRowClick: id => showDetails(+id),
+ *   });
+ *   await table.setQuery(params, page => listSongs({ ...params, ...page }, { supersede: 'songs' }));
+ */
+
+const DEFAULT_ROW_HEIGHT = 37; // px, until a real row has been measured
+
+export class VirtualTable {
+  constructor(table, { key, renderRow, onRowClick, pageSize = 200, overscan = 10 }) {
+    this.scroller  = table.closest('.table-scroll');
+    this.tbody     = table.tBodies[0];
+    this.key       = key;
+    this.renderRow = renderRow;
+    this.pageSize  = pageSize;
+    this.overscan  = overscan;
+
+    this.items      = [];        // every row loaded so far, in key order
+    this.hasMore    = false;     // the last page was full, so there may be more
+    this.loading    = false;
+    this.query      = null;      // JSON of the filters the items belong to
+    this.load       = null;      // page => Promise<rows>
+    this.generation = 0;         // bumped by every (re)load; stale results are dropped
+    this.rowHeight  = 0;
+    this.rendered   = new Map(); // key → { tr, signature } for the rows in the DOM
+    this.frame      = null;
+
+    const columns = table.tHead ? table.tHead.rows[0].cells.length : 1;
+    this.topSpacer    = spacerRow(columns);
+    this.bottomSpacer = spacerRow(columns);
+
+    this.scroller.addEventListener('scroll', () => this.scheduleRender(), { passive: true });
+    this.tbody.addEventListener('click', e => {
+      const tr = e.target.closest('tr[data-key]');
+      if (tr && onRowClick) onRowClick(tr.dataset.key);
+    });
+  }
+
+  /**
+   * Show the rows matching `params`, fetched with `load(page)` where `page` is
+   * `{ limit }` or `{ after, limit }`.  New filters start again at the top;
+   * the same filters again (e.g. after a save) refresh the loaded rows in place.
+   * Rejects with whatever `load` throws (an AbortError when superseded).
+   */
+  async setQuery(params, load) {
+    const query = JSON.stringify(params);
+    this.load = load;
+    if (query === this.query) return this.refresh();
+
+    this.query = query;
+    const gen = ++this.generation;
+    const page = await this.load(this.nextPage([]));
+    if (gen !== this.generation) return;
+
+    this.items   = page;
+    this.hasMore = page.length === this.pageSize;
+    this.scroller.scrollTop = 0;
+    this.render();
+  }
+
+  /** Reload as many rows as are loaded now, keeping the scroll position. */
+  async refresh() {
+    const gen = ++this.generation;
+    const wanted = Math.max(this.items.length, this.pageSize);
+    const items = [];
+    let more = true;
+    while (more && items.length < wanted) {
+      const page = await this.load(this.nextPage(items));
+      if (gen !== this.generation) return;
+      items.push(...page);
+      more = page.length === this.pageSize;
+    }
+    this.items   = items;
+    this.hasMore = more;
+    this.render();
+  }
+
+  /** Fetch the page after the last loaded row. */
+  async loadMore() {
+    if (!this.hasMore || this.loading) return;
+    const gen = this.generation;
+    this.loading = true;
+    try {
+      const page = await this.load(this.nextPage(this.items));
+      if (gen !== this.generation) return;
+      this.items   = this.items.concat(page);
+      this.hasMore = page.length === this.pageSize;
+    } catch (err) {
+      // 410: the last loaded row was deleted, so a sorted list cannot continue
+      // after it; reload the rows from the top instead
+      if (err.status === 410 && gen === this.generation) {
+        this.refresh().catch(e => {
+          if (e.name !== 'AbortError') console.error('[VirtualTable] reloading rows failed', e);
+        });
+        return;
+      }
+      if (err.name !== 'AbortError') console.error('[VirtualTable] loading more rows failed', err);
+      return;
+    } finally {
+      this.loading = false;
+    }
+    this.render();
+  }
+
+  nextPage(items) {
+    return items.length
+      ? { after: items[items.length - 1][this.key], limit: this.pageSize }
+      : { limit: this.pageSize };
+  }
+
+  scheduleRender() {
+    if (this.frame) return;
+    this.frame = requestAnimationFrame(() => {
+      this.frame = null;
+      this.render();
+    });
+  }
+
+  /** Bring the DOM in line with the scroll position and the loaded items. */
+  render() {
+    const height   = this.rowHeight || DEFAULT_ROW_HEIGHT;
+    const top      = this.scroller.scrollTop;
+    const viewport = this.scroller.clientHeight || height * 20;
+    const total    = this.items.length;
+    const first    = Math.max(0, Math.floor(top / height) - this.overscan);
+    const last     = Math.min(total, Math.ceil((top + viewport) / height) + this.overscan);
+
+    const rendered = new Map();
+    const rows = [];
+    for (let i = first; i < last; i++) {
+      const item = this.items[i];
+      const key = String(item[this.key]);
+      const signature = JSON.stringify(item);
+      let entry = this.rendered.get(key);
+      if (!entry || entry.signature !== signature) {
+        const tr = entry ? entry.tr : document.createElement('tr');
+        tr.dataset.key = key;
+        tr.innerHTML = this.renderRow(item);
+        entry = { tr, signature };
+      }
+      rendered.set(key, entry);
+      rows.push(entry.tr);
+    }
+    this.rendered = rendered;
+
+    this.topSpacer.style.height    = `${first * height}px`;
+    this.bottomSpacer.style.height = `${(total - last) * height}px`;
+
+    const children = [this.topSpacer, ...rows, this.bottomSpacer];
+    const current = this.tbody.children;
+    if (current.length !== children.length || children.some((tr, i) => current[i] !== tr)) {
+      this.tbody.replaceChildren(...children);
+    }
+
+    // Measure once rows are visible; re-render if the estimate was off
+    if (!this.rowHeight && rows.length && rows[0].offsetHeight) {
+      this.rowHeight = rows[0].offsetHeight;
+      if (this.rowHeight !== height) this.render();
+      return;
+    }
+
+    // Close to the end of the loaded rows: fetch the next page
+    if (this.hasMore && last >= total - this.overscan) this.loadMore();
+  }
+}
+
+function spacerRow(columns) {
+  const tr = document.createElement('tr');
+  tr.className = 'vt-spacer';
+  tr.innerHTML = `<td colspan="${columns}"></td>`;
+  return tr;
+}
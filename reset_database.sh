@@ -2,13 +2,51 @@
 
 # Name of the shell script: reset_database.sh
 
+API=http://localhost:5000
+
+# Init and populate run as background jobs (HTTP 202 + job JSON);
+# poll /api/jobs/<id> until the job has finished, for up to JOB_TIMEOUT seconds.
+JOB_TIMEOUT=${JOB_TIMEOUT:-600}
+
+wait_for_job() {
+    local job_id body status attempt
+    job_id=$(echo "$1" | sed -n 's/.*"JobID": *"\([^"]*\)".*/\1/p')
+    if [ -z "$job_id" ]; then
+        echo "Unexpected response: $1"
+        exit 1
+    fi
+
+    for ((attempt = 0; attempt < JOB_TIMEOUT; attempt++)); do
+        if ! body=$(curl -sf "$API/api/jobs/$job_id"); then
+            echo "Could not read the status of job $job_id."
+            exit 1
+        fi
+        status=$(echo "$body" | tr -d '\n' | sed -n 's/.*"Status": *"\([^"]*\)".*/\1/p')
+        case "$status" in
+            succeeded) return 0 ;;
+            queued|running) ;;
+            failed)
+                echo "$body"
+                echo "Job $job_id failed."
+                exit 1 ;;
+            *)
+                echo "$body"
+                echo "Job $job_id has an unknown status: '$status'."
+                exit 1 ;;
+        esac
+        sleep 1
+    done
+    echo "Job $job_id did not finish within ${JOB_TIMEOUT}s."
+    exit 1
+}
+
 # Drop existing tables
-curl -X POST http://localhost:5000/api/db/drop_tables
+curl -X POST $API/api/db/drop_tables
 
 # Initialize the database schema
-curl -X POST http://localhost:5000/api/db/init
+wait_for_job "$(curl -sf -X POST $API/api/db/init | tr -d '\n')"
 
 # Populate the database with initial data
-curl -X POST http://localhost:5000/api/db/populate
+wait_for_job "$(curl -sf -X POST $API/api/db/populate | tr -d '\n')"
 
-echo "Database reset complete."
\ No newline at end of file
+echo "Database reset complete."
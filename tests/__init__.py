@@ -0,0 +1,18 @@
+# tests/__init__.py
+"""
+Tests for the backend.  They need no database (see conftest.py), but they
+import pyodbc, which loads the ODBC driver manager (libodbc) when imported.
+"""
+import pytest
+
+
+def require_pyodbc():
+    """
+    Import pyodbc, or skip the calling test module if it cannot be loaded:
+    not installed, or installed without the driver manager it links against.
+    """
+    try:
+        import pyodbc
+    except ImportError as e:
+        pytest.skip(f"pyodbc cannot be loaded: {e}", allow_module_level=True)
+    return pyodbc
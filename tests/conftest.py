@@ -0,0 +1,47 @@
+# tests/conftest.py
+"""
+Fixtures for the tests: the Flask app, and a fake database every connection
+of a test is served from (tests/fakes.py).
+
+The app imports pyodbc, so it is only imported here by the fixtures; each
+test module calls tests.require_pyodbc() first and is skipped without it.
+"""
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app():
+    from backend import create_app
+    from backend.services import rollups, suggest
+
+    # No background refreshers: they would query the fake database of whichever test is running
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(rollups.refresher, 'start', lambda: None)
+        mp.setattr(suggest.suggestions, 'start', lambda: None)
+        app = create_app()
+    app.testing = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """
+    Serve every connection from one FakeCursor; add rules to `database.rules`.
+    Idempotency keys start empty too.
+
+    Yields the cursor, to inspect what was executed.
+    """
+    from config.database_config import DatabaseConfig
+    from backend.services import idempotency
+    from tests.fakes import FakeConnection, FakeCursor
+
+    cursor = FakeCursor()
+    monkeypatch.setattr(DatabaseConfig, 'get_connection', lambda: FakeConnection(cursor))
+    monkeypatch.setattr(DatabaseConfig, 'get_read_connection', lambda mode=None: FakeConnection(cursor))
+    monkeypatch.setattr(idempotency, 'memory_store', idempotency.MemoryStore())
+    yield cursor
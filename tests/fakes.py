@@ -0,0 +1,96 @@
+# tests/fakes.py
+"""
+In-memory stand-ins for pyodbc connections and cursors.
+
+A FakeCursor answers each statement from a list of rules, (text, rows): the
+first rule whose text occurs in the statement gives its rows, or a callable
+given the bound parameters returns them.  Like pyodbc, it keeps the input
+sizes of the last setinputsizes() call across executes, and a string bound to
+a BINARY parameter fails, so a stale binding shows up as it would in SQL
+Server.
+"""
+import pyodbc
+
+_BINARY_TYPES = (pyodbc.SQL_BINARY, pyodbc.SQL_VARBINARY)
+
+
+class FakeRow(tuple):
+    """A result row, readable by index and by column name."""
+
+    def __new__(cls, **columns):
+        row = super().__new__(cls, columns.values())
+        row._columns = columns
+        return row
+
+    def __getattr__(self, name):
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class FakeCursor:
+    def __init__(self, *rules):
+        self.rules = list(rules)
+        self.executed = []      # (sql, params, input sizes)
+        self.input_sizes = None
+        self.description = None
+        self._rows = []
+
+    def setinputsizes(self, sizes):
+        self.input_sizes = sizes
+
+    def execute(self, sql, *params):
+        for i, value in enumerate(params):
+            binding = self.input_sizes[i] if self.input_sizes and i < len(self.input_sizes) else None
+            if binding and binding[0] in _BINARY_TYPES and isinstance(value, str):
+                raise pyodbc.DataError(f"String data bound to a BINARY parameter: {value!r}")
+        self.executed.append((sql, params, self.input_sizes))
+        for text, rows in self.rules:
+            if text in sql:
+                self._rows = list(rows(*params) if callable(rows) else rows)
+                break
+        else:
+            self._rows = []
+        # Column names and Python types, from the first row when it is a FakeRow
+        columns = getattr(self._rows[0], '_columns', None) if self._rows else None
+        self.description = [(name, type(value), None, None, None, None, True)
+                            for name, value in columns.items()] if columns else None
+        return self
+
+    def statements(self, text):
+        """The executed statements containing `text`, as (sql, params, input sizes)."""
+        return [e for e in self.executed if text in e[0]]
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def nextset(self):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, cursor: FakeCursor):
+        self._cursor = cursor
+        self.autocommit = False
+        self.committed = self.closed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,32 @@
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from backend.endpoints import export
+from tests.fakes import FakeRow
+
+
+def test_parquet_without_pyarrow_is_a_400(client, database, monkeypatch):
+    monkeypatch.setattr(export, 'pa', None)
+    response = client.get('/api/export/songs?format=parquet')
+    assert response.status_code == 400
+    assert "requires the optional pyarrow package" in response.get_data(as_text=True)
+    assert database.executed == []
+
+
+def test_export_throughput_is_reported_under_its_id(client, database):
+    database.rules.append(("FROM dbo.vw_SongsBrief", [
+        FakeRow(SongID=1, Title='Fado', RowVersion=b'\0' * 8), FakeRow(SongID=2, Title='Morna', RowVersion=b'\0' * 8),
+    ]))
+    response = client.get('/api/export/songs?fields=title')
+    assert response.get_data(as_text=True) == "SongID,Title\n1,Fado\n2,Morna\n"
+    export_id = response.headers['X-Export-ID']
+
+    stats = client.get(f'/api/export/stats?id={export_id}').get_json()
+    assert stats['Entity'] == 'songs' and stats['Format'] == 'csv' and stats['Completed']
+    assert stats['Rows'] == 2 and stats['Bytes'] == len(response.get_data())
+    assert client.get('/api/export/stats').get_json()[0] == stats
+
+
+def test_stats_of_an_unknown_export_is_a_404(client):
+    assert client.get('/api/export/stats?id=nope').status_code == 404
@@ -0,0 +1,30 @@
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from backend.services import formats
+from tests.fakes import FakeRow
+
+ROWS = [FakeRow(SongID=1, Title='Fado'), FakeRow(SongID=2, Title='Morna')]
+
+
+def test_columnar_list(client, database):
+    database.rules.append(("FROM dbo.vw_SongsBrief", ROWS))
+    response = client.get('/api/songs?fields=title', headers={'Accept': formats.COLUMNAR})
+    assert response.content_type == formats.COLUMNAR
+    assert response.get_json(force=True) == {'columns': ['SongID', 'Title'],
+                                              'rows': [[1, 'Fado'], [2, 'Morna']]}
+
+
+def test_msgpack_without_the_package_is_not_acceptable(client, database, monkeypatch):
+    """Rather than a 500, or JSON the client said it cannot read."""
+    monkeypatch.setattr(formats, 'msgpack', None)
+    monkeypatch.setattr(formats, 'AVAILABLE', [formats.JSON, formats.COLUMNAR])
+    database.rules.append(("FROM dbo.vw_SongsBrief", ROWS))
+    response = client.get('/api/songs?fields=title', headers={'Accept': formats.MSGPACK})
+    assert response.status_code == 406
+    assert "requires the optional msgpack package" in response.get_data(as_text=True)
+    # A client that also takes JSON gets JSON
+    response = client.get('/api/songs?fields=title',
+                          headers={'Accept': f'{formats.MSGPACK}, {formats.JSON};q=0.5'})
+    assert response.status_code == 200 and response.content_type == formats.JSON
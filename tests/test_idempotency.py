@@ -0,0 +1,106 @@
+from tests import require_pyodbc
+
+pyodbc = require_pyodbc()
+
+from backend.services.idempotency import (
+    CLAIMED, IN_PROGRESS, MISMATCH, REPLAY, MemoryStore, StoredResponse,
+)
+from config.config import Config
+from tests.fakes import FakeRow
+
+STORED = StoredResponse(201, [('Content-Type', 'application/json')], b'compressed body')
+
+
+def test_claim_then_replay():
+    store = MemoryStore()
+    assert store.claim('k', b'fp') == (CLAIMED, None)
+    assert store.claim('k', b'fp') == (IN_PROGRESS, None)
+    assert store.get('k') is None
+    store.save('k', b'fp', STORED)
+    assert store.claim('k', b'fp') == (REPLAY, STORED)
+    assert store.get('k') == (b'fp', STORED)
+
+
+def test_claim_with_another_fingerprint_is_a_mismatch():
+    store = MemoryStore()
+    store.claim('k', b'fp')
+    assert store.claim('k', b'other') == (MISMATCH, None)
+    store.save('k', b'fp', STORED)
+    assert store.claim('k', b'other') == (MISMATCH, None)
+
+
+def test_release_frees_only_an_unfinished_claim():
+    store = MemoryStore()
+    store.claim('open', b'fp')
+    store.release('open')
+    assert store.claim('open', b'other') == (CLAIMED, None)
+
+    store.save('done', b'fp', STORED)
+    store.release('done')
+    assert store.get('done') == (b'fp', STORED)
+
+
+def test_expired_entries_are_claimed_again(monkeypatch):
+    monkeypatch.setattr(Config, 'IDEMPOTENCY_LOCK_SECONDS', 0)
+    monkeypatch.setattr(Config, 'IDEMPOTENCY_TTL_SECONDS', 0)
+    store = MemoryStore()
+    store.claim('crashed', b'fp')
+    assert store.claim('crashed', b'other') == (CLAIMED, None)
+    store.save('old', b'fp', STORED)
+    assert store.get('old') is None
+
+
+def test_oldest_keys_are_evicted_first(monkeypatch):
+    monkeypatch.setattr(Config, 'IDEMPOTENCY_MAX_KEYS', 2)
+    store = MemoryStore()
+    store.save('a', b'fp', STORED)
+    store.save('b', b'fp', STORED)
+    store.save('a', b'fp', STORED)      # saving again makes it the newest
+    store.claim('c', b'fp')
+    assert store.get('b') is None
+    assert store.get('a') == (b'fp', STORED)
+
+
+LABEL = {'Name': 'Valentim', 'Email': 'info@valentim.test'}
+
+
+def create_label(client, key, body=LABEL):
+    return client.post('/api/record_labels', json=body, headers={'Idempotency-Key': key})
+
+
+def test_retry_is_answered_from_the_stored_response(client, database):
+    database.rules.append(("sp_CreateRecordLabel", [FakeRow(NewID=41)]))
+    first = create_label(client, 'retry-1')
+    again = create_label(client, 'retry-1')
+
+    assert first.status_code == again.status_code == 201
+    assert again.get_data() == first.get_data()
+    assert again.get_json()['RecordLabelID'] == 41
+    assert again.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+    assert len(database.statements("sp_CreateRecordLabel")) == 1
+
+
+def test_key_reused_for_a_different_body_is_rejected(client, database):
+    database.rules.append(("sp_CreateRecordLabel", [FakeRow(NewID=41)]))
+    assert create_label(client, 'retry-2').status_code == 201
+    response = create_label(client, 'retry-2', {**LABEL, 'Name': 'Other'})
+
+    assert response.status_code == 422
+    assert "was already used for a different request" in response.get_data(as_text=True)
+    assert len(database.statements("sp_CreateRecordLabel")) == 1
+
+
+def test_server_error_frees_the_key(app, client, database, monkeypatch):
+    monkeypatch.setattr(app, 'testing', False)      # answer the unhandled error with a 500
+
+    def fail(*params):
+        raise pyodbc.OperationalError("Communication link failure")
+
+    database.rules.append(("sp_CreateRecordLabel", fail))
+    assert create_label(client, 'retry-3').status_code == 500
+
+    database.rules[:] = [("sp_CreateRecordLabel", [FakeRow(NewID=42)])]
+    response = create_label(client, 'retry-3')
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response.headers
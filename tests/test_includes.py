@@ -0,0 +1,75 @@
+from datetime import date
+
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from backend.services.includes import embed
+from tests.fakes import FakeCursor, FakeRow
+
+BINARY_8 = (-2, 8, 0)   # what sp_GetChanges leaves bound for @Since
+
+
+def songs_related():
+    return FakeCursor(
+        ("FROM dbo.Song_Genre", [
+            FakeRow(ParentKey=1, Genre='Jazz'), FakeRow(ParentKey=1, Genre='Pop'),
+            FakeRow(ParentKey=3, Genre='Rock'),
+        ]),
+        ("FROM dbo.Collaboration", [
+            FakeRow(ParentKey=3, CollaborationID=7, CollaborationName='Duet',
+                    StartDate=date(2024, 5, 1), EndDate=None),
+        ]),
+    )
+
+
+def test_embed_one_statement_per_include():
+    cursor = songs_related()
+    records = [{'SongID': 1}, {'SongID': 3}, {'SongID': 4}]
+    assert embed(cursor, 'songs', records, ('genres', 'collaboration')) is records
+    assert records == [
+        {'SongID': 1, 'genres': ['Jazz', 'Pop'], 'collaboration': None},
+        {'SongID': 3, 'genres': ['Rock'],
+         'collaboration': {'CollaborationID': 7, 'CollaborationName': 'Duet',
+                           'StartDate': '2024-05-01', 'EndDate': None}},
+        {'SongID': 4, 'genres': [], 'collaboration': None},
+    ]
+    assert len(cursor.executed) == 2
+    assert "STRING_SPLIT(?, ',')" in cursor.executed[0][0]
+
+
+def test_embed_binds_the_keys_as_one_varchar_parameter():
+    cursor = songs_related()
+    cursor.setinputsizes([BINARY_8])      # left over from an earlier statement
+    embed(cursor, 'songs', [{'SongID': 3}, {'SongID': 1}, {'SongID': 3}], ('genres',))
+    _, params, input_sizes = cursor.executed[0]
+    assert params == ('3,1',)
+    assert input_sizes == [(12, 0, 0)]
+
+
+def test_embed_without_records_runs_nothing():
+    cursor = songs_related()
+    assert embed(cursor, 'songs', [], ('genres',)) == []
+    assert cursor.executed == []
+
+
+def test_related_list_with_includes(client, database):
+    """The relationship endpoints fetch the rows before embedding into them."""
+    database.rules += [
+        ("SELECT ContributorID, RowVersion FROM", [FakeRow(ContributorID=7, RowVersion=bytes(8))]),
+        ("FROM dbo.Song_Genre", [FakeRow(ParentKey=1, Genre='Fado')]),
+        ("FROM dbo.vw_SongsBrief", [FakeRow(SongID=1, Title='Barco Negro'), FakeRow(SongID=2, Title='Gaivota')]),
+    ]
+    response = client.get('/api/contributors/7/songs?fields=title&include=genres')
+    assert response.status_code == 200
+    assert response.get_json() == [
+        {'SongID': 1, 'Title': 'Barco Negro', 'genres': ['Fado']},
+        {'SongID': 2, 'Title': 'Gaivota', 'genres': []},
+    ]
+    assert database.statements("FROM dbo.Song_Genre")[0][1] == ('1,2',)
+
+
+def test_unknown_include_is_a_400(client, database):
+    response = client.get('/api/songs?include=lyrics')
+    assert response.status_code == 400
+    assert database.executed == []
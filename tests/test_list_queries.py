@@ -0,0 +1,245 @@
+from datetime import date
+
+import pytest
+
+from tests import require_pyodbc
+
+pyodbc = require_pyodbc()
+
+from werkzeug.exceptions import BadRequest
+
+from backend.services.list_queries import LIST_QUERIES, RELATIONS, Filter, ListQuery, date_range_args
+from tests.fakes import FakeCursor, FakeRow
+
+INT = (4, 0, 0)
+DATE = LIST_QUERIES['songs'].filters[4].param.binding      # ReleasedFrom
+
+
+def songs():
+    """A fresh copy of the songs list, with an empty shape cache."""
+    q = LIST_QUERIES['songs']
+    return ListQuery(q.view, q.key, q.columns, *q.filters,
+                     sortable=q.sortable[1:], brief=(q.brief_view, q.brief_columns))
+
+
+def supplied(name, *filters):
+    """The `supplied` part of a shape: True for the named filters of list `name`."""
+    return tuple(f.name in filters for f in LIST_QUERIES[name].filters)
+
+
+# ---------- Compiled filters ----------
+
+def test_compile_unfiltered():
+    sql, input_sizes = songs().compile(((False,) * 9, False, False, (), None, None))
+    assert sql == ("SELECT SongID, Title, Duration, ReleaseDate, Genres, Contributors, "
+                   "CollaborationName, RowVersion FROM dbo.vw_Songs ORDER BY SongID")
+    assert input_sizes == []
+
+
+def test_compile_binds_parameters_in_marker_order():
+    sql, input_sizes = songs().compile((supplied('songs', 'Title'), True, True, (), None, None))
+    assert sql.startswith("SELECT TOP (?) ")
+    assert sql.endswith("WHERE Title LIKE '%' + ? + '%' AND SongID > ? ORDER BY SongID")
+    assert input_sizes == [INT, LIST_QUERIES['songs'].filters[0].param.binding, INT]
+
+
+def test_compile_caches_each_shape():
+    q = songs()
+    shape = ((False,) * 9, False, True, (), None, None)
+    assert q.compile(shape) is q.compile(shape)
+    assert q.shapes == 1
+
+
+def test_execute_passes_values_in_marker_order():
+    cursor = FakeCursor()
+    q = ListQuery('vw_Things', 'ThingID', ('ThingID', 'Name'),
+                  Filter('Name', 'VARCHAR(255)', 'Name'), Filter('MinID', 'INT', 'ThingID', 'min'))
+    q.execute(cursor, 'ab', None, 5, 10)
+    sql, params, input_sizes = cursor.executed[-1]
+    assert sql == ("SELECT TOP (?) ThingID, Name FROM dbo.vw_Things "
+                   "WHERE Name LIKE '%' + ? + '%' AND ThingID > ? ORDER BY ThingID")
+    assert params == (10, 'ab', 5)
+    assert len(input_sizes) == 3
+    assert cursor.input_sizes is None       # not left for the next statement
+
+
+def test_list_endpoint_sends_only_the_supplied_predicates(client, database):
+    response = client.get('/api/songs?title=fado&limit=5')
+    assert response.status_code == 200
+    sql, params, _ = database.executed[-1]
+    assert sql.endswith("FROM dbo.vw_Songs WHERE Title LIKE '%' + ? + '%' ORDER BY SongID")
+    assert params == (5, 'fado')
+
+
+def test_execute_checks_the_number_of_arguments():
+    with pytest.raises(TypeError):
+        songs().execute(FakeCursor(), None, None)
+
+
+# ---------- Sorting ----------
+
+def test_parse_sort():
+    q = songs()
+    assert q.parse_sort('-releaseDate,title') == (('ReleaseDate', True), ('Title', False))
+    assert q.parse_sort('') == ()
+    # Nothing can follow the key: it is unique
+    assert q.parse_sort('-songid,title') == (('SongID', True),)
+
+
+@pytest.mark.parametrize('text', ['genres', 'title,-title'])
+def test_parse_sort_rejects_unsortable_and_repeated_fields(text):
+    with pytest.raises(ValueError):
+        songs().parse_sort(text)
+
+
+def test_compile_orders_by_the_sort_then_the_key():
+    sql, _ = songs().compile(((False,) * 9, False, True, (('ReleaseDate', True),), None, None))
+    assert sql.endswith("FROM dbo.vw_Songs ORDER BY ReleaseDate DESC, SongID")
+
+
+def test_compile_pages_a_sorted_list_from_the_anchor_row():
+    sql, input_sizes = songs().compile(((False,) * 9, True, True, (('Title', True),), None, None))
+    assert sql.startswith("IF NOT EXISTS (SELECT 1 FROM dbo.vw_Songs WHERE SongID = ?) THROW 50410, ")
+    assert "; SELECT TOP (?) " in sql
+    assert "CROSS JOIN (SELECT Title AS Anchor0, SongID AS Anchor1 FROM dbo.vw_Songs WHERE SongID = ?)" in sql
+    assert "(Title < anchor.Anchor0 OR (Title IS NULL AND anchor.Anchor0 IS NOT NULL))" in sql
+    assert sql.endswith("ORDER BY Title DESC, SongID")
+    assert input_sizes == [INT, INT, INT]
+
+
+def test_key_order_pages_need_no_anchor_row():
+    sql, _ = songs().compile(((False,) * 9, True, True, (), None, None))
+    assert sql.startswith("SELECT TOP (?) ") and "anchor" not in sql
+
+
+def sorted_songs(existing):
+    """vw_Songs through the fake cursor: a sorted page THROWs when its `after` row is gone."""
+    def page(*params):
+        if params[0] not in existing:
+            raise pyodbc.ProgrammingError(
+                '42000', '[42000] [SQL Server]The after row no longer exists (50410) (SQLExecDirectW)')
+        return [FakeRow(SongID=key, Title=f'Song {key}') for key in sorted(existing) if key > params[0]]
+    return "FROM dbo.vw_SongsBrief", page
+
+
+def test_sorted_page_continues_after_the_anchor_row(client, database):
+    database.rules.append(sorted_songs({3, 5, 8}))
+    response = client.get('/api/songs?sort=title&after=5&limit=2&fields=title')
+    assert response.status_code == 200
+    assert response.get_json() == [{'SongID': 8, 'Title': 'Song 8'}]
+    _, params, _ = database.executed[-1]
+    assert params == (5, 2, 5)
+
+
+def test_sorted_page_after_a_deleted_row_is_gone(client, database):
+    """Not an empty page, which would look like the end of the list."""
+    database.rules.append(sorted_songs({3, 8}))
+    response = client.get('/api/songs?sort=title&after=5&limit=2&fields=title')
+    assert response.status_code == 410
+    assert "Row 5 no longer exists" in response.get_data(as_text=True)
+
+
+def test_unknown_sort_field_is_a_400(client, database):
+    response = client.get('/api/songs?sort=genres')
+    assert response.status_code == 400
+    assert database.executed == []
+
+
+# ---------- Range and interval filters ----------
+
+@pytest.mark.parametrize('args, expected', [
+    ('', (None, None)),
+    ('releasedFrom=2024-01-01', (date(2024, 1, 1), None)),
+    ('releasedFrom=2024-01-01&releasedTo=2024-01-01', (date(2024, 1, 1), date(2024, 1, 1))),
+])
+def test_date_range_args(app, args, expected):
+    with app.test_request_context(f'/api/songs?{args}'):
+        assert date_range_args('releasedFrom', 'releasedTo') == expected
+
+
+@pytest.mark.parametrize('args, message', [
+    ('releasedTo=2024-13-01', "releasedTo must be a date (YYYY-MM-DD), got '2024-13-01'"),
+    ('releasedFrom=2024-02-01&releasedTo=2024-01-31', "releasedFrom must not be after releasedTo"),
+])
+def test_date_range_args_rejects_malformed_and_reversed_ranges(app, args, message):
+    with app.test_request_context(f'/api/songs?{args}'), pytest.raises(BadRequest) as raised:
+        date_range_args('releasedFrom', 'releasedTo')
+    assert raised.value.description == message
+
+
+def test_range_filters_compare_the_bare_column():
+    q = LIST_QUERIES['songs']
+    sql, input_sizes = q.compile((supplied('songs', 'MinDuration', 'MaxDuration', 'ReleasedFrom', 'ReleasedTo'),
+                                  False, False, (), None, None))
+    assert sql.endswith("WHERE Duration >= ? AND Duration <= ? AND ReleaseDate >= ? AND ReleaseDate <= ?"
+                        " ORDER BY SongID")
+    assert input_sizes == [INT, INT, DATE, DATE]
+
+
+def test_active_window_is_an_interval_overlap():
+    """Started by the window's end, and not ended before its start (an open end never has)."""
+    q = LIST_QUERIES['collaborations']
+    sql, input_sizes = q.compile((supplied('collaborations', 'ActiveFrom', 'ActiveTo'),
+                                  False, False, (), None, None))
+    assert " WHERE (EndDate >= ? OR EndDate IS NULL) AND StartDate <= ? ORDER BY" in sql
+    assert input_sizes == [DATE, DATE]
+
+
+def test_collaborations_active_during_a_window(client, database):
+    response = client.get('/api/collaborations?activeFrom=2024-01-01&activeTo=2024-06-30&fields=CollaborationName')
+    assert response.status_code == 200
+    sql, params, _ = database.executed[-1]
+    assert "(EndDate >= ? OR EndDate IS NULL) AND StartDate <= ?" in sql
+    assert params == (date(2024, 1, 1), date(2024, 6, 30))
+
+
+def test_reversed_range_is_rejected_before_any_query(client, database):
+    response = client.get('/api/employees?hiredFrom=2024-02-01&hiredTo=2024-01-01')
+    assert response.status_code == 400
+    assert database.executed == []
+
+
+# ---------- Field projection ----------
+
+def test_parse_fields_keeps_view_order_and_adds_the_key():
+    assert songs().parse_fields('duration, TITLE') == ('SongID', 'Title', 'Duration')
+    assert songs().parse_fields(' , ') is None
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="Unknown field 'lyrics'"):
+        songs().parse_fields('title,lyrics')
+
+
+def test_compile_reads_the_brief_view_when_it_holds_every_column():
+    q = songs()
+    sql, _ = q.compile(((False,) * 9, False, False, (('Duration', False),), ('SongID', 'Title'), None))
+    assert sql.startswith("SELECT SongID, Title FROM dbo.vw_SongsBrief ")
+    # A filter on a column the brief view lacks needs the full view
+    sql, _ = q.compile((supplied('songs', 'Genre'), False, False, (), ('SongID', 'Title'), None))
+    assert "FROM dbo.vw_Songs " in sql
+
+
+def test_detail_projection_reads_the_row_version_too():
+    cursor = FakeCursor()
+    LIST_QUERIES['songs'].get(cursor, 7, ('SongID', 'Title'))
+    assert cursor.executed == [
+        ("SELECT SongID, Title, RowVersion FROM dbo.vw_SongsBrief WHERE SongID = ?", (7,), [INT]),
+    ]
+
+
+def test_projected_list(client, database):
+    database.rules.append(("FROM dbo.vw_SongsBrief", [FakeRow(SongID=1, Title='Fado')]))
+    response = client.get('/api/songs?fields=title')
+    assert response.status_code == 200
+    assert response.get_json() == [{'SongID': 1, 'Title': 'Fado'}]
+
+
+# ---------- Relationships ----------
+
+def test_compile_binds_every_marker_of_a_relation():
+    q = LIST_QUERIES['collaborations']
+    within = RELATIONS[('record_labels', 'collaborations')]
+    sql, input_sizes = q.compile(((False,) * len(q.filters), False, True, (), None, within))
+    assert f"WHERE {within} ORDER BY CollaborationID" in sql
+    assert input_sizes == [INT, INT, INT]
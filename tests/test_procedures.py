@@ -0,0 +1,46 @@
+import pytest
+
+from tests import require_pyodbc
+
+pyodbc = require_pyodbc()
+
+from backend.services.procedures import PROCEDURES, Param, call_procedure, execute_bound
+from tests.fakes import FakeCursor, FakeRow
+
+
+def test_param_bindings():
+    assert Param('Name', 'VARCHAR(255)').binding == (pyodbc.SQL_VARCHAR, 255, 0)
+    assert Param('Keys', 'VARCHAR(MAX)').binding == (pyodbc.SQL_VARCHAR, 0, 0)
+    assert Param('Salary', 'DECIMAL(10,2)').binding == (pyodbc.SQL_DECIMAL, 10, 2)
+    assert Param('Since', 'BINARY(8)').binding == (pyodbc.SQL_BINARY, 8, 0)
+    with pytest.raises(ValueError):
+        Param('X', 'GEOGRAPHY')
+
+
+def test_call_procedure_binds_its_declared_types():
+    cursor = FakeCursor(("sp_GetChanges", [FakeRow(Entity='songs')]))
+    assert call_procedure(cursor, 'sp_GetChanges', None, 'songs', 10).fetchall() == [FakeRow(Entity='songs')]
+    [(sql, params, input_sizes)] = cursor.executed
+    assert sql == "{CALL dbo.sp_GetChanges (?, ?, ?)}"
+    assert params == (None, 'songs', 10)
+    assert input_sizes == PROCEDURES['sp_GetChanges'].input_sizes
+
+
+def test_call_procedure_leaves_no_input_sizes_behind():
+    """A plain statement after a procedure call binds its own parameters."""
+    cursor = FakeCursor()
+    call_procedure(cursor, 'sp_GetChanges', bytes(8), None, 10)
+    assert cursor.input_sizes is None
+    cursor.execute("SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ',')", '1,2')
+
+
+def test_execute_bound_clears_the_input_sizes_when_the_statement_fails():
+    cursor = FakeCursor()
+    with pytest.raises(pyodbc.DataError):
+        execute_bound(cursor, "SELECT ?", [(pyodbc.SQL_BINARY, 8, 0)], 'not bytes')
+    assert cursor.input_sizes is None
+
+
+def test_call_procedure_checks_the_number_of_arguments():
+    with pytest.raises(TypeError):
+        call_procedure(FakeCursor(), 'sp_GetChanges', None)
@@ -0,0 +1,103 @@
+import pytest
+
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from werkzeug.exceptions import BadRequest
+
+from backend.services import references
+from backend.services.references import ReferenceMap, resolve_collaboration_references, split_names
+from config.config import Config
+from tests.fakes import FakeCursor, FakeRow
+
+
+class Labels:
+    """dbo.RecordLabel and the change feed, as the fake cursor serves them."""
+
+    def __init__(self, names):
+        self.names = dict(names)
+        self.feed = []
+
+    def table(self, keys=None):
+        wanted = self.names if keys is None else {int(k) for k in keys.split(',')}
+        return [(k, self.names[k]) for k in sorted(wanted) if k in self.names]
+
+    def changes(self, since, entity, limit):
+        return [e for e in self.feed if since is None or e.RowVer > since]
+
+    def write(self, key, name=None):
+        if name is None:
+            del self.names[key]
+        else:
+            self.names[key] = name
+        self.feed.append(FakeRow(Entity='record_labels', EntityKey=str(key), Operation='U',
+                                 RowVer=len(self.feed).to_bytes(8, 'big')))
+
+    def cursor(self):
+        return FakeCursor(
+            ("FROM dbo.ChangeLog", lambda: [(self.feed[-1].RowVer if self.feed else None,)]),
+            ("sp_GetChanges", self.changes),
+            ("FROM dbo.RecordLabel", self.table),
+        )
+
+
+def reference_map():
+    return ReferenceMap('record_labels', "SELECT RecordLabelID, Name FROM dbo.RecordLabel{where}",
+                        'RecordLabelID')
+
+
+def test_split_names():
+    assert split_names(' Sony, ,EMI,Sony ') == ['Sony', 'EMI']
+    assert split_names(['A', 2, ' ']) == ['A', '2']
+
+
+def test_resolve_folds_case_and_reports_unknown_names():
+    labels = Labels({1: 'Sony', 2: 'EMI'})
+    assert reference_map().resolve(labels.cursor(), ['emi', 'Warner', ' SONY ']) == ([2, 1], ['Warner'])
+
+
+def test_refresh_rereads_only_the_keys_in_the_feed():
+    labels = Labels({1: 'Sony', 2: 'EMI', 3: 'Warner'})
+    references = reference_map()
+    references.resolve(labels.cursor(), ['Sony'])
+
+    labels.write(2, 'Parlophone')
+    labels.write(3)
+    labels.write(4, 'Sony Music')
+    cursor = labels.cursor()
+    assert references.resolve(cursor, ['EMI', 'Parlophone', 'Warner', 'sony music', 'Sony']) == (
+        [2, 4, 1], ['EMI', 'Warner']
+    )
+    # Not bound as the BINARY(8) @Since of the sp_GetChanges call before it
+    [(_, params, input_sizes)] = cursor.statements("WHERE RecordLabelID IN")
+    assert params == ('2,3,4',) and input_sizes is None
+
+    # Caught up: the next resolution only reads the feed
+    cursor = labels.cursor()
+    references.resolve(cursor, ['Sony'])
+    assert [sql for sql, _, _ in cursor.executed] == ["{CALL dbo.sp_GetChanges (?, ?, ?)}"]
+
+
+def test_refresh_reloads_after_the_cache_period(monkeypatch):
+    labels = Labels({1: 'Sony'})
+    references = reference_map()
+    references.resolve(labels.cursor(), ['Sony'])
+    labels.names[1] = 'Renamed without a feed entry'
+    monkeypatch.setattr(Config, 'REFERENCE_CACHE_SECONDS', -1)
+    assert references.resolve(labels.cursor(), ['Sony']) == ([], ['Sony'])
+
+
+def test_unknown_labels_and_contributors_are_a_400_naming_all_of_them(app, database, monkeypatch):
+    monkeypatch.setattr(references, 'RECORD_LABELS', reference_map())
+    monkeypatch.setattr(references, 'CONTRIBUTORS', ReferenceMap(
+        'contributors', "SELECT ContributorID, Person_NIF FROM dbo.Contributor{where}", 'ContributorID'))
+    database.rules += [
+        ("FROM dbo.RecordLabel", [(1, 'Sony')]),
+        ("FROM dbo.Contributor", [(5, '123456789')]),
+    ]
+    with app.test_request_context():
+        assert resolve_collaboration_references('sony', ['123456789']) == ('1', '5')
+        with pytest.raises(BadRequest) as raised:
+            resolve_collaboration_references('Sony, EMI', '123456789, 999')
+    assert raised.value.description == "Unknown record labels: EMI; Unknown contributors (NIF): 999"
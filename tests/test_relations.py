@@ -0,0 +1,75 @@
+import pytest
+
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from backend.services.list_queries import LIST_QUERIES
+from tests.fakes import FakeRow
+
+# URL → (parent list, child list)
+ENDPOINTS = {
+    '/api/contributors/7/songs': ('contributors', 'songs'),
+    '/api/contributors/7/collaborations': ('contributors', 'collaborations'),
+    '/api/record_labels/7/employees': ('record_labels', 'employees'),
+    '/api/record_labels/7/collaborations': ('record_labels', 'collaborations'),
+    '/api/songs/7/contributors': ('songs', 'contributors'),
+}
+
+
+def list_row(name, key, **values):
+    """A row of list `name` with key `key`; the columns not in `values` are NULL."""
+    query = LIST_QUERIES[name]
+    columns = dict.fromkeys(query.columns)
+    columns.update({query.key: key, 'RowVersion': bytes(8)}, **values)
+    return FakeRow(**columns)
+
+
+def detail_rule(parent, found):
+    key = LIST_QUERIES[parent].key
+    return f"SELECT {key}, RowVersion FROM", [list_row(parent, 7)] if found else []
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_related_rows(client, database, url):
+    parent, child = ENDPOINTS[url]
+    key = LIST_QUERIES[child].key
+    database.rules += [
+        detail_rule(parent, found=True),
+        (f"FROM dbo.{LIST_QUERIES[child].view}", [list_row(child, 1), list_row(child, 2)]),
+    ]
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [r[key] for r in response.get_json()] == [1, 2]
+
+    sql, params, _ = database.executed[-1]
+    assert "?" in sql and set(params) == {7}
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_missing_parent(client, database, url):
+    parent, _ = ENDPOINTS[url]
+    database.rules.append(detail_rule(parent, found=False))
+    response = client.get(url)
+    assert response.status_code == 404
+    assert "with ID 7 not found" in response.get_data(as_text=True)
+    assert len(database.executed) == 1
+
+
+def test_related_rows_paged_and_projected(client, database):
+    database.rules += [
+        detail_rule('contributors', found=True),
+        ("FROM dbo.vw_SongsBrief", [list_row('songs', 12, Title='Fado')]),
+    ]
+    response = client.get('/api/contributors/7/songs?fields=title&after=10&limit=5')
+    assert response.status_code == 200
+    assert response.get_json() == [{'SongID': 12, 'Title': 'Fado'}]
+    sql, params, _ = database.executed[-1]
+    assert sql.startswith("SELECT TOP (?) SongID, Title FROM dbo.vw_SongsBrief WHERE SongID IN")
+    assert params == (5, 7, 10)
+
+
+def test_related_rows_reject_unknown_fields(client, database):
+    response = client.get('/api/songs/7/contributors?fields=lyrics')
+    assert response.status_code == 400
+    assert database.executed == []
@@ -0,0 +1,31 @@
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from backend.services.rollups import RollupRefresher, refresh_rollups, rollups_reading
+from tests.fakes import FakeRow
+
+
+def feed(*entries):
+    """sp_GetChanges through the fake cursor: (entity, key) entries, in feed order."""
+    rows = [FakeRow(Entity=entity, EntityKey=str(key), Operation='U', RowVer=i.to_bytes(8, 'big'))
+            for i, (entity, key) in enumerate(entries, 1)]
+    return "sp_GetChanges", rows
+
+
+def test_contributor_changes_make_the_label_rollup_stale():
+    """A contributor's person decides which label's employee it is."""
+    assert rollups_reading('contributors') == {'contributors', 'labels'}
+
+
+def test_changed_contributors_refresh_their_rollups_for_their_keys(database):
+    database.rules.append(feed(('contributors', 5), ('contributors', 2)))
+    RollupRefresher()._apply_changes()
+    [(_, params, _)] = database.statements("sp_RefreshStats")
+    assert params == ('contributors,labels', None, None, '2,5', None, None)
+
+
+def test_refresh_without_changes_recomputes_every_group(database):
+    refresh_rollups()
+    [(_, params, _)] = database.statements("sp_RefreshStats")
+    assert params == (None, None, None, None, None, None)
@@ -0,0 +1,95 @@
+import pytest
+
+from tests import require_pyodbc
+
+require_pyodbc()
+pytest.importorskip('numpy', minversion='2')
+
+from backend.services.snapshot import ColumnarList, SnapshotRefresher
+from tests.fakes import FakeCursor, FakeRow
+
+COLUMNS = ('RecordLabelID', 'Name', 'Location', 'Website', 'Email', 'PhoneNumber', 'RowVersion')
+
+
+def label(key, name, location=None):
+    return FakeRow(RecordLabelID=key, Name=name, Location=location, Website=None,
+                   Email=f'{name.lower()}@labels.test', PhoneNumber=None, RowVersion=bytes([0] * 7 + [key]))
+
+
+class Labels:
+    """vw_RecordLabels and the change feed, as the fake cursor serves them."""
+
+    def __init__(self, *rows):
+        self.rows = {r.RecordLabelID: r for r in rows}
+        self.feed = []
+
+    def view(self, keys=None):
+        wanted = self.rows if keys is None else {int(k) for k in keys.split(',')}
+        return [self.rows[k] for k in sorted(wanted) if k in self.rows]
+
+    def changes(self, since, entities, limit):
+        return [e for e in self.feed if since is None or e.RowVer > since]
+
+    def write(self, operation, row_or_key):
+        if operation == 'D':
+            key = row_or_key
+            del self.rows[key]
+        else:
+            key = row_or_key.RecordLabelID
+            self.rows[key] = row_or_key
+        self.feed.append(FakeRow(Entity='record_labels', EntityKey=str(key), Operation=operation,
+                                 RowVer=len(self.feed).to_bytes(8, 'big')))
+
+    def cursor(self):
+        return FakeCursor(("sp_GetChanges", self.changes), ("FROM dbo.vw_RecordLabels", self.view))
+
+
+def loaded(labels):
+    snapshot = ColumnarList('record_labels')
+    snapshot.load(labels.cursor())
+    return snapshot
+
+
+def test_select_filters_like_the_list_query():
+    snapshot = loaded(Labels(label(1, 'Annie', 'Lisbon'), label(2, 'Bob'), label(3, 'Bobby', 'Porto')))
+    assert [r.RecordLabelID for r in snapshot.select('BOB', None, None, None, None, None, None)] == [2, 3]
+    # A NULL never contains anything
+    assert [r.Name for r in snapshot.select(None, 'o', None, None, None, None, None)] == ['Annie', 'Bobby']
+    assert snapshot.select(None, None, None, None, None, 1, 1) == [
+        {'RecordLabelID': 2, 'Name': 'Bob', 'Location': None, 'Website': None,
+         'Email': 'bob@labels.test', 'PhoneNumber': None, 'RowVersion': bytes([0] * 7 + [2])},
+    ]
+
+
+def test_select_projects_fields():
+    snapshot = loaded(Labels(label(1, 'Annie')))
+    assert snapshot.select(None, None, None, None, None, None, None,
+                           fields=('RecordLabelID', 'Name')) == [{'RecordLabelID': 1, 'Name': 'Annie'}]
+
+
+@pytest.mark.parametrize('value', ['Bo%', 'B_b', '[B]'])
+def test_select_leaves_like_wildcards_to_sql_server(value):
+    snapshot = loaded(Labels(label(1, 'Bob')))
+    assert snapshot.select(value, None, None, None, None, None, None) is None
+
+
+def test_patch_after_a_feed_read():
+    """The keys are bound as VARCHAR even though sp_GetChanges last bound a BINARY(8)."""
+    labels = Labels(label(1, 'Annie'), label(2, 'Bob'), label(3, 'Cy'))
+    refresher = SnapshotRefresher()
+    refresher._lists = {'record_labels': ColumnarList('record_labels')}
+    assert refresher._apply_changes(labels.cursor(), ()) is True
+
+    labels.write('U', label(2, 'Bobby'))
+    labels.write('I', label(4, 'Dee'))
+    labels.write('D', 3)
+    cursor = labels.cursor()
+    assert refresher._apply_changes(cursor, ()) is True
+
+    patched = cursor.statements("WHERE RecordLabelID IN")
+    assert [params for _, params, _ in patched] == [('2,3,4',)]
+    snapshot = refresher._lists['record_labels']
+    assert [(r.RecordLabelID, r.Name) for r in snapshot.select(*[None] * 7)] == [
+        (1, 'Annie'), (2, 'Bobby'), (4, 'Dee'),
+    ]
+    assert refresher._position == (2).to_bytes(8, 'big')
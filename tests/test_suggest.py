@@ -0,0 +1,49 @@
+from tests import require_pyodbc
+
+require_pyodbc()
+
+from backend.services.suggest import PrefixIndex, suggestions
+from tests.fakes import FakeRow
+
+PEOPLE = [
+    {'Name': 'Ana Silva', 'NIF': '123'},
+    {'Name': 'Álvaro Sousa', 'NIF': '456'},
+    {'Name': 'Silvia Santos', 'NIF': '789'},
+]
+
+
+def index():
+    return PrefixIndex(PEOPLE, lambda r: [r['Name'], *r['Name'].split()[1:], r['NIF']])
+
+
+def test_search_matches_any_term_by_prefix_in_term_order():
+    assert index().search('sil', 10) == [PEOPLE[0], PEOPLE[2]]
+    assert index().search('45', 10) == [PEOPLE[1]]
+
+
+def test_search_ignores_case_and_accents():
+    assert index().search('  ALVA', 10) == [PEOPLE[1]]
+
+
+def test_search_returns_each_record_once_up_to_the_limit():
+    people = [{'Name': 'Sa Sa', 'NIF': 'sa'}, *PEOPLE]
+    found = PrefixIndex(people, lambda r: [r['Name'], *r['Name'].split()[1:], r['NIF']]).search('s', 3)
+    assert found == [people[0], people[3], people[1]]     # sa, santos, silva
+    assert index().search('zz', 10) == []
+
+
+def test_suggest_builds_a_missing_index_on_first_use(client, database, monkeypatch):
+    monkeypatch.setattr(suggestions, '_indexes', {})
+    database.rules.append(("FROM dbo.RecordLabel", [
+        FakeRow(RecordLabelID=1, Name='Sony Music'), FakeRow(RecordLabelID=2, Name='Valentim de Carvalho'),
+    ]))
+    response = client.get('/api/suggest?entity=label&q=CARV')
+    assert response.status_code == 200
+    assert response.get_json() == [{'RecordLabelID': 2, 'Name': 'Valentim de Carvalho'}]
+
+    client.get('/api/suggest?entity=label&q=so')
+    assert len(database.statements("FROM dbo.RecordLabel")) == 1
+
+
+def test_suggest_rejects_unknown_entities(client, database):
+    assert client.get('/api/suggest?entity=song&q=a').status_code == 400